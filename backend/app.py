@@ -7,12 +7,16 @@ The routes are kept clean by delegating business logic to the core modules.
 
 import os
 import json
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 
 # Import core components
-from core.session import UnifiedSession
+from core.session import UnifiedSession, start_session_tracking
 from models.parameters import SearchParameters
+from utils.timing import start_request_timing, get_stage_timings, stage, format_server_timing
+from utils.deadline import Deadline
+from services.telemetry import get_telemetry
+from config import REQUEST_BUDGET_SECONDS
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -21,16 +25,153 @@ CORS(app)  # Enable CORS for all routes
 # Initialize session manager
 session_manager = UnifiedSession()
 
+# Precompute the tactical fit matrix while the player database is loaded
+try:
+    from core.tactical_rankings import get_tactical_ranking_engine
+    get_tactical_ranking_engine()
+except Exception as e:
+    print(f"Tactical rankings unavailable: {str(e)}")
+
+@app.before_request
+def begin_stage_timing():
+    """Collect per-stage timings and the sessions used by every request"""
+    start_request_timing()
+    start_session_tracking()
+
+@app.teardown_request
+def save_request_sessions(error=None):
+    """Save the sessions used by the request and release their locks
+
+    Runs at teardown so streamed responses keep their session until the stream ends.
+    """
+    session_manager.save_request_sessions()
+
+@app.after_request
+def add_server_timing(response):
+    """Report the collected stage timings in a Server-Timing header and to telemetry"""
+    timings = get_stage_timings()
+    if timings:
+        response.headers["Server-Timing"] = format_server_timing(timings)
+        get_telemetry().record_stages(request.url_rule.rule if request.url_rule else request.path, timings)
+    return response
+
 # ================ ROUTES ================
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint to verify the service is running"""
+    from services.claude_api import (
+        get_prompt_cache_stats, get_rate_limiter_stats, get_circuit_breaker_stats, get_task_stats
+    )
+    from services.job_queue import get_job_queue
+    from services.semantic_cache import get_parameter_cache
+    parameter_cache = get_parameter_cache()
     return jsonify({
         "status": "healthy", 
-        "message": "Katena Scout Unified API v4.0 is running"
+        "message": "Katena Scout Unified API v4.0 is running",
+        "prompt_cache": get_prompt_cache_stats()["totals"],
+        "claude_limiter": get_rate_limiter_stats(),
+        "claude_circuit_breaker": get_circuit_breaker_stats(),
+        "claude_tasks": get_task_stats(),
+        "jobs": get_job_queue().stats(),
+        "parameter_cache": parameter_cache.stats() if parameter_cache else {"enabled": False},
+        "sessions": session_manager.sessions.stats(),
+        "session_backend": session_manager.session_backend.stats(),
+        "session_journal": session_manager.session_journal.stats() if session_manager.session_journal else {"enabled": False}
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Claude call, request stage and session store metrics in the Prometheus text format"""
+    body = get_telemetry().render_prometheus() + session_manager.sessions.render_prometheus()
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+def _recognize_intent(session, query, deadline=None):
+    """Identify the intent of a chat message and merge its entities into the session"""
+    from functools import partial
+    from core.intent import identify_intent, extract_entities
+    
+    # Intent and entity calls share the request's deadline
+    claude_api_call = partial(session_manager.call_claude_api, deadline=deadline)
+    
+    try:
+        with stage("intent"):
+            intent = identify_intent(session, query, claude_api_call)
+        print(f"Identified intent: {intent.name} with confidence {intent.confidence}")
+        session.current_intent = intent.name
+        
+        # Extract relevant entities based on intent
+        with stage("entities"):
+            entities = extract_entities(session, query, intent, claude_api_call)
+    except Exception as e:
+        # Log the error but continue with a safe default
+        print(f"Error in intent recognition: {str(e)}")
+        from core.intent import Intent
+        intent = Intent(name="casual_conversation", confidence=0.9)
+        session.current_intent = intent.name
+        entities = {}
+    session.entities.update(entities)
+    
+    return intent
+
+def _handle_intent(intent, session, query, deadline=None):
+    """Dispatch a chat message to the handler for its intent"""
+    from core.handlers import (
+        handle_player_search, 
+        handle_player_comparison, 
+        handle_stats_explanation, 
+        handle_casual_chat, 
+        handle_fallback
+    )
+    
+    if intent.name == "player_search":
+        return handle_player_search(session, query, session_manager, deadline)
+    elif intent.name == "player_comparison":
+        return handle_player_comparison(session, query, session_manager, deadline)
+    elif intent.name == "explain_stats":
+        return handle_stats_explanation(session, query, session_manager, deadline)
+    elif intent.name == "casual_conversation":
+        return handle_casual_chat(session, query, session_manager, deadline)
+    else:
+        return handle_fallback(session, query, session_manager, deadline)
+
+def _format_intent_response(response_data, language):
+    """Format handler output into the JSON body returned by /enhanced_search"""
+    if response_data["type"] == "search_results":
+        from utils.formatters import format_search_response
+        return format_search_response(
+            players=response_data["players"],
+            text_response=response_data["text"],
+            language=language,
+            follow_up_suggestions=response_data.get("follow_up_suggestions", [])
+        )
+    elif response_data["type"] == "player_comparison":
+        from utils.formatters import format_comparison_response
+        # Print debug info for in-chat comparison flag
+        print(f"DEBUG - Player comparison response with in_chat_comparison: {response_data.get('in_chat_comparison', False)}")
+        
+        return format_comparison_response(
+            players=response_data["players"],
+            comparison_text=response_data["text"],
+            comparison_aspects=response_data["comparison_aspects"],
+            language=language,
+            in_chat_comparison=response_data.get("in_chat_comparison", False)
+        )
+    elif response_data["type"] == "error":
+        from utils.formatters import format_error_response
+        return format_error_response(
+            error="processing_error",
+            message=response_data["message"],
+            language=language
+        )
+    else:
+        # Text response or other types
+        return {
+            "success": True,
+            "response": response_data["text"],
+            "language": language
+        }
+
 @app.route('/enhanced_search', methods=['POST'])
 def enhanced_search():
     """
@@ -87,80 +228,16 @@ def enhanced_search():
         # Add user message to session history
         session.messages.append({"role": "user", "content": query})
         
-        # Determine the user's intent
-        from core.intent import identify_intent, extract_entities
-        
-        try:
-            intent = identify_intent(session, query, session_manager.call_claude_api)
-            print(f"Identified intent: {intent.name} with confidence {intent.confidence}")
-            session.current_intent = intent.name
-            
-            # Extract relevant entities based on intent
-            entities = extract_entities(session, query, intent, session_manager.call_claude_api)
-        except Exception as e:
-            # Log the error but continue with a safe default
-            print(f"Error in intent recognition: {str(e)}")
-            from core.intent import Intent
-            intent = Intent(name="casual_conversation", confidence=0.9)
-            session.current_intent = intent.name
-            entities = {}
-        session.entities.update(entities)
-        
-        # Handle based on intent
-        from core.handlers import (
-            handle_player_search, 
-            handle_player_comparison, 
-            handle_stats_explanation, 
-            handle_casual_chat, 
-            handle_fallback
-        )
+        # All stages share one latency budget; when it runs out they degrade
+        # to local fallbacks instead of waiting on Claude
+        deadline = Deadline(REQUEST_BUDGET_SECONDS)
         
-        if intent.name == "player_search":
-            response_data = handle_player_search(session, query, session_manager)
-        elif intent.name == "player_comparison":
-            response_data = handle_player_comparison(session, query, session_manager)
-        elif intent.name == "explain_stats":
-            response_data = handle_stats_explanation(session, query, session_manager)
-        elif intent.name == "casual_conversation":
-            response_data = handle_casual_chat(session, query, session_manager)
-        else:
-            response_data = handle_fallback(session, query, session_manager)
+        # Determine the user's intent and handle it
+        intent = _recognize_intent(session, query, deadline)
+        response_data = _handle_intent(intent, session, query, deadline)
         
         # Format the response based on response type
-        if response_data["type"] == "search_results":
-            from utils.formatters import format_search_response
-            return jsonify(format_search_response(
-                players=response_data["players"],
-                text_response=response_data["text"],
-                language=language,
-                follow_up_suggestions=response_data.get("follow_up_suggestions", [])
-            ))
-        elif response_data["type"] == "player_comparison":
-            from utils.formatters import format_comparison_response
-            # Print debug info for in-chat comparison flag
-            print(f"DEBUG - Player comparison response with in_chat_comparison: {response_data.get('in_chat_comparison', False)}")
-            
-            return jsonify(format_comparison_response(
-                players=response_data["players"],
-                comparison_text=response_data["text"],
-                comparison_aspects=response_data["comparison_aspects"],
-                language=language,
-                in_chat_comparison=response_data.get("in_chat_comparison", False)
-            ))
-        elif response_data["type"] == "error":
-            from utils.formatters import format_error_response
-            return jsonify(format_error_response(
-                error="processing_error",
-                message=response_data["message"],
-                language=language
-            ))
-        else:
-            # Text response or other types
-            return jsonify({
-                "success": True,
-                "response": response_data["text"],
-                "language": language
-            })
+        return jsonify(_format_intent_response(response_data, language))
     
     except Exception as e:
         print(f"Error in enhanced search endpoint: {str(e)}")
@@ -171,6 +248,90 @@ def enhanced_search():
             language="english"
         ))
 
+@app.route('/enhanced_search/stream', methods=['POST'])
+def enhanced_search_stream():
+    """
+    Streaming variant of /enhanced_search using server-sent events
+    
+    Request: same body as /enhanced_search
+    
+    Response (text/event-stream), for player searches:
+        event: players      data: {"players": [...], "language": "english"}
+        event: narrative    data: {"text": "..."}              (repeated)
+        event: suggestions  data: {"follow_up_suggestions": [...], "satisfaction_question": "..."}
+        event: done         data: {}
+    
+    Other intents are answered with a single "response" event carrying the
+    same JSON body /enhanced_search would return, followed by "done".
+    """
+    from utils.formatters import (
+        format_sse_event, format_error_response, process_player_data, get_satisfaction_question
+    )
+    
+    data = request.json
+    
+    from utils.validators import validate_search_request
+    valid, error_msg, validated_data = validate_search_request(data)
+    
+    if not valid:
+        return jsonify(format_error_response(
+            error="invalid_request", 
+            message=error_msg,
+            language=validated_data.get("language", "english")
+        ))
+    
+    session_id = validated_data["session_id"]
+    query = validated_data["query"]
+    language = validated_data["language"]
+    
+    def generate():
+        deadline = Deadline(REQUEST_BUDGET_SECONDS)
+        try:
+            session = session_manager.get_session(session_id, language)
+            
+            session.is_follow_up = validated_data["is_follow_up"]
+            if validated_data["satisfaction"] is not None:
+                session.satisfaction = validated_data["satisfaction"]
+            
+            session.messages.append({"role": "user", "content": query})
+            
+            intent = _recognize_intent(session, query, deadline)
+            
+            if intent.name != "player_search":
+                response_data = _handle_intent(intent, session, query, deadline)
+                yield format_sse_event("response", _format_intent_response(response_data, language))
+            else:
+                from core.handlers import stream_player_search
+                for event, payload in stream_player_search(session, query, session_manager, deadline):
+                    if event == "players":
+                        payload = {
+                            "players": [process_player_data(player) for player in payload["players"]],
+                            "language": language
+                        }
+                    elif event == "suggestions":
+                        payload = {
+                            **payload,
+                            "satisfaction_question": get_satisfaction_question(language)
+                        }
+                    elif event == "response":
+                        payload = _format_intent_response(payload, language)
+                    yield format_sse_event(event, payload)
+        except Exception as e:
+            print(f"Error in enhanced search stream: {str(e)}")
+            yield format_sse_event("error", format_error_response(
+                error="server_error",
+                message="An unexpected error occurred. Please try again.",
+                language=language
+            ))
+        
+        yield format_sse_event("done", {})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.route('/player_comparison', methods=['POST'])
 def compare_players():
     """
@@ -179,9 +340,10 @@ def compare_players():
     Request:
     {
         "session_id": "unique-session-id",
-        "player_ids": ["player_id_1", "player_id_2"],
+        "player_ids": ["player_id_1", "player_id_2", ...] (2 up to MAX_COMPARISON_PLAYERS),
         "language": "english" (optional),
-        "include_ai_analysis": false (optional, defaults to false)
+        "include_ai_analysis": false (optional, defaults to false),
+        "async": false (optional; with include_ai_analysis, generate the text in a background job)
     }
     
     Response:
@@ -194,7 +356,9 @@ def compare_players():
         "metric_winners": {...},
         "overall_winner": {...},
         "categorized_metrics": {...},
-        "category_winners": {...}
+        "category_winners": {...},
+        "standings": [...], "dominance_matrix": [[...]], "metric_ranks": {...} (three or more players only),
+        "job": {"job_id": "...", "status": "queued", ...} (async only; "comparison" is then empty)
     }
     """
     try:
@@ -217,6 +381,7 @@ def compare_players():
         player_ids = validated_data["player_ids"]
         language = validated_data["language"]
         include_ai_analysis = validated_data.get("include_ai_analysis", False)
+        run_async = validated_data.get("async", False)
         
         # Extract additional tactical parameters
         playing_style = validated_data.get("playing_style", "")
@@ -227,13 +392,14 @@ def compare_players():
         
         # Find players for comparison (from direct API)
         from core.comparison import find_players_for_comparison
-        players = find_players_for_comparison(
-            session_manager,
-            session_id,
-            player_ids,
-            language,
-            source="api"  # indicate this is from direct API
-        )
+        with stage("find_players"):
+            players = find_players_for_comparison(
+                session_manager,
+                session_id,
+                player_ids,
+                language,
+                source="api"  # indicate this is from direct API
+            )
         
         # Ensure we have at least 2 players to compare
         if len(players) < 2:
@@ -247,18 +413,52 @@ def compare_players():
         # Initialize vars for result
         comparison_text = ""
         comparison_aspects = ["Technical", "Physical", "Mental", "Experience"]
+        job_info = None
         
+        if include_ai_analysis and run_async:
+            # Queue the AI text and answer now with the numeric comparison
+            def run_comparison():
+                from core.comparison import compare_players
+                comparison_result = compare_players(
+                    players=players,
+                    session_manager=session_manager,
+                    language=language,
+                    playing_style=playing_style,
+                    formation=formation
+                )
+                with session_manager.locked_session(session_id, language) as job_session:
+                    job_session.messages.append({
+                        "role": "assistant", 
+                        "content": comparison_result.get("comparison", "")
+                    })
+                return {
+                    "comparison": comparison_result.get("comparison", ""),
+                    "comparison_aspects": comparison_result.get("comparison_aspects", [])
+                }
+            
+            job_info, error_response = _submit_job(session_id, "comparison", run_comparison, language)
+            if error_response:
+                return jsonify(error_response)
+            
+            from core.enhanced_comparison import enhance_player_comparison
+            with stage("comparison"):
+                enhanced_data = enhance_player_comparison(
+                    players=players,
+                    comparison_text="",
+                    search_weights=None
+                )
         # If AI analysis is requested, use the standard comparison function
-        if include_ai_analysis:
+        elif include_ai_analysis:
             # Generate comparison with text analysis, including tactical parameters if provided
             from core.comparison import compare_players
-            comparison_result = compare_players(
-                players=players,
-                session_manager=session_manager,
-                language=language,
-                playing_style=playing_style,
-                formation=formation
-            )
+            with stage("comparison"):
+                comparison_result = compare_players(
+                    players=players,
+                    session_manager=session_manager,
+                    language=language,
+                    playing_style=playing_style,
+                    formation=formation
+                )
             
             comparison_text = comparison_result.get("comparison", "")
             comparison_aspects = comparison_result.get("comparison_aspects", comparison_aspects)
@@ -272,16 +472,17 @@ def compare_players():
         else:
             # Use enhanced comparison directly without AI analysis
             from core.enhanced_comparison import enhance_player_comparison
-            enhanced_data = enhance_player_comparison(
-                players=players,
-                comparison_text="",  # No AI text to process
-                search_weights=None
-            )
+            with stage("comparison"):
+                enhanced_data = enhance_player_comparison(
+                    players=players,
+                    comparison_text="",  # No AI text to process
+                    search_weights=None
+                )
         
         # Format response
         from utils.formatters import format_comparison_response
         
-        return jsonify(format_comparison_response(
+        response = format_comparison_response(
             players=players,
             comparison_text=comparison_text,
             comparison_aspects=comparison_aspects,
@@ -290,8 +491,15 @@ def compare_players():
             overall_winner=enhanced_data.get("overall_winner", {}),
             categorized_metrics=enhanced_data.get("categorized_metrics", {}),
             category_winners=enhanced_data.get("category_winners", {}),
-            negative_metrics=enhanced_data.get("negative_metrics", [])
-        ))
+            negative_metrics=enhanced_data.get("negative_metrics", []),
+            standings=enhanced_data.get("standings"),
+            dominance_matrix=enhanced_data.get("dominance_matrix"),
+            metric_ranks=enhanced_data.get("metric_ranks")
+        )
+        if job_info:
+            response["job"] = job_info
+        
+        return jsonify(response)
         
     except Exception as e:
         print(f"Error in player comparison endpoint: {str(e)}")
@@ -434,8 +642,8 @@ def get_follow_up_suggestions(session_id):
         # Generate follow-up suggestions based on session state
         from core.intent import generate_follow_up_suggestions
         
-        # Get the selected players from the session
-        players = session.selected_players if hasattr(session, "selected_players") else []
+        # Rebuild the selected players from the references kept in the session
+        players = session_manager.hydrate_players(session)
         
         # Generate suggestions
         suggestions = generate_follow_up_suggestions(session, players)
@@ -622,7 +830,8 @@ def tactical_analysis():
         "playing_style": "possession_based",
         "formation": "4-3-3",
         "original_query": "Compare players for possession style",
-        "language": "english" (optional)
+        "language": "english" (optional),
+        "async": false (optional; generate the analysis text in a background job)
     }
     
     Response:
@@ -639,7 +848,8 @@ def tactical_analysis():
             "style_display_name": "Possession-Based"
         },
         "players": [...],
-        "language": "english"
+        "language": "english",
+        "job": {"job_id": "...", "status": "queued", ...} (async only; "tactical_analysis" is then null)
     }
     """
     try:
@@ -666,8 +876,9 @@ def tactical_analysis():
         original_query = validated_data["original_query"]
         language = validated_data["language"]
         
-        # Get session
-        session = session_manager.get_session(session_id, language)
+        # Not used here, but loading the session takes its lock for this request,
+        # so the analysis does not run alongside another request on the session
+        session_manager.get_session(session_id, language)
         
         # Use provided players if available, otherwise find by IDs
         players = []
@@ -679,12 +890,13 @@ def tactical_analysis():
             # Find players by IDs
             print("Finding players by IDs for tactical analysis")
             from core.comparison import find_players_for_comparison
-            players = find_players_for_comparison(
-                session_manager,
-                session_id,
-                player_ids,
-                language
-            )
+            with stage("find_players"):
+                players = find_players_for_comparison(
+                    session_manager,
+                    session_id,
+                    player_ids,
+                    language
+                )
         
         # Ensure we have exactly 2 players to compare
         if len(players) != 2:
@@ -699,36 +911,52 @@ def tactical_analysis():
         from core.tactical_analysis import compare_players_tactically, generate_tactical_analysis
         
         # First get the tactical fit data
-        tactical_data = compare_players_tactically(
-            players=players,
-            style=playing_style,
-            formation=formation
-        )
+        with stage("tactical_fit"):
+            tactical_data = compare_players_tactically(
+                players=players,
+                style=playing_style,
+                formation=formation
+            )
         
         # Then generate the AI analysis
-        analysis_text = generate_tactical_analysis(
-            players=players,
-            original_query=original_query,
-            playing_style=playing_style,
-            formation=formation,
-            session_manager=session_manager,
-            language=language
-        )
-        
-        # Add to session history
-        session.messages.append({
-            "role": "assistant", 
-            "content": f"Tactical Analysis ({playing_style}, {formation}): {analysis_text[:100]}..."
-        })
+        def run_tactical_analysis():
+            with stage("tactical_narrative"):
+                analysis = generate_tactical_analysis(
+                    players=players,
+                    original_query=original_query,
+                    playing_style=playing_style,
+                    formation=formation,
+                    session_manager=session_manager,
+                    language=language
+                )
+            
+            # Add to session history (generate_tactical_analysis returns a response dict)
+            summary_text = analysis.get("comparison_text", "") if isinstance(analysis, dict) else str(analysis)
+            with session_manager.locked_session(session_id, language) as job_session:
+                job_session.messages.append({
+                    "role": "assistant", 
+                    "content": f"Tactical Analysis ({playing_style}, {formation}): {summary_text[:100]}..."
+                })
+            return analysis
         
-        # Format response (using a custom formatter for tactical analysis)
-        return jsonify({
+        response = {
             "success": True,
-            "tactical_analysis": analysis_text,
+            "tactical_analysis": None,
             "tactical_data": tactical_data,
             "players": players,
             "language": language
-        })
+        }
+        
+        if validated_data.get("async", False):
+            job_info, error_response = _submit_job(session_id, "tactical_analysis", run_tactical_analysis, language)
+            if error_response:
+                return jsonify(error_response)
+            response["job"] = job_info
+        else:
+            response["tactical_analysis"] = run_tactical_analysis()
+        
+        # Format response (using a custom formatter for tactical analysis)
+        return jsonify(response)
         
     except Exception as e:
         print(f"Error in tactical analysis endpoint: {str(e)}")
@@ -739,6 +967,377 @@ def tactical_analysis():
             language="english"
         ))
 
+@app.route('/tactical_rankings', methods=['POST'])
+def tactical_rankings():
+    """
+    Endpoint ranking the whole database by tactical fit for a playing style
+    
+    Request:
+    {
+        "playing_style": "gegenpressing" (key or display name),
+        "formation": "4-3-3" (optional; only players of the formation's positions),
+        "positions": ["cmf", "dmf"] (optional; only players of these positions),
+        "limit": 20 (optional),
+        "language": "english" (optional)
+    }
+    
+    Response:
+    {
+        "success": true,
+        "style": "gegenpressing",
+        "style_display_name": "Gegenpressing",
+        "formation": "4-3-3",
+        "positions": [],
+        "rankings": [
+            {"rank": 1, "wyId": 123, "name": "...", "age": 24, "positions": ["cmf"],
+             "style_score": 87.5, "coverage": 0.74, "position_fit": 100.0,
+             "key_strengths": [{"metric": "average_counterpressingRecoveries", "percentile": 97.5}, ...]},
+            ...
+        ],
+        "language": "english"
+    }
+    """
+    try:
+        from utils.validators import validate_tactical_rankings_request
+        valid, error_msg, validated_data = validate_tactical_rankings_request(request.json)
+        
+        if not valid:
+            from utils.formatters import format_error_response
+            return jsonify(format_error_response(
+                error="invalid_request",
+                message=error_msg,
+                language=validated_data.get("language", "english")
+            ))
+        
+        from config import TACTICAL_RANKINGS
+        from core.tactical_analysis import STYLE_DISPLAY_NAMES_REVERSE
+        from core.tactical_rankings import get_tactical_ranking_engine
+        
+        style = validated_data["playing_style"]
+        with stage("tactical_rankings"):
+            rankings = get_tactical_ranking_engine().rank(
+                style,
+                formation=validated_data["formation"],
+                positions=validated_data["positions"],
+                limit=validated_data["limit"],
+                min_coverage=TACTICAL_RANKINGS["min_coverage"]
+            )
+        
+        return jsonify({
+            "success": True,
+            "style": style,
+            "style_display_name": STYLE_DISPLAY_NAMES_REVERSE.get(style, style),
+            "formation": validated_data["formation"],
+            "positions": validated_data["positions"],
+            "rankings": rankings,
+            "language": validated_data["language"]
+        })
+        
+    except Exception as e:
+        print(f"Error in tactical rankings endpoint: {str(e)}")
+        from utils.formatters import format_error_response
+        return jsonify(format_error_response(
+            error="server_error",
+            message="An error occurred while ranking players. Please try again.",
+            language="english"
+        ))
+
+@app.route('/squad_builder', methods=['POST'])
+def squad_builder():
+    """
+    Endpoint building the best XI for a formation and playing style
+    
+    Request:
+    {
+        "formation": "4-3-3",
+        "playing_style": "gegenpressing" (key or display name),
+        "player_ids": ["player_id_1", ...] (optional; pick from this shortlist),
+        "club": "Estudiantes" (optional; team name or id),
+        "min_age": 18, "max_age": 25 (optional),
+        "contract_expiration": "2025-06-30" (optional; contracts ending by this date),
+        "language": "english" (optional)
+    }
+    Without player_ids or club the whole database is the pool; the filters apply to every pool.
+    
+    Response:
+    {
+        "success": true,
+        "formation": "4-3-3",
+        "style": "gegenpressing",
+        "style_display_name": "Gegenpressing",
+        "squad": [
+            {"slot": "gk", "slot_index": 0, "player": {"wyId": 123, "name": "...", "age": 27, "positions": ["gk"]},
+             "style_score": 71.3, "position_suitability": 1.0, "fit": 71.3},
+            ...
+        ],
+        "total_fit": 742.5,
+        "average_fit": 67.5,
+        "unfilled_slots": [],
+        "pool_size": 2451,
+        "candidates_considered": 98,
+        "language": "english"
+    }
+    """
+    try:
+        from utils.validators import validate_squad_builder_request
+        valid, error_msg, validated_data = validate_squad_builder_request(request.json)
+        
+        if not valid:
+            from utils.formatters import format_error_response
+            return jsonify(format_error_response(
+                error="invalid_request",
+                message=error_msg,
+                language=validated_data.get("language", "english")
+            ))
+        
+        from config import SQUAD_BUILDER, TACTICAL_RANKINGS
+        from core.squad_builder import build_squad, resolve_team_id, select_pool
+        from core.tactical_analysis import STYLE_DISPLAY_NAMES_REVERSE
+        from core.tactical_rankings import get_tactical_ranking_engine
+        
+        language = validated_data["language"]
+        team_id = None
+        if validated_data["club"] not in (None, ""):
+            team_id = resolve_team_id(validated_data["club"])
+            if team_id is None:
+                from utils.formatters import format_error_response
+                return jsonify(format_error_response(
+                    error="unknown_club",
+                    message=f"Club not found: {validated_data['club']}",
+                    language=language
+                ))
+        
+        engine = get_tactical_ranking_engine()
+        style = validated_data["playing_style"]
+        with stage("squad_builder"):
+            pool = select_pool(
+                engine,
+                player_ids=validated_data["player_ids"],
+                team_id=team_id,
+                min_age=validated_data["min_age"],
+                max_age=validated_data["max_age"],
+                contract_expiration=validated_data["contract_expiration"]
+            )
+            result = build_squad(
+                engine,
+                style,
+                validated_data["formation"],
+                pool,
+                top_k=SQUAD_BUILDER["top_k_per_slot"],
+                min_coverage=TACTICAL_RANKINGS["min_coverage"]
+            )
+        
+        return jsonify({
+            "success": True,
+            "formation": validated_data["formation"],
+            "style": style,
+            "style_display_name": STYLE_DISPLAY_NAMES_REVERSE.get(style, style),
+            **result,
+            "language": language
+        })
+        
+    except Exception as e:
+        print(f"Error in squad builder endpoint: {str(e)}")
+        from utils.formatters import format_error_response
+        return jsonify(format_error_response(
+            error="server_error",
+            message="An error occurred while building the squad. Please try again.",
+            language="english"
+        ))
+
+def _submit_job(session_id, kind, fn, language):
+    """
+    Queue a background job for a long AI generation
+    
+    Returns:
+        Tuple of (job info for the response, None) or (None, error response) when the queue is full
+    """
+    from services.job_queue import get_job_queue
+    from services.rate_limiter import QueueFullError
+    
+    try:
+        job = get_job_queue().submit(session_id, kind, fn)
+    except QueueFullError as e:
+        print(f"Rejected {kind} job: {str(e)}")
+        from utils.formatters import format_error_response
+        return None, format_error_response(
+            error="queue_full",
+            message="Too many analyses are in progress. Please try again in a moment.",
+            language=language
+        )
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events"
+    }, None
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Poll a background job started with "async": true
+    
+    Response:
+    {
+        "success": true,
+        "job": {"job_id": "...", "kind": "comparison", "status": "queued|running|succeeded|failed",
+                "result": {...} (succeeded), "error": "..." (failed), ...}
+    }
+    """
+    from services.job_queue import get_job_queue
+    
+    job = get_job_queue().get(job_id)
+    if job is None:
+        from utils.formatters import format_error_response
+        return jsonify(format_error_response(
+            error="job_not_found",
+            message="Job not found or expired",
+            language="english"
+        ))
+    
+    return jsonify({"success": True, "job": job.to_dict()})
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Subscribe to a background job using server-sent events
+    
+    Response (text/event-stream):
+        event: status   data: {"job_id": "...", "status": "queued|running"}   (on every change)
+        event: result   data: job as returned by /jobs/<job_id>              (succeeded or failed)
+        event: done     data: {}
+    """
+    from services.job_queue import get_job_queue, FINISHED_STATES
+    from utils.formatters import format_sse_event, format_error_response
+    
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id)
+    
+    def generate():
+        if job is None:
+            yield format_sse_event("error", format_error_response(
+                error="job_not_found",
+                message="Job not found or expired",
+                language="english"
+            ))
+        else:
+            version = -1
+            while True:
+                if job.version != version:
+                    version = job.version
+                    if job.status in FINISHED_STATES:
+                        yield format_sse_event("result", job.to_dict())
+                        break
+                    yield format_sse_event("status", {"job_id": job.id, "status": job.status})
+                # Wake up periodically so idle connections get a keep-alive comment
+                if job_queue.wait(job, version, timeout=15.0) == version:
+                    yield ": keep-alive\n\n"
+        
+        yield format_sse_event("done", {})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _check_admin_token():
+    """Return an error response unless the request carries the configured admin token"""
+    import hmac
+    from config import ADMIN_TOKEN
+    from utils.formatters import format_error_response
+    
+    if not ADMIN_TOKEN:
+        return jsonify(format_error_response(
+            error="admin_disabled",
+            message="Admin endpoints are disabled; set KATENA_ADMIN_TOKEN to enable them",
+            language="english"
+        ))
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+        return jsonify(format_error_response(
+            error="unauthorized",
+            message="Missing or invalid admin token",
+            language="english"
+        ))
+    return None
+
+@app.route('/admin/parameter_cache', methods=['GET'])
+def admin_parameter_cache():
+    """
+    Inspect the semantic parameter cache
+    
+    Query parameters: language (optional), limit (default 100)
+    
+    Response:
+    {
+        "success": true,
+        "stats": {"entries": {"english": 12}, "hits": 30, "misses": 12, ...},
+        "entries": [{"id": "...", "query": "...", "normalized": "...", "hits": 3, "params": {...}, ...}]
+    }
+    """
+    error_response = _check_admin_token()
+    if error_response is not None:
+        return error_response
+    
+    from services.semantic_cache import get_parameter_cache
+    
+    cache = get_parameter_cache()
+    if cache is None:
+        return jsonify({"success": True, "stats": {"enabled": False}, "entries": []})
+    
+    language = request.args.get("language")
+    limit = max(1, min(request.args.get("limit", 100, type=int), 1000))
+    return jsonify({"success": True, "stats": cache.stats(), "entries": cache.entries(language, limit)})
+
+@app.route('/admin/parameter_cache/evict', methods=['POST'])
+def admin_parameter_cache_evict():
+    """
+    Evict bad entries from the semantic parameter cache
+    
+    Request body (one of):
+        {"id": "<entry id>"}
+        {"query": "...", "language": "english", "threshold": 0.8 (optional)}  - every entry the query matches
+        {"all": true, "language": "english" (optional)}
+    
+    Response:
+    {
+        "success": true,
+        "evicted": ["<entry id>", ...] or "evicted_count": 12
+    }
+    """
+    error_response = _check_admin_token()
+    if error_response is not None:
+        return error_response
+    
+    from services.semantic_cache import get_parameter_cache
+    from utils.formatters import format_error_response
+    
+    data = request.json or {}
+    cache = get_parameter_cache()
+    if cache is None:
+        return jsonify({"success": True, "evicted": []})
+    
+    if data.get("id"):
+        evicted = [data["id"]] if cache.evict(str(data["id"])) else []
+        return jsonify({"success": True, "evicted": evicted})
+    if data.get("query"):
+        threshold = data.get("threshold")
+        evicted = cache.evict_query(
+            str(data["query"]),
+            data.get("language", "english"),
+            float(threshold) if threshold is not None else None
+        )
+        return jsonify({"success": True, "evicted": evicted})
+    if data.get("all") is True:
+        return jsonify({"success": True, "evicted_count": cache.clear(data.get("language"))})
+    
+    return jsonify(format_error_response(
+        error="invalid_request",
+        message='Provide "id", "query" or "all": true',
+        language="english"
+    ))
+
 # Run the application
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=False)
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Token-count benchmark for the players section of the search narrative prompt
+
+Compares the legacy keyed-JSON encoding with the compact table encoding from
+utils.prompt_encoder for a few typical searches. Token counts are estimated
+locally; if ANTHROPIC_API_KEY is set, exact counts are also fetched from the
+token counting endpoint.
+
+Usage:
+    python benchmark_prompt_encoding.py [number_of_players]
+"""
+
+import json
+import os
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.parameters import SearchParameters
+from services.data_service import get_player_database, get_player_database_by_id
+from core.player_search import get_player_info
+from utils.prompt_encoder import compare_encodings, encode_players_for_prompt
+
+# Representative parameter sets (mirroring the examples in the extraction prompt)
+SAMPLE_SEARCHES = {
+    "playmaking midfielders": SearchParameters(
+        position_codes=["cmf", "lcmf", "rcmf"],
+        key_description_word=["passing", "playmaking"],
+        average_passes=True,
+        percent_successfulPasses=True,
+        average_progressivePasses=True,
+        average_passesToFinalThird=True,
+        average_smartPasses=True,
+        average_keyPasses=True,
+        total_xgAssist=True
+    ),
+    "aerial centre backs": SearchParameters(
+        position_codes=["cb", "lcb", "rcb"],
+        key_description_word=["aerial", "defensive"],
+        average_aerialDuelsWon=True,
+        percent_aerialDuelsWon=True,
+        average_defensiveDuelsWon=True,
+        average_interceptions=True,
+        total_clearances=True
+    ),
+    "pressing strikers": SearchParameters(
+        position_codes=["cf"],
+        key_description_word=["scoring", "pressing"],
+        total_goals=True,
+        average_shotsOnTarget=True,
+        total_xgShot=True,
+        percent_goalConversion=True,
+        average_counterpressingRecoveries=True,
+        average_dangerousOpponentHalfRecoveries=True
+    )
+}
+
+
+def count_tokens_with_api(text: str):
+    """Get an exact input token count from the API, or None if unavailable"""
+    from services.claude_api import get_anthropic_api_key
+    api_key = get_anthropic_api_key()
+    if not api_key:
+        return None
+
+    import requests
+    try:
+        response = requests.post(
+            "https://api.anthropic.com/v1/messages/count_tokens",
+            headers={
+                "x-api-key": api_key,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json"
+            },
+            json={
+                "model": "claude-3-5-sonnet-20241022",
+                "messages": [{"role": "user", "content": text}]
+            },
+            timeout=30
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"Token counting endpoint unavailable: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    return response.json().get("input_tokens")
+
+
+def run_benchmark(player_count: int = 5):
+    """Print character and token counts for both encodings"""
+    database = get_player_database()
+    database_id = get_player_database_by_id()
+
+    print(f"Players per search: {player_count}\n")
+    print(f"{'search':<26}{'encoding':<10}{'chars':>8}{'est. tokens':>13}{'api tokens':>12}")
+
+    for label, params in SAMPLE_SEARCHES.items():
+        players = []
+        for name, player_data in database.items():
+            player_info = get_player_info(
+                player_id=player_data.get('wyId', name),
+                database=database,
+                database_id=database_id,
+                params=params
+            )
+            if 'error' not in player_info:
+                players.append(player_info)
+            if len(players) >= player_count:
+                break
+
+        results = compare_encodings(players, params)
+        texts = {
+            "json": json.dumps([{k: v for k, v in p.items() if k != "complete_profile"} for p in players]),
+            "table": encode_players_for_prompt(players, params)
+        }
+
+        for encoding, (chars, tokens) in results.items():
+            api_tokens = count_tokens_with_api(texts[encoding])
+            print(f"{label:<26}{encoding:<10}{chars:>8}{tokens:>13}{api_tokens if api_tokens is not None else '-':>12}")
+
+        saved = 1 - results["table"][1] / results["json"][1] if results["json"][1] else 0
+        print(f"{'':<26}{'saved':<10}{'':>8}{saved:>12.0%}\n")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
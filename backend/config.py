@@ -32,6 +32,52 @@ VALID_POSITION_CODES = [
     "cf"
 ]
 
+# Common position names and abbreviations (in the supported languages) mapped to position codes.
+# Used by services.nlp_service to correct invalid codes without calling Claude.
+POSITION_ALIASES = {
+    # English abbreviations
+    "gk": ["gk"], "keeper": ["gk"], "goalie": ["gk"],
+    "cb": ["cb", "rcb", "lcb"], "centre back": ["cb", "rcb", "lcb"], "central defender": ["cb", "rcb", "lcb"],
+    "defender": ["cb", "rcb", "lcb"], "sweeper": ["cb"],
+    "fb": ["rb", "lb"], "full back": ["rb", "lb"], "wb": ["rwb", "lwb"], "wing back": ["rwb", "lwb"],
+    "right wing back": ["rwb"], "left wing back": ["lwb"],
+    "dm": ["dmf", "rdmf", "ldmf"], "cdm": ["dmf", "rdmf", "ldmf"], "holding midfielder": ["dmf", "rdmf", "ldmf"],
+    "anchor": ["dmf"],
+    "cm": ["cmf", "rcmf", "lcmf"], "mf": ["cmf", "rcmf", "lcmf"], "midfielder": ["cmf", "rcmf", "lcmf", "dmf"],
+    "centre midfielder": ["cmf", "rcmf", "lcmf"], "box to box": ["cmf", "rcmf", "lcmf"],
+    "am": ["amf", "ramf", "lamf"], "cam": ["amf"], "playmaker": ["amf", "cmf"], "number 10": ["amf"],
+    "lm": ["lw", "lamf"], "rm": ["rw", "ramf"], "lmf": ["lw", "lamf"], "rmf": ["rw", "ramf"],
+    "winger": ["rw", "lw", "rwf", "lwf"], "wide forward": ["rwf", "lwf"],
+    "st": ["cf"], "fw": ["cf", "lwf", "rwf"], "ss": ["cf", "amf"], "centre forward": ["cf"],
+    "second striker": ["cf", "amf"], "target man": ["cf"], "number 9": ["cf"],
+    # Portuguese
+    "goleiro": ["gk"], "guarda redes": ["gk"], "zagueiro": ["cb", "rcb", "lcb"], "defesa central": ["cb", "rcb", "lcb"],
+    "lateral direito": ["rb", "rwb"], "lateral esquerdo": ["lb", "lwb"], "lateral": ["rb", "lb"],
+    "volante": ["dmf", "rdmf", "ldmf"], "primeiro volante": ["dmf"], "meio campo": ["cmf", "rcmf", "lcmf"], "meia": ["amf", "cmf"],
+    "meia atacante": ["amf"], "ponta": ["rw", "lw", "rwf", "lwf"], "ponta direita": ["rw", "rwf"],
+    "ponta esquerda": ["lw", "lwf"], "atacante": ["cf", "lwf", "rwf"], "centroavante": ["cf"],
+    # Spanish
+    "portero": ["gk"], "arquero": ["gk"], "central": ["cb", "rcb", "lcb"], "defensa central": ["cb", "rcb", "lcb"],
+    "lateral derecho": ["rb", "rwb"], "lateral izquierdo": ["lb", "lwb"], "carrilero": ["rwb", "lwb"],
+    "pivote": ["dmf"], "mediocentro": ["cmf", "dmf"], "centrocampista": ["cmf", "rcmf", "lcmf"],
+    "mediapunta": ["amf"], "enganche": ["amf"], "extremo": ["rw", "lw", "rwf", "lwf"],
+    "extremo derecho": ["rw", "rwf"], "extremo izquierdo": ["lw", "lwf"], "delantero": ["cf"],
+    "delantero centro": ["cf"], "ariete": ["cf"],
+    # Bulgarian
+    "вратар": ["gk"], "централен защитник": ["cb", "rcb", "lcb"], "защитник": ["cb", "rcb", "lcb"],
+    "десен бек": ["rb", "rwb"], "ляв бек": ["lb", "lwb"], "бек": ["rb", "lb"],
+    "дефанзивен полузащитник": ["dmf", "rdmf", "ldmf"], "полузащитник": ["cmf", "rcmf", "lcmf"],
+    "централен полузащитник": ["cmf", "rcmf", "lcmf"], "атакуващ полузащитник": ["amf", "ramf", "lamf"],
+    "плеймейкър": ["amf"], "крило": ["rw", "lw", "rwf", "lwf"], "дясно крило": ["rw", "rwf"],
+    "ляво крило": ["lw", "lwf"], "нападател": ["cf"], "централен нападател": ["cf"], "център нападател": ["cf"]
+}
+
+# Minimum similarity (1 - edit distance / length) for a fuzzy position-code match
+POSITION_MATCH_THRESHOLD = 0.75
+
+# Minimum confidence for resolving a player name to a database player (see services.name_index)
+NAME_MATCH_THRESHOLD = 0.6
+
 # Player search configurations
 DEFAULT_SEARCH_LIMIT = 5  # Number of players to return in search results
 MIN_SCORE_THRESHOLD = 0.4  # Minimum score for a player to be considered relevant
@@ -40,6 +86,138 @@ MIN_SCORE_THRESHOLD = 0.4  # Minimum score for a player to be considered relevan
 DEFAULT_MODEL = "claude-3-5-sonnet-20240624"  # Updated to correct model identifier
 DEFAULT_MAX_TOKENS = 4096
 
+# Model routing per task: every Claude call names its task and gets the model, max_tokens and
+# per-attempt timeout configured here (an explicit model/max_tokens from the caller still wins).
+# Tasks with "hedge" enabled send a second, identical request when the first has not answered
+# after the task's observed p95 latency, and use whichever answer arrives first.
+FAST_MODEL = "claude-3-5-haiku-20241022"
+STRONG_MODEL = "claude-3-5-sonnet-20241022"
+
+CLAUDE_TASK_ROUTING = {
+    "intent": {"model": FAST_MODEL, "max_tokens": 256, "timeout": 10.0, "hedge": True},
+    "entities": {"model": FAST_MODEL, "max_tokens": 512, "timeout": 10.0, "hedge": True},
+    "parameters": {"model": STRONG_MODEL, "max_tokens": 4096, "timeout": 20.0, "hedge": True},
+    "position_correction": {"model": FAST_MODEL, "max_tokens": 256, "timeout": 10.0, "hedge": True},
+    "stats_explanation": {"model": FAST_MODEL, "max_tokens": 2048, "timeout": 20.0, "hedge": False},
+    "casual_chat": {"model": FAST_MODEL, "max_tokens": 1024, "timeout": 15.0, "hedge": True},
+    "narrative": {"model": STRONG_MODEL, "max_tokens": 2048, "timeout": 30.0, "hedge": False},
+    "comparison": {"model": STRONG_MODEL, "max_tokens": 1500, "timeout": 30.0, "hedge": False},
+    "tactical": {"model": STRONG_MODEL, "max_tokens": 1800, "timeout": 30.0, "hedge": False}
+}
+
+# Conversation context sent with each Claude task, in estimated tokens (see core.context).
+# The most recent messages are kept (long ones elided); older ones are folded into a summary.
+CONTEXT_BUDGETS = {
+    "intent": 600,
+    "entities": 800,
+    "parameters": 400,
+    "casual_chat": 1500,
+    "default": 800
+}
+CONTEXT_RECENT_MESSAGES = 6  # Messages kept as-is before being folded into the summary
+CONTEXT_MESSAGE_MAX_CHARS = 600  # Longer recent messages (e.g. search narratives) are elided
+CONTEXT_SUMMARY_LINE_CHARS = 160  # Length of a summary line per older message
+CONTEXT_SUMMARY_MAX_TOKENS = 300  # Oldest summary lines are dropped beyond this
+CONTEXT_MAX_QUERIES = 3  # User queries combined for parameter extraction, current one included (too many confuse it)
+
+# Threads shared by request handlers to run local stages (suggestions, comparison
+# metrics, image info) while a Claude call is in flight (see core.stages)
+STAGE_WORKERS = 8
+
+# Semantic cache for extracted search parameters (see services.semantic_cache).
+# A new query whose TF-IDF cosine similarity to a cached query reaches `threshold`
+# (and that agrees on positions, numbers and left/right-style words) reuses its parameters.
+PARAMETER_CACHE = {
+    "enabled": True,
+    "threshold": 0.8,
+    "max_entries_per_language": 2000,
+    "ttl_seconds": 7 * 24 * 3600
+}
+
+# Hedging thresholds come from the latencies of the last `window` successful calls per task.
+# No hedge is sent until `min_samples` have been seen; the delay is clamped to the given range.
+CLAUDE_HEDGING = {
+    "enabled": True,
+    "percentile": 95,
+    "window": 200,
+    "min_samples": 20,
+    "min_delay_seconds": 0.5,
+    "max_delay_seconds": 10.0
+}
+
+# Prices in USD per million tokens, used for the cost estimates in services.telemetry.
+# Cache writes and reads are billed as multiples of the input price.
+CLAUDE_MODEL_PRICES = {
+    "claude-3-5-sonnet-20241022": {"input": 3.0, "output": 15.0, "cache_write_multiplier": 1.25, "cache_read_multiplier": 0.1},
+    "claude-3-5-haiku-20241022": {"input": 0.8, "output": 4.0, "cache_write_multiplier": 1.25, "cache_read_multiplier": 0.1},
+    "default": {"input": 3.0, "output": 15.0, "cache_write_multiplier": 1.25, "cache_read_multiplier": 0.1}
+}
+
+# Client-side rate limits for Claude API calls, per model ("default" applies to unlisted models).
+# Requests beyond the burst wait in a bounded FIFO queue; when the queue is full or the
+# wait would exceed max_wait_seconds the call fails fast with the usual fallback response.
+CLAUDE_RATE_LIMITS = {
+    "default": {
+        "requests_per_minute": 50,
+        "burst": 10,
+        "max_queue": 25,
+        "max_wait_seconds": 15.0
+    }
+}
+
+# Retry backoff for Claude API calls: full jitter, capped per attempt. A single call never
+# sleeps more than the retry budget in total; if the server asks for a longer wait
+# (Retry-After / anthropic-ratelimit-*-reset) the call falls back instead.
+CLAUDE_MAX_BACKOFF_SECONDS = 8.0
+CLAUDE_RETRY_BUDGET_SECONDS = 10.0
+
+# Per-attempt HTTP timeout for Claude calls (shortened further by the request deadline)
+CLAUDE_REQUEST_TIMEOUT_SECONDS = 30.0
+
+# Latency budget for a chat request (/enhanced_search), shared by all its stages.
+# Claude attempts are not started with less than CLAUDE_MIN_ATTEMPT_SECONDS left, and the
+# search narrative is replaced by the local template when less than
+# NARRATIVE_MIN_BUDGET_SECONDS remain after the search.
+REQUEST_BUDGET_SECONDS = 25.0
+CLAUDE_MIN_ATTEMPT_SECONDS = 1.0
+NARRATIVE_MIN_BUDGET_SECONDS = 4.0
+
+# Requests for the same session run one at a time; a request waits this long for the
+# session before failing (a little over one request budget)
+SESSION_LOCK_TIMEOUT_SECONDS = REQUEST_BUDGET_SECONDS + 10.0
+
+# Circuit breaker shared by all Claude calls in the process
+CLAUDE_CIRCUIT_BREAKER = {
+    "failure_threshold": 5,  # Consecutive failed attempts (5xx, 429, network) before opening
+    "recovery_timeout": 30.0,  # Seconds to stay open before a half-open probe
+    "half_open_max_calls": 1
+}
+
+# Background jobs for long AI generations ("async": true on /player_comparison and /tactical_analysis)
+JOB_QUEUE = {
+    "workers": 4,  # Worker threads running Claude generations
+    "max_pending": 100,  # Queued jobs across all sessions before new jobs are rejected
+    "max_pending_per_session": 3,  # Queued jobs per session; sessions are served round-robin
+    "result_ttl_seconds": 600.0,  # How long finished jobs can be fetched
+    "max_jobs": 1000  # Job table size limit
+}
+
+# Players a single /player_comparison request can compare (shortlists)
+MAX_COMPARISON_PLAYERS = 10
+
+# Database-wide tactical-fit rankings (/tactical_rankings)
+TACTICAL_RANKINGS = {
+    "min_position_players": 20,  # Smaller positions are normalised against all players
+    "min_coverage": 0.5,  # Share of a style's metric weight a player needs data for to be ranked
+    "default_limit": 20,
+    "max_limit": 100
+}
+
+# Formation squad builder (/squad_builder)
+SQUAD_BUILDER = {
+    "top_k_per_slot": 15  # Candidates kept per slot before the assignment; 11 or more keeps it optimal
+}
+
 # Languages supported by the system
 SUPPORTED_LANGUAGES = ["english", "portuguese", "spanish", "bulgarian"]
 
@@ -54,4 +232,69 @@ DATA_FILES = {
 
 # Player image directory (absolute path for reliability)
 import os
-PLAYER_IMAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "player_images"))
\ No newline at end of file
+PLAYER_IMAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "player_images"))
+
+# Precomputed stats glossary (generated by generate_stats_glossary.py)
+GLOSSARY_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "stats_glossary.json"))
+# Claude explanations of terms not in the glossary kept per process (the file is never rewritten)
+GLOSSARY_RUNTIME_CACHE_SIZE = 500
+
+# LLM telemetry: metrics are exported at /metrics; each Claude call and request is also
+# appended to an NDJSON log (set KATENA_TELEMETRY_LOG to "" to disable the log)
+TELEMETRY = {
+    "log_file": os.environ.get(
+        "KATENA_TELEMETRY_LOG",
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "logs", "llm_telemetry.ndjson"))
+    ),
+    "batch_size": 100,  # Records per write
+    "flush_interval_seconds": 2.0,  # Longest a record waits before it is written
+    "max_queue": 10000  # Records buffered before new ones are dropped
+}
+
+# In-memory session storage (see core.session_store). Sessions idle for cold_after_seconds,
+# or beyond the hot limits (least recently used first), are compressed in memory; compressed
+# sessions beyond max_cold_bytes or idle for longer than the TTL leave memory. Set
+# KATENA_SESSION_SPILL_DIR to write those to disk and reload them when they come back.
+SESSION_STORE = {
+    "max_sessions": 1000,
+    "max_bytes": 256 * 1024 * 1024,
+    "idle_ttl_seconds": 3 * 24 * 3600,  # Scouts leave sessions open for days
+    "active_grace_seconds": 120.0,  # Recently used sessions are evicted last (ones held by a request, never)
+    "spill_dir": os.environ.get("KATENA_SESSION_SPILL_DIR") or None,
+    "spill_ttl_seconds": 7 * 24 * 3600,
+    "sweep_interval_seconds": 30.0,
+    "cold_after_seconds": 900.0,
+    "max_cold_bytes": 64 * 1024 * 1024
+}
+
+# Where sessions are shared between workers (see core.session_backends): "memory" keeps
+# them in the process (single worker only); "sqlite" and "redis" let any worker serve any session.
+SESSION_BACKEND = {
+    "type": os.environ.get("KATENA_SESSION_BACKEND", "memory"),
+    "sqlite_path": os.environ.get(
+        "KATENA_SESSION_DB",
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "data", "sessions.db"))
+    ),
+    "redis_url": os.environ.get("KATENA_REDIS_URL", "redis://localhost:6379/0"),
+    "redis_key_prefix": "katena:session:",
+    "ttl_seconds": 7 * 24 * 3600,  # Sessions not saved for this long are dropped
+    "save_attempts": 5  # Merge-and-retry rounds when another worker saved the session first
+}
+
+# Append-only journal of session changes (see core.session_journal), so sessions survive
+# restarts with the memory backend; set KATENA_SESSION_JOURNAL_DIR to "" to disable it
+SESSION_JOURNAL = {
+    "directory": os.environ.get(
+        "KATENA_SESSION_JOURNAL_DIR",
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "data", "journal"))
+    ),
+    "snapshot_every": 50,  # Records after which the session is snapshotted and its journal compacted
+    "batch_size": 200,  # Queued saves written per batch
+    "flush_interval_seconds": 0.5,  # Longest a change waits before it is written
+    "max_queue": 20000,
+    "retention_seconds": 7 * 24 * 3600,  # Journals not written for this long are deleted
+    "sweep_interval_seconds": 3600.0
+}
+
+# Token required in the X-Admin-Token header by the /admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.environ.get("KATENA_ADMIN_TOKEN", "")
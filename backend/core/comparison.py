@@ -4,6 +4,8 @@ Player comparison functionality for KatenaScout
 
 from typing import List, Dict, Any, Optional
 from models.parameters import SearchParameters
+from utils.deadline import Deadline
+from core.stages import StageScheduler
 
 def compare_players(
     players: List[Dict[str, Any]], 
@@ -11,7 +13,8 @@ def compare_players(
     language: str = "english",
     search_weights: Dict[str, float] = None,
     playing_style: str = "",
-    formation: str = ""
+    formation: str = "",
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """
     Generate a comparison between players
@@ -21,6 +24,7 @@ def compare_players(
         session_manager: The session manager for API calls
         language: Language for the comparison
         search_weights: Optional weights from search parameters
+        deadline: Optional request deadline for the Claude call
         
     Returns:
         Dictionary with comparison text and aspects compared
@@ -132,19 +136,48 @@ Luego, identifica los aspectos clave que comparaste (como "Pases", "Tiro", "Pres
     # Get the appropriate user message based on language
     user_message = user_prompts.get(language, user_prompts["english"])
 
-    # Call Claude API to generate the comparison
-    response = session_manager.call_claude_api(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=1500,
-        system=system_prompt,
-        messages=[{"role": "user", "content": user_message}]
-    )
+    def generate_comparison_text() -> str:
+        # Call Claude API to generate the comparison
+        response = session_manager.call_claude_api(
+            task="comparison",
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_message}],
+            deadline=deadline
+        )
+        
+        # Extract the comparison text from the content array
+        comparison_text = ""
+        for content_item in response.content:
+            if hasattr(content_item, 'text'):
+                comparison_text += content_item.text
+        return comparison_text
     
-    # Extract the comparison text from the content array
-    comparison_text = ""
-    for content_item in response.content:
-        if hasattr(content_item, 'text'):
-            comparison_text += content_item.text
+    def analyze_metrics() -> Optional[Dict[str, Any]]:
+        # Metric-by-metric analysis only needs the players, not the text
+        from core.enhanced_comparison import enhance_player_comparison
+        return enhance_player_comparison(
+            players=players,
+            comparison_text="",
+            search_weights=search_weights
+        )
+    
+    def metrics_failed(error: Exception) -> None:
+        print(f"Error in enhanced comparison: {str(error)}")
+        return None
+    
+    # The metric analysis runs while the Claude call is in flight
+    results = (
+        StageScheduler()
+        .add("comparison_text", generate_comparison_text)
+        .add("comparison_metrics", analyze_metrics, on_error=metrics_failed)
+        .run()
+    )
+    comparison_text = results["comparison_text"]
+    enhanced_data = results["comparison_metrics"]
+    if enhanced_data is not None:
+        enhanced_data["comparison_text"] = comparison_text
+        if "original_comparison" in enhanced_data:
+            enhanced_data["original_comparison"] = comparison_text
     
     # Extract comparison aspects from the response
     aspects = []
@@ -168,18 +201,6 @@ Luego, identifica los aspectos clave que comparaste (como "Pases", "Tiro", "Pres
         # Fall back to default aspects if not found
         aspects = ["Technical Ability", "Physical Attributes", "Tactical Understanding", "Experience"]
     
-    # Use enhanced comparison module to get metric-by-metric analysis
-    try:
-        from core.enhanced_comparison import enhance_player_comparison
-        enhanced_data = enhance_player_comparison(
-            players=players,
-            comparison_text=comparison_text,
-            search_weights=search_weights
-        )
-    except Exception as e:
-        print(f"Error in enhanced comparison: {str(e)}")
-        enhanced_data = None
-    
     return {
         "comparison": comparison_text,
         "comparison_aspects": aspects,
@@ -223,223 +244,66 @@ def find_players_for_comparison(
     session = session_manager.get_session(session_id, language)
     print(f"Looking for players with identifiers: {player_identifiers}")
     
-    # Helper function to normalize a name for comparison
-    def normalize_name(name):
-        import unicodedata
-        # Convert to lowercase and remove accents
-        name = name.lower()
-        name = unicodedata.normalize('NFKD', name)
-        name = ''.join([c for c in name if not unicodedata.combining(c)])
-        return name
-    
-    # Helper function to check if a name is contained within another
-    def is_name_part_of(partial_name, full_name):
-        if not isinstance(partial_name, str) or not isinstance(full_name, str):
-            return False
-        
-        # Normalize names for comparison
-        norm_partial = normalize_name(partial_name)
-        norm_full = normalize_name(full_name)
-        
-        # Check if normalized partial name is in normalized full name
-        if norm_partial in norm_full:
-            return True
-        
-        # Check if all words in partial name are in full name
-        partial_words = norm_partial.split()
-        full_words = norm_full.split()
-        return all(word in full_words for word in partial_words)
+    from config import NAME_MATCH_THRESHOLD
+    from services.name_index import resolve_player_name
     
-    # Step 1: Try to find players in memory first (from previous searches) with improved matching
-    if hasattr(session, "selected_players") and session.selected_players:
-        for identifier in player_identifiers:
-            # First try to find player in memory by exact ID match
-            memory_player = next(
-                (p for p in session.selected_players if str(p.get("id", "")) == str(identifier) or
-                 str(p.get("wyId", "")) == str(identifier)),
-                None
-            )
-            
-            # If not found by ID, try by name with improved matching - only for string identifiers
-            if not memory_player and isinstance(identifier, str):
-                # Try exact match first (case-insensitive)
-                memory_player = next(
-                    (p for p in session.selected_players if 
-                     normalize_name(p.get("name", "")) == normalize_name(identifier)),
-                    None
-                )
-                
-                # If still not found, try partial name matching
-                if not memory_player:
-                    memory_player = next(
-                        (p for p in session.selected_players if 
-                         is_name_part_of(identifier, p.get("name", "")) or
-                         is_name_part_of(p.get("name", ""), identifier)),
-                        None
-                    )
-            
-            if memory_player:
-                print(f"Found player in memory: {memory_player.get('name')}")
-                result_players.append(memory_player)
+    # Players from the last search, by wyId; the session only keeps references,
+    # so rebuild the full player info first
+    remembered_players = session_manager.hydrate_players(session) if session.selected_players else []
+    remembered_by_id = {str(p.get("wyId", p.get("id", ""))): p for p in remembered_players}
     
-    # Step 2: Determine which identifiers we still need to find
-    remaining_identifiers = []
-    for identifier in player_identifiers:
-        # Check if we already found a player for this identifier
-        player_found = False
-        
-        # Check by ID
-        for player in result_players:
-            if (str(player.get("id", "")) == str(identifier) or 
-                str(player.get("wyId", "")) == str(identifier)):
-                player_found = True
-                break
-        
-        # Check by name
-        if not player_found and isinstance(identifier, str):
-            for player in result_players:
-                if (is_name_part_of(identifier, player.get("name", "")) or 
-                    is_name_part_of(player.get("name", ""), identifier)):
-                    player_found = True
-                    break
-        
-        # If not found, add to remaining list
-        if not player_found:
-            remaining_identifiers.append(identifier)
-    
-    # Step 3: For remaining identifiers, try direct ID lookup first
-    for identifier in remaining_identifiers[:]:  # Use a copy to safely remove items
+    def lookup_by_id(identifier):
+        if str(identifier) in remembered_by_id:
+            return remembered_by_id[str(identifier)]
         try:
-            # Try to get player by ID directly first
-            print(f"Trying direct ID lookup for: {identifier}")
-            player_info = session_manager.get_players_info(identifier)
-            
+            player_info = session_manager.get_players_info(str(identifier))
             if player_info and not player_info.get('error'):
-                print(f"Found player by ID lookup: {player_info.get('name')}")
-                result_players.append(player_info)
-                remaining_identifiers.remove(identifier)  # Remove from remaining list
+                return player_info
         except Exception as e:
             print(f"Error in direct ID lookup for {identifier}: {e}")
-            # Continue to try other methods
+        return None
     
-    # Step 4: For any still remaining, try name search with improved matching
-    # Prioritize based on source
-    if is_chat_source:
-        # For chat source, prioritize all string identifiers
-        remaining_identifiers = [x for x in remaining_identifiers if isinstance(x, str)] + \
-                                [x for x in remaining_identifiers if not isinstance(x, str)]
-    else:
-        # For API source, prioritize numeric IDs first, then strings
-        def sort_key(x):
-            if isinstance(x, (int, float)) or (isinstance(x, str) and x.isdigit()):
-                return 0  # Numeric IDs first
-            else:
-                return 1  # Everything else
-        
-        remaining_identifiers = sorted(remaining_identifiers, key=sort_key)
+    def lookup_by_name(identifier):
+        # One index lookup; among equally likely candidates prefer a player from the last search
+        candidates = resolve_player_name(identifier, limit=10, min_confidence=NAME_MATCH_THRESHOLD)
+        if not candidates:
+            print(f"No players found for identifier: {identifier}")
+            return None
+        if candidates[0]["match"] == "exact":
+            plausible = [c for c in candidates if c["match"] == "exact"]
+        else:
+            plausible = [c for c in candidates if c["confidence"] >= candidates[0]["confidence"] - 0.05]
+        best = next((c for c in plausible if c["wyId"] in remembered_by_id), plausible[0])
+        print(f"Resolved '{identifier}' to {best['name']} ({best['match']} match, confidence {best['confidence']})")
+        if len(plausible) > 1 and best["wyId"] not in remembered_by_id:
+            print(f"Ambiguous name '{identifier}': also {', '.join(c['name'] for c in plausible[1:3])}")
+        return lookup_by_id(best["wyId"])
     
-    # Enhanced name search for remaining identifiers
-    for identifier in remaining_identifiers:
-        try:
-            # Skip non-string identifiers for name search
-            if not isinstance(identifier, str):
-                print(f"Skipping non-string identifier for name search: {identifier}")
-                continue
-            
-            print(f"Performing enhanced name search for: {identifier}")
-            
-            # Try database search with broader criteria to handle partial names
-            from models.parameters import SearchParameters
-            
-            # First try exact name search
-            search_params = SearchParameters(
-                player_name=identifier,
-                is_name_search=True
-            )
-            
-            search_results = session_manager.search_players(search_params)
-            
-            # If no results or very few, try broadening the search
-            if not search_results or len(search_results) < 2:
-                # Try variations of the name
-                name_parts = identifier.split()
-                if len(name_parts) >= 1:
-                    # If it looks like a first name, try first name search
-                    first_name_search = SearchParameters(
-                        player_name=name_parts[0],
-                        is_name_search=True
-                    )
-                    first_results = session_manager.search_players(first_name_search)
-                    
-                    # Combine results, prioritizing exact matches
-                    if first_results:
-                        # Only add results that match the original query
-                        filtered_results = []
-                        for player in first_results:
-                            if is_name_part_of(identifier, player.get("name", "")):
-                                filtered_results.append(player)
-                        
-                        # Add these to our search results
-                        if filtered_results:
-                            if not search_results:
-                                search_results = filtered_results
-                            else:
-                                # Combine without duplicates
-                                for player in filtered_results:
-                                    if not any(p.get("name") == player.get("name") for p in search_results):
-                                        search_results.append(player)
-            
-            # Process search results
-            if search_results and len(search_results) > 0:
-                # Score all players based on how well they match the identifier
-                scored_players = []
-                for player in search_results:
-                    player_name = player.get("name", "")
-                    
-                    # Calculate match score based on name containment
-                    score = 0
-                    if normalize_name(player_name) == normalize_name(identifier):
-                        score = 1.0  # Exact match
-                    elif is_name_part_of(identifier, player_name):
-                        # Partial matches score based on length of match relative to name
-                        score = len(identifier) / len(player_name)
-                    elif is_name_part_of(player_name, identifier):
-                        score = len(player_name) / len(identifier)
-                    
-                    # Add score to player data
-                    scored_copy = player.copy()
-                    scored_copy["match_score"] = score
-                    scored_players.append(scored_copy)
-                
-                # Sort by match score
-                scored_players.sort(key=lambda p: p.get("match_score", 0), reverse=True)
-                
-                # Take the best match
-                if scored_players:
-                    best_match = scored_players[0]
-                    
-                    # Check if this player is already in results
-                    is_duplicate = False
-                    for existing_player in result_players:
-                        # Check by name since IDs might be missing
-                        if existing_player.get("name") == best_match.get("name"):
-                            is_duplicate = True
-                            break
-                    
-                    if not is_duplicate:
-                        print(f"Adding player from enhanced name search: {best_match.get('name')} (match score: {best_match.get('match_score', 0)})")
-                        # Remove the match score before adding to results
-                        if "match_score" in best_match:
-                            del best_match["match_score"]
-                        result_players.append(best_match)
-                    else:
-                        print(f"Skipping duplicate player: {best_match.get('name')}")
-            else:
-                print(f"No players found for identifier: {identifier}")
-        except Exception as e:
-            print(f"Error in enhanced name search for {identifier}: {e}")
+    def is_numeric_id(identifier):
+        return isinstance(identifier, (int, float)) or (isinstance(identifier, str) and identifier.isdigit())
+    
+    for identifier in player_identifiers:
+        if isinstance(identifier, str) and not identifier.strip():
+            continue
+        
+        # API calls send wyIds and chat sends names; a name can also match a database
+        # key directly, so try the likely interpretation first and the other one after
+        if is_numeric_id(identifier) and not is_chat_source:
+            player = lookup_by_id(identifier) or (lookup_by_name(identifier) if isinstance(identifier, str) else None)
+        elif isinstance(identifier, str):
+            player = lookup_by_name(identifier) or lookup_by_id(identifier)
+        else:
+            player = lookup_by_id(identifier)
+        
+        if not player:
+            continue
+        player_id = str(player.get("wyId", player.get("id", "")))
+        if any(str(p.get("wyId", p.get("id", ""))) == player_id for p in result_players):
+            print(f"Skipping duplicate player: {player.get('name')}")
+            continue
+        result_players.append(player)
     
-    # Step 5: Final check and logging
+    # Final check and logging
     print(f"Found {len(result_players)} players for comparison")
     if len(result_players) < 2:
         print(f"WARNING: Not enough players found for comparison. Need at least 2, found {len(result_players)}")
@@ -0,0 +1,166 @@
+"""
+Conversation context for Claude prompts
+
+Builds the conversation context sent with intent, entity, parameter and chat
+calls within a per-task token budget (estimated locally, no API call):
+- the most recent messages are kept, long ones (search narratives) elided
+- older messages are folded into a compact summary stored on the session;
+  each message is summarized once, when it leaves the recent window, so the
+  summary is extended incrementally instead of recomputed on every request
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    CONTEXT_BUDGETS,
+    CONTEXT_RECENT_MESSAGES,
+    CONTEXT_MESSAGE_MAX_CHARS,
+    CONTEXT_SUMMARY_LINE_CHARS,
+    CONTEXT_SUMMARY_MAX_TOKENS,
+    CONTEXT_MAX_QUERIES
+)
+from utils.prompt_encoder import estimate_tokens
+
+
+def elide(text: Any, max_chars: int) -> str:
+    """Collapse whitespace and cut text longer than max_chars, marking the cut"""
+    text = " ".join(str(text or "").split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 6)].rstrip() + " [...]"
+
+
+def update_context_summary(session) -> List[str]:
+    """
+    Fold messages that left the recent window into the session's summary
+
+    Args:
+        session: SessionData with messages, context_summary and summarized_until
+
+    Returns:
+        The session's summary lines, oldest first
+    """
+    messages = session.messages
+    if session.summarized_until > len(messages):
+        # History was replaced or truncated; start over
+        session.context_summary = []
+        session.summarized_until = 0
+
+    fold_until = len(messages) - CONTEXT_RECENT_MESSAGES
+    if fold_until <= session.summarized_until:
+        return session.context_summary
+
+    for message in messages[session.summarized_until:fold_until]:
+        content = message.get("content")
+        if content:
+            session.context_summary.append(
+                f"{message.get('role', 'user')}: {elide(content, CONTEXT_SUMMARY_LINE_CHARS)}"
+            )
+    session.summarized_until = fold_until
+
+    # Keep the summary itself bounded by dropping its oldest lines
+    while session.context_summary and estimate_tokens("\n".join(session.context_summary)) > CONTEXT_SUMMARY_MAX_TOKENS:
+        session.context_summary.pop(0)
+
+    return session.context_summary
+
+
+def build_context_messages(session, task: str, message: Optional[str] = None) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    Build the conversation context for a task within its token budget
+
+    Args:
+        session: SessionData
+        task: Task name in CONTEXT_BUDGETS (e.g. "intent", "casual_chat")
+        message: Current user message, appended if it is not the last message already
+
+    Returns:
+        Tuple of (summary of older turns, possibly empty; recent messages oldest first,
+        starting with a user message)
+    """
+    budget = CONTEXT_BUDGETS.get(task, CONTEXT_BUDGETS["default"])
+    summary_lines = update_context_summary(session)
+
+    recent = [
+        {"role": item.get("role", "user"), "content": item.get("content")}
+        for item in session.messages[session.summarized_until:]
+        if item.get("content")
+    ]
+    current = (message or "").strip()
+    if current and not (recent and recent[-1]["role"] == "user" and str(recent[-1]["content"]).strip() == current):
+        recent.append({"role": "user", "content": current})
+
+    # Newest first until the budget is spent; the current message is always kept
+    selected: List[Dict[str, str]] = []
+    used = 0
+    for index, item in enumerate(reversed(recent)):
+        content = elide(item["content"], CONTEXT_MESSAGE_MAX_CHARS) if index else str(item["content"])
+        tokens = estimate_tokens(content)
+        if index and used + tokens > budget:
+            break
+        selected.append({"role": item["role"], "content": content})
+        used += tokens
+    selected.reverse()
+
+    # Claude expects the conversation to start with a user turn
+    while len(selected) > 1 and selected[0]["role"] != "user":
+        selected.pop(0)
+
+    # Add as much of the summary as still fits, newest lines first
+    kept_lines: List[str] = []
+    for line in reversed(summary_lines):
+        tokens = estimate_tokens(line)
+        if used + tokens > budget:
+            break
+        kept_lines.insert(0, line)
+        used += tokens
+
+    return "\n".join(kept_lines), selected
+
+
+def build_context(session, task: str, message: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Build the context as a single list for prompts that embed it as JSON
+
+    The summary, if any, comes first as a {"role": "summary"} entry.
+    """
+    summary, messages = build_context_messages(session, task, message)
+    if summary:
+        return [{"role": "summary", "content": summary}] + messages
+    return messages
+
+
+def build_query_context(session, natural_query: str, task: str = "parameters") -> List[str]:
+    """
+    Get the user's recent queries, oldest first, within the task's token budget
+
+    At most CONTEXT_MAX_QUERIES queries are returned, the current one included.
+
+    Args:
+        session: SessionData
+        natural_query: The current query, always included last
+        task: Task name in CONTEXT_BUDGETS
+
+    Returns:
+        List of (possibly elided) user queries ending with natural_query
+    """
+    budget = CONTEXT_BUDGETS.get(task, CONTEXT_BUDGETS["default"])
+    used = estimate_tokens(natural_query)
+    queries: List[str] = []
+
+    for item in reversed(session.messages):
+        if len(queries) + 1 >= CONTEXT_MAX_QUERIES:
+            break
+        if item.get("role") != "user" or not item.get("content"):
+            continue
+        content = str(item["content"]).strip()
+        if content == natural_query.strip() or content in queries:
+            continue
+        content = elide(content, CONTEXT_MESSAGE_MAX_CHARS)
+        tokens = estimate_tokens(content)
+        if used + tokens > budget:
+            break
+        queries.insert(0, content)
+        used += tokens
+
+    return queries + [natural_query]
@@ -3,11 +3,15 @@ Enhanced player comparison functionality for KatenaScout
 
 This module provides metric-by-metric comparison between players,
 determining winners for each metric and calculating an overall winner.
+Two players are compared pairwise; three or more (shortlists) go through
+compare_player_matrix, which ranks all of them at once.
 """
 
 from typing import List, Dict, Any, Optional, Tuple
 import copy
 
+import numpy as np
+
 # Metrics where lower values are better (negative metrics)
 NEGATIVE_METRICS = [
     "ballLosses", "miscontrols", "dispossessed", "challengeLost", 
@@ -295,18 +299,20 @@ def enhance_player_comparison(
     Enhance the player comparison with metric-by-metric analysis
     
     Args:
-        players: List of player data (exactly 2 players)
+        players: List of player data (2 players, or more for an N-way comparison)
         comparison_text: Natural language comparison text
         search_weights: Optional weights from search parameters
         
     Returns:
         Enhanced comparison data
     """
-    if len(players) != 2:
+    if len(players) < 2:
         return {
-            "error": "Enhanced comparison requires exactly 2 players",
+            "error": "Enhanced comparison requires at least 2 players",
             "original_comparison": comparison_text
         }
+    if len(players) > 2:
+        return compare_player_matrix(players, comparison_text, search_weights)
     
     player1 = players[0]
     player2 = players[1]
@@ -361,4 +367,126 @@ def enhance_player_comparison(
         "category_winners": category_winners,
         "comparison_text": comparison_text,
         "negative_metrics": NEGATIVE_METRICS
-    }
\ No newline at end of file
+    }
+
+def get_shared_metrics(players: List[Dict[str, Any]]) -> List[str]:
+    """
+    Get metrics every player has a numeric value for
+
+    Args:
+        players: List of player data
+
+    Returns:
+        Sorted list of shared metric names
+    """
+    shared = None
+    for player in players:
+        numeric = {
+            metric for metric, value in player.get("stats", {}).items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        shared = numeric if shared is None else shared & numeric
+    return sorted(shared or [])
+
+
+def compare_player_matrix(
+    players: List[Dict[str, Any]],
+    comparison_text: str = "",
+    search_weights: Dict[str, float] = None
+) -> Dict[str, Any]:
+    """
+    Compare any number of players at once
+
+    Builds a players x metrics matrix of the shared metrics (negated for
+    negative metrics so higher is always better) and derives everything from
+    it: per-metric ranks, metric and category winners, weighted standings and
+    a pairwise dominance matrix. Players are referred to as "player1",
+    "player2", ... in request order, as in the two-player comparison.
+
+    Args:
+        players: List of player data (2 or more)
+        comparison_text: Natural language comparison text
+        search_weights: Optional weights from search parameters
+
+    Returns:
+        Enhanced comparison data with the keys of the two-player comparison plus
+        "metric_ranks", "standings" and "dominance_matrix"
+    """
+    keys = [f"player{number}" for number in range(1, len(players) + 1)]
+    metrics = get_shared_metrics(players)
+    if not metrics:
+        print("Warning: No common metrics found between players")
+
+    count = len(players)
+    values = np.array([[player["stats"][metric] for metric in metrics] for player in players], dtype=float)
+    values = values.reshape(count, len(metrics))
+    direction = np.array([-1.0 if metric in NEGATIVE_METRICS else 1.0 for metric in metrics])
+    weights = np.array([get_metric_weight(metric, search_weights) for metric in metrics])
+    oriented = values * direction
+
+    # beats[i, j, m]: player i is strictly better than player j at metric m
+    beats = oriented[:, None, :] > oriented[None, :, :]
+    # Competition ranks (1 = best, ties share the better rank)
+    ranks = 1 + beats.sum(axis=0)
+    best = ranks == 1
+    outright = best & (best.sum(axis=0) == 1)
+
+    metric_winners = {}
+    for index, metric in enumerate(metrics):
+        winner = np.flatnonzero(outright[:, index])
+        metric_winners[metric] = keys[winner[0]] if winner.size else "tie"
+
+    # A metric is worth its weight to the best player and nothing to the worst
+    points = (count - ranks) / (count - 1)
+    scores = points @ weights
+    standings_order = np.argsort(-scores, kind="stable")
+
+    # dominance[i, j]: share of the weighted metrics where player i beats player j
+    total_weight = weights.sum()
+    dominance = beats @ weights / total_weight if total_weight > 0 else np.zeros((count, count))
+
+    standings = [
+        {
+            "player": keys[index],
+            "name": players[index].get("name", keys[index]),
+            "position": position,
+            "score": round(float(scores[index]), 2),
+            "metric_wins": int(outright[index].sum())
+        }
+        for position, index in enumerate(standings_order, start=1)
+    ]
+
+    top, runner_up = scores[standings_order[0]], scores[standings_order[1]]
+    overall_winner = {
+        "winner": keys[standings_order[0]] if top > runner_up else "tie",
+        "winner_name": players[standings_order[0]].get("name", keys[standings_order[0]]) if top > runner_up else "Tie",
+        **{f"{key}_score": round(float(score), 2) for key, score in zip(keys, scores)},
+        "margin_percentage": int(100 * (top - runner_up) / (top + runner_up)) if top + runner_up > 0 else 0
+    }
+
+    categorized_metrics = categorize_metrics(metrics)
+    metric_index = {metric: index for index, metric in enumerate(metrics)}
+    category_winners = {}
+    for category, category_metrics in categorized_metrics.items():
+        wins = outright[:, [metric_index[metric] for metric in category_metrics]].sum(axis=1)
+        leaders = np.flatnonzero(wins == wins.max())
+        category_winners[category] = keys[leaders[0]] if len(leaders) == 1 and wins.max() > 0 else "tie"
+
+    # Winner flags: every player sharing the best value of a metric gets one
+    enhanced_players = copy.deepcopy(players)
+    for index, metric in enumerate(metrics):
+        for row, player in enumerate(enhanced_players):
+            player["stats"][f"{metric}_winner"] = bool(best[row, index])
+
+    return {
+        "players": enhanced_players,
+        "metric_winners": metric_winners,
+        "metric_ranks": {metric: ranks[:, index].tolist() for index, metric in enumerate(metrics)},
+        "overall_winner": overall_winner,
+        "standings": standings,
+        "dominance_matrix": np.round(dominance, 3).tolist(),
+        "categorized_metrics": categorized_metrics,
+        "category_winners": category_winners,
+        "comparison_text": comparison_text,
+        "negative_metrics": NEGATIVE_METRICS
+    }
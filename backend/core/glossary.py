@@ -0,0 +1,200 @@
+"""
+Stats glossary for KatenaScout
+
+This module serves explanations of football statistics from a precomputed,
+versioned glossary file (stats_glossary.json, built by generate_stats_glossary.py).
+An alias index resolves the many spellings of a metric ("xG", "expected goals",
+"xgShot", "total_xgShot") to one entry, so explanation requests are answered
+from memory. The file is read-only at runtime: terms that are not in it are
+explained by Claude and the answers kept in a bounded per-process cache.
+"""
+
+import re
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from unidecode import unidecode
+from config import GLOSSARY_FILE, GLOSSARY_RUNTIME_CACHE_SIZE, SUPPORTED_LANGUAGES
+
+# Schema version of the glossary file; bump when the entry layout changes
+GLOSSARY_SCHEMA_VERSION = 1
+
+# Words that qualify a metric rather than name it ("average passes", "passes percent")
+METRIC_MODIFIERS = {"average", "avg", "total", "percent", "percentage", "per", "90", "p90", "rate"}
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_term(term: str) -> str:
+    """
+    Normalize a metric name for alias lookup
+
+    Splits camelCase and snake_case, strips accents and punctuation and lowercases:
+    "xgShot" -> "xg shot", "progressive_passes" -> "progressive passes".
+
+    Args:
+        term: Metric name as typed by a user or used in the data
+
+    Returns:
+        Normalized, space-separated lowercase form
+    """
+    text = _CAMEL_BOUNDARY.sub(" ", unidecode(term or ""))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def strip_modifiers(normalized: str) -> str:
+    """Drop qualifier words ("average", "total", "percent", ...) from a normalized term"""
+    words = [word for word in normalized.split() if word not in METRIC_MODIFIERS]
+    return " ".join(words) or normalized
+
+
+class StatsGlossary:
+    """In-memory glossary with an alias index and a cache of runtime explanations"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, max_learned: int = GLOSSARY_RUNTIME_CACHE_SIZE):
+        """
+        Args:
+            data: Parsed glossary file contents
+            max_learned: Runtime explanations kept; the least recently used are dropped first
+        """
+        data = data or {}
+        if data and data.get("schema_version") != GLOSSARY_SCHEMA_VERSION:
+            print(f"Warning: stats glossary schema {data.get('schema_version')} "
+                  f"does not match {GLOSSARY_SCHEMA_VERSION}, ignoring file")
+            data = {}
+
+        self.revision = data.get("revision", 0)
+        self.generated_at = data.get("generated_at")
+        self.entries: Dict[str, Dict[str, Any]] = data.get("entries", {})
+
+        self._lock = threading.Lock()
+        # (entry key or normalized term, language) -> explanation; never written to the file
+        self.max_learned = max_learned
+        self._learned: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._alias_index: Dict[str, str] = {}
+        for key, entry in self.entries.items():
+            self._index_entry(key, entry)
+
+    @classmethod
+    def load(cls, path: str = GLOSSARY_FILE) -> "StatsGlossary":
+        """Load the glossary file, starting empty if it does not exist"""
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            print(f"Stats glossary not found at {path}, starting empty")
+            data = {}
+        except json.JSONDecodeError as e:
+            print(f"Error reading stats glossary {path}: {str(e)}")
+            data = {}
+
+        return cls(data)
+
+    def _index_entry(self, key: str, entry: Dict[str, Any]) -> None:
+        """Add an entry's key, name and aliases to the alias index"""
+        for alias in [key, entry.get("name", "")] + entry.get("aliases", []):
+            normalized = normalize_term(alias)
+            if normalized:
+                self._alias_index.setdefault(normalized, key)
+                self._alias_index.setdefault(strip_modifiers(normalized), key)
+
+    def resolve(self, term: str) -> Optional[str]:
+        """
+        Resolve a metric name or alias to its glossary key
+
+        Args:
+            term: Metric name in any supported spelling
+
+        Returns:
+            The entry key, or None if the term is unknown
+        """
+        normalized = normalize_term(term)
+        key = self._alias_index.get(normalized)
+        if key is None:
+            key = self._alias_index.get(strip_modifiers(normalized))
+        return key
+
+    def explain(self, term: str, language: str = "english") -> Optional[str]:
+        """
+        Get the explanation of a metric in the given language
+
+        Args:
+            term: Metric name in any supported spelling
+            language: One of SUPPORTED_LANGUAGES
+
+        Returns:
+            The explanation, or None if the term or the translation is missing or
+            only a placeholder template ("Accelerations: Accelerations per 90 min.")
+        """
+        key = self.resolve(term)
+        if key is not None:
+            entry = self.entries[key]
+            if entry.get("sources", {}).get(language) != "template" and entry.get("explanations", {}).get(language):
+                return entry["explanations"][language]
+
+        learned_key = (key or strip_modifiers(normalize_term(term)), language)
+        with self._lock:
+            explanation = self._learned.get(learned_key)
+            if explanation is not None:
+                self._learned.move_to_end(learned_key)
+        return explanation
+
+    def add_explanation(self, term: str, language: str, explanation: str) -> None:
+        """
+        Remember an explanation obtained at runtime (from Claude) for this process
+
+        Args:
+            term: Metric name as requested
+            language: Language of the explanation
+            explanation: Explanation text
+        """
+        learned_key = (self.resolve(term) or strip_modifiers(normalize_term(term)), language)
+        with self._lock:
+            self._learned[learned_key] = explanation.strip()
+            self._learned.move_to_end(learned_key)
+            while len(self._learned) > self.max_learned:
+                self._learned.popitem(last=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the glossary in the file format"""
+        return {
+            "schema_version": GLOSSARY_SCHEMA_VERSION,
+            "revision": self.revision,
+            "generated_at": self.generated_at,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "languages": SUPPORTED_LANGUAGES,
+            "entries": self.entries
+        }
+
+
+_glossary: Optional[StatsGlossary] = None
+_glossary_lock = threading.Lock()
+
+
+def get_glossary() -> StatsGlossary:
+    """Get the process-wide stats glossary, loading it on first use"""
+    global _glossary
+    if _glossary is None:
+        with _glossary_lock:
+            if _glossary is None:
+                _glossary = StatsGlossary.load()
+    return _glossary
+
+
+def explain_stats(stats: List[str], language: str) -> Dict[str, Optional[str]]:
+    """
+    Look up explanations for several stats at once
+
+    Args:
+        stats: Metric names as requested
+        language: Language of the explanations
+
+    Returns:
+        Dictionary mapping each requested stat to its explanation (None if unknown)
+    """
+    glossary = get_glossary()
+    return {stat: glossary.explain(stat, language) for stat in stats}
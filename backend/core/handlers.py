@@ -4,12 +4,41 @@ Intent-specific handlers for KatenaScout
 This module contains handlers for different user intents.
 """
 
-from typing import Dict, List, Any, Optional
-import json
-from core.session import SessionData
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from core.session import SessionData, to_player_refs
+from models.parameters import SearchParameters
+from utils.prompt_encoder import encode_players_for_prompt
 from core.intent import generate_follow_up_suggestions
 from core.comparison import compare_players, find_players_for_comparison
-from config import SUPPORTED_LANGUAGES
+from core.glossary import get_glossary, normalize_term
+from core.stages import StageScheduler, run_in_background
+from utils.formatters import process_player_data
+from utils.timing import stage
+from utils.deadline import Deadline, DeadlineExceeded
+from config import SUPPORTED_LANGUAGES, CLAUDE_MIN_ATTEMPT_SECONDS, NARRATIVE_MIN_BUDGET_SECONDS
+
+# Tool for explaining stats that are not in the glossary yet
+STATS_EXPLANATION_TOOL = {
+    "name": "explain_statistics",
+    "description": "Explain each requested football statistic",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "explanations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "stat": {"type": "string", "description": "The statistic exactly as requested"},
+                        "explanation": {"type": "string", "description": "Two or three sentence explanation"}
+                    },
+                    "required": ["stat", "explanation"]
+                }
+            }
+        },
+        "required": ["explanations"]
+    }
+}
 
 # Language-specific prompts for response generation
 def get_language_specific_prompt(language: str) -> str:
@@ -46,29 +75,111 @@ def get_language_specific_prompt(language: str) -> str:
     
     return prompts.get(language, prompts["english"])
 
-def clean_players_for_claude(players):
+def prepare_player_search(session: SessionData, message: str, session_manager, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
-    Remove complete_profile data from players before sending to Claude
-    to avoid token overflow.
+    Run the player search up to (but not including) the narrative generation
+    
+    This is shared by the regular and streaming search flows. It extracts the
+    parameters and scores the players; the follow-up suggestions and the
+    narrative are left to the caller so they can run concurrently.
     
     Args:
-        players: List of player objects
+        session: The session data
+        message: The user message
+        session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
         
     Returns:
-        Cleaned list of player objects
+        Either {"type": "search_ready", "params": SearchParameters, "players": [...]}
+        or a complete response dictionary (text/error) that should be returned as-is
     """
-    # Create a deep copy to avoid modifying the original data
-    import copy
-    cleaned_players = copy.deepcopy(players)
-    
-    for player in cleaned_players:
-        # Remove complete_profile key if present
-        if "complete_profile" in player:
-            del player["complete_profile"]
-            
-    return cleaned_players
+    # Simple validation for extremely short messages that might be misclassified
+    # Only redirect very short messages (1-2 words)
+    if len(message.split()) < 3:
+        print(f"Very short message '{message}' in player_search handler. Redirecting to casual_chat.")
+        return handle_casual_chat(session, message, session_manager, deadline)
+    
+    # For follow-up queries, ensure proper session state
+    if session.is_follow_up:
+        # If user wasn't satisfied with previous results, this helps with query refinement
+        if session.satisfaction is False:
+            print(f"User wasn't satisfied with previous results")
+        
+        print(f"Handling follow-up query")
+    else:
+        # New search - reset satisfaction
+        session.satisfaction = None
+        print(f"Handling new search query")
+    
+    # Extract search parameters (single source of truth)
+    print(f"DEBUG - Attempting to extract parameters from: {message}")
+    try:
+        with stage("parameters"):
+            params = session_manager.get_parameters(session.session_id, message, deadline)
+        print(f"DEBUG - Successfully extracted parameters: {params}")
+    except ValueError as e:
+        print(f"Error extracting parameters: {str(e)}")
+        return {
+            "type": "text",
+            "text": "I couldn't understand your search request. Could you try describing the players you're looking for in more detail?"
+        }
+    
+    # Store parameters in session
+    session.search_params = params.model_dump()
+    session.last_search_params = params.model_dump()
+    
+    # Search for players
+    print(f"DEBUG - About to search with params: {params}")
+    with stage("search"):
+        players = session_manager.search_players(params)
+    
+    # Validate the players return value
+    if not isinstance(players, list):
+        raise TypeError(f"Expected list of players but got {type(players)}")
+    
+    # Update session with players found
+    if players:
+        print(f"Search returned {len(players)} players")
+        session.selected_players = to_player_refs(players)
+    
+    return {
+        "type": "search_ready",
+        "params": params,
+        "players": players
+    }
+
+def build_search_narrative_messages(
+    message: str,
+    players: List[Dict[str, Any]],
+    params: Optional[SearchParameters] = None
+) -> List[Dict[str, str]]:
+    """Build the Claude messages asking for a narrative about the found players"""
+    # Players are sent as a compact table with only the stats relevant to the search;
+    # complete_profile stays out of the prompt but is kept in the response to the frontend
+    players_table = encode_players_for_prompt(players, params)
+    
+    return [
+        {"role": "user", "content": f"User's search query: {message}"},
+        {"role": "user", "content": f"Players found (one row per player, columns in the header row, '-' means not available):\n{players_table}"}
+    ]
+
+def build_fallback_search_text(players: List[Dict[str, Any]]) -> str:
+    """Build a simple template response listing the found players without the LLM"""
+    fallback_response = f"Found {len(players)} players matching your criteria.\n\n"
+    
+    for player in players:
+        name = player.get('name', 'Unknown')
+        positions = ', '.join(player.get('positions', ['Unknown']))
+        score = player.get('score', 0)
+        fallback_response += f"- {name} ({positions}) - Score: {score}\n"
+    
+    return fallback_response
 
-def handle_player_search(session: SessionData, message: str, session_manager) -> Dict[str, Any]:
+def has_budget(deadline: Optional[Deadline], seconds: float = CLAUDE_MIN_ATTEMPT_SECONDS) -> bool:
+    """Whether the request can still afford an operation expected to take `seconds`"""
+    return deadline is None or deadline.allows(seconds)
+
+def handle_player_search(session: SessionData, message: str, session_manager, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Handle player search intent
     
@@ -76,118 +187,57 @@ def handle_player_search(session: SessionData, message: str, session_manager) ->
         session: The session data
         message: The user message
         session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
         
     Returns:
         Response data
     """
     try:
-        # Simple validation for extremely short messages that might be misclassified
-        # Only redirect very short messages (1-2 words)
-        if len(message.split()) < 3:
-            print(f"Very short message '{message}' in player_search handler. Redirecting to casual_chat.")
-            from core.handlers import handle_casual_chat
-            return handle_casual_chat(session, message, session_manager)
+        prepared = prepare_player_search(session, message, session_manager, deadline)
+        if prepared["type"] != "search_ready":
+            return prepared
         
-        # For follow-up queries, ensure proper session state
-        if session.is_follow_up:
-            # If user wasn't satisfied with previous results, this helps with query refinement
-            if session.satisfaction is False:
-                print(f"User wasn't satisfied with previous results")
-            
-            print(f"Handling follow-up query")
-        else:
-            # New search - reset satisfaction
-            session.satisfaction = None
-            print(f"Handling new search query")
+        players = prepared["players"]
         
-        # Extract search parameters (single source of truth)
-        print(f"DEBUG - Attempting to extract parameters from: {message}")
-        try:
-            params = session_manager.get_parameters(session.session_id, message)
-            print(f"DEBUG - Successfully extracted parameters: {params}")
-        except ValueError as e:
-            print(f"Error extracting parameters: {str(e)}")
-            return {
-                "type": "text",
-                "text": "I couldn't understand your search request. Could you try describing the players you're looking for in more detail?"
-            }
-        
-        # Store parameters in session
-        session.search_params = params.model_dump()
-        session.last_search_params = params.model_dump()
-        
-        # Search for players
-        print(f"DEBUG - About to search with params: {params}")
-        players = session_manager.search_players(params)
-        print(f"DEBUG - Search returned players of type: {type(players)}")
-        print(f"DEBUG - Players value: {players}")
-        
-        # Validate the players return value
-        if not isinstance(players, list):
-            raise TypeError(f"Expected list of players but got {type(players)}")
-        
-        # Update session with players found
-        if players:
-            print(f"DEBUG - Updating session.selected_players with players")
-            session.selected_players = players
-        
-        # Generate follow-up suggestions
-        print(f"DEBUG - About to call generate_follow_up_suggestions")
-        suggestions = generate_follow_up_suggestions(session, players)
-        
-        # Generate natural language response
-        system_prompt = get_language_specific_prompt(session.language)
-        
-        try:
-            # Clean players data before sending to Claude to avoid token overflow
-            # We remove the complete_profile from players for the LLM
-            # but keep it in the response to the frontend
-            cleaned_players = clean_players_for_claude(players)
+        def generate_narrative() -> str:
+            # Out of budget: answer now with the template instead of the narrative
+            if not has_budget(deadline, NARRATIVE_MIN_BUDGET_SECONDS):
+                raise DeadlineExceeded(f"{deadline.remaining():.1f}s left for the narrative")
             
-            # Create conversational response
             claude_response = session_manager.call_claude_api(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2048,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": f"User's search query: {message}"},
-                    {"role": "user", "content": f"Players found: {json.dumps(cleaned_players)}"}
-                ]
+                task="narrative",
+                system=get_language_specific_prompt(session.language),
+                messages=build_search_narrative_messages(message, players, prepared["params"]),
+                deadline=deadline
             )
-            
-            text_response = claude_response.content[0].text
-            
-            # Add response to session history
-            session.messages.append({"role": "assistant", "content": text_response})
-            
-            # Return the response data
-            return {
-                "type": "search_results",
-                "players": players,
-                "text": text_response,
-                "follow_up_suggestions": suggestions
-            }
-        except Exception as e:
-            print(f"Error generating natural language response: {str(e)}")
-            
-            # Fallback to simple response
-            fallback_response = f"Found {len(players)} players matching your criteria.\n\n"
-            
-            for player in players:
-                name = player.get('name', 'Unknown')
-                positions = ', '.join(player.get('positions', ['Unknown']))
-                score = player.get('score', 0)
-                fallback_response += f"- {name} ({positions}) - Score: {score}\n"
-            
-            # Add response to session history
-            session.messages.append({"role": "assistant", "content": fallback_response})
-            
-            return {
-                "type": "search_results",
-                "players": players,
-                "text": fallback_response,
-                "follow_up_suggestions": suggestions
-            }
+            if claude_response.id == "error":
+                raise RuntimeError("Claude API returned the fallback response")
+            return claude_response.content[0].text
+        
+        def fallback_narrative(error: Exception) -> str:
+            print(f"Error generating natural language response: {str(error)}")
+            return build_fallback_search_text(players)
+        
+        # The narrative call runs here; suggestions and image info overlap with it
+        results = (
+            StageScheduler()
+            .add("narrative", generate_narrative, on_error=fallback_narrative)
+            .add("suggestions", lambda: generate_follow_up_suggestions(session, players))
+            .add("player_images", lambda: [process_player_data(player) for player in players])
+            .run()
+        )
+        
+        text_response = results["narrative"]
+        
+        # Add response to session history
+        session.messages.append({"role": "assistant", "content": text_response})
+        
+        return {
+            "type": "search_results",
+            "players": results["player_images"],
+            "text": text_response,
+            "follow_up_suggestions": results["suggestions"]
+        }
     except Exception as e:
         print(f"Error in handle_player_search: {str(e)}")
         # Return error response
@@ -196,7 +246,70 @@ def handle_player_search(session: SessionData, message: str, session_manager) ->
             "message": f"Error searching for players: {str(e)}"
         }
 
-def handle_player_comparison(session: SessionData, message: str, session_manager) -> Dict[str, Any]:
+def stream_player_search(session: SessionData, message: str, session_manager,
+                         deadline: Optional[Deadline] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Handle player search intent as a stream of events
+    
+    The players are emitted as soon as they are scored, the narrative follows
+    token by token and the follow-up suggestions come last.
+    
+    Args:
+        session: The session data
+        message: The user message
+        session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
+        
+    Yields:
+        (event_name, data) tuples: "players", "narrative" (repeated), "suggestions",
+        or a single "response" carrying a complete non-search response
+    """
+    try:
+        prepared = prepare_player_search(session, message, session_manager, deadline)
+    except Exception as e:
+        print(f"Error in stream_player_search: {str(e)}")
+        prepared = {
+            "type": "error",
+            "message": f"Error searching for players: {str(e)}"
+        }
+    
+    if prepared["type"] != "search_ready":
+        yield "response", prepared
+        return
+    
+    players = prepared["players"]
+    yield "players", {"players": players}
+    
+    # Suggestions are computed while the narrative streams
+    suggestions = run_in_background("suggestions", lambda: generate_follow_up_suggestions(session, players))
+    
+    # Stream the narrative, falling back to the template if nothing was produced
+    chunks = []
+    try:
+        if not has_budget(deadline, NARRATIVE_MIN_BUDGET_SECONDS):
+            raise DeadlineExceeded(f"{deadline.remaining():.1f}s left for the narrative")
+        
+        for chunk in session_manager.stream_claude_api(
+            task="narrative",
+            system=get_language_specific_prompt(session.language),
+            messages=build_search_narrative_messages(message, players, prepared["params"]),
+            deadline=deadline
+        ):
+            chunks.append(chunk)
+            yield "narrative", {"text": chunk}
+    except Exception as e:
+        print(f"Error streaming natural language response: {str(e)}")
+        if not chunks:
+            fallback_response = build_fallback_search_text(players)
+            chunks.append(fallback_response)
+            yield "narrative", {"text": fallback_response}
+    
+    # Add the full response to session history
+    session.messages.append({"role": "assistant", "content": "".join(chunks)})
+    
+    yield "suggestions", {"follow_up_suggestions": suggestions.result()}
+
+def handle_player_comparison(session: SessionData, message: str, session_manager, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Handle player comparison intent
     
@@ -204,6 +317,7 @@ def handle_player_comparison(session: SessionData, message: str, session_manager
         session: The session data
         message: The user message
         session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
         
     Returns:
         Response data
@@ -233,7 +347,7 @@ def handle_player_comparison(session: SessionData, message: str, session_manager
                 
                 # Use the top N players from the last search
                 if session.selected_players:
-                    players = session.selected_players[:top_n]
+                    players = session_manager.hydrate_players(session, top_n)
                 else:
                     return {
                         "type": "error",
@@ -248,7 +362,7 @@ def handle_player_comparison(session: SessionData, message: str, session_manager
         else:
             # No entities detected, use top 2 from recent search
             if session.selected_players and len(session.selected_players) >= 2:
-                players = session.selected_players[:2]
+                players = session_manager.hydrate_players(session, 2)
             else:
                 return {
                     "type": "error",
@@ -262,12 +376,19 @@ def handle_player_comparison(session: SessionData, message: str, session_manager
                 "message": "At least two players are needed for comparison."
             }
         
-        # Generate the comparison
-        comparison_result = compare_players(
-            players=players,
-            session_manager=session_manager,
-            language=session.language
+        # Generate the comparison; image info is added while Claude writes it
+        results = (
+            StageScheduler()
+            .add("comparison", lambda: compare_players(
+                players=players,
+                session_manager=session_manager,
+                language=session.language,
+                deadline=deadline
+            ))
+            .add("player_images", lambda: [process_player_data(player) for player in players])
+            .run()
         )
+        comparison_result = results["comparison"]
         
         # Add comparison to session history
         session.messages.append({
@@ -278,7 +399,7 @@ def handle_player_comparison(session: SessionData, message: str, session_manager
         # Return the comparison data with in_chat_comparison flag
         return {
             "type": "player_comparison",
-            "players": players,
+            "players": results["player_images"],
             "text": comparison_result["comparison"],
             "comparison_aspects": comparison_result["comparison_aspects"],
             "in_chat_comparison": True  # Flag to indicate this is an in-chat comparison
@@ -290,7 +411,7 @@ def handle_player_comparison(session: SessionData, message: str, session_manager
             "message": f"Error comparing players: {str(e)}"
         }
 
-def handle_stats_explanation(session: SessionData, message: str, session_manager) -> Dict[str, Any]:
+def handle_stats_explanation(session: SessionData, message: str, session_manager, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Handle stats explanation intent
     
@@ -298,6 +419,7 @@ def handle_stats_explanation(session: SessionData, message: str, session_manager
         session: The session data
         message: The user message
         session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
         
     Returns:
         Response data
@@ -313,82 +435,78 @@ def handle_stats_explanation(session: SessionData, message: str, session_manager
             "message": "No statistics specified for explanation. Please mention which stat you'd like explained."
         }
     
-    # Define system prompt for explanations
-    system_prompt = f"""You are a football analytics expert explaining football statistics in {session.language}.
-    Provide clear, concise explanations of football metrics that are informative but accessible.
-    Include context about why each metric is important and how scouts use it to evaluate players."""
+    # Known metrics are answered from the precomputed glossary without calling Claude
+    glossary = get_glossary()
+    explanations = {}
+    unknown_stats = []
+    for stat in stats:
+        explanation = glossary.explain(stat, session.language)
+        if explanation:
+            explanations[stat] = explanation
+        else:
+            unknown_stats.append(stat)
     
-    try:
-        # Generate explanations with Claude
-        claude_response = session_manager.call_claude_api(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=2048,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": f"Explain these football statistics: {', '.join(stats)}"}
-            ]
-        )
-        
-        explanation_text = claude_response.content[0].text
+    if unknown_stats and not has_budget(deadline):
+        print(f"Skipping explanations for {unknown_stats}: request deadline reached")
+    elif unknown_stats:
+        print(f"Stats not in glossary for {session.language}: {unknown_stats}")
         
-        # Create a structured explanations dictionary
-        explanations = {}
-        
-        # Split the explanation by stat (simple approach - in reality would need more robust parsing)
-        for stat in stats:
-            # Find explanation for this stat in the text
-            # This is a simplistic approach - in production would need better parsing
-            if stat.lower() in explanation_text.lower():
-                # Extract paragraphs containing the stat name
-                stat_paragraphs = []
-                for paragraph in explanation_text.split("\n\n"):
-                    if stat.lower() in paragraph.lower():
-                        stat_paragraphs.append(paragraph)
-                
-                if stat_paragraphs:
-                    explanations[stat] = "\n\n".join(stat_paragraphs)
-                else:
-                    explanations[stat] = f"Explanation for {stat} not found."
-            else:
-                explanations[stat] = f"Explanation for {stat} not found."
+        # Define system prompt for explanations
+        system_prompt = f"""You are a football analytics expert explaining football statistics in {session.language}.
+        Provide clear, concise explanations of football metrics that are informative but accessible.
+        Include context about why each metric is important and how scouts use it to evaluate players."""
         
-        # Add explanation to session history
-        session.messages.append({"role": "assistant", "content": explanation_text})
-        
-        return {
-            "type": "stats_explanation",
-            "text": explanation_text,
-            "explanations": explanations
-        }
-    except Exception as e:
-        print(f"Error in handle_stats_explanation: {str(e)}")
-        
-        # Fallback explanations
-        fallback_explanations = {
-            "xg": "Expected Goals (xG) measures the quality of a shot based on several variables and represents the probability that a shot will result in a goal.",
-            "progressive passes": "Progressive passes are passes that move the ball significantly closer to the opponent's goal, typically at least 10 meters closer.",
-            "defensive duels": "Defensive duels are one-on-one situations where a defender challenges an attacker for the ball.",
-            "ball recoveries": "Ball recoveries are instances where a player regains possession of the ball after the opposing team had control."
-        }
-        
-        explanations = {}
-        for stat in stats:
-            if stat.lower() in fallback_explanations:
-                explanations[stat] = fallback_explanations[stat.lower()]
-            else:
-                explanations[stat] = f"Sorry, I don't have a detailed explanation for {stat} at the moment."
-        
-        explanation_text = "\n\n".join([f"{stat}: {explanation}" for stat, explanation in explanations.items()])
-        
-        session.messages.append({"role": "assistant", "content": explanation_text})
-        
-        return {
-            "type": "stats_explanation",
-            "text": explanation_text,
-            "explanations": explanations
-        }
+        try:
+            # Generate explanations with Claude, one structured item per stat
+            claude_response = session_manager.call_claude_api(
+                task="stats_explanation",
+                system=system_prompt,
+                messages=[
+                    {"role": "user", "content": f"Explain these football statistics: {', '.join(unknown_stats)}"}
+                ],
+                tools=[STATS_EXPLANATION_TOOL],
+                tool_choice={"type": "tool", "name": "explain_statistics"},
+                deadline=deadline
+            )
+            
+            for content in claude_response.content:
+                if content.type != "tool_use":
+                    continue
+                for item in content.input.get("explanations", []):
+                    stat = _match_requested_stat(item.get("stat", ""), unknown_stats)
+                    if stat and item.get("explanation"):
+                        explanations[stat] = item["explanation"]
+                        # Remember the answer so the next request in this worker skips Claude
+                        glossary.add_explanation(stat, session.language, item["explanation"])
+        except Exception as e:
+            print(f"Error in handle_stats_explanation: {str(e)}")
+    
+    # Keep the requested order
+    explanations = {
+        stat: explanations.get(stat, f"Sorry, I don't have a detailed explanation for {stat} at the moment.")
+        for stat in stats
+    }
+    
+    explanation_text = "\n\n".join([f"{stat}: {explanation}" for stat, explanation in explanations.items()])
+    
+    # Add explanation to session history
+    session.messages.append({"role": "assistant", "content": explanation_text})
+    
+    return {
+        "type": "stats_explanation",
+        "text": explanation_text,
+        "explanations": explanations
+    }
+
+def _match_requested_stat(name: str, requested: List[str]) -> Optional[str]:
+    """Map a stat name returned by Claude back to the name the user requested"""
+    normalized = normalize_term(name)
+    for stat in requested:
+        if normalize_term(stat) == normalized:
+            return stat
+    return None
 
-def handle_casual_chat(session: SessionData, message: str, session_manager) -> Dict[str, Any]:
+def handle_casual_chat(session: SessionData, message: str, session_manager, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Handle casual conversation intent
     
@@ -396,12 +514,14 @@ def handle_casual_chat(session: SessionData, message: str, session_manager) -> D
         session: The session data
         message: The user message
         session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
         
     Returns:
         Response data
     """
-    # Get conversation context
-    context = session.messages[-5:] if len(session.messages) >= 5 else session.messages
+    # Get conversation context within the chat token budget; older turns come as a summary
+    from core.context import build_context_messages
+    context_summary, context = build_context_messages(session, "casual_chat", message)
     
     # Create system prompt based on language
     language = session.language
@@ -436,13 +556,22 @@ def handle_casual_chat(session: SessionData, message: str, session_manager) -> D
     IMPORTANT: You must respond in {language}. The user is expecting responses in {language}, so all your messages should be in {language}.
     """
     
+    if context_summary:
+        system_prompt += f"""
+    ## Earlier Conversation (summary)
+    {context_summary}
+    """
+    
     try:
+        if not has_budget(deadline):
+            raise DeadlineExceeded("request deadline reached")
+        
         # Call Claude with the conversation context
         response = session_manager.call_claude_api(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
+            task="casual_chat",
             system=system_prompt,
-            messages=context
+            messages=context,
+            deadline=deadline
         )
         
         # Extract the response text
@@ -474,7 +603,7 @@ def handle_casual_chat(session: SessionData, message: str, session_manager) -> D
             "text": fallback_text
         }
 
-def handle_fallback(session: SessionData, message: str, session_manager) -> Dict[str, Any]:
+def handle_fallback(session: SessionData, message: str, session_manager, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Handle fallback for unrecognized intents
     
@@ -482,6 +611,7 @@ def handle_fallback(session: SessionData, message: str, session_manager) -> Dict
         session: The session data
         message: The user message
         session_manager: The session manager
+        deadline: Optional request deadline shared by the Claude calls
         
     Returns:
         Response data
@@ -7,6 +7,7 @@ This module handles the identification of user intents and extraction of entitie
 from typing import List, Dict, Any, Optional, Callable
 from pydantic import BaseModel, Field
 import json
+from services.claude_api import build_cached_system
 
 class Intent(BaseModel):
     """Model representing a user intent with confidence score"""
@@ -17,6 +18,67 @@ class SessionMemory:
     """Type for function signatures that reference session memory"""
     pass
 
+# Static intent recognition prompt and tool, kept at module level so the
+# cached prompt prefix is byte-identical between calls
+INTENT_SYSTEM_PROMPT = """
+You are an intent recognition system for a football scouting AI.
+Your task is to determine which of the defined intents best matches the user's message, considering the conversation context.
+
+You must identify one of the following intents:
+- player_search: User wants to find players with specific characteristics. IMPORTANT: THE QUERY MUST BE SPECIFIC. IT MUST INCLUDE A DESCRIPTION OF A PLAYER'S ATRIBUTES, NOT ONLY "I WANT TO FIND THE PERFECT PLAYER"
+- player_comparison: User wants to compare two or more players
+- explain_stats: User wants an explanation of football statistics or metrics
+- casual_conversation: User is engaging in small talk or asking about the system itself
+
+IMPORTANT: FOR PLAYER SEARCH, THE QUERY MUST BE SPECIFIC. IT MUST INCLUDE A DESCRIPTION OF A PLAYER'S ATRIBUTES, NOT ONLY "I WANT TO FIND THE PERFECT PLAYER". DO NOT SEND TO PLAYER SEARCH INTENT IF THE QUERY IS TOO VAGUE. JUST SEND TO CASUAL CONVERSATION.
+## Examples:
+<example1>
+- "Find a center back with good passing"
+- Response: "intent": "player_search", "confidence": 0.95
+- Reason: The user is explicitly looking for a player with specific attributes
+</example1>
+<example2>
+- "I want to find the best player"
+- Response: "intent": "casual_conversation", "confidence": 0.85
+- Reason: The query is too vague and does not match any specific intent
+</example2>
+<example3>
+- "What is xG?"
+- Response: "intent": "explain_stats", "confidence": 0.90
+- Reason: The user is asking for an explanation of a football statistic
+</example3>
+<example4>
+- "Compare Ronaldo and Messi"
+- Response: "intent": "player_comparison", "confidence": 0.80
+- Reason: The user wants to compare two players
+</example4>
+
+
+Return only the most likely intent and a confidence score (0-1) where 1 is complete certainty.
+"""
+
+INTENT_TOOLS = [{
+    "name": "classify_intent",
+    "description": "Classify the intent of the user message",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "intent": {
+                "type": "string",
+                "enum": ["player_search", "player_comparison", "explain_stats", "casual_conversation"],
+                "description": "The identified intent"
+            },
+            "confidence": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
+                "description": "Confidence score (0-1). It describes how certain the system is about the intent"
+            }
+        },
+        "required": ["intent", "confidence"]
+    }
+}]
+
 def identify_intent(memory: SessionMemory, message: str, claude_api_call, context_messages: Optional[List[Dict[str, Any]]] = None) -> Intent:
     """
     Identify the user's intent from their message using Claude API
@@ -62,11 +124,11 @@ def identify_intent(memory: SessionMemory, message: str, claude_api_call, contex
         ]
     }
     
-    # Get conversation context if not provided
+    # Get conversation context if not provided, trimmed to the task's token budget
     if context_messages is None:
         if hasattr(memory, "messages") and len(memory.messages) > 0:
-            window_size = min(5, len(memory.messages))
-            context_messages = memory.messages[-window_size:]
+            from core.context import build_context
+            context_messages = build_context(memory, "intent", message)
         else:
             context_messages = []
     
@@ -75,44 +137,6 @@ def identify_intent(memory: SessionMemory, message: str, claude_api_call, contex
     if not any(msg.get("content") == current_message_content for msg in context_messages if msg.get("role") == "user"):
         context_messages.append({"role": "user", "content": current_message_content})
     
-    # Create system prompt for intent recognition
-    system_prompt = """
-    You are an intent recognition system for a football scouting AI.
-    Your task is to determine which of the defined intents best matches the user's message, considering the conversation context.
-    
-    You must identify one of the following intents:
-    - player_search: User wants to find players with specific characteristics. IMPORTANT: THE QUERY MUST BE SPECIFIC. IT MUST INCLUDE A DESCRIPTION OF A PLAYER'S ATRIBUTES, NOT ONLY "I WANT TO FIND THE PERFECT PLAYER"
-    - player_comparison: User wants to compare two or more players
-    - explain_stats: User wants an explanation of football statistics or metrics
-    - casual_conversation: User is engaging in small talk or asking about the system itself
-    
-    IMPORTANT: FOR PLAYER SEARCH, THE QUERY MUST BE SPECIFIC. IT MUST INCLUDE A DESCRIPTION OF A PLAYER'S ATRIBUTES, NOT ONLY "I WANT TO FIND THE PERFECT PLAYER". DO NOT SEND TO PLAYER SEARCH INTENT IF THE QUERY IS TOO VAGUE. JUST SEND TO CASUAL CONVERSATION.
-    ## Examples:
-    <example1>
-    - "Find a center back with good passing"
-    - Response: "intent": "player_search", "confidence": 0.95
-    - Reason: The user is explicitly looking for a player with specific attributes
-    </example1>
-    <example2>
-    - "I want to find the best player"
-    - Response: "intent": "casual_conversation", "confidence": 0.85
-    - Reason: The query is too vague and does not match any specific intent
-    </example2>
-    <example3>
-    - "What is xG?"
-    - Response: "intent": "explain_stats", "confidence": 0.90
-    - Reason: The user is asking for an explanation of a football statistic
-    </example3>
-    <example4>
-    - "Compare Ronaldo and Messi"
-    - Response: "intent": "player_comparison", "confidence": 0.80
-    - Reason: The user wants to compare two players
-    </example4>
-    
-
-    Return only the most likely intent and a confidence score (0-1) where 1 is complete certainty.
-    """
-    
     # Provide conversation context and available intents
     user_prompt = f"""
     Here is the conversation context:
@@ -125,33 +149,12 @@ def identify_intent(memory: SessionMemory, message: str, claude_api_call, contex
     try:
         # Call Claude API with tool for structured output
         response = claude_api_call(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
-            system=system_prompt,
+            task="intent",
+            system=build_cached_system(INTENT_SYSTEM_PROMPT),
             messages=[
                 {"role": "user", "content": user_prompt}
             ],
-            tools=[{
-                "name": "classify_intent",
-                "description": "Classify the intent of the user message",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "intent": {
-                            "type": "string",
-                            "enum": ["player_search", "player_comparison", "explain_stats", "casual_conversation"],
-                            "description": "The identified intent"
-                        },
-                        "confidence": {
-                            "type": "number",
-                            "minimum": 0,
-                            "maximum": 1,
-                            "description": "Confidence score (0-1). It describes how certain the system is about the intent"
-                        }
-                    },
-                    "required": ["intent", "confidence"]
-                }
-            }],
+            tools=INTENT_TOOLS,
             tool_choice={"type": "tool", "name": "classify_intent"}
         )
         
@@ -182,11 +185,11 @@ def extract_entities(memory: SessionMemory, message: str, intent: Intent, claude
     Returns:
         Dictionary of extracted entities
     """
-    # Get conversation context if not provided
+    # Get conversation context if not provided, trimmed to the task's token budget
     if context_messages is None:
         if hasattr(memory, "messages") and len(memory.messages) > 0:
-            window_size = min(5, len(memory.messages))
-            context_messages = memory.messages[-window_size:]
+            from core.context import build_context
+            context_messages = build_context(memory, "entities", message)
         else:
             context_messages = []
     
@@ -212,6 +215,20 @@ def extract_search_entities(memory: SessionMemory, message: str, claude_api_call
     # The actual parameter extraction is handled by get_parameters
     return {}
 
+def _selected_player_names(memory: SessionMemory) -> List[str]:
+    """Names of the players selected in the session (kept there as wyId references)"""
+    from services.data_service import find_player_by_id
+    
+    names = []
+    for ref in getattr(memory, "selected_players", None) or []:
+        name = ref.get("name")
+        if not name:
+            player = find_player_by_id(ref.get("wyId"))
+            name = player.get("name") if player else None
+        if name:
+            names.append(name)
+    return names
+
 def extract_comparison_entities(memory: SessionMemory, message: str, claude_api_call, context_messages: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Extract entities for player comparison intent"""
     system_prompt = f"""
@@ -219,7 +236,7 @@ def extract_comparison_entities(memory: SessionMemory, message: str, claude_api_
     Extract the names of football players mentioned for comparison in the context of this conversation.
     You must fetch player's complete names from partial mentions or nicknames. Identify which players the user is referring to.
     These are the players you must fetch the players from: 
-     "database": {json.dumps(memory.selected_players)} \n
+     "database": {json.dumps(_selected_player_names(memory), ensure_ascii=False)} \n
     ## Examples:
     <ex_1>
     User:
@@ -283,8 +300,7 @@ def extract_comparison_entities(memory: SessionMemory, message: str, claude_api_
     try:
         # Call Claude API with tool for structured output
         response = claude_api_call(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
+            task="entities",
             system=system_prompt,
             messages=[
                 {"role": "user", "content": user_prompt}
@@ -360,8 +376,7 @@ def extract_stat_entities(memory: SessionMemory, message: str, claude_api_call,
     try:
         # Call Claude API with tool for structured output
         response = claude_api_call(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
+            task="entities",
             system=system_prompt,
             messages=[
                 {"role": "user", "content": user_prompt}
@@ -403,16 +418,6 @@ def generate_follow_up_suggestions(memory: SessionMemory, players: Any) -> List[
     Returns:
         List of follow-up suggestion strings
     """
-    # DEBUG: Print players and their type for troubleshooting
-    print(f"DEBUG - generate_follow_up_suggestions received players of type: {type(players)}")
-    print(f"DEBUG - players value: {players}")
-    print(f"DEBUG - memory type: {type(memory)}")
-    try:
-        import json
-        print(f"DEBUG - first player: {json.dumps(players[0]) if isinstance(players, list) and len(players) > 0 else 'None'}")
-    except Exception as e:
-        print(f"DEBUG - Error accessing players: {str(e)}")
-    
     # Handle various error cases
     if not players:
         return [
@@ -5,7 +5,7 @@ This module provides the core functionality for searching players based on param
 All player search operations should use the functions in this module to ensure consistency.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
 import os
 import json
 import unidecode
@@ -197,7 +197,7 @@ def get_players_with_position(position_code: str, database: Dict[str, Any] = Non
         database = get_player_database()
     
     # Validate inputs to prevent type errors
-    if not isinstance(database, dict):
+    if not isinstance(database, Mapping):
         print(f"ERROR: database is not a dictionary but {type(database)}")
         return []
     
@@ -205,7 +205,8 @@ def get_players_with_position(position_code: str, database: Dict[str, Any] = Non
     players_list = []
     for player_name, player_data in database.items():
         if any(pos["position"]["code"] == position_code for pos in player_data.get("positions", [])):
-            # Add the player name to the data for easier access
+            # Add the player name to a copy; the database is shared by all requests
+            player_data = player_data.copy()
             player_data["name"] = unidecode.unidecode(player_name)
             players_list.append(player_data)
     return players_list
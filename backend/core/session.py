@@ -5,14 +5,20 @@ This module combines the functionality of the original ChatSession and Conversat
 to provide a single source of truth for conversation state.
 """
 
-import json
-import os
+import threading
 import requests
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Iterator, Mapping, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 # Import models using absolute imports
-from models.parameters import SearchParameters
+from models.parameters import SearchParameters, KEY_DESCRIPTION_WORDS
+from config import POSITIONS_MAPPING, SESSION_LOCK_TIMEOUT_SECONDS
+from services.claude_api import build_cached_system
+from services.nlp_service import resolve_position_codes
+from utils.deadline import Deadline
+from utils.timing import stage
 
 
 class SessionData(BaseModel):
@@ -38,7 +44,7 @@ class SessionData(BaseModel):
     # Search state
     search_params: Dict[str, Any] = Field(default_factory=dict)
     last_search_params: Dict[str, Any] = Field(default_factory=dict)
-    selected_players: List[Dict] = Field(default_factory=list)
+    selected_players: List[Dict[str, Any]] = Field(default_factory=list)  # [{"wyId": ..., "score": ...}, ...]
     
     # Interaction state
     satisfaction: Optional[bool] = None
@@ -46,9 +52,240 @@ class SessionData(BaseModel):
     
     # Configuration
     context_window: int = 5  # Number of previous message pairs to include
+    context_summary: List[str] = Field(default_factory=list)  # Compact lines for turns older than the recent window
+    summarized_until: int = 0  # Number of messages already folded into context_summary
     
     # Function call tracking
     recent_function_calls: List[str] = Field(default_factory=list)
+    
+    # Shared backend bookkeeping (not serialized): version loaded/saved and its data,
+    # the base of the merge when another worker saved the session in between
+    _backend_version: int = PrivateAttr(default=0)
+    _backend_data: bytes = PrivateAttr(default=b"")
+    # What of the session has been written to the session journal (core.session_journal.JournalMark)
+    _journal_mark: Any = PrivateAttr(default=None)
+    
+    @field_validator("selected_players")
+    @classmethod
+    def _keep_player_refs(cls, players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Sessions stored before players were kept as references still hold full profiles
+        return to_player_refs(players)
+
+
+def to_player_refs(players: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Reduce players to the references kept in sessions
+    
+    Sessions only keep each player's wyId and the score of the search that found it;
+    the full profile is rebuilt from the player database when it is needed
+    (see UnifiedSession.hydrate_players).
+    
+    Args:
+        players: Player dicts as returned by search_players (or references already)
+        
+    Returns:
+        A list of {"wyId": ..., "score": ...} in the same order
+    """
+    refs = []
+    for player in players or []:
+        if not isinstance(player, dict):
+            continue
+        player_id = player.get("wyId", player.get("id"))
+        if player_id is None:
+            continue
+        refs.append({"wyId": player_id, "score": player.get("score")})
+    return refs
+
+
+# Sessions used by the request being handled (locked by it), saved and released when it ends
+_request_sessions: ContextVar[Optional[Dict[str, "SessionData"]]] = ContextVar("request_sessions", default=None)
+
+
+def start_session_tracking() -> None:
+    """Start recording the sessions used by a new request"""
+    _request_sessions.set({})
+
+
+class SessionBusyError(TimeoutError):
+    """Another request kept the session locked for longer than SESSION_LOCK_TIMEOUT_SECONDS"""
+
+
+
+# === Parameter extraction prompts ===
+# These are module-level constants so that the cached prompt prefix (tools + system)
+# is byte-identical on every call; per-query text only goes into the messages.
+
+_PARAMETER_EXAMPLES = """## Examples:
+ {
+        "query": "Identifique meias centrais modernos com excelente visão de jogo e precisão nos passes",
+        "intent": "Encontrar meio-campistas capazes de ditar o ritmo do jogo e criar oportunidades",
+        "search_params": {
+            "position_codes": ["lcmf", "rcmf", "lcmf3", "rcmf3"],
+            "min_passes": "true",
+            "min_pass_accuracy": "true",
+            "min_progressive_passes": "true",
+            "min_passes_to_final_third": "true",
+            "min_smart_passes": "true",
+            "min_through_passes": "true",
+            "min_key_passes": "true",
+            "min_successful_progressive_passes_percent": "true",
+            "min_successful_smart_passes_percent": "true",
+            "min_xg_assist": "true"
+        },
+        "explanation": "Estes parâmetros focam em meio-campistas centrais que dominam a posse de bola, progridem o jogo e criam chances com passes precisos e inteligentes."
+    },
+    {
+        "query": "Encontre centroavantes móveis com alta eficiência de finalização e contribuição no pressing",
+        "intent": "Identificar atacantes modernos que combinam gols com trabalho defensivo",
+        "search_params": {
+            "position_codes": ["cf"],
+            "min_goals": "true",
+            "min_shots_on_target": "true",
+            "min_xg_shot": "true",
+            "min_goal_conversion_percent": "true",
+            "min_successful_dribbles": "true",
+            "min_accelerations": "true",
+            "min_counterpressing_recoveries": "true",
+            "min_dangerous_opponent_half_recoveries": "true",
+            "min_offensive_duels_won": "true"
+        },
+        "explanation": "Estes critérios visam centroavantes que não só finalizam com eficiência, mas também pressionam ativamente e contribuem na recuperação da posse em zonas avançadas."
+    },
+    {
+        "query": "Localize zagueiros modernos com excelente capacidade de construção e domínio aéreo",
+        "intent": "Encontrar defensores centrais que iniciam jogadas e dominam defensivamente",
+        "search_params": {
+            "position_codes": ["cb", "lcb", "rcb", "lcb3", "rcb3"],
+            "min_long_passes": "true",
+            "min_progressive_passes": "true",
+            "min_successful_long_passes_percent": "true",
+            "min_aerial_duels_won": "true",
+            "min_aerial_duels_won_percent": "true",
+            "min_defensive_duels_won": "true",
+            "min_interceptions": "true",
+            "max_dangerous_own_half_losses": "true",
+            "min_successful_forward_passes_percent": "true"
+        },
+        "explanation": "Estes parâmetros buscam zagueiros que são seguros na saída de bola, dominantes no jogo aéreo e eficientes em ações defensivas."
+    },
+    {
+        "query": "Identifique laterais completos com forte presença ofensiva e defensiva",
+        "intent": "Encontrar laterais modernos que contribuem em ambas as fases do jogo",
+        "search_params": {
+            "position_codes": ["lb", "rb", "lb5", "rb5", "lwb", "rwb"],
+            "min_crosses": "true",
+            "min_successful_crosses_percent": "true",
+            "min_progressive_runs": "true",
+            "min_successful_dribbles": "true",
+            "min_defensive_duels_won": "true",
+            "min_interceptions": "true",
+            "min_ball_recoveries": "true",
+            "min_passes_to_final_third": "true",
+            "min_successful_passes_to_final_third_percent": "true"
+        },
+        "explanation": "Estes critérios focam em laterais que são efetivos tanto no ataque, com cruzamentos e progressões, quanto na defesa, com recuperações e duelos defensivos."
+    },
+    {
+        "query": "Encontre goleiros modernos com excelente jogo com os pés e domínio da área",
+        "intent": "Identificar goleiros que contribuem na construção e são seguros defensivamente",
+        "search_params": {
+            "position_codes": ["gk"],
+            "min_gk_saves_percent": "true",
+            "min_gk_successful_exits_percent": "true",
+            "min_successful_goal_kicks_percent": "true",
+            "min_passes": "true",
+            "min_long_passes": "true",
+            "min_successful_long_passes_percent": "true",
+            "min_pass_accuracy": "true"
+        },
+        "explanation": "Estes parâmetros buscam goleiros que são seguros nas defesas, eficientes nas saídas e capazes de iniciar jogadas com passes precisos, incluindo lançamentos longos."
+    },
+    {
+        "query": "Identifique meias atacantes criativos com habilidade de drible e criação de chances",
+        "intent": "Encontrar jogadores que podem desequilibrar defesas e criar oportunidades de gol",
+        "search_params": {
+            "position_codes": ["amf", "lamf", "ramf"],
+            "min_successful_dribbles": "true",
+            "min_successful_dribbles_percent": "true",
+            "min_key_passes": "true",
+            "min_through_passes": "true",
+            "min_smart_passes": "true",
+            "min_xg_assist": "true",
+            "min_progressive_runs": "true",
+            "min_offensive_duels_won": "true",
+            "min_successful_passes_to_final_third_percent": "true"
+        },
+        "explanation": "Estes critérios focam em meias atacantes que podem superar adversários no drible e criar chances de gol com passes criativos e inteligentes."
+    },
+    {
+        "query": "Localize volantes defensivos com forte presença na marcação e boa distribuição",
+        "intent": "Identificar meio-campistas defensivos que protegem a defesa e iniciam jogadas",
+        "search_params": {
+            "position_codes": ["dmf", "ldmf", "rdmf"],
+            "min_interceptions": "true",
+            "min_ball_recoveries": "true",
+            "min_defensive_duels_won": "true",
+            "min_aerial_duels_won": "true",
+            "min_passes": "true",
+            "min_long_passes": "true",
+            "min_successful_forward_passes_percent": "true",
+            "min_successful_long_passes_percent": "true",
+            "max_dangerous_own_half_losses": "true"
+        },
+        "explanation": "Estes parâmetros buscam volantes que são eficientes na recuperação de bola, fortes nos duelos defensivos e capazes de distribuir o jogo com segurança."
+    }
+]
+"""
+
+_PARAMETER_REFERENCE = f"""
+## Reference data:
+Position codes map (position -> valid codes): {POSITIONS_MAPPING}
+Key description words: {KEY_DESCRIPTION_WORDS}
+"""
+
+PARAMETER_SYSTEM_PROMPT = """I am a scout AI assistant, with 20 years of experience in scouting. I am known for my expertise in soccer and for my data-driven approach to player analysis. The future of soccer depends on my ability to identify the best players for your team.
+
+I must be able to transform the coaches desires into searchable parameters that will help me find the perfect player for their team. I must understand the coach's needs and translate them into actionable search criteria.
+
+VERY IMPORTANT INSTRUCTIONS:
+You MUST activate specific statistical parameters (set to True) that correspond to the query.
+Never return ONLY position_codes and key_description_word - you MUST also set statistical parameters to TRUE.
+For example, for "strong defenders", set min_defensive_duels_won=true, min_interceptions=true, etc.
+For "fast attackers", set min_accelerations=true, min_progressive_runs=true, etc.
+
+For queries about contract expiration, set contract_expiration to a date string in YYYY-MM-DD format.
+For example, if looking for players whose contracts expire soon, set contract_expiration="2025-12-31".
+
+For queries about preferred foot, set foot to "left", "right", or "both" as appropriate.
+Default to "both" if no specific foot preference is mentioned.
+
+ALWAYS set at least 5-8 statistical parameters to TRUE based on the description of the player.
+
+""" + _PARAMETER_EXAMPLES + _PARAMETER_REFERENCE
+
+PARAMETER_FOLLOW_UP_SYSTEM_PROMPT = """I am a scout AI assistant, with 20 years of experience in scouting. I am known for my expertise in soccer and for my data-driven approach to player analysis. The future of soccer depends on my ability to identify the best players for your team.
+
+Pay careful attention to the conversation history and how each message builds on previous ones.
+For follow-up queries, preserve relevant parameters from previous searches while incorporating new constraints.
+
+VERY IMPORTANT INSTRUCTIONS:
+You MUST activate specific statistical parameters (set to True) that correspond to the query.
+Never return ONLY position_codes and key_description_word - you MUST also set statistical parameters to TRUE.
+For example, for "strong defenders", set min_defensive_duels_won=true, min_interceptions=true, etc.
+
+For queries about contract expiration, set contract_expiration to a date string in YYYY-MM-DD format.
+For example, if looking for players whose contracts expire soon, set contract_expiration="2025-12-31".
+
+For queries about preferred foot, set foot to "left", "right", or "both" as appropriate.
+Default to "both" if no specific foot preference is mentioned.
+
+""" + _PARAMETER_EXAMPLES + _PARAMETER_REFERENCE
+
+PARAMETER_TOOLS = [{
+    "name": "define_scouting_parameters",
+    "description": "Generate standardized searchable parameters to be looked for, not the values.",
+    "input_schema": SearchParameters.model_json_schema()
+}]
 
 
 class UnifiedSession:
@@ -56,7 +293,7 @@ class UnifiedSession:
     Unified session manager that combines functionality from ChatSession and ConversationMemory
     
     This class provides:
-    - Session management (create, get, update sessions)
+    - Session management (create, get, update sessions), one request per session at a time
     - Claude API integration
     - Player search and information retrieval
     - Parameter management
@@ -69,46 +306,222 @@ class UnifiedSession:
         from services.claude_api import get_anthropic_api_key
         self.anthropic_api_key = get_anthropic_api_key()
         
-        # Load necessary data files
+        # Load necessary data files (read-only, shared by all request threads)
         self.average = self._load_json('average_statistics_by_position.json')
         self.weights = self._load_json('weights_dict.json')
         self.database = self._load_json('database.json')
         self.database_id = self._load_json('db_by_id.json')
         
-        # Session storage
-        self.sessions: Dict[str, SessionData] = {}
-    
-    def _load_json(self, filename: str) -> dict:
-        """Load a JSON file, trying different paths"""
-        paths = [
-            filename,  # Current directory
-            os.path.join('backend', filename),  # Backend subdirectory
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), filename)  # From core directory
-        ]
+        # Session storage, bounded by count, size and idle time
+        from config import SESSION_STORE, SESSION_BACKEND, SESSION_JOURNAL
+        from core.session_store import SessionStore
+        from core.session_backends import create_session_backend
+        from core.session_journal import SessionJournal
+        self.sessions = SessionStore(**SESSION_STORE)
         
-        for path in paths:
-            try:
-                with open(path, 'r', encoding='utf-8') as file:
-                    return json.load(file)
-            except FileNotFoundError:
-                continue
+        # session_id -> [lock, number of requests holding or waiting for it]
+        self._session_locks: Dict[str, list] = {}
+        self._session_locks_guard = threading.Lock()
+        
+        # Shared copy of the sessions for multi-worker deployments
+        self.session_backend = create_session_backend(SESSION_BACKEND)
         
-        raise FileNotFoundError(f"Could not find {filename} in any expected location")
+        # Sessions survive restarts through the journal; shared backends already persist them
+        self.session_journal = None
+        if SESSION_JOURNAL.get("directory") and not self.session_backend.shared:
+            self.session_journal = SessionJournal(**SESSION_JOURNAL)
+    
+    def _load_json(self, filename: str) -> Mapping[str, Any]:
+        """Load a JSON file, sharing the read-only copy of the data service"""
+        from services.data_service import load_json
+        return load_json(filename)
     
     # === Session Management ===
     
     def create_session(self, session_id: str, language: str = 'english') -> SessionData:
         """Create a new session with the given ID and language"""
         session = SessionData(session_id=session_id, language=language)
-        self.sessions[session_id] = session
+        self.sessions.put(session_id, session)
         return session
     
     def get_session(self, session_id: str, language: str = 'english') -> SessionData:
-        """Get an existing session or create a new one if it doesn't exist"""
-        if session_id not in self.sessions:
-            return self.create_session(session_id, language)
+        """
+        Get an existing session or create a new one if it doesn't exist
+        
+        Within a request the session is locked until the request ends (see
+        save_request_sessions), so two requests for the same session (e.g. two
+        tabs) run one after the other instead of overwriting each other's changes.
+        
+        Raises:
+            SessionBusyError: If another request holds the session for too long
+        """
+        requested = _request_sessions.get()
+        if requested is not None and session_id not in requested:
+            self._acquire_session_lock(session_id)
+            requested[session_id] = None
+        
+        session = self._load_session(session_id, language)
+        if requested is not None:
+            requested[session_id] = session
+        return session
+    
+    @contextmanager
+    def locked_session(self, session_id: str, language: str = 'english') -> Iterator[SessionData]:
+        """
+        Use a session exclusively outside of a request, e.g. in a background job
+        
+        Waits until no request or job uses the session and saves it before the
+        next one gets it. Within a request that already uses the session this is
+        simply that request's session.
+        
+        Raises:
+            SessionBusyError: If the session stays locked for too long
+        """
+        requested = _request_sessions.get()
+        if requested is not None and session_id in requested:
+            yield self.get_session(session_id, language)
+            return
+        
+        self._acquire_session_lock(session_id)
+        try:
+            session = self._load_session(session_id, language)
+            try:
+                yield session
+            finally:
+                self.save_session(session)
+        finally:
+            self._release_session_lock(session_id)
+    
+    def _acquire_session_lock(self, session_id: str) -> None:
+        with self._session_locks_guard:
+            entry = self._session_locks.setdefault(session_id, [threading.Lock(), 0])
+            entry[1] += 1
+        if entry[0].acquire(timeout=SESSION_LOCK_TIMEOUT_SECONDS):
+            # The holder mutates the session in place: keep it out of the cold tier until released
+            self.sessions.checkout(session_id)
+            return
+        self._release_session_lock(session_id, acquired=False)
+        raise SessionBusyError(f"Session {session_id} is busy with another request")
+    
+    def _release_session_lock(self, session_id: str, acquired: bool = True) -> None:
+        # Plain locks (not RLock): a request may release from another thread than it locked in
+        with self._session_locks_guard:
+            entry = self._session_locks[session_id]
+            if acquired:
+                self.sessions.checkin(session_id)
+                entry[0].release()
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._session_locks[session_id]
+    
+    def _load_session(self, session_id: str, language: str) -> SessionData:
+        """Get a session from memory, the shared backend or the journal, or create it"""
+        session = self.sessions.get(session_id)
+        
+        # Another worker may have changed the session; reload only if its version moved
+        if self.session_backend.shared:
+            session = self._refresh_from_backend(session_id, session)
+        
+        # Not seen since the last restart: recover it from its journal on first access
+        if session is None and self.session_journal is not None:
+            session = self.session_journal.recover(session_id)
+            if session is not None:
+                self.sessions.put(session_id, session)
         
-        return self.sessions[session_id]
+        if session is None:
+            session = self.create_session(session_id, language)
+        return session
+    
+    def _refresh_from_backend(self, session_id: str, session: Optional[SessionData]) -> Optional[SessionData]:
+        """Return the backend's copy of a session if it is newer than the local one"""
+        from core.session_backends import deserialize_session
+        
+        try:
+            version = self.session_backend.version(session_id)
+            if version is None or (session is not None and session._backend_version == version):
+                return session
+            
+            stored = self.session_backend.load(session_id)
+            if stored is None:
+                return session
+            data, version = stored
+            loaded = deserialize_session(data)
+        except Exception as e:
+            # Serve the local copy (or a new session) rather than failing the request
+            print(f"Error loading session {session_id} from the session backend: {str(e)}")
+            return session
+        
+        loaded._backend_version = version
+        loaded._backend_data = data
+        self.sessions.put(session_id, loaded)
+        return loaded
+    
+    def save_session(self, session: SessionData) -> None:
+        """
+        Write a session to the shared backend if it changed since it was loaded or saved
+        
+        Called when a request ends (see save_request_sessions), after a streamed
+        response and by background jobs. With the memory backend the changes are
+        appended to the session journal instead (if enabled).
+        
+        Session locks only serialize requests within a worker. If another worker
+        saved the session since it was loaded, its copy is reloaded, this
+        session's changes are merged into it (see merge_session_data) and the
+        save is retried.
+        """
+        if self.session_journal is not None:
+            try:
+                self.session_journal.record(session)
+            except Exception as e:
+                print(f"Error journaling session {session.session_id}: {str(e)}")
+        if not self.session_backend.shared:
+            return
+        from config import SESSION_BACKEND
+        from core.session_backends import serialize_session, deserialize_session, merge_session_data
+        
+        try:
+            data = serialize_session(session)
+            for _ in range(SESSION_BACKEND["save_attempts"]):
+                if data == session._backend_data:
+                    return
+                version = self.session_backend.save(session.session_id, data, session._backend_version)
+                if version is not None:
+                    session._backend_version = version
+                    session._backend_data = data
+                    return
+                
+                # Another worker saved first: apply this session's changes to its copy
+                stored = self.session_backend.load(session.session_id)
+                theirs_data, theirs_version = stored if stored is not None else (b"", 0)
+                base = (deserialize_session(session._backend_data) if session._backend_data
+                        else SessionData(session_id=session.session_id, language=session.language))
+                theirs = deserialize_session(theirs_data) if theirs_data else base
+                merged = SessionData.model_validate(merge_session_data(
+                    base.model_dump(mode="json"), session.model_dump(mode="json"), theirs.model_dump(mode="json")
+                ))
+                for field in SessionData.model_fields:
+                    setattr(session, field, getattr(merged, field))
+                session._backend_version = theirs_version
+                session._backend_data = theirs_data
+                data = serialize_session(session)
+                print(f"Session {session.session_id} was saved by another worker, merged version {theirs_version}")
+            print(f"Error saving session {session.session_id}: still conflicting after "
+                  f"{SESSION_BACKEND['save_attempts']} attempts")
+        except Exception as e:
+            print(f"Error saving session {session.session_id} to the session backend: {str(e)}")
+    
+    def save_request_sessions(self) -> None:
+        """Save the sessions used by the current request and release their locks"""
+        requested = _request_sessions.get()
+        if not requested:
+            return
+        for session_id, session in list(requested.items()):
+            try:
+                if session is not None:
+                    self.save_session(session)
+            finally:
+                self._release_session_lock(session_id)
+        requested.clear()
     
     def update_session(self, session_id: str, **kwargs) -> SessionData:
         """
@@ -134,7 +547,7 @@ class UnifiedSession:
             session.current_prompt = kwargs['prompt']
             
         if 'players' in kwargs:
-            session.selected_players = kwargs['players']
+            session.selected_players = to_player_refs(kwargs['players'])
             
         if 'entities' in kwargs and isinstance(kwargs['entities'], dict):
             session.entities.update(kwargs['entities'])
@@ -145,16 +558,19 @@ class UnifiedSession:
                 setattr(session, key, value)
         
         # Save updated session
-        self.sessions[session_id] = session
+        self.sessions.put(session_id, session)
         return session
     
     # === Claude API Integration ===
     
-    def call_claude_api(self, model: str, max_tokens: int, system=None, messages=None, tools=None, tool_choice=None):
+    def call_claude_api(self, model: Optional[str] = None, max_tokens: Optional[int] = None, system=None, messages=None,
+                        tools=None, tool_choice=None, deadline: Optional[Deadline] = None, task: Optional[str] = None):
         """
         Call the Claude API using the unified service
         
-        This uses the claude_api service for implementation but maintains backward compatibility
+        This uses the claude_api service for implementation but maintains backward compatibility.
+        The task selects the model and limits from CLAUDE_TASK_ROUTING; with a deadline the
+        call only uses the request's remaining budget.
         """
         from services.claude_api import call_claude_api
         return call_claude_api(
@@ -164,12 +580,32 @@ class UnifiedSession:
             system=system,
             messages=messages,
             tools=tools,
-            tool_choice=tool_choice
+            tool_choice=tool_choice,
+            deadline=deadline,
+            task=task
+        )
+    
+    def stream_claude_api(self, model: Optional[str] = None, max_tokens: Optional[int] = None, system=None, messages=None,
+                          deadline: Optional[Deadline] = None, task: Optional[str] = None):
+        """
+        Stream a text response from the Claude API
+        
+        Returns a generator of text fragments; see services.claude_api.stream_claude_api
+        """
+        from services.claude_api import stream_claude_api
+        return stream_claude_api(
+            api_key=self.anthropic_api_key,
+            model=model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=messages,
+            deadline=deadline,
+            task=task
         )
     
     # === Parameter Management ===
     
-    def get_parameters(self, session_id: str, natural_query: str) -> SearchParameters:
+    def get_parameters(self, session_id: str, natural_query: str, deadline: Optional[Deadline] = None) -> SearchParameters:
         """
         Extract search parameters from a natural language query
         
@@ -178,6 +614,7 @@ class UnifiedSession:
         Args:
             session_id: The session ID
             natural_query: The natural language query from the user
+            deadline: Optional request deadline for the Claude calls
             
         Returns:
             SearchParameters object with extracted parameters
@@ -200,13 +637,10 @@ class UnifiedSession:
             
             # Use structured message history if available
             if has_structured_messages:
-                # Filter to just user messages
-                user_messages = [msg["content"] for msg in session.messages if msg.get("role") == "user"]
-                # Use last few messages for context (not too many to avoid confusion)
-                context_messages = user_messages[-3:] if len(user_messages) > 3 else user_messages
-                # Add current query if not already included
-                if natural_query not in context_messages:
-                    context_messages.append(natural_query)
+                # Recent user messages within the parameter task's token budget,
+                # ending with the current query
+                from core.context import build_query_context
+                context_messages = build_query_context(session, natural_query)
                     
                 # Use context-aware query for parameter extraction
                 query_to_use = "Based on this conversation: " + " THEN: ".join(context_messages)
@@ -225,153 +659,30 @@ class UnifiedSession:
             
             print(f"Using new query: {query_to_use}")
         
+        # Only standalone queries are cached: follow-ups depend on the conversation
+        parameter_cache = None
+        if query_to_use == natural_query and not (has_structured_messages and session.is_follow_up):
+            from services.semantic_cache import get_parameter_cache
+            parameter_cache = get_parameter_cache()
+        
+        if parameter_cache is not None:
+            with stage("parameters.cache"):
+                cached_params = parameter_cache.lookup(natural_query, session.language)
+            if cached_params is not None:
+                params = SearchParameters(**cached_params)
+                session.search_params = params.model_dump()
+                session.last_search_params = params.model_dump()
+                return params
+        
         try:
             # Import constants from config
-            from models.parameters import KEY_DESCRIPTION_WORDS
-            from config import POSITIONS_MAPPING, VALID_POSITION_CODES
+            from config import VALID_POSITION_CODES
             
             # Create Claude API prompt based on whether we're using structured history
             if has_structured_messages and session.is_follow_up:
                 # Use a more sophisticated prompt for follow-up queries
                 
-                system_prompt = """
-                I am a scout AI assistant, with 20 years of experience in scouting. I am known for my expertise in soccer and for my data-driven approach to player analysis. The future of soccer depends on my ability to identify the best players for your team.
-                
-                Pay careful attention to the conversation history and how each message builds on previous ones.
-                For follow-up queries, preserve relevant parameters from previous searches while incorporating new constraints.
-                
-                VERY IMPORTANT INSTRUCTIONS:
-                You MUST activate specific statistical parameters (set to True) that correspond to the query.
-                Never return ONLY position_codes and key_description_word - you MUST also set statistical parameters to TRUE.
-                For example, for "strong defenders", set min_defensive_duels_won=true, min_interceptions=true, etc.
-                
-                For queries about contract expiration, set contract_expiration to a date string in YYYY-MM-DD format.
-                For example, if looking for players whose contracts expire soon, set contract_expiration="2025-12-31".
-                
-                For queries about preferred foot, set foot to "left", "right", or "both" as appropriate.
-                Default to "both" if no specific foot preference is mentioned.
-                
-                ## Examples:
-                 {
-        "query": "Identifique meias centrais modernos com excelente visão de jogo e precisão nos passes",
-        "intent": "Encontrar meio-campistas capazes de ditar o ritmo do jogo e criar oportunidades",
-        "search_params": {
-            "position_codes": ["lcmf", "rcmf", "lcmf3", "rcmf3"],
-            "min_passes": "true",
-            "min_pass_accuracy": "true",
-            "min_progressive_passes": "true",
-            "min_passes_to_final_third": "true",
-            "min_smart_passes": "true",
-            "min_through_passes": "true",
-            "min_key_passes": "true",
-            "min_successful_progressive_passes_percent": "true",
-            "min_successful_smart_passes_percent": "true",
-            "min_xg_assist": "true"
-        },
-        "explanation": "Estes parâmetros focam em meio-campistas centrais que dominam a posse de bola, progridem o jogo e criam chances com passes precisos e inteligentes."
-    },
-    {
-        "query": "Encontre centroavantes móveis com alta eficiência de finalização e contribuição no pressing",
-        "intent": "Identificar atacantes modernos que combinam gols com trabalho defensivo",
-        "search_params": {
-            "position_codes": ["cf"],
-            "min_goals": "true",
-            "min_shots_on_target": "true",
-            "min_xg_shot": "true",
-            "min_goal_conversion_percent": "true",
-            "min_successful_dribbles": "true",
-            "min_accelerations": "true",
-            "min_counterpressing_recoveries": "true",
-            "min_dangerous_opponent_half_recoveries": "true",
-            "min_offensive_duels_won": "true"
-        },
-        "explanation": "Estes critérios visam centroavantes que não só finalizam com eficiência, mas também pressionam ativamente e contribuem na recuperação da posse em zonas avançadas."
-    },
-    {
-        "query": "Localize zagueiros modernos com excelente capacidade de construção e domínio aéreo",
-        "intent": "Encontrar defensores centrais que iniciam jogadas e dominam defensivamente",
-        "search_params": {
-            "position_codes": ["cb", "lcb", "rcb", "lcb3", "rcb3"],
-            "min_long_passes": "true",
-            "min_progressive_passes": "true",
-            "min_successful_long_passes_percent": "true",
-            "min_aerial_duels_won": "true",
-            "min_aerial_duels_won_percent": "true",
-            "min_defensive_duels_won": "true",
-            "min_interceptions": "true",
-            "max_dangerous_own_half_losses": "true",
-            "min_successful_forward_passes_percent": "true"
-        },
-        "explanation": "Estes parâmetros buscam zagueiros que são seguros na saída de bola, dominantes no jogo aéreo e eficientes em ações defensivas."
-    },
-    {
-        "query": "Identifique laterais completos com forte presença ofensiva e defensiva",
-        "intent": "Encontrar laterais modernos que contribuem em ambas as fases do jogo",
-        "search_params": {
-            "position_codes": ["lb", "rb", "lb5", "rb5", "lwb", "rwb"],
-            "min_crosses": "true",
-            "min_successful_crosses_percent": "true",
-            "min_progressive_runs": "true",
-            "min_successful_dribbles": "true",
-            "min_defensive_duels_won": "true",
-            "min_interceptions": "true",
-            "min_ball_recoveries": "true",
-            "min_passes_to_final_third": "true",
-            "min_successful_passes_to_final_third_percent": "true"
-        },
-        "explanation": "Estes critérios focam em laterais que são efetivos tanto no ataque, com cruzamentos e progressões, quanto na defesa, com recuperações e duelos defensivos."
-    },
-    {
-        "query": "Encontre goleiros modernos com excelente jogo com os pés e domínio da área",
-        "intent": "Identificar goleiros que contribuem na construção e são seguros defensivamente",
-        "search_params": {
-            "position_codes": ["gk"],
-            "min_gk_saves_percent": "true",
-            "min_gk_successful_exits_percent": "true",
-            "min_successful_goal_kicks_percent": "true",
-            "min_passes": "true",
-            "min_long_passes": "true",
-            "min_successful_long_passes_percent": "true",
-            "min_pass_accuracy": "true"
-        },
-        "explanation": "Estes parâmetros buscam goleiros que são seguros nas defesas, eficientes nas saídas e capazes de iniciar jogadas com passes precisos, incluindo lançamentos longos."
-    },
-    {
-        "query": "Identifique meias atacantes criativos com habilidade de drible e criação de chances",
-        "intent": "Encontrar jogadores que podem desequilibrar defesas e criar oportunidades de gol",
-        "search_params": {
-            "position_codes": ["amf", "lamf", "ramf"],
-            "min_successful_dribbles": "true",
-            "min_successful_dribbles_percent": "true",
-            "min_key_passes": "true",
-            "min_through_passes": "true",
-            "min_smart_passes": "true",
-            "min_xg_assist": "true",
-            "min_progressive_runs": "true",
-            "min_offensive_duels_won": "true",
-            "min_successful_passes_to_final_third_percent": "true"
-        },
-        "explanation": "Estes critérios focam em meias atacantes que podem superar adversários no drible e criar chances de gol com passes criativos e inteligentes."
-    },
-    {
-        "query": "Localize volantes defensivos com forte presença na marcação e boa distribuição",
-        "intent": "Identificar meio-campistas defensivos que protegem a defesa e iniciam jogadas",
-        "search_params": {
-            "position_codes": ["dmf", "ldmf", "rdmf"],
-            "min_interceptions": "true",
-            "min_ball_recoveries": "true",
-            "min_defensive_duels_won": "true",
-            "min_aerial_duels_won": "true",
-            "min_passes": "true",
-            "min_long_passes": "true",
-            "min_successful_forward_passes_percent": "true",
-            "min_successful_long_passes_percent": "true",
-            "max_dangerous_own_half_losses": "true"
-        },
-        "explanation": "Estes parâmetros buscam volantes que são eficientes na recuperação de bola, fortes nos duelos defensivos e capazes de distribuir o jogo com segurança."
-    }
-]
-                """
+                system_prompt = build_cached_system(PARAMETER_FOLLOW_UP_SYSTEM_PROMPT)
                
                 # Construct a better message that explains we're working with conversation context
                 messages = [
@@ -382,7 +693,7 @@ class UnifiedSession:
                     Conversation: {query_to_use}
                     
                     Based on the FULL conversation context, identify the searchable parameters, the position_codes and choose
-                     the key description words ({KEY_DESCRIPTION_WORDS}) that better describe the users query, following this map {POSITIONS_MAPPING}.
+                     the key description words that better describe the users query, following the reference data in your instructions.
                     
                     If the conversation mentions preferred foot (left/right/both), set that parameter appropriately.
                     If the conversation mentions contract expiration, set contract_expiration to a date in YYYY-MM-DD format.
@@ -394,151 +705,13 @@ class UnifiedSession:
                 ]
             else:
                 # For new queries, use the original approach
-                system_prompt = """
-                I am a scout AI assistant, with 20 years of experience in scouting. I am known for my expertise in soccer and for my data-driven approach to player analysis. The future of soccer depends on my ability to identify the best players for your team.
-                
-                I must be able to transform the coaches desires into searchable parameters that will help me find the perfect player for their team. I must understand the coach's needs and translate them into actionable search criteria.
-                
-                VERY IMPORTANT INSTRUCTIONS:
-                You MUST activate specific statistical parameters (set to True) that correspond to the query.
-                Never return ONLY position_codes and key_description_word - you MUST also set statistical parameters to TRUE.
-                For example, for "strong defenders", set min_defensive_duels_won=true, min_interceptions=true, etc.
-                For "fast attackers", set min_accelerations=true, min_progressive_runs=true, etc.
-                
-                For queries about contract expiration, set contract_expiration to a date string in YYYY-MM-DD format.
-                For example, if looking for players whose contracts expire soon, set contract_expiration="2025-12-31".
-                
-                For queries about preferred foot, set foot to "left", "right", or "both" as appropriate.
-                Default to "both" if no specific foot preference is mentioned.
-                
-                ALWAYS set at least 5-8 statistical parameters to TRUE based on the description of the player.
-                ## Examples:
-                 {
-        "query": "Identifique meias centrais modernos com excelente visão de jogo e precisão nos passes",
-        "intent": "Encontrar meio-campistas capazes de ditar o ritmo do jogo e criar oportunidades",
-        "search_params": {
-            "position_codes": ["lcmf", "rcmf", "lcmf3", "rcmf3"],
-            "min_passes": "true",
-            "min_pass_accuracy": "true",
-            "min_progressive_passes": "true",
-            "min_passes_to_final_third": "true",
-            "min_smart_passes": "true",
-            "min_through_passes": "true",
-            "min_key_passes": "true",
-            "min_successful_progressive_passes_percent": "true",
-            "min_successful_smart_passes_percent": "true",
-            "min_xg_assist": "true"
-        },
-        "explanation": "Estes parâmetros focam em meio-campistas centrais que dominam a posse de bola, progridem o jogo e criam chances com passes precisos e inteligentes."
-    },
-    {
-        "query": "Encontre centroavantes móveis com alta eficiência de finalização e contribuição no pressing",
-        "intent": "Identificar atacantes modernos que combinam gols com trabalho defensivo",
-        "search_params": {
-            "position_codes": ["cf"],
-            "min_goals": "true",
-            "min_shots_on_target": "true",
-            "min_xg_shot": "true",
-            "min_goal_conversion_percent": "true",
-            "min_successful_dribbles": "true",
-            "min_accelerations": "true",
-            "min_counterpressing_recoveries": "true",
-            "min_dangerous_opponent_half_recoveries": "true",
-            "min_offensive_duels_won": "true"
-        },
-        "explanation": "Estes critérios visam centroavantes que não só finalizam com eficiência, mas também pressionam ativamente e contribuem na recuperação da posse em zonas avançadas."
-    },
-    {
-        "query": "Localize zagueiros modernos com excelente capacidade de construção e domínio aéreo",
-        "intent": "Encontrar defensores centrais que iniciam jogadas e dominam defensivamente",
-        "search_params": {
-            "position_codes": ["cb", "lcb", "rcb", "lcb3", "rcb3"],
-            "min_long_passes": "true",
-            "min_progressive_passes": "true",
-            "min_successful_long_passes_percent": "true",
-            "min_aerial_duels_won": "true",
-            "min_aerial_duels_won_percent": "true",
-            "min_defensive_duels_won": "true",
-            "min_interceptions": "true",
-            "max_dangerous_own_half_losses": "true",
-            "min_successful_forward_passes_percent": "true"
-        },
-        "explanation": "Estes parâmetros buscam zagueiros que são seguros na saída de bola, dominantes no jogo aéreo e eficientes em ações defensivas."
-    },
-    {
-        "query": "Identifique laterais completos com forte presença ofensiva e defensiva",
-        "intent": "Encontrar laterais modernos que contribuem em ambas as fases do jogo",
-        "search_params": {
-            "position_codes": ["lb", "rb", "lb5", "rb5", "lwb", "rwb"],
-            "min_crosses": "true",
-            "min_successful_crosses_percent": "true",
-            "min_progressive_runs": "true",
-            "min_successful_dribbles": "true",
-            "min_defensive_duels_won": "true",
-            "min_interceptions": "true",
-            "min_ball_recoveries": "true",
-            "min_passes_to_final_third": "true",
-            "min_successful_passes_to_final_third_percent": "true"
-        },
-        "explanation": "Estes critérios focam em laterais que são efetivos tanto no ataque, com cruzamentos e progressões, quanto na defesa, com recuperações e duelos defensivos."
-    },
-    {
-        "query": "Encontre goleiros modernos com excelente jogo com os pés e domínio da área",
-        "intent": "Identificar goleiros que contribuem na construção e são seguros defensivamente",
-        "search_params": {
-            "position_codes": ["gk"],
-            "min_gk_saves_percent": "true",
-            "min_gk_successful_exits_percent": "true",
-            "min_successful_goal_kicks_percent": "true",
-            "min_passes": "true",
-            "min_long_passes": "true",
-            "min_successful_long_passes_percent": "true",
-            "min_pass_accuracy": "true"
-        },
-        "explanation": "Estes parâmetros buscam goleiros que são seguros nas defesas, eficientes nas saídas e capazes de iniciar jogadas com passes precisos, incluindo lançamentos longos."
-    },
-    {
-        "query": "Identifique meias atacantes criativos com habilidade de drible e criação de chances",
-        "intent": "Encontrar jogadores que podem desequilibrar defesas e criar oportunidades de gol",
-        "search_params": {
-            "position_codes": ["amf", "lamf", "ramf"],
-            "min_successful_dribbles": "true",
-            "min_successful_dribbles_percent": "true",
-            "min_key_passes": "true",
-            "min_through_passes": "true",
-            "min_smart_passes": "true",
-            "min_xg_assist": "true",
-            "min_progressive_runs": "true",
-            "min_offensive_duels_won": "true",
-            "min_successful_passes_to_final_third_percent": "true"
-        },
-        "explanation": "Estes critérios focam em meias atacantes que podem superar adversários no drible e criar chances de gol com passes criativos e inteligentes."
-    },
-    {
-        "query": "Localize volantes defensivos com forte presença na marcação e boa distribuição",
-        "intent": "Identificar meio-campistas defensivos que protegem a defesa e iniciam jogadas",
-        "search_params": {
-            "position_codes": ["dmf", "ldmf", "rdmf"],
-            "min_interceptions": "true",
-            "min_ball_recoveries": "true",
-            "min_defensive_duels_won": "true",
-            "min_aerial_duels_won": "true",
-            "min_passes": "true",
-            "min_long_passes": "true",
-            "min_successful_forward_passes_percent": "true",
-            "min_successful_long_passes_percent": "true",
-            "max_dangerous_own_half_losses": "true"
-        },
-        "explanation": "Estes parâmetros buscam volantes que são eficientes na recuperação de bola, fortes nos duelos defensivos e capazes de distribuir o jogo com segurança."
-    }
-]
-                """
+                system_prompt = build_cached_system(PARAMETER_SYSTEM_PROMPT)
                 messages = [
                     {"role": "user", "content": f"""
                     For the query: "{query_to_use}"
                     
-                    1. Identify the position_codes from {POSITIONS_MAPPING}
-                    2. Choose the key description words from {KEY_DESCRIPTION_WORDS} that best describe the query
+                    1. Identify the position_codes from the position codes map in your reference data
+                    2. Choose the key description words from your reference data that best describe the query
                     3. MOST IMPORTANTLY: Set specific statistical parameters to TRUE that match the description
                        When setting parameters, look at the examples in the prompt for similar player types
                     4. If the query mentions preferred foot, set foot to "left", "right", or "both"
@@ -571,16 +744,12 @@ class UnifiedSession:
             
             # Make the API call
             response = self.call_claude_api(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=8192,
+                task="parameters",
                 system=system_prompt,
                 messages=messages,
-                tools=[{
-                    "name": "define_scouting_parameters",
-                    "description": "Generate standardized searchable parameters to be looked for, not the values.",
-                    "input_schema": SearchParameters.model_json_schema()
-                }],
-                tool_choice={"type": "tool", "name": "define_scouting_parameters"}
+                tools=PARAMETER_TOOLS,
+                tool_choice={"type": "tool", "name": "define_scouting_parameters"},
+                deadline=deadline
             )
             
             # Get the tool input - handle potential string vs dict response
@@ -609,8 +778,16 @@ class UnifiedSession:
             
             # Validate position codes
             invalid_codes = [code for code in params.position_codes if code not in VALID_POSITION_CODES]
+            corrected_by_claude = True
             if invalid_codes:
-                params.position_codes = self._correct_position_codes(invalid_codes)
+                # Resolve locally first; only codes nothing matches go to Claude
+                corrected_codes, unresolved_codes = resolve_position_codes(invalid_codes)
+                if unresolved_codes:
+                    claude_codes, corrected_by_claude = self._correct_position_codes(unresolved_codes, deadline)
+                    corrected_codes += claude_codes
+                
+                valid_codes = [code for code in params.position_codes if code in VALID_POSITION_CODES]
+                params.position_codes = list(dict.fromkeys(valid_codes + corrected_codes))
             
             # Debug the parameter values that are set to True or have values
             true_params = params.get_true_parameters()
@@ -633,6 +810,11 @@ class UnifiedSession:
             session.search_params = params.model_dump()
             session.last_search_params = params.model_dump()
             
+            # Fallback parameters (Claude unreachable, or position codes it could not
+            # correct) must not be reused for paraphrases
+            if parameter_cache is not None and response.id != "error" and corrected_by_claude:
+                parameter_cache.store(natural_query, session.language, session.search_params)
+            
             return params
         except Exception as e:
             print(f"ERROR in get_parameters: {str(e)}")
@@ -640,9 +822,25 @@ class UnifiedSession:
             # This will allow the calling function to handle it appropriately
             raise ValueError(f"Failed to extract search parameters: {str(e)}")
     
-    def _correct_position_codes(self, invalid_codes: List[str]) -> List[str]:
-        """Correct invalid position codes using Claude AI"""
-        from config import POSITIONS_MAPPING
+    def _correct_position_codes(self, invalid_codes: List[str],
+                                deadline: Optional[Deadline] = None) -> Tuple[List[str], bool]:
+        """
+        Correct invalid position codes using Claude AI
+
+        Args:
+            invalid_codes: Codes that could not be resolved locally
+            deadline: Request deadline
+
+        Returns:
+            Tuple of (position_codes, corrected); corrected is False when the
+            codes are a fallback because the correction was skipped or failed
+        """
+        from config import POSITIONS_MAPPING, CLAUDE_MIN_ATTEMPT_SECONDS
+        
+        if deadline is not None and not deadline.allows(CLAUDE_MIN_ATTEMPT_SECONDS):
+            # Searching without these codes beats not answering in time
+            print(f"Skipping position code correction for {invalid_codes}: request deadline reached")
+            return [], False
         
         correction_prompt = f"The position codes {invalid_codes} are invalid. Please provide valid position codes that are similar to {invalid_codes} from the following map: {POSITIONS_MAPPING}. Example: cm -> lcmf, rcmf or dmf"
         
@@ -650,8 +848,7 @@ class UnifiedSession:
             from models.parameters import PositionCorrection
             
             correction_response = self.call_claude_api(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1024,
+                task="position_correction",
                 messages=[
                     {"role": "user", "content": correction_prompt}
                 ],
@@ -660,7 +857,8 @@ class UnifiedSession:
                     "description": "Provide corrected position codes",
                     "input_schema": PositionCorrection.model_json_schema()
                 }],
-                tool_choice={"type": "tool", "name": "correct_position_codes"}
+                tool_choice={"type": "tool", "name": "correct_position_codes"},
+                deadline=deadline
             )
             
             # Get the tool input - handle potential string vs dict response
@@ -685,11 +883,11 @@ class UnifiedSession:
                 args = tool_input
                 
             # Create PositionCorrection from the args and return the corrected positions
-            return PositionCorrection(**args).corrected_postion
+            return PositionCorrection(**args).corrected_postion, True
         except Exception as e:
             print(f"Error in position code correction: {str(e)}")
             # Return a sensible default if correction fails
-            return ["cmf", "rcmf", "lcmf"]
+            return ["cmf", "rcmf", "lcmf"], False
             
     # === Player Search ===
     
@@ -750,4 +948,38 @@ class UnifiedSession:
             params=params,
             weights=self.weights,
             average_stats=self.average
-        )
\ No newline at end of file
+        )
+    
+    def hydrate_players(self, session: SessionData, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rebuild the full player info of the session's selected players
+        
+        Args:
+            session: The session whose player references to hydrate
+            limit: Optional maximum number of players (from the top of the last search)
+            
+        Returns:
+            Player information dictionaries in search order, with their search scores
+        """
+        refs = session.selected_players[:limit] if limit else session.selected_players
+        if not refs:
+            return []
+        
+        # The same parameters the players were found with, so the same stats are included
+        params = None
+        if session.last_search_params:
+            try:
+                params = SearchParameters(**session.last_search_params)
+            except ValueError:
+                params = None
+        
+        players = []
+        for ref in refs:
+            player = self.get_players_info(str(ref.get("wyId")), params)
+            if not player or player.get("error"):
+                print(f"Warning: Could not hydrate player {ref.get('wyId')} of session {session.session_id}")
+                continue
+            if ref.get("score") is not None:
+                player["score"] = ref["score"]
+            players.append(player)
+        return players
@@ -0,0 +1,345 @@
+"""
+Session backends for KatenaScout
+
+The in-process SessionStore only works with a single worker. A shared backend
+keeps the authoritative copy of every session so any gunicorn worker (or
+host) can serve any session:
+
+- MemoryBackend: process-local, nothing is shared (single worker, default)
+- SQLiteBackend: one SQLite file in WAL mode, shared by the workers of a host
+- RedisBackend: any Redis-protocol server (fakeredis can stand in for tests),
+  shared across hosts
+
+Sessions are stored with a version that is bumped on every save. Workers keep
+their local copy and only reload a session when its version has changed, so
+the common case costs one small read per request. A save only succeeds if the
+stored version is still the one the worker loaded (compare-and-set); when
+another worker saved in between, the caller merges its changes into the
+newer copy (see merge_session_data) and saves again.
+
+Sessions are serialized with msgpack when it is installed, otherwise as
+JSON; a one-byte prefix records the format so both can be read back.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Format prefixes of serialized sessions
+MSGPACK_FORMAT = b"M"
+JSON_FORMAT = b"J"
+
+
+def serialize_session(session) -> bytes:
+    """Serialize a SessionData compactly (msgpack if available, JSON otherwise)"""
+    data = session.model_dump(mode="json")
+    if msgpack is not None:
+        return MSGPACK_FORMAT + msgpack.packb(data, use_bin_type=True)
+    return JSON_FORMAT + json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def deserialize_session(data: bytes):
+    """
+    Restore a SessionData serialized by serialize_session
+
+    Raises:
+        ValueError: If the data is in an unknown format, or msgpack is needed but not installed
+    """
+    from core.session import SessionData
+
+    prefix, payload = data[:1], data[1:]
+    if prefix == MSGPACK_FORMAT:
+        if msgpack is None:
+            raise ValueError("Session was stored with msgpack, which is not installed")
+        return SessionData.model_validate(msgpack.unpackb(payload, raw=False))
+    if prefix == JSON_FORMAT:
+        return SessionData.model_validate_json(payload)
+    raise ValueError(f"Unknown session format {prefix!r}")
+
+
+def merge_session_data(base: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Three-way merge of session data after a save conflict
+
+    Fields (and dict keys, recursively) only one side changed since base take
+    that side's value. When both changed a list that started as base, items
+    appended by each are kept, theirs first. Otherwise ours (the save being
+    retried) wins.
+
+    Args:
+        base: Session data both sides started from
+        ours: Session data of the save that conflicted
+        theirs: Session data stored by the other worker
+
+    Returns:
+        Merged session data
+    """
+    merged = dict(theirs)
+    for key, value in ours.items():
+        original = base.get(key)
+        other = theirs.get(key)
+        if key not in theirs or other == original:
+            merged[key] = value
+        elif value == original:
+            continue
+        elif isinstance(value, dict) and isinstance(other, dict) and isinstance(original, dict):
+            merged[key] = merge_session_data(original, value, other)
+        elif (isinstance(value, list) and isinstance(other, list) and isinstance(original, list)
+              and value[:len(original)] == original and other[:len(original)] == original):
+            merged[key] = other + value[len(original):]
+        else:
+            merged[key] = value
+    return merged
+
+
+class SessionBackend(ABC):
+    """Interface of session backends; stored sessions are (serialized bytes, version)"""
+
+    # Whether other workers see the sessions; the memory backend is process-local
+    shared = False
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Tuple[bytes, int]]:
+        """Get a stored session and its version, or None"""
+
+    @abstractmethod
+    def version(self, session_id: str) -> Optional[int]:
+        """Get the version of a stored session, or None if it is not stored"""
+
+    @abstractmethod
+    def save(self, session_id: str, data: bytes, expected_version: int) -> Optional[int]:
+        """
+        Store a session if its stored version is still expected_version
+
+        Args:
+            session_id: Session to store
+            data: Serialized session
+            expected_version: Version the data is based on (0: not stored yet)
+
+        Returns:
+            The new version, or None if another save changed the version first
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove a stored session"""
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend type and counters"""
+        return {"type": self.__class__.__name__}
+
+
+class MemoryBackend(SessionBackend):
+    """Process-local backend: the SessionStore is the only copy, so nothing is stored"""
+
+    def load(self, session_id: str) -> Optional[Tuple[bytes, int]]:
+        return None
+
+    def version(self, session_id: str) -> Optional[int]:
+        return None
+
+    def save(self, session_id: str, data: bytes, expected_version: int) -> Optional[int]:
+        return 0
+
+    def delete(self, session_id: str) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"type": "memory", "shared": False}
+
+
+class SQLiteBackend(SessionBackend):
+    """
+    Sessions in a SQLite database in WAL mode (readers never block the writer)
+
+    Args:
+        path: Database file, shared by all workers on the host
+        ttl_seconds: Sessions not saved for this long are deleted
+        cleanup_interval_seconds: Minimum time between expiry passes
+    """
+
+    shared = True
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, cleanup_interval_seconds: float = 300.0):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self._local = threading.local()
+        self._last_cleanup = 0.0
+        self._counters = {"loads": 0, "saves": 0, "conflicts": 0, "expired": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; SQLite connections must not be shared across threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def load(self, session_id: str) -> Optional[Tuple[bytes, int]]:
+        row = self._connection().execute(
+            "SELECT data, version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._counters["loads"] += 1
+        return bytes(row[0]), row[1]
+
+    def version(self, session_id: str) -> Optional[int]:
+        row = self._connection().execute(
+            "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id: str, data: bytes, expected_version: int) -> Optional[int]:
+        now = time.time()
+        with self._connection() as connection:
+            if expected_version == 0:
+                saved = connection.execute(
+                    "INSERT OR IGNORE INTO sessions (session_id, data, version, updated_at) VALUES (?, ?, 1, ?)",
+                    (session_id, sqlite3.Binary(data), now)
+                ).rowcount
+            else:
+                saved = connection.execute(
+                    "UPDATE sessions SET data = ?, version = version + 1, updated_at = ? "
+                    "WHERE session_id = ? AND version = ?",
+                    (sqlite3.Binary(data), now, session_id, expected_version)
+                ).rowcount
+        if not saved:
+            self._counters["conflicts"] += 1
+            return None
+        self._counters["saves"] += 1
+        self._cleanup(now)
+        return expected_version + 1
+
+    def delete(self, session_id: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _cleanup(self, now: float) -> None:
+        if now - self._last_cleanup < self.cleanup_interval_seconds:
+            return
+        self._last_cleanup = now
+        with self._connection() as connection:
+            deleted = connection.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        self._counters["expired"] += max(0, deleted)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"type": "sqlite", "shared": True, "path": self.path, **self._counters}
+
+
+class RedisBackend(SessionBackend):
+    """
+    Sessions in a Redis-protocol server, one hash (data, version) per session
+
+    Args:
+        client: A redis.Redis-compatible client (e.g. fakeredis.FakeRedis); created from url if omitted
+        url: Server URL used when no client is given
+        key_prefix: Prefix of the session keys
+        ttl_seconds: Expiry of a session after its last save
+    """
+
+    shared = True
+
+    def __init__(self, client=None, url: str = "redis://localhost:6379/0",
+                 key_prefix: str = "katena:session:", ttl_seconds: float = 7 * 24 * 3600):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("The redis session backend requires the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.key_prefix = key_prefix
+        self.ttl_seconds = int(ttl_seconds)
+        self._counters = {"loads": 0, "saves": 0, "conflicts": 0}
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    def load(self, session_id: str) -> Optional[Tuple[bytes, int]]:
+        data, version = self.client.hmget(self._key(session_id), "data", "version")
+        if data is None:
+            return None
+        self._counters["loads"] += 1
+        return bytes(data), int(version or 0)
+
+    def version(self, session_id: str) -> Optional[int]:
+        version = self.client.hget(self._key(session_id), "version")
+        return int(version) if version is not None else None
+
+    def save(self, session_id: str, data: bytes, expected_version: int) -> Optional[int]:
+        from redis.exceptions import WatchError
+
+        key = self._key(session_id)
+        with self.client.pipeline(transaction=True) as pipeline:
+            try:
+                # The transaction fails if the key changes between WATCH and EXEC
+                pipeline.watch(key)
+                version = pipeline.hget(key, "version")
+                if int(version or 0) != expected_version:
+                    pipeline.unwatch()
+                    self._counters["conflicts"] += 1
+                    return None
+                pipeline.multi()
+                pipeline.hset(key, mapping={"data": data, "version": expected_version + 1})
+                pipeline.expire(key, self.ttl_seconds)
+                pipeline.execute()
+            except WatchError:
+                self._counters["conflicts"] += 1
+                return None
+        self._counters["saves"] += 1
+        return expected_version + 1
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"type": "redis", "shared": True, **self._counters}
+
+
+def create_session_backend(config: Dict[str, Any]) -> SessionBackend:
+    """
+    Create the session backend selected in config.SESSION_BACKEND
+
+    Args:
+        config: {"type": "memory" | "sqlite" | "redis", ...backend settings}
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the type is unknown
+    """
+    backend_type = (config.get("type") or "memory").lower()
+    if backend_type == "memory":
+        return MemoryBackend()
+    if backend_type == "sqlite":
+        return SQLiteBackend(config["sqlite_path"], ttl_seconds=config["ttl_seconds"])
+    if backend_type == "redis":
+        return RedisBackend(url=config["redis_url"], key_prefix=config["redis_key_prefix"],
+                            ttl_seconds=config["ttl_seconds"])
+    raise ValueError(f"Unknown session backend '{backend_type}'")
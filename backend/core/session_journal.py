@@ -0,0 +1,317 @@
+"""
+Append-only session journal for KatenaScout
+
+With the default memory backend all conversation state lived in the worker
+and was lost on every restart or deploy. The journal persists it as one
+NDJSON file per session:
+
+- When a request's sessions are saved (see UnifiedSession.save_session), the
+  changes since the last save are appended: one "message" record per new
+  message and one "set" record with the fields that changed, whether they
+  were changed through update_session or directly by a route handler.
+- Records are written by a background thread in batches, so requests never
+  wait for the disk.
+- Every `snapshot_every` records the session is written as a "snapshot"
+  record and the file is compacted to start from it.
+- Nothing is read at startup; a session is recovered from its file the first
+  time its id is requested, so boot time does not depend on how many
+  sessions are stored.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class JournalMark:
+    """What of a session has been journaled: field digests, message count, records since the snapshot"""
+
+    __slots__ = ("fields", "messages", "last_message", "records")
+
+    def __init__(self, fields: Dict[str, bytes], messages: int, last_message: bytes, records: int):
+        self.fields = fields
+        self.messages = messages
+        self.last_message = last_message
+        self.records = records
+
+
+class SessionJournal:
+    """
+    Per-session append-only journals with batched background writes
+
+    Args:
+        directory: Directory of the journal files (created on first write)
+        snapshot_every: Records after which the session is snapshotted and its file compacted
+        batch_size: Queued changes written per batch at most
+        flush_interval_seconds: Longest a change waits before it is written
+        max_queue: Changes buffered before new ones are dropped (the session is then snapshotted)
+        retention_seconds: Journals not written for this long are deleted
+        sweep_interval_seconds: Minimum time between retention sweeps
+    """
+
+    def __init__(self, directory: str, snapshot_every: int = 50, batch_size: int = 200,
+                 flush_interval_seconds: float = 0.5, max_queue: int = 20000,
+                 retention_seconds: float = 7 * 24 * 3600, sweep_interval_seconds: float = 3600.0):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retention_seconds = retention_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+
+        # (session_id, [(is_snapshot, NDJSON line), ...]) of one save each
+        self._queue: "queue.Queue[Tuple[str, List[Tuple[bool, str]]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        # Queued changes per session; recovery waits until a session has none
+        self._pending: Dict[str, int] = {}
+        self._pending_changed = threading.Condition()
+        self._last_sweep = time.monotonic()
+        self._counters = {"records": 0, "snapshots": 0, "recovered": 0, "dropped": 0, "write_errors": 0}
+        atexit.register(self.flush)
+
+    # === Recording ===
+
+    def record(self, session) -> int:
+        """
+        Queue the changes of a session since it was last journaled
+
+        Args:
+            session: The SessionData to journal
+
+        Returns:
+            Number of records queued
+        """
+        data = session.model_dump(mode="json", exclude={"messages"})
+        messages = session.messages
+        fields = {field: _digest(value) for field, value in data.items()}
+        mark: Optional[JournalMark] = session._journal_mark
+
+        if mark is None or mark.records >= self.snapshot_every or not _messages_appended(mark, messages):
+            # Unknown baseline (new, reloaded or dropped), due for compaction, or history rewritten
+            records = [{"op": "snapshot", "session": {**data, "messages": messages}}]
+            journaled = 0
+        else:
+            records = [{"op": "message", "message": message} for message in messages[mark.messages:]]
+            changed = {field: data[field] for field, digest in fields.items() if mark.fields.get(field) != digest}
+            if changed:
+                records.append({"op": "set", "fields": changed})
+            journaled = mark.records
+        if not records:
+            return 0
+
+        # Serialized now: the request keeps mutating the session after this returns
+        now = round(time.time(), 3)
+        lines = [(record["op"] == "snapshot", _line({**record, "ts": now})) for record in records]
+        if not self._enqueue(session.session_id, lines):
+            session._journal_mark = None
+            return 0
+        session._journal_mark = JournalMark(
+            fields, len(messages), _digest(messages[-1]) if messages else b"", journaled + len(records)
+        )
+        return len(records)
+
+    def _enqueue(self, session_id: str, lines: List[Tuple[bool, str]]) -> bool:
+        self._ensure_thread()
+        with self._pending_changed:
+            try:
+                self._queue.put_nowait((session_id, lines))
+            except queue.Full:
+                self._counters["dropped"] += len(lines)
+                return False
+            self._pending[session_id] = self._pending.get(session_id, 0) + 1
+        return True
+
+    # === Recovery ===
+
+    def recover(self, session_id: str):
+        """
+        Rebuild a session from its journal
+
+        Returns:
+            The SessionData, or None if the session has no (readable) journal
+        """
+        from core.session import SessionData
+
+        path = self._path(session_id)
+        self._wait_for_pending(session_id)
+        if not os.path.exists(path):
+            return None
+
+        state: Optional[Dict[str, Any]] = None
+        records = 0
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            complete, _, torn = content.rpartition(b"\n")
+            if torn:
+                # Torn write at the end of the file (crash while writing): cut it off so
+                # the next record does not get appended to the partial line
+                with open(path, "r+b") as file:
+                    file.truncate(len(complete) + 1 if complete else 0)
+            for line in complete.split(b"\n") if complete else []:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                operation = record.get("op")
+                if operation == "snapshot":
+                    state, records = dict(record["session"]), 0
+                elif state is None:
+                    continue
+                elif operation == "message":
+                    state.setdefault("messages", []).append(record["message"])
+                elif operation == "set":
+                    state.update(record["fields"])
+                records += 1
+            if state is None or state.get("session_id") != session_id:
+                return None
+            session = SessionData.model_validate(state)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error recovering session {session_id} from its journal: {str(e)}")
+            return None
+
+        # Continue the journal from here instead of snapshotting again
+        data = session.model_dump(mode="json", exclude={"messages"})
+        session._journal_mark = JournalMark(
+            {field: _digest(value) for field, value in data.items()},
+            len(session.messages),
+            _digest(session.messages[-1]) if session.messages else b"",
+            records
+        )
+        self._counters["recovered"] += 1
+        return session
+
+    def _wait_for_pending(self, session_id: str, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        with self._pending_changed:
+            while self._pending.get(session_id):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._pending_changed.wait(remaining)
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session's journal"""
+        self._wait_for_pending(session_id)
+        path = self._path(session_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every queued change is written (also run at interpreter exit)"""
+        deadline = time.monotonic() + timeout
+        with self._pending_changed:
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._pending_changed.wait(remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue size and write/recovery counters"""
+        return {"directory": self.directory, "queued": self._queue.qsize(), **self._counters}
+
+    # === Writer ===
+
+    def _path(self, session_id: str) -> str:
+        # Session ids come from clients; never use them as file names directly
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.journal")
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._pending_changed:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            self._sweep()
+
+    def _write(self, batch: List[Tuple[str, List[Tuple[bool, str]]]]) -> None:
+        # Group by session, keeping the order of each session's changes
+        by_session: Dict[str, List[Tuple[bool, str]]] = {}
+        for session_id, lines in batch:
+            by_session.setdefault(session_id, []).extend(lines)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating session journal directory {self.directory}: {str(e)}")
+
+        for session_id, lines in by_session.items():
+            path = self._path(session_id)
+            snapshots = [index for index, (is_snapshot, _) in enumerate(lines) if is_snapshot]
+            try:
+                if snapshots:
+                    # Compact: the file restarts from the latest snapshot
+                    lines = lines[snapshots[-1]:]
+                    temp_path = f"{path}.tmp"
+                    with open(temp_path, "w", encoding="utf-8") as file:
+                        file.write("".join(line for _, line in lines))
+                    os.replace(temp_path, path)
+                    self._counters["snapshots"] += 1
+                else:
+                    with open(path, "a", encoding="utf-8") as file:
+                        file.write("".join(line for _, line in lines))
+                self._counters["records"] += len(lines)
+            except OSError as e:
+                print(f"Error writing journal of session {session_id}: {str(e)}")
+                self._counters["write_errors"] += 1
+
+        with self._pending_changed:
+            for session_id, _ in batch:
+                remaining = self._pending.get(session_id, 0) - 1
+                if remaining > 0:
+                    self._pending[session_id] = remaining
+                else:
+                    self._pending.pop(session_id, None)
+            self._pending_changed.notify_all()
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        if now - self._last_sweep < self.sweep_interval_seconds or not os.path.isdir(self.directory):
+            return
+        self._last_sweep = now
+        cutoff = time.time() - self.retention_seconds
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".journal") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+        except OSError as e:
+            print(f"Error cleaning session journals: {str(e)}")
+
+
+def _digest(value: Any) -> bytes:
+    return hashlib.blake2b(
+        json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"), digest_size=8
+    ).digest()
+
+
+def _messages_appended(mark: JournalMark, messages: List[Dict[str, Any]]) -> bool:
+    """Whether messages only grew since the mark (the last journaled message is unchanged)"""
+    if len(messages) < mark.messages:
+        return False
+    return mark.messages == 0 or _digest(messages[mark.messages - 1]) == mark.last_message
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, default=str) + "\n"
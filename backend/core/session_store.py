@@ -0,0 +1,507 @@
+"""
+Bounded in-memory storage for chat sessions
+
+Sessions keep their full message history and the selected players with
+complete profiles, so an unbounded dict grows until the worker is killed.
+SessionStore keeps them in LRU order and bounds them by:
+- number of resident sessions
+- approximate resident bytes (size of the serialized session)
+- idle time since the last access
+
+Sessions are kept in tiers:
+- hot: SessionData objects, for sessions used recently
+- cold: sessions idle for `cold_after_seconds`, or pushed out of the hot tier
+  by the limits, are serialized and compressed in memory (zstd when the
+  zstandard package is installed, zlib otherwise). Chat histories are long,
+  repetitive text in a handful of languages and compress several times over.
+- disk: cold sessions past the idle TTL or the cold tier's byte limit can
+  optionally be spilled to disk as JSON
+
+get() transparently brings cold and spilled sessions back. Sessions checked
+out by a request or background job (see checkout) are never evicted: the
+holder mutates the object in place, and a copy thawed by the next get() would
+lose those updates. Of the rest, sessions used in the last few seconds are
+only evicted when nothing else can go.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from services.telemetry import Histogram
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Format prefixes of compressed sessions
+ZSTD_FORMAT = b"S"
+ZLIB_FORMAT = b"Z"
+
+# Histogram bucket upper bounds for rehydrating a cold session, in seconds
+REHYDRATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+def compress_session_data(data: bytes) -> bytes:
+    """Compress a serialized session (zstd if available, zlib otherwise)"""
+    if zstandard is not None:
+        return ZSTD_FORMAT + zstandard.ZstdCompressor(level=3).compress(data)
+    return ZLIB_FORMAT + zlib.compress(data, 6)
+
+
+def decompress_session_data(blob: bytes) -> bytes:
+    """
+    Restore data compressed by compress_session_data
+
+    Raises:
+        ValueError: If the format is unknown, or zstd is needed but not installed
+    """
+    prefix, payload = blob[:1], blob[1:]
+    if prefix == ZLIB_FORMAT:
+        return zlib.decompress(payload)
+    if prefix == ZSTD_FORMAT:
+        if zstandard is None:
+            raise ValueError("Session was compressed with zstd, which is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unknown compression format {prefix!r}")
+
+
+class _ColdSession:
+    """A compressed session with its size before compression and its private (non-serialized) state"""
+
+    __slots__ = ("blob", "raw_size", "private", "last_access")
+
+    def __init__(self, blob: bytes, raw_size: int, private: Optional[Dict[str, Any]], last_access: float):
+        self.blob = blob
+        self.raw_size = raw_size
+        self.private = private
+        self.last_access = last_access
+
+
+class SessionStore:
+    """
+    Thread-safe LRU store of SessionData with size, count and idle limits
+
+    Args:
+        max_sessions: Maximum hot (resident) sessions
+        max_bytes: Maximum approximate hot size in bytes
+        idle_ttl_seconds: Sessions idle for longer are evicted from memory (cold tier included)
+        active_grace_seconds: Sessions accessed more recently are evicted last
+        spill_dir: Directory evicted sessions are written to (None disables spilling)
+        spill_ttl_seconds: Spilled sessions older than this are deleted
+        sweep_interval_seconds: Minimum time between idle/spill sweeps
+        cold_after_seconds: Hot sessions idle for longer are compressed into the cold tier
+            (None disables the cold tier: sessions leave memory directly)
+        max_cold_bytes: Maximum compressed size of the cold tier in bytes
+    """
+
+    def __init__(self, max_sessions: int = 1000, max_bytes: int = 256 * 1024 * 1024,
+                 idle_ttl_seconds: float = 3600.0, active_grace_seconds: float = 120.0,
+                 spill_dir: Optional[str] = None, spill_ttl_seconds: float = 7 * 24 * 3600,
+                 sweep_interval_seconds: float = 30.0, cold_after_seconds: Optional[float] = 900.0,
+                 max_cold_bytes: int = 64 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.active_grace_seconds = active_grace_seconds
+        self.spill_dir = spill_dir
+        self.spill_ttl_seconds = spill_ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.cold_after_seconds = cold_after_seconds
+        self.max_cold_bytes = max_cold_bytes
+
+        self._lock = threading.RLock()
+        # session_id -> session, least recently used first
+        self._sessions: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._last_access: Dict[str, float] = {}
+        # session_id -> number of holders; checked-out sessions stay hot
+        self._checked_out: Dict[str, int] = {}
+        # Sessions handed out since they were last measured; callers mutate them in place,
+        # so a session's size may lag by the changes of the request holding it
+        self._unmeasured: Set[str] = set()
+        self._resident_bytes = 0
+        # session_id -> compressed session, least recently used first
+        self._cold: "OrderedDict[str, _ColdSession]" = OrderedDict()
+        self._cold_bytes = 0
+        self._cold_raw_bytes = 0
+        self._rehydration_latency = Histogram(REHYDRATION_BUCKETS)
+        self._last_sweep = 0.0
+        self._counters = {
+            "hits": 0, "misses": 0, "reloads": 0, "spills": 0, "spill_errors": 0,
+            "evicted_lru": 0, "evicted_bytes": 0, "evicted_idle": 0, "evicted_cold_bytes": 0,
+            "frozen": 0, "rehydrations": 0, "rehydration_errors": 0
+        }
+
+    # === Access ===
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """Get a session, rehydrating it from the cold tier or the spill directory if needed"""
+        with self._lock:
+            self._maintain()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._counters["hits"] += 1
+                self._touch(session_id)
+                return session
+
+            if session_id in self._cold:
+                session = self._thaw(session_id)
+                if session is not None:
+                    self._insert(session_id, session)
+                    return session
+
+            session = self._reload(session_id)
+            if session is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["reloads"] += 1
+            self._insert(session_id, session)
+            return session
+
+    def checkout(self, session_id: str) -> None:
+        """Pin a session in the hot tier while a request or job holds it (see checkin)"""
+        with self._lock:
+            self._checked_out[session_id] = self._checked_out.get(session_id, 0) + 1
+
+    def checkin(self, session_id: str) -> None:
+        """Release a pin taken by checkout"""
+        with self._lock:
+            holders = self._checked_out.get(session_id, 0) - 1
+            if holders > 0:
+                self._checked_out[session_id] = holders
+            else:
+                self._checked_out.pop(session_id, None)
+
+    def put(self, session_id: str, session: Any) -> None:
+        """Add or replace a session"""
+        with self._lock:
+            self._maintain()
+            if session_id in self._sessions:
+                self._forget(session_id)
+            self._forget_cold(session_id)
+            self._insert(session_id, session)
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session from memory and from the spill directory"""
+        with self._lock:
+            found = session_id in self._sessions or session_id in self._cold
+            if session_id in self._sessions:
+                self._forget(session_id)
+            self._forget_cold(session_id)
+            path = self._spill_path(session_id)
+            if path and os.path.exists(path):
+                os.remove(path)
+                found = True
+            return found
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._sessions or session_id in self._cold:
+                return True
+            path = self._spill_path(session_id)
+            return bool(path and os.path.exists(path))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def session_ids(self) -> List[str]:
+        """Ids of the hot sessions, least recently used first"""
+        with self._lock:
+            return list(self._sessions)
+
+    # === Metrics ===
+
+    def stats(self) -> Dict[str, Any]:
+        """Hot and cold counts and sizes, limits, compression and eviction counters"""
+        with self._lock:
+            self._measure()
+            latency = self._rehydration_latency
+            return {
+                "resident_sessions": len(self._sessions),
+                "resident_bytes": self._resident_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "cold_sessions": len(self._cold),
+                "cold_bytes": self._cold_bytes,
+                "cold_raw_bytes": self._cold_raw_bytes,
+                "max_cold_bytes": self.max_cold_bytes,
+                "compression": "zstd" if zstandard is not None else "zlib",
+                "compression_ratio": round(self._cold_raw_bytes / self._cold_bytes, 2) if self._cold_bytes else 0.0,
+                "rehydration_avg_ms": round(latency.sum / latency.count * 1000, 3) if latency.count else 0.0,
+                "spill_enabled": bool(self.spill_dir),
+                **self._counters
+            }
+
+    def render_prometheus(self) -> str:
+        """Export the store's gauges and counters in the Prometheus text format"""
+        stats = self.stats()
+        lines = [
+            "# HELP katena_sessions_resident Sessions held in memory",
+            "# TYPE katena_sessions_resident gauge",
+            f"katena_sessions_resident {stats['resident_sessions']}",
+            "# HELP katena_sessions_resident_bytes Approximate size of the sessions held in memory",
+            "# TYPE katena_sessions_resident_bytes gauge",
+            f"katena_sessions_resident_bytes {stats['resident_bytes']}",
+            "# HELP katena_sessions_evicted_total Sessions evicted from memory by reason",
+            "# TYPE katena_sessions_evicted_total counter"
+        ]
+        for reason in ("lru", "bytes", "idle"):
+            lines.append(f'katena_sessions_evicted_total{{reason="{reason}"}} {stats["evicted_" + reason]}')
+        lines += [
+            "# HELP katena_sessions_spilled_total Evicted sessions written to disk",
+            "# TYPE katena_sessions_spilled_total counter",
+            f"katena_sessions_spilled_total {stats['spills']}",
+            "# HELP katena_sessions_reloaded_total Sessions reloaded from disk",
+            "# TYPE katena_sessions_reloaded_total counter",
+            f"katena_sessions_reloaded_total {stats['reloads']}",
+            "# HELP katena_sessions_cold Sessions held compressed in memory",
+            "# TYPE katena_sessions_cold gauge",
+            f"katena_sessions_cold {stats['cold_sessions']}",
+            "# HELP katena_sessions_cold_bytes Compressed size of the cold sessions",
+            "# TYPE katena_sessions_cold_bytes gauge",
+            f"katena_sessions_cold_bytes {stats['cold_bytes']}",
+            "# HELP katena_sessions_cold_raw_bytes Uncompressed size of the cold sessions",
+            "# TYPE katena_sessions_cold_raw_bytes gauge",
+            f"katena_sessions_cold_raw_bytes {stats['cold_raw_bytes']}",
+            "# HELP katena_sessions_frozen_total Sessions compressed into the cold tier",
+            "# TYPE katena_sessions_frozen_total counter",
+            f"katena_sessions_frozen_total {stats['frozen']}",
+            "# HELP katena_sessions_rehydration_seconds Time to restore a cold session",
+            "# TYPE katena_sessions_rehydration_seconds histogram"
+        ]
+        with self._lock:
+            latency = self._rehydration_latency
+            lines += [
+                f'katena_sessions_rehydration_seconds_bucket{{le="{bound}"}} {count}'
+                for bound, count in latency.cumulative()
+            ]
+            lines += [
+                f"katena_sessions_rehydration_seconds_sum {latency.sum:.6f}",
+                f"katena_sessions_rehydration_seconds_count {latency.count}"
+            ]
+        return "\n".join(lines) + "\n"
+
+    # === Internals (called with the lock held) ===
+
+    def _insert(self, session_id: str, session: Any) -> None:
+        self._sessions[session_id] = session
+        self._sizes[session_id] = 0
+        self._touch(session_id)
+        self._enforce_limits()
+        # Measured above, but the caller is about to mutate it
+        self._unmeasured.add(session_id)
+
+    def _touch(self, session_id: str) -> None:
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+        self._unmeasured.add(session_id)
+
+    def _forget(self, session_id: str) -> Any:
+        session = self._sessions.pop(session_id)
+        self._resident_bytes -= self._sizes.pop(session_id, 0)
+        self._last_access.pop(session_id, None)
+        self._unmeasured.discard(session_id)
+        return session
+
+    def _measure(self) -> None:
+        """Re-measure the sessions handed out since their last measurement"""
+        for session_id in self._unmeasured:
+            session = self._sessions.get(session_id)
+            if session is None:
+                continue
+            size = _session_size(session)
+            self._resident_bytes += size - self._sizes.get(session_id, 0)
+            self._sizes[session_id] = size
+        self._unmeasured.clear()
+
+    def _maintain(self) -> None:
+        self._measure()
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval_seconds:
+            self._last_sweep = now
+            self._sweep_idle(now)
+            self._sweep_spilled()
+        self._enforce_limits()
+
+    def _sweep_idle(self, now: float) -> None:
+        if self.cold_after_seconds is not None:
+            idle = [
+                session_id for session_id, accessed in self._last_access.items()
+                if now - accessed > self.cold_after_seconds and session_id not in self._checked_out
+            ]
+            for session_id in idle:
+                self._freeze(session_id, self._forget(session_id))
+            expired = [
+                session_id for session_id, cold in self._cold.items()
+                if now - cold.last_access > self.idle_ttl_seconds
+            ]
+            for session_id in expired:
+                self._evict_cold(session_id, "idle")
+            return
+
+        expired = [
+            session_id for session_id, accessed in self._last_access.items()
+            if now - accessed > self.idle_ttl_seconds and session_id not in self._checked_out
+        ]
+        for session_id in expired:
+            self._evict(session_id, "idle")
+
+    def _enforce_limits(self) -> None:
+        self._measure()
+        now = time.monotonic()
+        while len(self._sessions) > self.max_sessions or (
+            self._resident_bytes > self.max_bytes and len(self._sessions) > 1
+        ):
+            candidate = self._eviction_candidate(now)
+            if candidate is None:
+                # Every other session is checked out; the limits are exceeded until one is released
+                break
+            self._evict(candidate, "lru" if len(self._sessions) > self.max_sessions else "bytes")
+
+    def _eviction_candidate(self, now: float) -> Optional[str]:
+        """
+        Least recently used session that is not checked out, preferring ones outside
+        the active grace period; never the newest session. None if nothing can go.
+        """
+        newest = next(reversed(self._sessions))
+        available = [
+            session_id for session_id in self._sessions
+            if session_id != newest and session_id not in self._checked_out
+        ]
+        for session_id in available:
+            if now - self._last_access.get(session_id, 0.0) > self.active_grace_seconds:
+                return session_id
+        # Everything else was used recently; fall back to plain LRU
+        return available[0] if available else None
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        """Take a session out of the hot tier: into the cold tier if enabled, otherwise out of memory"""
+        session = self._forget(session_id)
+        self._counters[f"evicted_{reason}"] += 1
+        if self.cold_after_seconds is not None:
+            self._freeze(session_id, session)
+        else:
+            self._spill(session_id, session.model_dump_json().encode("utf-8"))
+
+    # === Cold tier ===
+
+    def _freeze(self, session_id: str, session: Any) -> None:
+        """Compress a session (already taken out of the hot tier) into the cold tier"""
+        try:
+            data = session.model_dump_json().encode("utf-8")
+        except Exception as e:
+            print(f"Error serializing session {session_id} for the cold tier: {str(e)}")
+            return
+        blob = compress_session_data(data)
+        # Keep bookkeeping such as the shared backend version, which serialization drops
+        private = dict(session.__pydantic_private__) if getattr(session, "__pydantic_private__", None) else None
+        self._cold[session_id] = _ColdSession(blob, len(data), private, time.monotonic())
+        self._cold_bytes += len(blob)
+        self._cold_raw_bytes += len(data)
+        self._counters["frozen"] += 1
+
+        while self._cold_bytes > self.max_cold_bytes and len(self._cold) > 1:
+            self._evict_cold(next(iter(self._cold)), "cold_bytes")
+
+    def _thaw(self, session_id: str) -> Optional[Any]:
+        """Take a session out of the cold tier and restore it"""
+        from core.session import SessionData
+
+        started = time.perf_counter()
+        cold = self._forget_cold(session_id)
+        try:
+            session = SessionData.model_validate_json(decompress_session_data(cold.blob))
+        except ValueError as e:
+            print(f"Error rehydrating session {session_id}: {str(e)}")
+            self._counters["rehydration_errors"] += 1
+            return None
+        if cold.private:
+            session.__pydantic_private__.update(cold.private)
+        self._rehydration_latency.observe(time.perf_counter() - started)
+        self._counters["rehydrations"] += 1
+        return session
+
+    def _forget_cold(self, session_id: str) -> Optional[_ColdSession]:
+        cold = self._cold.pop(session_id, None)
+        if cold is not None:
+            self._cold_bytes -= len(cold.blob)
+            self._cold_raw_bytes -= cold.raw_size
+        return cold
+
+    def _evict_cold(self, session_id: str, reason: str) -> None:
+        """Take a session out of memory altogether (to the spill directory if enabled)"""
+        cold = self._forget_cold(session_id)
+        self._counters[f"evicted_{reason}"] += 1
+        if self.spill_dir:
+            try:
+                self._spill(session_id, decompress_session_data(cold.blob))
+            except (ValueError, zlib.error) as e:
+                print(f"Error spilling session {session_id}: {str(e)}")
+                self._counters["spill_errors"] += 1
+
+    # === Spill directory ===
+
+    def _spill_path(self, session_id: str) -> Optional[str]:
+        if not self.spill_dir:
+            return None
+        # Session ids come from clients; never use them as file names directly
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.spill_dir, f"{digest}.json")
+
+    def _spill(self, session_id: str, data: bytes) -> None:
+        """Write a serialized (JSON) session to the spill directory"""
+        path = self._spill_path(session_id)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+            self._counters["spills"] += 1
+        except (OSError, ValueError) as e:
+            print(f"Error spilling session {session_id}: {str(e)}")
+            self._counters["spill_errors"] += 1
+
+    def _reload(self, session_id: str) -> Optional[Any]:
+        path = self._spill_path(session_id)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            from core.session import SessionData
+            with open(path, "r", encoding="utf-8") as file:
+                session = SessionData.model_validate_json(file.read())
+            os.remove(path)
+        except (OSError, ValueError) as e:
+            print(f"Error reloading session {session_id}: {str(e)}")
+            return None
+        if session.session_id != session_id:
+            return None
+        return session
+
+    def _sweep_spilled(self) -> None:
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return
+        cutoff = time.time() - self.spill_ttl_seconds
+        try:
+            for entry in os.scandir(self.spill_dir):
+                if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+        except OSError as e:
+            print(f"Error cleaning spilled sessions: {str(e)}")
+
+
+def _session_size(session: Any) -> int:
+    """Approximate memory footprint of a session: the size of its JSON form"""
+    try:
+        return len(session.model_dump_json())
+    except Exception:
+        return 0
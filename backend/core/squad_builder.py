@@ -0,0 +1,237 @@
+"""
+Formation squad builder for KatenaScout
+
+Fills the eleven slots of a formation (see FORMATIONS) from a candidate pool
+so that the total tactical fit is as high as possible:
+
+- A player's fit for a slot is their style score from the tactical ranking
+  engine times how well they suit the slot's position: their primary
+  position, a secondary one, or a related code ("lcb" for a "cb" slot).
+- Each slot keeps only its top-k candidates. With k at least the number of
+  slots this cannot change the result: a slot's best choice outside its top
+  k could always be swapped for one of its top k no other slot took.
+- The pruned slots x candidates cost matrix is solved with the Hungarian
+  algorithm, so no player is used twice.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import POSITIONS_MAPPING, POSITION_ALIASES
+from core.tactical_analysis import FORMATIONS
+
+# Position suitability: the slot's own code, or a related code, as primary or secondary position
+PRIMARY_POSITION = 1.0
+SECONDARY_POSITION = 0.9
+RELATED_PRIMARY_POSITION = 0.85
+RELATED_SECONDARY_POSITION = 0.75
+
+# Cost of a slot/candidate pair that is not allowed (player cannot play the position)
+_UNSUITABLE = 1e6
+
+
+def related_positions(slot: str) -> List[str]:
+    """Position codes close enough to play a formation slot ("cb" -> "lcb", "rcb")"""
+    codes = set(POSITION_ALIASES.get(slot, []))
+    for group in POSITIONS_MAPPING.values():
+        if slot in group:
+            codes.update(group)
+    codes.discard(slot)
+    return sorted(codes)
+
+
+def hungarian(cost: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Minimum-cost assignment of every row to a distinct column
+
+    Shortest augmenting path version of the Hungarian algorithm, O(rows^2 x columns).
+
+    Args:
+        cost: Rows x columns cost matrix with rows <= columns
+
+    Returns:
+        (row, column) pairs, one per row
+    """
+    rows, columns = cost.shape
+    if rows > columns:
+        raise ValueError("The cost matrix needs at least as many columns as rows")
+
+    # 1-based potentials and matching as in the textbook formulation; column 0 is a sentinel
+    u = np.zeros(rows + 1)
+    v = np.zeros(columns + 1)
+    match = np.zeros(columns + 1, dtype=int)  # match[j]: row assigned to column j (0 = none)
+    way = np.zeros(columns + 1, dtype=int)
+
+    for row in range(1, rows + 1):
+        match[0] = row
+        current = 0
+        min_slack = np.full(columns + 1, np.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+        while True:
+            used[current] = True
+            assigned_row = match[current]
+            free = ~used[1:]
+            slack = cost[assigned_row - 1] - u[assigned_row] - v[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = current
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            u[match[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+
+            current = next_column
+            if match[current] == 0:
+                break
+
+        # Flip the augmenting path
+        while current:
+            previous = way[current]
+            match[current] = match[previous]
+            current = previous
+
+    return sorted((int(match[column]) - 1, column - 1) for column in range(1, columns + 1) if match[column])
+
+
+def resolve_team_id(club: Any) -> Optional[str]:
+    """Team id for a club id or name (accents and case ignored), None if unknown"""
+    from services.data_service import get_team_names
+    from services.nlp_service import normalize_text
+
+    teams = get_team_names()
+    if str(club) in teams or str(club).isdigit():
+        return str(club)
+    wanted = normalize_text(str(club))
+    if not wanted:
+        return None
+    names = {team_id: normalize_text(team.get("name", "")) for team_id, team in teams.items()}
+    exact = [team_id for team_id, name in names.items() if name == wanted]
+    if exact:
+        return exact[0]
+    partial = sorted((len(name), team_id) for team_id, name in names.items() if wanted in name)
+    return partial[0][1] if partial else None
+
+
+def select_pool(engine, player_ids: Optional[Sequence[str]] = None, team_id: Optional[str] = None,
+                min_age: Optional[int] = None, max_age: Optional[int] = None,
+                contract_expiration: Optional[str] = None) -> np.ndarray:
+    """
+    Engine rows of the candidate pool
+
+    Args:
+        engine: The TacticalRankingEngine
+        player_ids: Only these players (a shortlist)
+        team_id: Only players of this club
+        min_age: Minimum age
+        max_age: Maximum age
+        contract_expiration: Only contracts ending on or before this date (YYYY-MM-DD)
+
+    Returns:
+        Row indices into the engine's matrices
+    """
+    if player_ids:
+        rows = np.array(sorted({engine.row_by_id[str(i)] for i in player_ids if str(i) in engine.row_by_id}), dtype=int)
+    else:
+        rows = np.arange(len(engine.player_ids))
+
+    keep = np.ones(len(rows), dtype=bool)
+    for index, row in enumerate(rows):
+        age = engine.players[row].get("age")
+        if team_id is not None and engine.team_ids[row] != str(team_id):
+            keep[index] = False
+        elif (min_age is not None or max_age is not None) and not isinstance(age, (int, float)):
+            keep[index] = False
+        elif min_age is not None and age < min_age:
+            keep[index] = False
+        elif max_age is not None and age > max_age:
+            keep[index] = False
+        elif contract_expiration and not (engine.contracts[row] and engine.contracts[row] <= contract_expiration):
+            keep[index] = False
+    return rows[keep]
+
+
+def build_squad(engine, style: str, formation: str, pool: np.ndarray, top_k: int = 15,
+                min_coverage: float = 0.5) -> Dict[str, Any]:
+    """
+    Assign pool players to the formation's slots maximising total tactical fit
+
+    Args:
+        engine: The TacticalRankingEngine
+        style: Style key (see TACTICAL_STYLES)
+        formation: Formation (see FORMATIONS)
+        pool: Engine rows of the candidate pool (see select_pool)
+        top_k: Candidates kept per slot before the assignment
+        min_coverage: Share of the style's weight a player needs data for
+
+    Returns:
+        The squad (one entry per slot, "player" None when nobody in the pool can
+        play it), total and average fit, and pool and candidate counts
+    """
+    slots = FORMATIONS[formation]
+    style_column = engine.styles.index(style)
+    pool = pool[engine.coverage[pool, style_column] >= min_coverage]
+    style_scores = engine.fit[pool, style_column]
+
+    code_index = {code: index for index, code in enumerate(engine.position_codes)}
+    primary = engine.primary_positions[pool]
+    plays = engine.position_matrix[pool]
+
+    # Slots x pool fit (0 where the player cannot play the slot)
+    fit = np.zeros((len(slots), len(pool)))
+    for slot_index, slot in enumerate(slots):
+        suitability = np.zeros(len(pool))
+        for code in related_positions(slot):
+            if code in code_index:
+                suitability = np.maximum(suitability, np.where(plays[:, code_index[code]], RELATED_SECONDARY_POSITION, 0.0))
+            suitability = np.maximum(suitability, np.where(primary == code, RELATED_PRIMARY_POSITION, 0.0))
+        if slot in code_index:
+            suitability = np.maximum(suitability, np.where(plays[:, code_index[slot]], SECONDARY_POSITION, 0.0))
+        suitability = np.maximum(suitability, np.where(primary == slot, PRIMARY_POSITION, 0.0))
+        fit[slot_index] = style_scores * suitability
+
+    # Top-k eligible candidates per slot
+    kept = set()
+    for slot_index in range(len(slots)):
+        eligible = np.flatnonzero(fit[slot_index] > 0)
+        if eligible.size > top_k:
+            eligible = eligible[np.argpartition(-fit[slot_index, eligible], top_k - 1)[:top_k]]
+        kept.update(eligible.tolist())
+    candidates = np.array(sorted(kept), dtype=int)
+
+    squad: List[Dict[str, Any]] = [
+        {"slot": slot, "slot_index": slot_index, "player": None, "style_score": None,
+         "position_suitability": None, "fit": None}
+        for slot_index, slot in enumerate(slots)
+    ]
+    if candidates.size:
+        candidate_fit = fit[:, candidates]
+        cost = np.where(candidate_fit > 0, -candidate_fit, _UNSUITABLE)
+        if candidates.size < len(slots):
+            # Dummy columns leave slots empty when there are fewer candidates than slots
+            cost = np.hstack([cost, np.full((len(slots), len(slots) - candidates.size), _UNSUITABLE)])
+        for slot_index, column in hungarian(cost):
+            if column >= candidates.size or cost[slot_index, column] >= _UNSUITABLE:
+                continue
+            row = pool[candidates[column]]
+            score = float(engine.fit[row, style_column])
+            squad[slot_index].update({
+                "player": engine.players[row],
+                "style_score": round(score, 1),
+                "position_suitability": round(float(candidate_fit[slot_index, column]) / score, 2) if score else 0.0,
+                "fit": round(float(candidate_fit[slot_index, column]), 1)
+            })
+
+    filled = [entry["fit"] for entry in squad if entry["player"] is not None]
+    return {
+        "squad": squad,
+        "total_fit": round(sum(filled), 1),
+        "average_fit": round(sum(filled) / len(filled), 1) if filled else 0.0,
+        "unfilled_slots": [entry["slot"] for entry in squad if entry["player"] is None],
+        "pool_size": int(len(pool)),
+        "candidates_considered": int(candidates.size)
+    }
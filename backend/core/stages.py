@@ -0,0 +1,179 @@
+"""
+Stage scheduling for request handlers
+
+Handlers declare the steps of a request as named stages with their
+dependencies; the scheduler runs every stage as soon as its dependencies are
+done, so CPU-local work (follow-up suggestions, comparison metrics, image
+info) overlaps with the outbound Claude call instead of running before or
+after it.
+
+- The first ready stage of each round runs in the calling thread; the others
+  run on a shared thread pool. Declare the Claude call first so it starts at
+  once and the pool only gets the local work.
+- Stages see the caller's context variables, so stage timings still end up
+  in the request's Server-Timing header.
+- A stage that was queued but not yet started when the caller runs out of
+  work is taken back and run inline, so nested schedulers cannot deadlock on
+  a saturated pool.
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from config import STAGE_WORKERS
+from utils.timing import stage
+
+# Shared pool, created on first use
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_stage_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool that runs stages"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="stage")
+    return _executor
+
+
+def run_in_background(name: str, fn: Callable[[], Any]) -> Future:
+    """
+    Start a single timed stage on the stage pool
+
+    For flows that cannot block on a scheduler, e.g. a streamed response that
+    yields the narrative while the suggestions are computed.
+
+    Returns:
+        Future with the stage result
+    """
+    context = copy_context()
+    return get_stage_executor().submit(context.run, _timed, name, fn, ())
+
+
+def _timed(name: str, fn: Callable[..., Any], args: Sequence[Any]) -> Any:
+    with stage(name):
+        return fn(*args)
+
+
+class _Stage:
+    def __init__(self, name: str, fn: Callable[..., Any], after: Sequence[str],
+                 on_error: Optional[Callable[[Exception], Any]]):
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+        self.on_error = on_error
+
+
+class StageScheduler:
+    """
+    Run a small dependency graph of request stages concurrently
+
+    Example:
+        scheduler = StageScheduler()
+        scheduler.add("narrative", lambda: call_claude(...))
+        scheduler.add("suggestions", lambda: suggest(players))
+        scheduler.add("response", lambda text, tips: {...}, after=("narrative", "suggestions"))
+        results = scheduler.run()
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, _Stage] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], after: Sequence[str] = (),
+            on_error: Optional[Callable[[Exception], Any]] = None) -> "StageScheduler":
+        """
+        Declare a stage
+
+        Args:
+            name: Stage name, also used for its Server-Timing entry
+            fn: Called with the results of the `after` stages, in that order
+            after: Names of stages that must finish first (declared before this one)
+            on_error: Called with the exception if fn raises; its return value becomes
+                the stage result. Without it the exception is raised from run().
+
+        Returns:
+            The scheduler, for chaining
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already declared")
+        missing = [dependency for dependency in after if dependency not in self._stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undeclared stages {missing}")
+        self._stages[name] = _Stage(name, fn, after, on_error)
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run all stages, each as soon as its dependencies are done
+
+        Returns:
+            Mapping of stage name to result
+
+        Raises:
+            The first exception of a stage without on_error, once no stage is running
+        """
+        results: Dict[str, Any] = {}
+        pending: List[_Stage] = list(self._stages.values())
+        running: Dict[Future, _Stage] = {}
+        errors: List[Exception] = []
+
+        while pending or running:
+            ready = [] if errors else [
+                item for item in pending
+                if all(dependency in results for dependency in item.after)
+            ]
+            for item in ready:
+                pending.remove(item)
+
+            # Everything but the first ready stage goes to the pool
+            for item in ready[1:]:
+                running[get_stage_executor().submit(copy_context().run, self._execute, item, results)] = item
+            if ready:
+                self._finish(ready[0], self._execute(ready[0], results), results, errors)
+
+            # Take back queued stages the pool has not started and run them here
+            for future, item in list(running.items()):
+                if future.cancel():
+                    del running[future]
+                    self._finish(item, self._execute(item, results), results, errors)
+
+            if running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish(running.pop(future), future.result(), results, errors)
+            elif errors or (pending and not ready):
+                break
+
+        if errors:
+            raise errors[0]
+        return results
+
+    @staticmethod
+    def _execute(item: _Stage, results: Dict[str, Any]) -> Any:
+        """Run a stage; returns its result or the exception it raised"""
+        try:
+            return _timed(item.name, item.fn, [results[dependency] for dependency in item.after])
+        except Exception as e:
+            if item.on_error is None:
+                return _StageError(e)
+            print(f"Stage '{item.name}' failed, using its fallback: {str(e)}")
+            return item.on_error(e)
+
+    @staticmethod
+    def _finish(item: _Stage, outcome: Any, results: Dict[str, Any], errors: List[Exception]) -> None:
+        if isinstance(outcome, _StageError):
+            print(f"Stage '{item.name}' failed: {str(outcome.error)}")
+            errors.append(outcome.error)
+        else:
+            results[item.name] = outcome
+
+
+class _StageError:
+    """Wraps the exception of a failed stage so it can travel as a result"""
+
+    def __init__(self, error: Exception):
+        self.error = error
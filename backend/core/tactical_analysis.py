@@ -608,8 +608,7 @@ Be specific and refer to the actual metric values in your analysis.
     
     # Call Claude API
     response = session_manager.call_claude_api(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=1800,
+        task="tactical",
         system=system_prompt,
         messages=[{"role": "user", "content": prompt}]
     )
@@ -0,0 +1,255 @@
+"""
+Database-wide tactical-fit rankings for KatenaScout
+
+calculate_tactical_fit scores the two players of a tactical analysis one dict
+at a time and assumes every metric is on a 0-100 scale. Answering "top 20
+players for a gegenpressing 4-3-3" needs every player scored, so the scores
+are precomputed once, when the engine is built:
+
+- Each TACTICAL_STYLES entry is compiled into a weight vector over canonical
+  metric columns (the "<category>_<metric>" names of SearchParameters).
+- Every metric is converted to a percentile among the players of the same
+  primary position, inverted for negative metrics, so per-90 counts, totals
+  and percentages become comparable.
+- The players x styles fit matrix is the weighted mean of those percentiles
+  over the metrics each player has data for; a ranking is a column of it,
+  filtered by position.
+"""
+
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.tactical_analysis import TACTICAL_STYLES, FORMATIONS, STYLE_DISPLAY_NAMES, NEGATIVE_METRICS
+
+# Style metric -> canonical database column. Metrics the database does not
+# record (None) are left out of the weight vectors.
+STYLE_METRIC_COLUMNS = {
+    "passes": "average_passes",
+    "pass_accuracy": "percent_successfulPasses",
+    "successful_passes_percent": "percent_successfulPasses",
+    "forward_passes": "average_forwardPasses",
+    "progressive_passes": "average_progressivePasses",
+    "passes_to_final_third": "average_passesToFinalThird",
+    "ball_losses": "average_ballLosses",
+    "received_pass": "average_receivedPass",
+    "progressive_runs": "average_progressiveRun",
+    "key_passes": "average_keyPasses",
+    "smart_passes": "average_smartPasses",
+    "xg_assist": "total_xgAssist",
+    "counterpressing_recoveries": "average_counterpressingRecoveries",
+    "dangerous_opponent_half_recoveries": "average_dangerousOpponentHalfRecoveries",
+    "ball_recoveries": "average_ballRecoveries",
+    "interceptions": "average_interceptions",
+    "defensive_duels_won": "percent_defensiveDuelsWon",
+    "offensive_duels_won": "percent_offensiveDuelsWon",
+    "accelerations": "average_accelerations",
+    "pressing_duels": None,
+    "pressing_duels_won": None,
+    "successful_through_passes": "percent_successfulThroughPasses",
+    "successful_smart_passes": "percent_successfulSmartPasses",
+    "shots": "average_shots",
+    "xg_shot": "total_xgShot",
+    "long_passes": "average_longPasses",
+    "successful_long_passes_percent": "percent_successfulLongPasses",
+    "aerial_duels_won": "percent_aerialDuelsWon",
+    "touch_in_box": "average_touchInBox",
+    "successful_dribbles": "percent_successfulDribbles",
+    "clearances": "total_clearances",
+    "successful_sliding_tackles": "percent_successfulSlidingTackles",
+    "successful_crosses": "percent_successfulCrosses"
+}
+
+
+def resolve_style(style: str) -> Optional[str]:
+    """Style key for a key or display name ("Gegenpressing", "gegenpressing"), None if unknown"""
+    if style in TACTICAL_STYLES:
+        return style
+    if style in STYLE_DISPLAY_NAMES:
+        return STYLE_DISPLAY_NAMES[style]
+    key = style.strip().lower().replace("-", "_").replace(" ", "_")
+    return key if key in TACTICAL_STYLES else None
+
+
+class TacticalRankingEngine:
+    """
+    Precomputed tactical fit of every player for every style
+
+    Args:
+        database_by_id: Player records by wyId (db_by_id.json)
+        min_position_players: Positions with fewer players are normalised against all players
+    """
+
+    def __init__(self, database_by_id: Mapping[str, Mapping[str, Any]], min_position_players: int = 20):
+        self.styles = list(TACTICAL_STYLES)
+        self.columns = sorted({column for column in STYLE_METRIC_COLUMNS.values() if column})
+        column_index = {column: index for index, column in enumerate(self.columns)}
+
+        # Styles x columns weights; a column used twice by a style gets both weights
+        self.weights = np.zeros((len(self.styles), len(self.columns)))
+        for row, style in enumerate(self.styles):
+            for metric, weight in TACTICAL_STYLES[style].items():
+                column = STYLE_METRIC_COLUMNS.get(metric)
+                if column:
+                    self.weights[row, column_index[column]] += weight
+
+        self.player_ids: List[str] = []
+        self.players: List[Dict[str, Any]] = []
+        # Pool filters of the squad builder
+        self.team_ids: List[str] = []
+        self.contracts: List[str] = []
+        raw = np.full((len(database_by_id), len(self.columns)), np.nan)
+        for row, (player_id, player) in enumerate(database_by_id.items()):
+            self.player_ids.append(str(player_id))
+            self.players.append({
+                "wyId": player.get("wyId", player_id),
+                "name": player.get("name", ""),
+                "age": player.get("age"),
+                "positions": [pos["position"]["code"] for pos in player.get("positions", [])]
+            })
+            self.team_ids.append(str(player.get("currentTeamId", "")))
+            contract = player.get("contractUntil") or (player.get("contract") or {}).get("contractExpiration")
+            self.contracts.append(str(contract) if contract else "")
+            for index, column in enumerate(self.columns):
+                category, metric = column.split("_", 1)
+                value = (player.get(category) or {}).get(metric)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    raw[row, index] = value
+
+        self.row_by_id = {player_id: row for row, player_id in enumerate(self.player_ids)}
+        primary_positions = [player["positions"][0] if player["positions"] else "" for player in self.players]
+        self.primary_positions = np.array(primary_positions, dtype=object)
+        self.goalkeepers = self.primary_positions == "gk"
+        self.percentiles = _position_percentiles(raw, primary_positions, min_position_players)
+        for index, column in enumerate(self.columns):
+            if column.split("_", 1)[1] in NEGATIVE_METRICS:
+                self.percentiles[:, index] = 1.0 - self.percentiles[:, index]
+
+        # Weighted mean over the metrics each player has data for
+        available = ~np.isnan(self.percentiles)
+        filled = np.where(available, self.percentiles, 0.0)
+        available_weight = available.astype(float) @ self.weights.T
+        self.fit = np.divide(
+            filled @ self.weights.T * 100.0, available_weight,
+            out=np.zeros_like(available_weight), where=available_weight > 0
+        )
+        self.coverage = available_weight / self.weights.sum(axis=1)
+
+        # Players x position codes membership
+        self.position_codes = sorted({code for player in self.players for code in player["positions"]})
+        code_index = {code: index for index, code in enumerate(self.position_codes)}
+        self.position_matrix = np.zeros((len(self.players), len(self.position_codes)), dtype=bool)
+        for row, player in enumerate(self.players):
+            for code in player["positions"]:
+                self.position_matrix[row, code_index[code]] = True
+
+    def rank(self, style: str, formation: Optional[str] = None, positions: Optional[Sequence[str]] = None,
+             limit: int = 20, min_coverage: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Best-fitting players for a style
+
+        Args:
+            style: Style key (see TACTICAL_STYLES)
+            formation: Only players who play a position of this formation (see FORMATIONS)
+            positions: Only players who play one of these position codes
+            limit: Number of players returned
+            min_coverage: Share of the style's weight a player needs data for
+
+        Returns:
+            Players ordered by style score, each with its score, coverage, position fit
+            and strongest metrics
+        """
+        column = self.styles.index(style)
+        eligible = self.coverage[:, column] >= min_coverage
+        if not positions or "gk" not in positions:
+            # The styles weigh outfield metrics; a goalkeeper's percentiles among
+            # goalkeepers would rank them above outfield players
+            eligible &= ~self.goalkeepers
+
+        formation_codes = [code for code in set(FORMATIONS.get(formation, [])) if code in self.position_codes]
+        wanted = set(positions) if positions else set(FORMATIONS[formation]) if formation else set()
+        if wanted:
+            wanted_columns = [self.position_codes.index(code) for code in wanted if code in self.position_codes]
+            eligible &= self.position_matrix[:, wanted_columns].any(axis=1)
+
+        candidates = np.flatnonzero(eligible)
+        if candidates.size == 0:
+            return []
+        scores = self.fit[candidates, column]
+        if candidates.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+
+        position_fit = None
+        if formation_codes:
+            formation_columns = [self.position_codes.index(code) for code in formation_codes]
+            counts = np.maximum(self.position_matrix[candidates].sum(axis=1), 1)
+            position_fit = self.position_matrix[candidates][:, formation_columns].sum(axis=1) / counts
+
+        rankings = []
+        for rank, index in enumerate(order, start=1):
+            row = candidates[index]
+            contributions = np.nan_to_num(self.percentiles[row]) * self.weights[column]
+            # Metrics the player has no data for are not strengths (and their NaN is not valid JSON)
+            strengths = [
+                {"metric": self.columns[metric], "percentile": round(float(self.percentiles[row, metric]) * 100, 1)}
+                for metric in np.argsort(-contributions, kind="stable")
+                if self.weights[column, metric] > 0 and not np.isnan(self.percentiles[row, metric])
+            ][:3]
+            rankings.append({
+                **self.players[row],
+                "rank": rank,
+                "style_score": round(float(self.fit[row, column]), 1),
+                "coverage": round(float(self.coverage[row, column]), 2),
+                "position_fit": round(float(position_fit[index]) * 100, 1) if position_fit is not None else None,
+                "key_strengths": strengths
+            })
+        return rankings
+
+    def stats(self) -> Dict[str, Any]:
+        """Matrix dimensions"""
+        return {"players": len(self.players), "styles": len(self.styles), "metrics": len(self.columns)}
+
+
+def _position_percentiles(raw: np.ndarray, groups: Sequence[str], min_group: int) -> np.ndarray:
+    """Mid-rank percentiles (0-1) of each column within each group; NaN stays NaN"""
+    result = np.full(raw.shape, np.nan)
+    group_rows: Dict[str, List[int]] = {}
+    for row, group in enumerate(groups):
+        group_rows.setdefault(group, []).append(row)
+
+    everyone = np.arange(raw.shape[0])
+    for rows in group_rows.values():
+        rows = np.array(rows)
+        reference = rows if len(rows) >= min_group else everyone
+        for column in range(raw.shape[1]):
+            values = raw[rows, column]
+            known = np.sort(raw[reference, column][~np.isnan(raw[reference, column])])
+            if known.size == 0:
+                continue
+            below = np.searchsorted(known, values, side="left")
+            up_to = np.searchsorted(known, values, side="right")
+            result[rows, column] = np.where(np.isnan(values), np.nan, (below + up_to) / (2.0 * known.size))
+    return result
+
+
+_engine: Optional[TacticalRankingEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_tactical_ranking_engine() -> TacticalRankingEngine:
+    """Get the process-wide ranking engine, building it from the player database on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from config import TACTICAL_RANKINGS
+                from services.data_service import get_player_database_by_id
+                _engine = TacticalRankingEngine(
+                    get_player_database_by_id(),
+                    min_position_players=TACTICAL_RANKINGS["min_position_players"]
+                )
+                print(f"Tactical ranking engine built: {_engine.stats()}")
+    return _engine
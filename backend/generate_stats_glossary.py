@@ -0,0 +1,822 @@
+"""
+Generate the stats glossary served by core.glossary
+
+The set of metrics is closed: the SearchParameters stat fields, the
+METRIC_CATEGORIES metrics and the TACTICAL_STYLES metric keys. This script
+collects them, merges spellings of the same metric into one entry with an
+alias list, and writes stats_glossary.json with an explanation per supported
+language.
+
+Explanations come from the curated seed below, which covers every known
+metric in all languages. Metrics added to the system later get an English
+placeholder built from the parameter description until Claude is asked for
+all missing explanations (skipped with --offline); the runtime glossary treats
+placeholders as missing.
+
+Usage:
+    python generate_stats_glossary.py [--offline] [output_path]
+"""
+
+import os
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import GLOSSARY_FILE, SUPPORTED_LANGUAGES, DEFAULT_MODEL
+from models.parameters import SearchParameters
+from core.enhanced_comparison import METRIC_CATEGORIES
+from core.tactical_analysis import TACTICAL_STYLES
+from core.glossary import StatsGlossary, normalize_term, strip_modifiers, GLOSSARY_SCHEMA_VERSION
+
+# Hand-written entries for the metrics scouts ask about most
+CURATED_ENTRIES = {
+    "xgShot": {
+        "name": "Expected goals (xG)",
+        "aliases": ["xG", "expected goals", "xg per shot"],
+        "explanations": {
+            "english": "Expected goals (xG) measures the quality of a shot as the probability that it results in a goal, based on factors such as distance, angle and type of assist. Summed over a season it shows how many goals a player's chances were worth, independent of finishing luck.",
+            "portuguese": "Os golos esperados (xG) medem a qualidade de um remate como a probabilidade de resultar em golo, com base em fatores como distância, ângulo e tipo de assistência. Somados ao longo da época, mostram quantos golos valiam as oportunidades de um jogador, independentemente da sorte na finalização.",
+            "spanish": "Los goles esperados (xG) miden la calidad de un disparo como la probabilidad de que termine en gol, según factores como la distancia, el ángulo y el tipo de asistencia. Sumados en una temporada muestran cuántos goles valían las ocasiones de un jugador, sin depender de la suerte en la definición.",
+            "bulgarian": "Очакваните голове (xG) измерват качеството на удара като вероятността той да завърши с гол въз основа на разстояние, ъгъл и вид на подаването. Сумирани за сезона, те показват колко гола са стрували положенията на играча, независимо от късмета при завършването."
+        }
+    },
+    "xgAssist": {
+        "name": "Expected assists (xA)",
+        "aliases": ["xA", "expected assists", "expectedAssists", "xg assist"],
+        "explanations": {
+            "english": "Expected assists (xA) is the xG value of the shots that come directly from a player's passes. It credits the quality of chances created even when the teammate does not score.",
+            "portuguese": "As assistências esperadas (xA) correspondem ao valor de xG dos remates que resultam diretamente dos passes de um jogador. Valorizam a qualidade das oportunidades criadas mesmo quando o colega não marca.",
+            "spanish": "Las asistencias esperadas (xA) son el valor de xG de los disparos que nacen directamente de los pases de un jugador. Reconocen la calidad de las ocasiones creadas aunque el compañero no marque.",
+            "bulgarian": "Очакваните асистенции (xA) са xG стойността на ударите, които следват директно от подаванията на играча. Те отчитат качеството на създадените положения, дори когато съотборникът не отбележи."
+        }
+    },
+    "progressivePasses": {
+        "name": "Progressive passes",
+        "aliases": ["progressive passing"],
+        "explanations": {
+            "english": "Progressive passes are completed passes that move the ball significantly closer to the opponent's goal (typically at least 10 metres, or into the penalty area). They show how much a player advances play rather than keeping possession.",
+            "portuguese": "Os passes progressivos são passes certos que aproximam significativamente a bola da baliza adversária (normalmente pelo menos 10 metros, ou para dentro da área). Mostram o quanto um jogador faz a equipa avançar em vez de apenas manter a posse.",
+            "spanish": "Los pases progresivos son pases completados que acercan el balón de forma significativa a la portería rival (normalmente al menos 10 metros, o hacia el área). Muestran cuánto hace avanzar un jugador el juego en lugar de solo conservar la posesión.",
+            "bulgarian": "Прогресивните подавания са точни подавания, които приближават топката значително към вратата на противника (обикновено поне 10 метра или в наказателното поле). Те показват доколко играчът придвижва играта напред, а не просто пази владеенето."
+        }
+    },
+    "progressiveRun": {
+        "name": "Progressive runs",
+        "aliases": ["progressive runs", "progressiveRuns", "progressive carries"],
+        "explanations": {
+            "english": "Progressive runs are carries in which a player moves the ball significantly towards the opponent's goal while dribbling. They identify players who break lines with the ball at their feet.",
+            "portuguese": "As conduções progressivas são ações em que o jogador leva a bola significativamente em direção à baliza adversária. Identificam jogadores que quebram linhas com a bola nos pés.",
+            "spanish": "Las conducciones progresivas son acciones en las que el jugador lleva el balón de forma significativa hacia la portería rival. Identifican a los jugadores que rompen líneas con el balón controlado.",
+            "bulgarian": "Прогресивните пробиви са движения с топката, при които играчът я придвижва значително към противниковата врата. Те открояват играчите, които пробиват линиите с топка в крака."
+        }
+    },
+    "keyPasses": {
+        "name": "Key passes",
+        "aliases": ["chances created", "shot assists"],
+        "explanations": {
+            "english": "Key passes are passes that lead directly to a teammate's shot. They measure how often a player creates chances, regardless of whether the shot is scored.",
+            "portuguese": "Os passes decisivos são passes que levam diretamente a um remate de um colega. Medem a frequência com que um jogador cria oportunidades, independentemente de o remate resultar em golo.",
+            "spanish": "Los pases clave son pases que terminan directamente en un disparo de un compañero. Miden con qué frecuencia un jugador crea ocasiones, se marque o no.",
+            "bulgarian": "Ключовите подавания са подавания, след които съотборник директно стреля. Те измерват колко често играчът създава положения, независимо дали ударът завършва с гол."
+        }
+    },
+    "smartPasses": {
+        "name": "Smart passes",
+        "aliases": [],
+        "explanations": {
+            "english": "Smart passes are creative, penetrating passes that try to break the opponent's defensive lines and put a teammate in an advantageous position. They reflect vision and risk-taking in possession.",
+            "portuguese": "Os passes inteligentes são passes criativos e de rutura que procuram ultrapassar as linhas defensivas adversárias e deixar um colega em vantagem. Refletem visão de jogo e capacidade de arriscar.",
+            "spanish": "Los pases inteligentes son pases creativos y de ruptura que buscan superar las líneas defensivas rivales y dejar a un compañero en ventaja. Reflejan visión de juego y disposición a arriesgar.",
+            "bulgarian": "Умните подавания са креативни, пробивни подавания, които целят да преминат защитните линии на противника и да поставят съотборник в изгодна позиция. Те отразяват визия и готовност за риск."
+        }
+    },
+    "throughPasses": {
+        "name": "Through passes",
+        "aliases": ["through balls", "throughBalls"],
+        "explanations": {
+            "english": "Through passes are passes played into the space behind the defence for a teammate to run onto. They are a key tool against high defensive lines.",
+            "portuguese": "Os passes em profundidade são passes para o espaço nas costas da defesa, para um colega atacar. São uma arma importante contra linhas defensivas subidas.",
+            "spanish": "Los pases al hueco son pases al espacio a la espalda de la defensa para que un compañero ataque ese espacio. Son un arma clave contra defensas adelantadas.",
+            "bulgarian": "Пасовете в дълбочина са подавания в пространството зад защитата, към което се затичва съотборник. Те са важно оръжие срещу високо разположени защитни линии."
+        }
+    },
+    "passesToFinalThird": {
+        "name": "Passes to final third",
+        "aliases": ["passes into final third", "passesIntoFinalThird", "final third passes"],
+        "explanations": {
+            "english": "Passes to the final third are completed passes that move the ball into the attacking third of the pitch. They show a player's contribution to moving the team into dangerous areas.",
+            "portuguese": "Os passes para o último terço são passes certos que colocam a bola no terço ofensivo do campo. Mostram a contribuição do jogador para levar a equipa a zonas perigosas.",
+            "spanish": "Los pases al último tercio son pases completados que llevan el balón al tercio ofensivo del campo. Muestran la contribución del jugador para llevar al equipo a zonas peligrosas.",
+            "bulgarian": "Подаванията към последната третина са точни подавания, които внасят топката в атакуващата третина на терена. Те показват приноса на играча за придвижването на отбора към опасни зони."
+        }
+    },
+    "defensiveDuels": {
+        "name": "Defensive duels",
+        "aliases": ["defensive duels won", "defensiveDuelsWon", "one on one defending"],
+        "explanations": {
+            "english": "Defensive duels are one-on-one situations in which a player challenges an opponent who has the ball. The number shows defensive involvement and the win percentage shows how reliably the player stops attackers.",
+            "portuguese": "Os duelos defensivos são situações de um para um em que o jogador disputa a bola com um adversário em posse. O número mostra o envolvimento defensivo e a percentagem de vitórias mostra a fiabilidade a travar atacantes.",
+            "spanish": "Los duelos defensivos son situaciones de uno contra uno en las que el jugador disputa el balón a un rival que lo tiene. El número muestra la implicación defensiva y el porcentaje ganado, la fiabilidad para frenar atacantes.",
+            "bulgarian": "Защитните единоборства са ситуации един срещу един, при които играчът атакува съперник с топка. Броят показва защитната ангажираност, а процентът спечелени – колко надеждно играчът спира нападателите."
+        }
+    },
+    "offensiveDuelsWon": {
+        "name": "Offensive duels won",
+        "aliases": ["offensive duels", "offensiveDuels"],
+        "explanations": {
+            "english": "Offensive duels are one-on-one situations in which a player in possession tries to beat or hold off a defender. Winning them shows press resistance and the ability to keep or advance the ball under pressure.",
+            "portuguese": "Os duelos ofensivos são situações de um para um em que o jogador com bola tenta ultrapassar ou proteger-se de um defensor. Vencê-los mostra resistência à pressão e capacidade de manter ou progredir com a bola.",
+            "spanish": "Los duelos ofensivos son situaciones de uno contra uno en las que el jugador con balón intenta superar o protegerse de un defensor. Ganarlos muestra resistencia a la presión y capacidad de conservar o avanzar con el balón.",
+            "bulgarian": "Атакуващите единоборства са ситуации един срещу един, при които играчът с топка опитва да преодолее или удържи защитник. Спечелването им показва устойчивост на преса и умение да запази или придвижи топката под натиск."
+        }
+    },
+    "aerialDuelsWon": {
+        "name": "Aerial duels won",
+        "aliases": ["aerial duels", "aerialDuels", "headers won", "aerial ability"],
+        "explanations": {
+            "english": "Aerial duels are contests for the ball in the air, such as headers from crosses, goal kicks and long balls. The win percentage is a key indicator for centre-backs and target strikers.",
+            "portuguese": "Os duelos aéreos são disputas da bola pelo ar, como cabeceamentos após cruzamentos, pontapés de baliza e bolas longas. A percentagem de vitórias é um indicador essencial para centrais e pontas de lança de referência.",
+            "spanish": "Los duelos aéreos son disputas del balón por alto, como remates de cabeza tras centros, saques de puerta y balones largos. El porcentaje ganado es un indicador clave para centrales y delanteros de referencia.",
+            "bulgarian": "Въздушните единоборства са борби за топката във въздуха – например при центрирания, вратарски удари и дълги топки. Процентът спечелени е ключов показател за централни защитници и таргет нападатели."
+        }
+    },
+    "ballRecoveries": {
+        "name": "Ball recoveries",
+        "aliases": ["recoveries", "possession regains"],
+        "explanations": {
+            "english": "Ball recoveries count the times a player regains possession for their team after the opponent had control or the ball was loose. They reflect reading of the game and work rate without the ball.",
+            "portuguese": "As recuperações de bola contam as vezes que um jogador recupera a posse para a sua equipa depois de o adversário a ter ou de a bola estar dividida. Refletem leitura de jogo e trabalho sem bola.",
+            "spanish": "Las recuperaciones de balón cuentan las veces que un jugador recupera la posesión para su equipo después de que el rival la tuviera o el balón estuviera suelto. Reflejan lectura del juego y trabajo sin balón.",
+            "bulgarian": "Възстановените топки отчитат колко пъти играчът връща владеенето на отбора си, след като противникът е контролирал топката или тя е била ничия. Те отразяват прочита на играта и работата без топка."
+        }
+    },
+    "counterpressingRecoveries": {
+        "name": "Counterpressing recoveries",
+        "aliases": ["counterpressing", "counter pressing recoveries", "gegenpressing recoveries"],
+        "explanations": {
+            "english": "Counterpressing recoveries are ball recoveries made within a few seconds of the team losing possession. They are the defining metric for pressing and gegenpressing systems.",
+            "portuguese": "As recuperações em contrapressão são recuperações feitas poucos segundos depois de a equipa perder a bola. São a métrica de referência para sistemas de pressão alta e gegenpressing.",
+            "spanish": "Las recuperaciones en contrapresión son recuperaciones logradas pocos segundos después de que el equipo pierda el balón. Son la métrica de referencia para sistemas de presión y gegenpressing.",
+            "bulgarian": "Възстановяванията при контрапреса са отнети топки в рамките на няколко секунди след загуба на владеенето. Те са определящият показател за пресиращи и гегенпресинг системи."
+        }
+    },
+    "dangerousOpponentHalfRecoveries": {
+        "name": "Dangerous opponent half recoveries",
+        "aliases": ["opponent half recoveries", "high recoveries"],
+        "explanations": {
+            "english": "Dangerous opponent-half recoveries are ball recoveries in the opponent's half that lead to a shot shortly afterwards. They show how often a player's pressing turns directly into chances.",
+            "portuguese": "As recuperações perigosas no meio-campo adversário são recuperações no meio-campo contrário que resultam num remate pouco depois. Mostram com que frequência a pressão do jogador gera oportunidades diretamente.",
+            "spanish": "Las recuperaciones peligrosas en campo rival son recuperaciones en la mitad contraria que terminan en un disparo poco después. Muestran con qué frecuencia la presión del jugador genera ocasiones directamente.",
+            "bulgarian": "Опасните възстановявания в половината на противника са отнети топки в чуждата половина, след които скоро следва удар. Те показват колко често пресата на играча води директно до положения."
+        }
+    },
+    "successfulPasses": {
+        "name": "Pass accuracy",
+        "aliases": ["pass accuracy", "passAccuracy", "passing accuracy", "accuratePasses", "pass completion"],
+        "explanations": {
+            "english": "Pass accuracy is the percentage of a player's passes that reach a teammate. It should be read together with pass difficulty: safe sideways passing inflates it, while progressive passers often have lower values.",
+            "portuguese": "A precisão de passe é a percentagem de passes de um jogador que chegam a um colega. Deve ser lida em conjunto com a dificuldade dos passes: passes laterais seguros inflacionam-na, enquanto passadores progressivos costumam ter valores mais baixos.",
+            "spanish": "La precisión de pase es el porcentaje de pases de un jugador que llegan a un compañero. Debe leerse junto a la dificultad de los pases: los pases laterales seguros la inflan y los pasadores progresivos suelen tener valores más bajos.",
+            "bulgarian": "Точността на подаванията е процентът подавания на играча, които достигат до съотборник. Тя трябва да се тълкува заедно с трудността им: безопасните странични подавания я повишават, а играчите с прогресивни подавания често имат по-ниски стойности."
+        }
+    },
+    "goalConversion": {
+        "name": "Goal conversion",
+        "aliases": ["conversion rate", "finishing"],
+        "explanations": {
+            "english": "Goal conversion is the percentage of a player's shots that become goals. Compared with xG it indicates whether a player finishes above or below the quality of their chances.",
+            "portuguese": "A taxa de conversão é a percentagem de remates de um jogador que se transformam em golo. Comparada com o xG, indica se o jogador finaliza acima ou abaixo da qualidade das suas oportunidades.",
+            "spanish": "La tasa de conversión es el porcentaje de disparos de un jugador que terminan en gol. Comparada con el xG indica si el jugador define por encima o por debajo de la calidad de sus ocasiones.",
+            "bulgarian": "Реализацията е процентът удари на играча, които завършват с гол. Сравнена с xG, тя показва дали играчът завършва над или под качеството на положенията си."
+        }
+    },
+    "interceptions": {
+        "name": "Interceptions",
+        "aliases": [],
+        "explanations": {
+            "english": "Interceptions count passes by the opponent that a player cuts out by reading the play. High values point to good anticipation and positioning rather than physical duels.",
+            "portuguese": "As interceções contam os passes adversários que um jogador corta por antecipação. Valores altos indicam boa leitura de jogo e posicionamento, mais do que força nos duelos.",
+            "spanish": "Las intercepciones cuentan los pases rivales que un jugador corta anticipándose a la jugada. Valores altos indican buena lectura y colocación más que fuerza en los duelos.",
+            "bulgarian": "Пресечените топки отчитат подаванията на противника, които играчът прекъсва, като прочита играта. Високите стойности говорят за добра антиципация и позициониране, а не за физически единоборства."
+        }
+    },
+    "successfulDribbles": {
+        "name": "Successful dribbles",
+        "aliases": ["dribbles", "dribbling", "dribble success rate", "dribbleSuccessRate", "take ons"],
+        "explanations": {
+            "english": "Successful dribbles count the times a player beats an opponent while keeping the ball. The per-90 number shows how often a player takes defenders on and the percentage shows how reliably they succeed.",
+            "portuguese": "Os dribles bem-sucedidos contam as vezes que um jogador ultrapassa um adversário mantendo a bola. O número por 90 minutos mostra com que frequência encara defensores e a percentagem mostra a sua eficácia.",
+            "spanish": "Los regates exitosos cuentan las veces que un jugador supera a un rival manteniendo el balón. El número por 90 minutos muestra con qué frecuencia encara a los defensores y el porcentaje, su eficacia.",
+            "bulgarian": "Успешните дрибъли отчитат колко пъти играчът преодолява съперник, като запазва топката. Броят на 90 минути показва колко често играчът атакува защитниците, а процентът – колко надеждно успява."
+        }
+    },
+    "ballLosses": {
+        "name": "Ball losses",
+        "aliases": ["losses", "turnovers"],
+        "explanations": {
+            "english": "Ball losses count the times a player gives possession away through a misplaced pass, failed dribble or being tackled. Lower is better, but the value should be weighed against how much risk the player's role requires.",
+            "portuguese": "As perdas de bola contam as vezes que um jogador perde a posse por passe errado, drible falhado ou desarme. Quanto menor melhor, mas o valor deve ser ponderado pelo risco que a função do jogador exige.",
+            "spanish": "Las pérdidas de balón cuentan las veces que un jugador pierde la posesión por un pase errado, un regate fallido o una entrada. Cuanto menos mejor, aunque hay que valorarlo según el riesgo que exige su rol.",
+            "bulgarian": "Загубените топки отчитат колко пъти играчът губи владеенето след неточно подаване, неуспешен дрибъл или отнемане. По-малко е по-добре, но стойността трябва да се преценява спрямо риска, който изисква ролята на играча."
+        }
+    },
+    "touchInBox": {
+        "name": "Touches in box",
+        "aliases": ["touches in box", "touches in the box", "box touches"],
+        "explanations": {
+            "english": "Touches in the box count how often a player receives or plays the ball inside the opponent's penalty area. They show how frequently an attacker gets into scoring positions.",
+            "portuguese": "Os toques na área contam quantas vezes um jogador recebe ou joga a bola dentro da área adversária. Mostram com que frequência um atacante chega a posições de finalização.",
+            "spanish": "Los toques en el área cuentan cuántas veces un jugador recibe o juega el balón dentro del área rival. Muestran con qué frecuencia un atacante llega a posiciones de remate.",
+            "bulgarian": "Докосванията в наказателното поле отчитат колко често играчът получава или играе топката в противниковото наказателно поле. Те показват колко често нападателят достига до голови позиции."
+        }
+    }
+}
+
+# Display names and extra aliases for metrics whose key does not humanize well ("npxG" -> "Npx g")
+CURATED_NAMES = {
+    "npxG": "Non-penalty expected goals (npxG)",
+    "gkSaves": "Goalkeeper saves",
+    "gkSuccessfulExits": "Goalkeeper successful exits"
+}
+CURATED_ALIASES = {
+    "npxG": ["npxg", "non-penalty expected goals", "non-penalty xG"],
+    "gkSaves": ["goalkeeper saves"],
+    "gkSuccessfulExits": ["goalkeeper successful exits"]
+}
+
+# Hand-written explanations for the remaining metrics, keyed like the glossary entries
+CURATED_EXPLANATIONS = {
+    "accelerations": {
+        "english": "Accelerations count the times per 90 minutes a player bursts from a low to a high speed, with or without the ball. Scouts use them to spot explosive players who win the first yards in a race or a press.",
+        "portuguese": "As acelerações contam as vezes por 90 minutos em que um jogador passa rapidamente de uma velocidade baixa para uma alta, com ou sem bola. Ajudam a identificar jogadores explosivos, que ganham os primeiros metros numa corrida ou numa pressão.",
+        "spanish": "Las aceleraciones cuentan las veces por 90 minutos en que un jugador pasa de golpe de una velocidad baja a una alta, con o sin balón. Sirven para detectar jugadores explosivos que ganan los primeros metros en una carrera o una presión.",
+        "bulgarian": "Ускоренията отчитат колко пъти на 90 минути играчът рязко преминава от ниска към висока скорост, със или без топка. Те открояват експлозивните играчи, които печелят първите метри в спринт или при преса."
+    },
+    "assists": {
+        "english": "Assists are the passes or touches that directly lead to a teammate's goal. They reward the final pass but depend on the teammate finishing, so scouts read them together with expected assists (xA).",
+        "portuguese": "As assistências são os passes ou toques que levam diretamente a um golo de um colega. Premeiam o último passe, mas dependem da finalização do colega, por isso são lidas em conjunto com as assistências esperadas (xA).",
+        "spanish": "Las asistencias son los pases o toques que terminan directamente en un gol de un compañero. Premian el último pase, pero dependen de la definición del compañero, por eso se leen junto a las asistencias esperadas (xA).",
+        "bulgarian": "Асистенциите са подаванията или докосванията, които водят директно до гол на съотборник. Те награждават последния пас, но зависят от завършването на съотборника, затова се разглеждат заедно с очакваните асистенции (xA)."
+    },
+    "assistsPerGame": {
+        "english": "Assists per game divide a player's assists by the matches played. They make creators with different playing time comparable, although minutes-based rates (per 90) are more precise for substitutes.",
+        "portuguese": "As assistências por jogo dividem as assistências de um jogador pelos jogos disputados. Tornam comparáveis criadores com tempos de jogo diferentes, embora as taxas por 90 minutos sejam mais precisas para suplentes.",
+        "spanish": "Las asistencias por partido dividen las asistencias de un jugador entre los partidos jugados. Permiten comparar creadores con distinto tiempo de juego, aunque las tasas por 90 minutos son más precisas para suplentes.",
+        "bulgarian": "Асистенциите на мач разделят асистенциите на играча на изиграните мачове. Те правят сравними създателите с различно игрово време, макар че показателите на 90 минути са по-точни за резервите."
+    },
+    "backPasses": {
+        "english": "Back passes are passes played towards the player's own goal, per 90 minutes. A high number often means a player recycles possession safely rather than taking risks going forward.",
+        "portuguese": "Os passes para trás são passes jogados em direção à própria baliza, por 90 minutos. Um número alto indica muitas vezes um jogador que recicla a posse com segurança em vez de arriscar para a frente.",
+        "spanish": "Los pases hacia atrás son pases jugados en dirección a la propia portería, por 90 minutos. Un número alto suele indicar un jugador que recicla la posesión con seguridad en lugar de arriesgar hacia delante.",
+        "bulgarian": "Подаванията назад са подавания към собствената врата на 90 минути. Високият брой често означава играч, който пази владеенето сигурно, вместо да рискува напред."
+    },
+    "blocks": {
+        "english": "Blocks count the shots, crosses and passes a player stops with their body. They show a defender's positioning and willingness to put themselves in the way in and around the box.",
+        "portuguese": "Os bloqueios contam os remates, cruzamentos e passes que um jogador trava com o corpo. Mostram o posicionamento de um defesa e a sua disponibilidade para se meter à frente da bola dentro e perto da área.",
+        "spanish": "Los bloqueos cuentan los disparos, centros y pases que un jugador frena con el cuerpo. Muestran la colocación de un defensor y su disposición a interponerse dentro y cerca del área.",
+        "bulgarian": "Блокираните удари отчитат ударите, центриранията и подаванията, които играчът спира с тялото си. Те показват позиционирането на защитника и готовността му да застане на пътя на топката в и около наказателното поле."
+    },
+    "cleanSheets": {
+        "english": "Clean sheets are matches in which the team concedes no goals while the player is on the pitch. They are mostly a team measure, so scouts weigh them against shots faced and goals prevented.",
+        "portuguese": "Os jogos sem sofrer golos são partidas em que a equipa não sofre golos enquanto o jogador está em campo. São sobretudo uma medida coletiva, por isso comparam-se com os remates enfrentados e os golos evitados.",
+        "spanish": "Las porterías a cero son partidos en los que el equipo no encaja goles mientras el jugador está en el campo. Son sobre todo una medida colectiva, por eso se comparan con los disparos recibidos y los goles evitados.",
+        "bulgarian": "Мачовете без допуснат гол са срещите, в които отборът не допуска гол, докато играчът е на терена. Те са предимно отборен показател, затова се сравняват с ударите срещу вратата и предотвратените голове."
+    },
+    "clearances": {
+        "english": "Clearances count the times a player kicks or heads the ball away from danger near their own goal. Many clearances suit a defender who protects the box, but can also reflect a team that defends deep.",
+        "portuguese": "Os alívios contam as vezes em que um jogador afasta a bola de perigo perto da própria baliza, com o pé ou de cabeça. Muitos alívios caracterizam um defesa que protege a área, mas podem refletir uma equipa que defende baixo.",
+        "spanish": "Los despejes cuentan las veces en que un jugador aleja el balón del peligro cerca de su portería, con el pie o de cabeza. Muchos despejes definen a un defensor que protege el área, pero también pueden reflejar un equipo que defiende atrás.",
+        "bulgarian": "Изчистванията отчитат колко пъти играчът отдалечава топката от опасност близо до своята врата с крак или глава. Многото изчиствания подхождат на защитник, който пази наказателното поле, но може да отразяват и отбор, който се защитава ниско."
+    },
+    "crosses": {
+        "english": "Crosses are passes played from the wide areas into the opponent's penalty area, per 90 minutes. They identify wingers and full-backs who supply the box; cross accuracy shows how many reach a teammate.",
+        "portuguese": "Os cruzamentos são passes feitos das alas para a área adversária, por 90 minutos. Identificam extremos e laterais que abastecem a área; a precisão de cruzamento mostra quantos chegam a um colega.",
+        "spanish": "Los centros son pases desde las bandas hacia el área rival, por 90 minutos. Identifican a extremos y laterales que abastecen el área; la precisión de centros muestra cuántos llegan a un compañero.",
+        "bulgarian": "Центриранията са подавания от фланговете към противниковото наказателно поле на 90 минути. Те открояват крилата и беците, които снабдяват наказателното поле; точността показва колко от тях достигат съотборник."
+    },
+    "crossingAccuracy": {
+        "english": "Crossing accuracy is the share of a player's crosses that reach a teammate. It separates wide players who deliver quality balls from those who only cross often.",
+        "portuguese": "A precisão de cruzamento é a percentagem de cruzamentos de um jogador que chegam a um colega. Distingue os jogadores de ala que colocam bolas de qualidade dos que apenas cruzam muito.",
+        "spanish": "La precisión de centros es el porcentaje de centros de un jugador que llegan a un compañero. Distingue a los jugadores de banda que ponen balones de calidad de los que solo centran mucho.",
+        "bulgarian": "Точността на центриранията е делът от центриранията на играча, които достигат съотборник. Тя отличава крилата с качествени центрирания от тези, които просто центрират често."
+    },
+    "dangerousOwnHalfLosses": {
+        "english": "Dangerous own half losses count the times per 90 minutes a player loses the ball in their own half in a way that lets the opponent attack quickly. Lower is better: it measures how risky a player is in build-up.",
+        "portuguese": "As perdas perigosas no próprio meio-campo contam as vezes por 90 minutos em que um jogador perde a bola no seu meio-campo e permite um ataque rápido adversário. Quanto menos, melhor: medem o risco de um jogador na construção.",
+        "spanish": "Las pérdidas peligrosas en campo propio cuentan las veces por 90 minutos en que un jugador pierde el balón en su mitad y permite un ataque rápido rival. Cuantas menos, mejor: miden el riesgo de un jugador en la salida.",
+        "bulgarian": "Опасните загуби в собствената половина отчитат колко пъти на 90 минути играчът губи топката в своята половина така, че противникът може бързо да атакува. По-малко е по-добре: показателят мери колко рисков е играчът при изграждането."
+    },
+    "dispossessed": {
+        "english": "Dispossessed counts the times a player loses the ball to an opponent's tackle while in possession, excluding failed dribbles. Lower is better: it shows how well a player protects the ball under pressure.",
+        "portuguese": "Desarmado conta as vezes em que um jogador perde a bola por um desarme adversário quando a tem em sua posse, sem contar dribles falhados. Quanto menos, melhor: mostra como um jogador protege a bola sob pressão.",
+        "spanish": "Desposeído cuenta las veces en que un jugador pierde el balón por una entrada rival cuando lo controla, sin contar regates fallidos. Cuantas menos, mejor: muestra cómo protege el balón bajo presión.",
+        "bulgarian": "Отнетите топки отчитат колко пъти играчът губи топката след намеса на противник, докато я владее, без неуспешните дрибъли. По-малко е по-добре: показателят показва как играчът пази топката под натиск."
+    },
+    "distanceCovered": {
+        "english": "Distance covered is the total distance a player runs in a match, usually in kilometres. It shows work rate and stamina, but says nothing about the intensity or purpose of the running.",
+        "portuguese": "A distância percorrida é a distância total que um jogador corre num jogo, normalmente em quilómetros. Mostra a capacidade de trabalho e a resistência, mas não a intensidade nem a utilidade das corridas.",
+        "spanish": "La distancia recorrida es la distancia total que un jugador corre en un partido, normalmente en kilómetros. Muestra el volumen de trabajo y la resistencia, pero no la intensidad ni la utilidad de las carreras.",
+        "bulgarian": "Изминатото разстояние е общото разстояние, което играчът пробягва в мач, обикновено в километри. То показва трудолюбието и издръжливостта, но не и интензивността или смисъла на бягането."
+    },
+    "duelsWon": {
+        "english": "Duels won counts the one-on-one contests for the ball a player wins, on the ground or in the air; as a percentage it is the share of duels won. It measures how reliably a player wins individual battles.",
+        "portuguese": "Os duelos ganhos contam as disputas individuais pela bola que um jogador vence, no chão ou no ar; em percentagem, é a parte dos duelos ganhos. Medem a fiabilidade de um jogador nos confrontos individuais.",
+        "spanish": "Los duelos ganados cuentan los enfrentamientos individuales por el balón que gana un jugador, por tierra o por aire; en porcentaje es la parte de duelos ganados. Miden la fiabilidad de un jugador en los choques individuales.",
+        "bulgarian": "Спечелените единоборства отчитат двубоите за топката, които играчът печели на земята или във въздуха; в проценти това е делът на спечелените. Те мерят колко надеждно играчът печели индивидуалните битки."
+    },
+    "forwardPasses": {
+        "english": "Forward passes are passes played towards the opponent's goal, per 90 minutes. They show how directly a player moves the ball; progressive passes add the condition that it gains significant ground.",
+        "portuguese": "Os passes para a frente são passes jogados em direção à baliza adversária, por 90 minutos. Mostram quão direto é um jogador a mover a bola; os passes progressivos exigem ainda um ganho significativo de terreno.",
+        "spanish": "Los pases hacia delante son pases jugados en dirección a la portería rival, por 90 minutos. Muestran lo directo que es un jugador al mover el balón; los pases progresivos exigen además ganar terreno de forma significativa.",
+        "bulgarian": "Подаванията напред са подавания към противниковата врата на 90 минути. Те показват колко директно играчът придвижва топката; прогресивните подавания изискват и значителна спечелена територия."
+    },
+    "foulsCommitted": {
+        "english": "Fouls committed count the fouls a player gives away. Many fouls can mean an aggressive or mistimed defender and raise the risk of cards and set pieces against.",
+        "portuguese": "As faltas cometidas contam as faltas que um jogador comete. Muitas faltas podem indicar um defesa agressivo ou com mau timing e aumentam o risco de cartões e de bolas paradas contra.",
+        "spanish": "Las faltas cometidas cuentan las faltas que hace un jugador. Muchas faltas pueden indicar un defensor agresivo o que llega tarde, y aumentan el riesgo de tarjetas y de balones parados en contra.",
+        "bulgarian": "Направените нарушения отчитат фаловете, които играчът прави. Многото нарушения може да означават агресивен или закъсняващ защитник и увеличават риска от картони и статични положения срещу отбора."
+    },
+    "foulsWon": {
+        "english": "Fouls won count the fouls opponents commit on a player. They point to players who carry the ball into contact and draw free kicks, relieving pressure and creating set pieces.",
+        "portuguese": "As faltas sofridas contam as faltas que os adversários cometem sobre um jogador. Apontam jogadores que levam a bola para o contacto e ganham livres, aliviando a pressão e criando bolas paradas.",
+        "spanish": "Las faltas recibidas cuentan las faltas que los rivales cometen sobre un jugador. Señalan a jugadores que conducen hacia el contacto y provocan tiros libres, aliviando la presión y creando balones parados.",
+        "bulgarian": "Спечелените нарушения отчитат фаловете, които противниците правят срещу играча. Те открояват играчи, които търсят контакта с топка и печелят свободни удари, облекчавайки натиска и създавайки статични положения."
+    },
+    "gkSaves": {
+        "english": "Goalkeeper saves count the shots on target a goalkeeper stops; as a percentage they are the share of shots on target saved. Scouts read them against the quality of the shots faced, for example with goals prevented.",
+        "portuguese": "As defesas do guarda-redes contam os remates enquadrados que ele trava; em percentagem, são a parte dos remates enquadrados defendidos. Devem ser lidas face à qualidade dos remates enfrentados, por exemplo com os golos evitados.",
+        "spanish": "Las paradas del portero cuentan los disparos a puerta que detiene; en porcentaje son la parte de disparos a puerta atajados. Se leen frente a la calidad de los disparos recibidos, por ejemplo con los goles evitados.",
+        "bulgarian": "Спасяванията на вратаря отчитат ударите във вратата, които той спира; в проценти това е делът на спасените удари във вратата. Те се тълкуват спрямо качеството на ударите, например чрез предотвратените голове."
+    },
+    "gkSuccessfulExits": {
+        "english": "Goalkeeper successful exits is the share of a goalkeeper's exits from goal, to claim a ball or meet an attacker, that end with the danger cleared. It shows how safely a keeper sweeps behind the defence and commands the box.",
+        "portuguese": "As saídas bem-sucedidas do guarda-redes são a percentagem das suas saídas da baliza, para agarrar a bola ou enfrentar um atacante, que terminam com o perigo afastado. Mostram a segurança com que cobre as costas da defesa e domina a área.",
+        "spanish": "Las salidas exitosas del portero son el porcentaje de sus salidas de la portería, para atrapar el balón o cerrar a un atacante, que terminan con el peligro despejado. Muestran con qué seguridad cubre la espalda de la defensa y domina el área.",
+        "bulgarian": "Успешните излизания на вратаря са делът от излизанията му от вратата, за да хване топката или да пресрещне нападател, които завършват с отстранена опасност. Те показват колко сигурно вратарят покрива гърба на защитата и командва наказателното поле."
+    },
+    "goalkeeperExitsPerformed": {
+        "english": "Goalkeeper exits performed count the times per 90 minutes a goalkeeper leaves the line to claim a ball or meet an attacker. They describe how proactive a keeper is; successful exits show how well those decisions work out.",
+        "portuguese": "As saídas do guarda-redes contam as vezes por 90 minutos em que ele deixa a linha para agarrar a bola ou enfrentar um atacante. Descrevem quão proativo é; as saídas bem-sucedidas mostram se essas decisões resultam.",
+        "spanish": "Las salidas del portero cuentan las veces por 90 minutos en que abandona la línea para atrapar el balón o cerrar a un atacante. Describen lo proactivo que es; las salidas exitosas muestran si esas decisiones salen bien.",
+        "bulgarian": "Излизанията на вратаря отчитат колко пъти на 90 минути той напуска линията, за да хване топката или да пресрещне нападател. Те описват колко активен е вратарят, а успешните излизания показват доколко тези решения са правилни."
+    },
+    "goals": {
+        "english": "Goals count the goals a player scores. They are the end product scouts look for in attackers, best compared with expected goals (xG) to separate finishing skill from chance volume and luck.",
+        "portuguese": "Os golos contam os golos marcados por um jogador. São o resultado final procurado nos atacantes e comparam-se melhor com os golos esperados (xG), para separar a qualidade de finalização do volume de oportunidades e da sorte.",
+        "spanish": "Los goles cuentan los goles que marca un jugador. Son el producto final que se busca en los atacantes y se comparan mejor con los goles esperados (xG), para separar la calidad de definición del volumen de ocasiones y la suerte.",
+        "bulgarian": "Головете отчитат головете, отбелязани от играча. Те са крайният резултат, който се търси при нападателите, и се сравняват най-добре с очакваните голове (xG), за да се отдели умението за завършване от броя положения и късмета."
+    },
+    "goalsConceded": {
+        "english": "Goals conceded count the goals scored against the team while a goalkeeper or defender is on the pitch. They depend heavily on the team, so they are read together with the shots and expected goals faced.",
+        "portuguese": "Os golos sofridos contam os golos marcados contra a equipa enquanto um guarda-redes ou defesa está em campo. Dependem muito da equipa, por isso leem-se juntamente com os remates e os golos esperados enfrentados.",
+        "spanish": "Los goles encajados cuentan los goles marcados contra el equipo mientras un portero o defensor está en el campo. Dependen mucho del equipo, por eso se leen junto con los disparos y los goles esperados recibidos.",
+        "bulgarian": "Допуснатите голове отчитат головете срещу отбора, докато вратарят или защитникът е на терена. Те зависят силно от отбора, затова се разглеждат заедно с ударите и очакваните голове срещу него."
+    },
+    "goalsPrevented": {
+        "english": "Goals prevented compare the expected goals of the shots on target a goalkeeper faced with the goals actually conceded. A positive value means the keeper saved more than an average goalkeeper would have.",
+        "portuguese": "Os golos evitados comparam os golos esperados dos remates enquadrados enfrentados por um guarda-redes com os golos realmente sofridos. Um valor positivo significa que defendeu mais do que um guarda-redes médio defenderia.",
+        "spanish": "Los goles evitados comparan los goles esperados de los disparos a puerta que recibió un portero con los goles que encajó realmente. Un valor positivo significa que paró más de lo que habría parado un portero medio.",
+        "bulgarian": "Предотвратените голове сравняват очакваните голове от ударите във вратата срещу вратаря с реално допуснатите голове. Положителна стойност означава, че вратарят е спасил повече от среден вратар."
+    },
+    "headedGoals": {
+        "english": "Headed goals count the goals a player scores with the head. They highlight aerial threat in the box, useful for teams that cross a lot or rely on set pieces.",
+        "portuguese": "Os golos de cabeça contam os golos que um jogador marca de cabeça. Destacam a ameaça aérea na área, útil para equipas que cruzam muito ou dependem de bolas paradas.",
+        "spanish": "Los goles de cabeza cuentan los goles que marca un jugador con la cabeza. Destacan la amenaza aérea en el área, útil para equipos que centran mucho o dependen del balón parado.",
+        "bulgarian": "Головете с глава отчитат головете, които играчът отбелязва с глава. Те показват въздушната заплаха в наказателното поле, полезна за отбори, които центрират често или разчитат на статични положения."
+    },
+    "highClaims": {
+        "english": "High claims count the crosses and high balls a goalkeeper catches or holds. They show how well a keeper commands the area and relieves pressure from aerial deliveries.",
+        "portuguese": "As saídas por alto contam os cruzamentos e bolas altas que um guarda-redes agarra. Mostram como domina a área e alivia a pressão das bolas aéreas.",
+        "spanish": "Las atrapadas por alto cuentan los centros y balones altos que un portero atrapa. Muestran cómo domina el área y alivia la presión de los balones aéreos.",
+        "bulgarian": "Хванатите високи топки отчитат центриранията и високите топки, които вратарят хваща. Те показват как вратарят командва наказателното поле и облекчава натиска при въздушни топки."
+    },
+    "intensityRuns": {
+        "english": "Intensity runs count the runs a player makes above a high-speed threshold. They measure how often a player repeats demanding efforts, which matters for pressing and transition play.",
+        "portuguese": "As corridas de alta intensidade contam as corridas de um jogador acima de um limiar de velocidade elevado. Medem com que frequência repete esforços exigentes, importante para a pressão e as transições.",
+        "spanish": "Las carreras de alta intensidad cuentan las carreras de un jugador por encima de un umbral de velocidad elevado. Miden con qué frecuencia repite esfuerzos exigentes, clave para la presión y las transiciones.",
+        "bulgarian": "Интензивните бягания отчитат бяганията на играча над висок праг на скоростта. Те мерят колко често играчът повтаря тежки усилия, което е важно за пресата и преходите."
+    },
+    "lateralPasses": {
+        "english": "Lateral passes are passes played sideways, per 90 minutes. They are typical of players who circulate possession and switch play rather than break lines.",
+        "portuguese": "Os passes laterais são passes jogados para o lado, por 90 minutos. São típicos de jogadores que fazem circular a posse e mudam o jogo de flanco em vez de quebrar linhas.",
+        "spanish": "Los pases laterales son pases jugados hacia los lados, por 90 minutos. Son típicos de jugadores que hacen circular la posesión y cambian el juego de banda en lugar de romper líneas.",
+        "bulgarian": "Страничните подавания са подавания встрани на 90 минути. Те са типични за играчи, които въртят владеенето и сменят посоката на играта, вместо да пробиват линии."
+    },
+    "longBallAccuracy": {
+        "english": "Long ball accuracy is the share of a player's long balls that reach a teammate. It shows who can switch play or find runners over the top reliably.",
+        "portuguese": "A precisão das bolas longas é a percentagem de bolas longas de um jogador que chegam a um colega. Mostra quem consegue mudar o jogo ou encontrar desmarcações nas costas com fiabilidade.",
+        "spanish": "La precisión de balones largos es el porcentaje de balones largos de un jugador que llegan a un compañero. Muestra quién puede cambiar el juego o encontrar desmarques a la espalda con fiabilidad.",
+        "bulgarian": "Точността на дългите топки е делът от дългите топки на играча, които достигат съотборник. Тя показва кой може надеждно да смени посоката на играта или да намери разбягващи се играчи зад защитата."
+    },
+    "longPassAccuracy": {
+        "english": "Long pass accuracy is the share of long passes that reach a teammate; for goalkeepers it measures distribution beyond the first line. It shows whether a keeper can start attacks with long balls.",
+        "portuguese": "A precisão de passe longo é a percentagem de passes longos que chegam a um colega; nos guarda-redes mede a distribuição para lá da primeira linha. Mostra se consegue iniciar ataques com bolas longas.",
+        "spanish": "La precisión de pase largo es el porcentaje de pases largos que llegan a un compañero; en los porteros mide la distribución más allá de la primera línea. Muestra si puede iniciar ataques con balones largos.",
+        "bulgarian": "Точността на дългите подавания е делът от дългите подавания, които достигат съотборник; при вратарите тя мери разпределението на топката отвъд първата линия. Показва дали вратарят може да започва атаки с дълги топки."
+    },
+    "longPasses": {
+        "english": "Long passes are passes over a long distance, usually more than 30 metres, per 90 minutes. They identify players who switch play or go direct; their accuracy shows the quality of that range.",
+        "portuguese": "Os passes longos são passes de longa distância, normalmente acima de 30 metros, por 90 minutos. Identificam jogadores que mudam o jogo ou jogam direto; a sua precisão mostra a qualidade desse alcance.",
+        "spanish": "Los pases largos son pases de larga distancia, normalmente más de 30 metros, por 90 minutos. Identifican a jugadores que cambian el juego o juegan en directo; su precisión muestra la calidad de ese alcance.",
+        "bulgarian": "Дългите подавания са подавания на голямо разстояние, обикновено над 30 метра, на 90 минути. Те открояват играчи, които сменят посоката или играят директно; точността им показва качеството на този диапазон."
+    },
+    "miscontrols": {
+        "english": "Miscontrols count the times a player loses the ball through a poor first touch or control. Lower is better: it reflects technique under pressure.",
+        "portuguese": "Os maus controlos contam as vezes em que um jogador perde a bola por uma má receção ou controlo. Quanto menos, melhor: refletem a técnica sob pressão.",
+        "spanish": "Los malos controles cuentan las veces en que un jugador pierde el balón por un mal primer toque o control. Cuantos menos, mejor: reflejan la técnica bajo presión.",
+        "bulgarian": "Лошите контроли отчитат колко пъти играчът губи топката заради слабо първо докосване или контрол. По-малко е по-добре: показателят отразява техниката под натиск."
+    },
+    "npxG": {
+        "english": "Non-penalty expected goals (npxG) is expected goals without penalties. It measures the quality of the chances a player gets from open play and set pieces, without inflation from penalty duty.",
+        "portuguese": "Os golos esperados sem penáltis (npxG) são os golos esperados excluindo penáltis. Medem a qualidade das oportunidades que um jogador tem em jogo corrido e bolas paradas, sem o efeito de ser o marcador de penáltis.",
+        "spanish": "Los goles esperados sin penaltis (npxG) son los goles esperados excluyendo penaltis. Miden la calidad de las ocasiones de un jugador en jugada y balón parado, sin el efecto de ser el lanzador de penaltis.",
+        "bulgarian": "Очакваните голове без дузпи (npxG) са очакваните голове, изключвайки дузпите. Те мерят качеството на положенията на играча от игра и статични положения, без ефекта от изпълнението на дузпи."
+    },
+    "passes": {
+        "english": "Passes count the passes a player attempts per 90 minutes. They show how involved a player is in possession; pass accuracy and progressive passes add how safe and ambitious those passes are.",
+        "portuguese": "Os passes contam os passes que um jogador tenta por 90 minutos. Mostram o envolvimento de um jogador na posse; a precisão e os passes progressivos acrescentam quão seguros e ambiciosos são.",
+        "spanish": "Los pases cuentan los pases que intenta un jugador por 90 minutos. Muestran cuánto participa en la posesión; la precisión y los pases progresivos añaden lo seguros y ambiciosos que son.",
+        "bulgarian": "Подаванията отчитат подаванията, които играчът опитва на 90 минути. Те показват колко е ангажиран с владеенето; точността и прогресивните подавания добавят колко сигурни и амбициозни са те."
+    },
+    "penaltiesSaved": {
+        "english": "Penalties saved count the penalty kicks a goalkeeper stops. They are a small sample, so they are a bonus rather than a reliable measure of a keeper's quality.",
+        "portuguese": "Os penáltis defendidos contam os penáltis que um guarda-redes trava. São uma amostra pequena, por isso são um bónus e não uma medida fiável da qualidade do guarda-redes.",
+        "spanish": "Los penaltis parados cuentan los penaltis que detiene un portero. Son una muestra pequeña, por eso son un extra más que una medida fiable de la calidad del portero.",
+        "bulgarian": "Спасените дузпи отчитат дузпите, които вратарят спира. Извадката е малка, затова те са по-скоро бонус, отколкото надежден показател за качеството на вратаря."
+    },
+    "possessionLost": {
+        "english": "Possession lost counts every time a player gives the ball away, through passes, dribbles or control. Lower is better relative to how often the player has the ball.",
+        "portuguese": "A posse perdida conta todas as vezes em que um jogador perde a bola, por passes, dribles ou controlo. Quanto menos, melhor, em relação a quantas vezes o jogador tem a bola.",
+        "spanish": "La posesión perdida cuenta todas las veces en que un jugador pierde el balón, por pases, regates o control. Cuanto menos, mejor, en relación con cuántas veces tiene el balón.",
+        "bulgarian": "Загубеното владеене отчита всеки път, когато играчът губи топката чрез подавания, дрибъли или контрол. По-малко е по-добре спрямо това колко често играчът е с топка."
+    },
+    "pressingDuels": {
+        "english": "Pressing duels are the duels a player starts by pressing an opponent who has the ball. They show how actively a player presses, a key trait for high-pressing and gegenpressing teams.",
+        "portuguese": "Os duelos de pressão são os duelos que um jogador inicia ao pressionar um adversário com bola. Mostram quão ativamente pressiona, uma característica-chave em equipas de pressão alta e gegenpressing.",
+        "spanish": "Los duelos de presión son los duelos que un jugador inicia al presionar a un rival con balón. Muestran lo activamente que presiona, un rasgo clave en equipos de presión alta y gegenpressing.",
+        "bulgarian": "Единоборствата при преса са двубоите, които играчът започва, като пресира противник с топка. Те показват колко активно пресира играчът, ключова черта за отбори с висока преса и гегенпресинг."
+    },
+    "pressingDuelsWon": {
+        "english": "Pressing duels won count the pressing duels that end with the player winning the ball or stopping the attack. They show whether a player's pressing actually recovers possession.",
+        "portuguese": "Os duelos de pressão ganhos contam os duelos de pressão em que o jogador recupera a bola ou trava o ataque. Mostram se a pressão de um jogador recupera de facto a posse.",
+        "spanish": "Los duelos de presión ganados cuentan los duelos de presión en los que el jugador recupera el balón o frena el ataque. Muestran si la presión de un jugador recupera realmente la posesión.",
+        "bulgarian": "Спечелените единоборства при преса отчитат двубоите при преса, в които играчът печели топката или спира атаката. Те показват дали пресата на играча наистина връща владеенето."
+    },
+    "pressures": {
+        "english": "Pressures count the times a player closes down an opponent who has or is receiving the ball. They measure defensive work rate without the ball, whether or not the ball is won.",
+        "portuguese": "As pressões contam as vezes em que um jogador fecha um adversário que tem ou está a receber a bola. Medem o trabalho defensivo sem bola, quer a bola seja recuperada ou não.",
+        "spanish": "Las presiones cuentan las veces en que un jugador cierra a un rival que tiene o está recibiendo el balón. Miden el trabajo defensivo sin balón, se recupere o no.",
+        "bulgarian": "Пресите отчитат колко пъти играчът притиска противник, който има или получава топката. Те мерят защитната работа без топка, независимо дали топката е спечелена."
+    },
+    "punches": {
+        "english": "Punches count the times a goalkeeper punches the ball clear instead of catching it. They show how a keeper deals with crowded boxes, although catching keeps possession.",
+        "portuguese": "Os socos contam as vezes em que um guarda-redes afasta a bola a soco em vez de a agarrar. Mostram como lida com áreas congestionadas, embora agarrar mantenha a posse.",
+        "spanish": "Los despejes de puños cuentan las veces en que un portero despeja el balón con los puños en lugar de atraparlo. Muestran cómo resuelve áreas congestionadas, aunque atrapar conserva la posesión.",
+        "bulgarian": "Избиванията с юмрук отчитат колко пъти вратарят избива топката вместо да я хване. Те показват как се справя при пренаселено наказателно поле, макар че хващането запазва владеенето."
+    },
+    "receivedPass": {
+        "english": "Received passes count the passes a player receives per 90 minutes. They show how often teammates look for a player, a sign of how well they find space and offer themselves.",
+        "portuguese": "Os passes recebidos contam os passes que um jogador recebe por 90 minutos. Mostram com que frequência os colegas o procuram, sinal de como encontra espaço e se oferece.",
+        "spanish": "Los pases recibidos cuentan los pases que recibe un jugador por 90 minutos. Muestran con qué frecuencia lo buscan los compañeros, señal de cómo encuentra espacios y se ofrece.",
+        "bulgarian": "Получените подавания отчитат подаванията, които играчът получава на 90 минути. Те показват колко често съотборниците го търсят, знак колко добре намира пространство и се предлага."
+    },
+    "runs": {
+        "english": "Runs count the times a goalkeeper comes off the line to deal with a ball or an attacker. They describe how far a keeper plays from goal; successful runs out show how well it goes.",
+        "portuguese": "As saídas contam as vezes em que um guarda-redes sai da linha para resolver uma bola ou enfrentar um atacante. Descrevem quão longe da baliza joga; as saídas bem-sucedidas mostram se resultam.",
+        "spanish": "Las salidas cuentan las veces en que un portero abandona la línea para resolver un balón o cerrar a un atacante. Describen lo lejos de la portería que juega; las salidas exitosas muestran si le salen bien.",
+        "bulgarian": "Излизанията отчитат колко пъти вратарят напуска линията, за да се справи с топка или нападател. Те описват колко далеч от вратата играе, а успешните излизания показват доколко се получава."
+    },
+    "savePercentage": {
+        "english": "Save percentage is the share of shots on target a goalkeeper saves. It is the classic shot-stopping measure, best adjusted for shot quality with goals prevented.",
+        "portuguese": "A percentagem de defesas é a parte dos remates enquadrados que um guarda-redes defende. É a medida clássica de defesa de remates, melhor ajustada à qualidade dos remates com os golos evitados.",
+        "spanish": "El porcentaje de paradas es la parte de disparos a puerta que detiene un portero. Es la medida clásica de paradas, mejor ajustada a la calidad del disparo con los goles evitados.",
+        "bulgarian": "Процентът спасявания е делът от ударите във вратата, които вратарят спасява. Това е класическият показател за спасяване на удари, по-точен, когато се коригира с предотвратените голове."
+    },
+    "saves": {
+        "english": "Saves count the shots on target a goalkeeper stops. A high number shows a busy keeper; save percentage and goals prevented show how good the saving is.",
+        "portuguese": "As defesas contam os remates enquadrados que um guarda-redes trava. Um número alto mostra um guarda-redes muito solicitado; a percentagem de defesas e os golos evitados mostram a sua qualidade.",
+        "spanish": "Las paradas cuentan los disparos a puerta que detiene un portero. Un número alto muestra un portero muy exigido; el porcentaje de paradas y los goles evitados muestran su calidad.",
+        "bulgarian": "Спасяванията отчитат ударите във вратата, които вратарят спира. Високият брой показва натоварен вратар, а процентът спасявания и предотвратените голове показват качеството."
+    },
+    "shots": {
+        "english": "Shots count the shots a player attempts per 90 minutes. They show how often a player gets into shooting positions; expected goals show the quality of those chances.",
+        "portuguese": "Os remates contam os remates que um jogador tenta por 90 minutos. Mostram com que frequência chega a posições de remate; os golos esperados mostram a qualidade dessas oportunidades.",
+        "spanish": "Los disparos cuentan los disparos que intenta un jugador por 90 minutos. Muestran con qué frecuencia llega a posiciones de tiro; los goles esperados muestran la calidad de esas ocasiones.",
+        "bulgarian": "Ударите отчитат ударите, които играчът опитва на 90 минути. Те показват колко често стига до позиция за удар, а очакваните голове показват качеството на тези положения."
+    },
+    "shotsFromBox": {
+        "english": "Shots from the box count the shots a player takes inside the penalty area. They point to attackers who get into high-quality positions rather than shooting from distance.",
+        "portuguese": "Os remates dentro da área contam os remates de um jogador dentro da grande área. Apontam atacantes que chegam a posições de qualidade em vez de rematar de longe.",
+        "spanish": "Los disparos dentro del área cuentan los disparos de un jugador dentro del área grande. Señalan a atacantes que llegan a posiciones de calidad en lugar de tirar de lejos.",
+        "bulgarian": "Ударите от наказателното поле отчитат ударите на играча в наказателното поле. Те открояват нападатели, които стигат до качествени позиции, вместо да стрелят отдалеч."
+    },
+    "shotsFromOutOfBox": {
+        "english": "Shots from outside the box count the shots a player takes from beyond the penalty area. They show a long-range threat, but such shots rarely score, so many of them can also mean poor shot selection.",
+        "portuguese": "Os remates de fora da área contam os remates de um jogador de fora da grande área. Mostram ameaça de meia distância, mas raramente dão golo, por isso muitos podem indicar má seleção de remate.",
+        "spanish": "Los disparos desde fuera del área cuentan los disparos de un jugador desde fuera del área grande. Muestran amenaza de media distancia, pero rara vez acaban en gol, así que muchos pueden indicar mala selección de tiro.",
+        "bulgarian": "Ударите извън наказателното поле отчитат ударите на играча отвъд наказателното поле. Те показват заплаха от далечна дистанция, но рядко водят до гол, затова многото такива удари може да означават лош избор."
+    },
+    "shotsOnTarget": {
+        "english": "Shots on target count the shots that would go in without a save, per 90 minutes; as a percentage they are the share of shots on target. They measure how accurately a player finishes.",
+        "portuguese": "Os remates enquadrados contam os remates que entrariam sem uma defesa, por 90 minutos; em percentagem, são a parte dos remates enquadrados. Medem a precisão de finalização de um jogador.",
+        "spanish": "Los disparos a puerta cuentan los disparos que entrarían sin una parada, por 90 minutos; en porcentaje son la parte de disparos a puerta. Miden la precisión de un jugador al definir.",
+        "bulgarian": "Ударите във вратата отчитат ударите, които биха влезли без спасяване, на 90 минути; в проценти това е делът на ударите във вратата. Те мерят точността на завършване на играча."
+    },
+    "shotsOnTargetAgainst": {
+        "english": "Shots on target against count the shots on target a goalkeeper faces. They show how much work the defence leaves the keeper and put saves and goals conceded in context.",
+        "portuguese": "Os remates enquadrados contra contam os remates enquadrados que um guarda-redes enfrenta. Mostram quanto trabalho a defesa lhe deixa e contextualizam as defesas e os golos sofridos.",
+        "spanish": "Los disparos a puerta en contra cuentan los disparos a puerta que recibe un portero. Muestran cuánto trabajo le deja la defensa y dan contexto a las paradas y los goles encajados.",
+        "bulgarian": "Ударите във вратата срещу вратаря отчитат ударите във вратата, които той посреща. Те показват колко работа му оставя защитата и поставят в контекст спасяванията и допуснатите голове."
+    },
+    "slidingTackles": {
+        "english": "Sliding tackles count the tackles a player makes by sliding in, per 90 minutes. They show last-ditch defending; the success rate shows whether they win the ball cleanly.",
+        "portuguese": "Os carrinhos contam os desarmes feitos em carrinho por 90 minutos. Mostram defesa in extremis; a taxa de sucesso mostra se ganham a bola de forma limpa.",
+        "spanish": "Las entradas en plancha cuentan las entradas deslizándose por 90 minutos. Muestran defensa al límite; la tasa de éxito muestra si ganan el balón limpiamente.",
+        "bulgarian": "Шпагатите отчитат отнемането с плъзгане на 90 минути. Те показват защита в последния момент, а успеваемостта показва дали играчът печели топката чисто."
+    },
+    "sprintDistance": {
+        "english": "Sprint distance is the distance a player covers at sprinting speed. It shows capacity for repeated high-speed running, important for wide players and pressing forwards.",
+        "portuguese": "A distância em sprint é a distância que um jogador percorre a velocidade de sprint. Mostra a capacidade de repetir corridas a alta velocidade, importante para alas e avançados que pressionam.",
+        "spanish": "La distancia en sprint es la distancia que un jugador recorre a velocidad de sprint. Muestra la capacidad de repetir carreras a alta velocidad, importante para jugadores de banda y delanteros que presionan.",
+        "bulgarian": "Разстоянието в спринт е разстоянието, което играчът пробягва със спринтова скорост. То показва способността за повтарящи се бързи бягания, важна за крилата и пресиращите нападатели."
+    },
+    "standingTackles": {
+        "english": "Standing tackles count the tackles a player makes while staying on their feet. They show controlled defending that wins the ball without going to ground.",
+        "portuguese": "Os desarmes de pé contam os desarmes de um jogador sem ir ao chão. Mostram uma defesa controlada que ganha a bola sem se atirar ao relvado.",
+        "spanish": "Las entradas de pie cuentan las entradas de un jugador sin ir al suelo. Muestran una defensa controlada que gana el balón sin tirarse al césped.",
+        "bulgarian": "Отнемането в стойка отчита отнемането, при което играчът остава на крака. То показва контролирана защита, която печели топката без падане на земята."
+    },
+    "successfulCrosses": {
+        "english": "Successful crosses is the share of a player's crosses that reach a teammate. It shows the quality of wide delivery, separate from how often a player crosses.",
+        "portuguese": "Os cruzamentos certos são a percentagem de cruzamentos de um jogador que chegam a um colega. Mostram a qualidade do cruzamento, independentemente de quantas vezes cruza.",
+        "spanish": "Los centros acertados son el porcentaje de centros de un jugador que llegan a un compañero. Muestran la calidad del centro, independientemente de cuántas veces centra.",
+        "bulgarian": "Успешните центрирания са делът от центриранията на играча, които достигат съотборник. Те показват качеството на центриранията, независимо колко често играчът центрира."
+    },
+    "successfulGoalKicks": {
+        "english": "Successful goal kicks is the share of a goalkeeper's goal kicks that reach a teammate. It shows how well a keeper restarts play, short or long.",
+        "portuguese": "Os pontapés de baliza certos são a percentagem de pontapés de baliza de um guarda-redes que chegam a um colega. Mostram como reinicia o jogo, curto ou longo.",
+        "spanish": "Los saques de puerta acertados son el porcentaje de saques de puerta de un portero que llegan a un compañero. Muestran cómo reinicia el juego, en corto o en largo.",
+        "bulgarian": "Успешните удари от вратата са делът от ударите от вратата на вратаря, които достигат съотборник. Те показват колко добре вратарят подновява играта, късо или дълго."
+    },
+    "successfulLongPasses": {
+        "english": "Successful long passes is the share of a player's long passes that reach a teammate. It shows whether a player's range of passing is also reliable.",
+        "portuguese": "Os passes longos certos são a percentagem de passes longos de um jogador que chegam a um colega. Mostram se o alcance de passe de um jogador também é fiável.",
+        "spanish": "Los pases largos acertados son el porcentaje de pases largos de un jugador que llegan a un compañero. Muestran si el alcance de pase de un jugador también es fiable.",
+        "bulgarian": "Успешните дълги подавания са делът от дългите подавания на играча, които достигат съотборник. Те показват дали дългият пас на играча е и надежден."
+    },
+    "successfulPressures": {
+        "english": "Successful pressures count the pressures after which the team wins the ball back within a few seconds. They show whether a player's pressing forces turnovers, not just effort.",
+        "portuguese": "As pressões bem-sucedidas contam as pressões após as quais a equipa recupera a bola em poucos segundos. Mostram se a pressão de um jogador força perdas de bola e não só esforço.",
+        "spanish": "Las presiones exitosas cuentan las presiones tras las que el equipo recupera el balón en pocos segundos. Muestran si la presión de un jugador provoca pérdidas y no solo esfuerzo.",
+        "bulgarian": "Успешните преси отчитат пресите, след които отборът си връща топката до няколко секунди. Те показват дали пресата на играча води до отнемане, а не само до усилие."
+    },
+    "successfulProgressivePasses": {
+        "english": "Successful progressive passes is the share of a player's progressive passes that reach a teammate. It shows how reliably a player moves the ball into dangerous areas.",
+        "portuguese": "Os passes progressivos certos são a percentagem de passes progressivos de um jogador que chegam a um colega. Mostram a fiabilidade com que leva a bola para zonas perigosas.",
+        "spanish": "Los pases progresivos acertados son el porcentaje de pases progresivos de un jugador que llegan a un compañero. Muestran con qué fiabilidad lleva el balón a zonas peligrosas.",
+        "bulgarian": "Успешните прогресивни подавания са делът от прогресивните подавания на играча, които достигат съотборник. Те показват колко надеждно играчът придвижва топката към опасни зони."
+    },
+    "successfulRunsOut": {
+        "english": "Successful runs out is the share of a goalkeeper's runs off the line that end with the ball claimed or cleared. It shows how safely a keeper sweeps behind the defence.",
+        "portuguese": "As saídas bem-sucedidas são a percentagem de saídas de um guarda-redes que terminam com a bola agarrada ou afastada. Mostram a segurança com que cobre as costas da defesa.",
+        "spanish": "Las salidas exitosas son el porcentaje de salidas de un portero que terminan con el balón atrapado o despejado. Muestran con qué seguridad cubre la espalda de la defensa.",
+        "bulgarian": "Успешните излизания са делът от излизанията на вратаря, които завършват с хваната или изчистена топка. Те показват колко сигурно вратарят покрива гърба на защитата."
+    },
+    "successfulSlidingTackles": {
+        "english": "Successful sliding tackles is the share of a player's sliding tackles that win the ball. It separates well-timed defenders from those who go to ground and miss.",
+        "portuguese": "Os carrinhos certos são a percentagem de carrinhos de um jogador que ganham a bola. Distinguem os defesas com bom timing dos que vão ao chão e falham.",
+        "spanish": "Las entradas en plancha acertadas son el porcentaje de entradas en plancha de un jugador que ganan el balón. Distinguen a los defensores con buen tiempo de los que van al suelo y fallan.",
+        "bulgarian": "Успешните шпагати са делът от шпагатите на играча, с които печели топката. Те отличават защитниците с добър момент от тези, които падат и пропускат."
+    },
+    "successfulSmartPasses": {
+        "english": "Successful smart passes is the share of a player's smart passes, creative passes that break the opponent's lines, that reach a teammate. It measures the accuracy of a player's riskiest creative passing.",
+        "portuguese": "Os passes inteligentes certos são a percentagem de passes inteligentes de um jogador, passes criativos que quebram linhas adversárias, que chegam a um colega. Medem a precisão do passe criativo mais arriscado.",
+        "spanish": "Los pases inteligentes acertados son el porcentaje de pases inteligentes de un jugador, pases creativos que rompen líneas rivales, que llegan a un compañero. Miden la precisión del pase creativo más arriesgado.",
+        "bulgarian": "Успешните умни подавания са делът от умните подавания на играча, креативни подавания, пробиващи линиите на противника, които достигат съотборник. Те мерят точността на най-рисковия креативен пас."
+    },
+    "successfulThroughPasses": {
+        "english": "Successful through passes is the share of a player's through balls, passes into space behind the defence, that reach a teammate. It shows how well a player finds runners in behind.",
+        "portuguese": "Os passes de rutura certos são a percentagem de passes em profundidade de um jogador, nas costas da defesa, que chegam a um colega. Mostram como encontra as desmarcações nas costas.",
+        "spanish": "Los pases al hueco acertados son el porcentaje de pases en profundidad de un jugador, a la espalda de la defensa, que llegan a un compañero. Muestran cómo encuentra los desmarques a la espalda.",
+        "bulgarian": "Успешните пасове в дълбочина са делът от подаванията на играча в пространството зад защитата, които достигат съотборник. Те показват колко добре играчът намира разбягващите се зад защитата."
+    },
+    "tackleSuccessRate": {
+        "english": "Tackle success rate is the share of a player's tackles that win the ball. It shows how clean and well-timed a player's tackling is.",
+        "portuguese": "A taxa de sucesso nos desarmes é a percentagem de desarmes de um jogador que ganham a bola. Mostra quão limpos e oportunos são os seus desarmes.",
+        "spanish": "La tasa de éxito en entradas es el porcentaje de entradas de un jugador que ganan el balón. Muestra lo limpias y oportunas que son sus entradas.",
+        "bulgarian": "Успеваемостта при отнемане е делът от опитите за отнемане на играча, с които печели топката. Тя показва колко чисто и навреме играчът отнема."
+    },
+    "tackles": {
+        "english": "Tackles count the attempts to win the ball from an opponent who has it. They show how often a player engages; tackle success rate shows how often it works.",
+        "portuguese": "Os desarmes contam as tentativas de ganhar a bola a um adversário que a tem. Mostram com que frequência um jogador entra no duelo; a taxa de sucesso mostra quantas vezes resulta.",
+        "spanish": "Las entradas cuentan los intentos de quitar el balón a un rival que lo tiene. Muestran con qué frecuencia un jugador disputa; la tasa de éxito muestra cuántas veces funciona.",
+        "bulgarian": "Отнемането отчита опитите играчът да вземе топката от противник, който я владее. То показва колко често играчът се намесва, а успеваемостта показва колко често успява."
+    },
+    "topSpeed": {
+        "english": "Top speed is the highest speed a player reaches in a match, usually in km/h. It shows raw pace, useful for judging who can run in behind or recover defensively.",
+        "portuguese": "A velocidade máxima é a maior velocidade que um jogador atinge num jogo, normalmente em km/h. Mostra a velocidade pura, útil para avaliar quem consegue atacar a profundidade ou recuperar defensivamente.",
+        "spanish": "La velocidad máxima es la mayor velocidad que alcanza un jugador en un partido, normalmente en km/h. Muestra la velocidad pura, útil para valorar quién puede atacar el espacio o recuperar en defensa.",
+        "bulgarian": "Максималната скорост е най-високата скорост, която играчът достига в мач, обикновено в км/ч. Тя показва чистата бързина, полезна при преценка кой може да атакува зад защитата или да се връща в защита."
+    },
+    "touches": {
+        "english": "Touches count every time a player plays the ball. They show how involved a player is in the game and where on the pitch the team uses them.",
+        "portuguese": "Os toques contam todas as vezes em que um jogador joga a bola. Mostram o envolvimento de um jogador no jogo e onde a equipa o utiliza no campo.",
+        "spanish": "Los toques cuentan todas las veces en que un jugador juega el balón. Muestran cuánto participa en el juego y dónde lo utiliza el equipo en el campo.",
+        "bulgarian": "Докосванията отчитат всеки път, когато играчът играе топката. Те показват колко е ангажиран в играта и къде на терена го използва отборът."
+    }
+}
+
+# Statistic-type prefixes used by the SearchParameters fields
+PARAMETER_PREFIXES = ("average_", "total_", "percent_")
+
+# Tool used to ask Claude for missing explanations in all languages at once
+GLOSSARY_TOOL = {
+    "name": "write_glossary_entries",
+    "description": "Write short explanations of football statistics for a scouting glossary",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "entries": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": dict(
+                        {"key": {"type": "string"}},
+                        **{language: {"type": "string"} for language in SUPPORTED_LANGUAGES}
+                    ),
+                    "required": ["key"] + SUPPORTED_LANGUAGES
+                }
+            }
+        },
+        "required": ["entries"]
+    }
+}
+
+
+def humanize(metric: str) -> str:
+    """Turn a metric key into a display name ("longPasses" -> "Long passes")"""
+    words = normalize_term(metric).split()
+    return " ".join(words).capitalize() if words else metric
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Collect every metric known to the system with its aliases and description
+
+    Returns:
+        Dictionary mapping metric key to {"aliases", "description", "category"}
+    """
+    metrics: Dict[str, Dict[str, Any]] = {}
+
+    def add(metric: str, alias: str, description: str = None, category: str = None) -> None:
+        entry = metrics.setdefault(metric, {"aliases": set(), "description": None, "category": None})
+        entry["aliases"].add(alias)
+        entry["description"] = entry["description"] or description
+        entry["category"] = entry["category"] or category
+
+    for field_name, field in SearchParameters.model_fields.items():
+        if field_name.startswith(PARAMETER_PREFIXES):
+            metric = field_name.split("_", 1)[1]
+            add(metric, field_name, field.description)
+
+    for category, category_metrics in METRIC_CATEGORIES.items():
+        for metric in category_metrics:
+            add(metric, metric, category=category)
+
+    for style_metrics in TACTICAL_STYLES.values():
+        for metric in style_metrics:
+            add(metric, metric)
+
+    return metrics
+
+
+def build_glossary(offline: bool) -> Dict[str, Any]:
+    """
+    Build the glossary file contents
+
+    Args:
+        offline: Skip the Claude pass for missing explanations
+
+    Returns:
+        Parsed glossary file contents
+    """
+    glossary = StatsGlossary({
+        "schema_version": GLOSSARY_SCHEMA_VERSION,
+        "entries": {
+            key: {
+                "name": seed["name"],
+                "aliases": list(seed["aliases"]),
+                "category": None,
+                "explanations": dict(seed["explanations"]),
+                "sources": {language: "curated" for language in seed["explanations"]}
+            }
+            for key, seed in CURATED_ENTRIES.items()
+        }
+    })
+
+    # Merge every spelling into an existing entry or create one per new metric
+    for metric, info in collect_metrics().items():
+        key = glossary.resolve(metric)
+        if key is None:
+            key = metric
+            if "_" in metric:
+                # Snake-case tactical keys become camelCase keys like the player stats
+                words = strip_modifiers(normalize_term(metric)).split()
+                key = words[0] + "".join(word.capitalize() for word in words[1:])
+            glossary.entries[key] = {
+                "name": CURATED_NAMES.get(key, humanize(key)),
+                "aliases": [],
+                "category": None,
+                "explanations": {},
+                "sources": {}
+            }
+
+        entry = glossary.entries[key]
+        entry["category"] = entry["category"] or info["category"]
+        for alias in sorted(info["aliases"]) + CURATED_ALIASES.get(key, []):
+            if alias != key and alias not in entry["aliases"]:
+                entry["aliases"].append(alias)
+        for language, explanation in CURATED_EXPLANATIONS.get(key, {}).items():
+            if language not in entry["explanations"]:
+                entry["explanations"][language] = explanation
+                entry["sources"][language] = "curated"
+        if info["description"] and "english" not in entry["explanations"]:
+            entry["explanations"]["english"] = f"{entry['name']}: {info['description']}."
+            entry["sources"]["english"] = "template"
+
+        glossary._index_entry(key, entry)
+
+    if not offline:
+        fill_missing_with_claude(glossary)
+
+    data = glossary.to_dict()
+    data["generated_at"] = data["updated_at"]
+    return data
+
+
+def fill_missing_with_claude(glossary: StatsGlossary, batch_size: int = 10) -> None:
+    """Ask Claude for explanations that are missing or only templated"""
+    from services.claude_api import call_claude_api, get_anthropic_api_key
+
+    api_key = get_anthropic_api_key()
+    if not api_key:
+        print("ANTHROPIC_API_KEY not set, skipping Claude pass (use --offline to silence)")
+        return
+
+    pending = [
+        key for key, entry in glossary.entries.items()
+        if any(entry["sources"].get(language) in (None, "template") for language in SUPPORTED_LANGUAGES)
+    ]
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        listing = "\n".join(
+            f"- {key}: {glossary.entries[key]['name']} (also known as: {', '.join(glossary.entries[key]['aliases'][:5]) or '-'})"
+            for key in batch
+        )
+        response = call_claude_api(
+            api_key=api_key,
+            model=DEFAULT_MODEL,
+            max_tokens=4096,
+            system="You are a football analytics expert writing a scouting glossary. "
+                   "Explain each statistic in two sentences: what it measures and how scouts use it.",
+            messages=[{"role": "user", "content": f"Write glossary entries in {', '.join(SUPPORTED_LANGUAGES)} for:\n{listing}"}],
+            tools=[GLOSSARY_TOOL],
+            tool_choice={"type": "tool", "name": "write_glossary_entries"}
+        )
+
+        for content in response.content:
+            if content.type != "tool_use":
+                continue
+            for item in content.input.get("entries", []):
+                entry = glossary.entries.get(item.get("key"))
+                if entry is None:
+                    continue
+                for language in SUPPORTED_LANGUAGES:
+                    if item.get(language) and entry["sources"].get(language) in (None, "template"):
+                        entry["explanations"][language] = item[language]
+                        entry["sources"][language] = "llm"
+
+        print(f"Filled {min(start + batch_size, len(pending))}/{len(pending)} entries")
+
+
+def main() -> None:
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    offline = "--offline" in sys.argv
+    output_path = args[0] if args else GLOSSARY_FILE
+
+    data = build_glossary(offline)
+
+    import json
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+    entries = data["entries"]
+    complete = sum(1 for entry in entries.values() if all(language in entry["explanations"] for language in SUPPORTED_LANGUAGES))
+    print(f"Wrote {len(entries)} entries ({complete} in all languages) to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+End-to-end load generator for the KatenaScout backend
+
+Replays the conversation scripts in conversations.json with a number of
+concurrent virtual users and reports p50/p95/p99 latency per endpoint and per
+stage. Stage timings come from the Server-Timing header set by the backend
+(intent, parameters, search, narrative, each Claude call, ...). Streaming
+endpoints also report time to the first event.
+
+Run the backend against the mock API so no credits are spent:
+
+    python loadtest/mock_anthropic.py --port 8089 &
+    ANTHROPIC_BASE_URL=http://localhost:8089 python app.py &
+    python loadtest/load_generator.py --base-url http://localhost:5000 --users 20 --duration 120 \\
+        --mock-url http://localhost:8089
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+DEFAULT_SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conversations.json")
+
+_SERVER_TIMING = re.compile(r"([\w.]+);dur=([\d.]+)")
+_PLAYERS_PLACEHOLDER = re.compile(r"^\$players:(\d+)$")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Parse a Server-Timing header into {stage: milliseconds}"""
+    return {name: float(duration) for name, duration in _SERVER_TIMING.findall(header or "")}
+
+
+class Results:
+    """Latency samples collected by all virtual users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints: Dict[str, List[float]] = {}
+        self.first_event: Dict[str, List[float]] = {}
+        self.stages: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.conversations = 0
+
+    def add(self, endpoint: str, elapsed_ms: float, ok: bool, stages: Dict[str, float],
+            first_event_ms: Optional[float] = None) -> None:
+        with self.lock:
+            self.endpoints.setdefault(endpoint, []).append(elapsed_ms)
+            if first_event_ms is not None:
+                self.first_event.setdefault(endpoint, []).append(first_event_ms)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            for name, duration in stages.items():
+                self.stages.setdefault(name, []).append(duration)
+
+    def summary(self) -> Dict[str, Any]:
+        def describe(values: List[float]) -> Dict[str, float]:
+            return {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+                "max_ms": round(max(values), 1) if values else 0.0
+            }
+
+        with self.lock:
+            return {
+                "conversations": self.conversations,
+                "endpoints": {
+                    name: dict(describe(values), errors=self.errors.get(name, 0))
+                    for name, values in sorted(self.endpoints.items())
+                },
+                "first_event": {name: describe(values) for name, values in sorted(self.first_event.items())},
+                "stages": {name: describe(values) for name, values in sorted(self.stages.items())}
+            }
+
+
+def _fill_placeholders(body: Dict[str, Any], session_id: str, last_players: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add the session id and substitute "$players:N" with player ids from the last results"""
+    filled = {"session_id": session_id}
+    for key, value in body.items():
+        match = _PLAYERS_PLACEHOLDER.match(value) if isinstance(value, str) else None
+        if match:
+            count = int(match.group(1))
+            value = [str(player.get("wyId")) for player in last_players[:count]]
+        filled[key] = value
+    return filled
+
+
+def _post_json(http: requests.Session, url: str, body: Dict[str, Any], timeout: float) -> Tuple[bool, Dict[str, Any], Dict[str, float]]:
+    response = http.post(url, json=body, timeout=timeout)
+    stages = parse_server_timing(response.headers.get("Server-Timing"))
+    try:
+        data = response.json()
+    except ValueError:
+        return False, {}, stages
+    return response.status_code == 200 and data.get("success", False), data, stages
+
+
+def _post_stream(http: requests.Session, url: str, body: Dict[str, Any], timeout: float,
+                 started: float) -> Tuple[bool, Dict[str, Any], Optional[float]]:
+    """Consume an SSE response; returns (ok, collected data, time to first event in ms)"""
+    first_event_ms = None
+    data: Dict[str, Any] = {"players": []}
+    ok = False
+    event = None
+
+    with http.post(url, json=body, timeout=timeout, stream=True) as response:
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+                if first_event_ms is None:
+                    first_event_ms = (time.perf_counter() - started) * 1000
+            elif line.startswith("data:") and event:
+                payload = json.loads(line[len("data:"):].strip())
+                if event == "players":
+                    data["players"] = payload.get("players", [])
+                elif event == "response":
+                    data.update(payload)
+                elif event == "done":
+                    ok = True
+                elif event == "error":
+                    ok = False
+                    break
+
+    return ok, data, first_event_ms
+
+
+def run_conversation(base_url: str, script: Dict[str, Any], results: Results, think_time: float, timeout: float) -> None:
+    """Replay one conversation script with a fresh session"""
+    http = requests.Session()
+    session_id = f"loadtest-{uuid.uuid4().hex[:12]}"
+    last_players: List[Dict[str, Any]] = []
+
+    for step in script["steps"]:
+        endpoint = step["endpoint"]
+        body = _fill_placeholders(step.get("body", {}), session_id, last_players)
+        url = f"{base_url}{endpoint}"
+
+        started = time.perf_counter()
+        first_event_ms = None
+        stages: Dict[str, float] = {}
+        try:
+            if endpoint.endswith("/stream"):
+                ok, data, first_event_ms = _post_stream(http, url, body, timeout, started)
+            else:
+                ok, data, stages = _post_json(http, url, body, timeout)
+        except (requests.RequestException, ValueError) as e:
+            print(f"{endpoint} failed: {str(e)}")
+            ok, data = False, {}
+
+        results.add(endpoint, (time.perf_counter() - started) * 1000, ok, stages, first_event_ms)
+
+        if data.get("players"):
+            last_players = data["players"]
+
+        if think_time:
+            time.sleep(random.uniform(0, 2 * think_time))
+
+    with results.lock:
+        results.conversations += 1
+
+
+def virtual_user(base_url: str, scripts: List[Dict[str, Any]], results: Results, deadline: float,
+                 iterations: Optional[int], think_time: float, timeout: float) -> None:
+    """Pick weighted scripts until the deadline or the iteration count is reached"""
+    weights = [script.get("weight", 1) for script in scripts]
+    done = 0
+    while time.time() < deadline and (iterations is None or done < iterations):
+        script = random.choices(scripts, weights=weights)[0]
+        run_conversation(base_url, script, results, think_time, timeout)
+        done += 1
+
+
+def print_report(summary: Dict[str, Any], elapsed: float, mock_stats: Optional[Dict[str, Any]]) -> None:
+    def table(title: str, rows: Dict[str, Dict[str, Any]], with_errors: bool = False) -> None:
+        if not rows:
+            return
+        print(f"\n{title}")
+        header = f"{'name':<34}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        print(header + (f"{'errors':>8}" if with_errors else ""))
+        for name, row in rows.items():
+            line = f"{name:<34}{row['count']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}"
+            print(line + (f"{row['errors']:>8}" if with_errors else ""))
+
+    print(f"\nCompleted {summary['conversations']} conversations in {elapsed:.1f}s")
+    table("Endpoints (full response)", summary["endpoints"], with_errors=True)
+    table("Streaming endpoints (first event)", summary["first_event"])
+    table("Stages (Server-Timing)", summary["stages"])
+
+    if mock_stats:
+        print(f"\nMock API: requests={mock_stats.get('requests')} injected errors={mock_stats.get('errors')}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay conversation scripts against the KatenaScout backend")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--scripts", default=DEFAULT_SCRIPTS, help="Conversation scripts JSON file")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Run time in seconds")
+    parser.add_argument("--iterations", type=int, default=None, help="Conversations per user (overrides --duration)")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between steps in seconds")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--mock-url", default=None, help="Mock Anthropic server to collect stats from")
+    parser.add_argument("--output", default=None, help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    with open(args.scripts, "r", encoding="utf-8") as file:
+        scripts = json.load(file)["scripts"]
+
+    if args.mock_url:
+        requests.post(f"{args.mock_url}/mock/reset", timeout=5)
+
+    results = Results()
+    deadline = float("inf") if args.iterations else time.time() + args.duration
+    started = time.time()
+
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for _ in range(args.users):
+            pool.submit(virtual_user, args.base_url.rstrip("/"), scripts, results, deadline,
+                        args.iterations, args.think_time, args.timeout)
+
+    summary = results.summary()
+    mock_stats = requests.get(f"{args.mock_url}/mock/stats", timeout=5).json() if args.mock_url else None
+    if mock_stats:
+        summary["mock"] = mock_stats
+
+    print_report(summary, time.time() - started, mock_stats)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+"""
+Mock Anthropic Messages API for local load testing
+
+Implements the subset of POST /v1/messages used by services.claude_api:
+- tool_use responses for every tool the backend forces via tool_choice, with
+  plausible answers for classify_intent, define_scouting_parameters and the
+  entity extraction tools, and schema-derived answers for any other tool
+- text responses, non-streaming and streaming (server-sent events)
+- usage blocks, including prompt cache reads/writes for cache_control blocks
+- configurable latency distributions (global and per tool)
+- error injection: 429 with Retry-After and anthropic-ratelimit-* headers,
+  500, 529 overloaded, slow responses past the client timeout, and errors in
+  the middle of a stream
+
+Control endpoints:
+    GET  /mock/stats    request counts, injected errors and served latency percentiles
+    GET  /mock/config   current configuration
+    POST /mock/config   update configuration (same keys as the command-line options)
+    POST /mock/reset    clear statistics and the prompt cache
+
+Usage:
+    python loadtest/mock_anthropic.py --port 8089 \\
+        --latency lognormal:900,0.4 --tool-latency classify_intent=lognormal:350,0.3 \\
+        --errors 429=0.02,500=0.01,529=0.01,timeout=0.002,stream=0.01
+
+    ANTHROPIC_BASE_URL=http://localhost:8089 python app.py
+
+Latency specs are in milliseconds: fixed:MS, uniform:MIN,MAX, normal:MEAN,STD
+or lognormal:MEDIAN,SIGMA.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+# Error kinds that can be injected, with their HTTP status and Anthropic error type
+ERROR_KINDS = {
+    "429": (429, "rate_limit_error", "Number of requests has exceeded your rate limit"),
+    "500": (500, "api_error", "Internal server error"),
+    "529": (529, "overloaded_error", "Overloaded"),
+    "timeout": (500, "api_error", "Request took too long"),
+    "stream": (200, "overloaded_error", "Overloaded")
+}
+
+# Keyword heuristics used to answer classify_intent like a real model would
+INTENT_KEYWORDS = [
+    ("player_comparison", ["compare", "comparison", " vs ", "versus", "comparar", "сравн", "better than"]),
+    ("explain_stats", ["explain", "what is", "what are", "what does", "meaning", "explica", "o que é", "qué es", "обясн"]),
+    ("player_search", ["find", "search", "looking for", "need a", "i need", "better at", "show me", "busco", "procuro", "encontr", "намери", "търся"])
+]
+
+# Keyword heuristics for define_scouting_parameters: (keywords, position codes, description words, stats)
+SEARCH_PROFILES = [
+    (["striker", "forward", "goalscorer", "atacante", "delantero", "нападател"], ["cf"], ["scoring", "offensive"],
+     ["total_goals", "total_xgShot", "average_shots", "percent_goalConversion"]),
+    (["winger", "extremo", "ponta", "крило"], ["lw", "rw", "lwf", "rwf"], ["dribbling", "creation"],
+     ["average_successfulDribbles", "average_crosses", "total_xgAssist", "average_progressiveRun"]),
+    (["centre back", "center back", "defender", "zagueiro", "central", "защитник"], ["cb", "lcb", "rcb"], ["defensive", "aerial"],
+     ["percent_aerialDuelsWon", "percent_defensiveDuelsWon", "average_interceptions", "total_clearances"]),
+    (["full back", "fullback", "lateral", "бек"], ["lb", "rb", "lwb", "rwb"], ["transition", "offensive"],
+     ["average_crosses", "average_progressiveRun", "percent_defensiveDuelsWon"]),
+    (["goalkeeper", "keeper", "goleiro", "portero", "вратар"], ["gk"], ["sweeping", "distribution"],
+     ["percent_gkSaves", "average_gkSaves", "percent_gkSuccessfulExits"]),
+    (["midfielder", "playmaker", "meio-campo", "centrocampista", "полузащитник"], ["cmf", "lcmf", "rcmf", "dmf"], ["passing", "playmaking"],
+     ["average_passes", "percent_successfulPasses", "average_progressivePasses", "average_keyPasses"])
+]
+
+STAT_TERMS = ["xG", "xA", "progressive passes", "PPDA", "defensive duels", "through passes", "key passes", "ball recoveries"]
+
+NARRATIVE_SENTENCES = [
+    "Based on your criteria, these players stand out in the current dataset.",
+    "{name} combines strong output in the selected metrics with consistent minutes.",
+    "{name} is particularly effective in progressive actions and ranks well above the positional average.",
+    "{name} offers a different profile, with excellent numbers in duels and ball recoveries.",
+    "All of them fit the age and position filters you asked for.",
+    "Would you like me to refine the search or compare any of these players in detail?"
+]
+
+
+class LatencyDistribution:
+    """Latency distribution parsed from a spec string; samples are in seconds"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, values = spec.partition(":")
+        self.kind = kind.strip()
+        self.values = [float(value) for value in values.split(",") if value.strip()]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        """Draw one latency in seconds"""
+        if self.kind == "fixed":
+            ms = self.values[0]
+        elif self.kind == "uniform":
+            ms = random.uniform(self.values[0], self.values[1])
+        elif self.kind == "normal":
+            ms = random.gauss(self.values[0], self.values[1])
+        else:
+            ms = random.lognormvariate(math.log(self.values[0]), self.values[1])
+        return max(0.0, ms) / 1000
+
+
+class MockState:
+    """Configuration and statistics shared by all request threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = LatencyDistribution("lognormal:800,0.4")
+        self.tool_latency: Dict[str, LatencyDistribution] = {}
+        self.error_rates: Dict[str, float] = {}
+        self.tokens_per_second = 80.0
+        self.timeout_seconds = 35.0
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests: Dict[str, int] = {}
+            self.errors: Dict[str, int] = {}
+            self.latencies: Dict[str, List[float]] = {}
+            self.cached_prefixes = set()
+            self.message_count = 0
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Apply configuration using the command-line option names"""
+        with self.lock:
+            if config.get("latency"):
+                self.latency = LatencyDistribution(config["latency"])
+            if config.get("tool_latency") is not None:
+                self.tool_latency = {
+                    name: LatencyDistribution(spec) for name, spec in _parse_pairs(config["tool_latency"]).items()
+                }
+            if config.get("errors") is not None:
+                self.error_rates = {kind: float(rate) for kind, rate in _parse_pairs(config["errors"]).items()}
+                unknown = set(self.error_rates) - set(ERROR_KINDS)
+                if unknown:
+                    raise ValueError(f"Unknown error kinds: {sorted(unknown)}")
+            if config.get("tokens_per_second"):
+                self.tokens_per_second = float(config["tokens_per_second"])
+            if config.get("timeout_seconds"):
+                self.timeout_seconds = float(config["timeout_seconds"])
+
+    def describe(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "latency": self.latency.spec,
+                "tool_latency": ",".join(f"{name}={dist.spec}" for name, dist in self.tool_latency.items()),
+                "errors": ",".join(f"{kind}={rate}" for kind, rate in self.error_rates.items()),
+                "tokens_per_second": self.tokens_per_second,
+                "timeout_seconds": self.timeout_seconds
+            }
+
+    def latency_for(self, task: str) -> float:
+        with self.lock:
+            distribution = self.tool_latency.get(task, self.latency)
+        return distribution.sample()
+
+    def pick_error(self, streaming: bool) -> Optional[str]:
+        """Randomly pick an error kind to inject, or None"""
+        with self.lock:
+            rates = dict(self.error_rates)
+        roll = random.random()
+        for kind, rate in rates.items():
+            if kind == "stream" and not streaming:
+                continue
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def record(self, task: str, outcome: str, seconds: float) -> None:
+        with self.lock:
+            self.requests[task] = self.requests.get(task, 0) + 1
+            if outcome != "ok":
+                self.errors[outcome] = self.errors.get(outcome, 0) + 1
+            self.latencies.setdefault(task, []).append(seconds * 1000)
+
+    def cache_usage(self, body: Dict[str, Any], input_tokens: int) -> Dict[str, int]:
+        """Simulate prompt caching for requests with cache_control blocks"""
+        system = body.get("system")
+        if not isinstance(system, list) or not any(block.get("cache_control") for block in system):
+            return {"input_tokens": input_tokens, "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+
+        prefix = json.dumps([body.get("tools"), system[0]], sort_keys=True)
+        prefix_tokens = min(input_tokens, len(prefix) // 4)
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        with self.lock:
+            hit = key in self.cached_prefixes
+            self.cached_prefixes.add(key)
+        return {
+            "input_tokens": input_tokens - prefix_tokens,
+            "cache_creation_input_tokens": 0 if hit else prefix_tokens,
+            "cache_read_input_tokens": prefix_tokens if hit else 0
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            latencies = {
+                task: {
+                    "count": len(values),
+                    "p50_ms": round(percentile(values, 50), 1),
+                    "p95_ms": round(percentile(values, 95), 1),
+                    "p99_ms": round(percentile(values, 99), 1)
+                }
+                for task, values in self.latencies.items()
+            }
+            return {
+                "requests": dict(self.requests),
+                "errors": dict(self.errors),
+                "latency": latencies,
+                "cached_prefixes": len(self.cached_prefixes)
+            }
+
+
+def _parse_pairs(spec: str) -> Dict[str, str]:
+    """Parse "a=x,b=y" (values may contain commas after a colon, e.g. lognormal:800,0.4)"""
+    pairs = {}
+    for match in re.finditer(r"([\w-]+)=([^=]+?)(?=,[\w-]+=|$)", spec or ""):
+        pairs[match.group(1)] = match.group(2)
+    return pairs
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _last_user_text(body: Dict[str, Any]) -> str:
+    """Get the text of the last user message"""
+    for message in reversed(body.get("messages", [])):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, str):
+            return content
+        return " ".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return ""
+
+
+def _example_from_schema(schema: Dict[str, Any]) -> Any:
+    """Build a minimal value that satisfies a JSON schema"""
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema and schema["default"] is not None:
+        return schema["default"]
+
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _example_from_schema(prop) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_example_from_schema(schema.get("items", {"type": "string"}))]
+    if kind == "number":
+        return 0.5
+    if kind == "integer":
+        return 1
+    if kind == "boolean":
+        return False
+    return "example"
+
+
+def build_tool_input(tool: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Answer a forced tool call the way the real model plausibly would"""
+    name = tool.get("name")
+    lowered = f" {text.lower()} "
+
+    if name == "classify_intent":
+        for intent, keywords in INTENT_KEYWORDS:
+            if any(keyword in lowered for keyword in keywords):
+                return {"intent": intent, "confidence": round(random.uniform(0.8, 0.98), 2)}
+        return {"intent": "casual_conversation", "confidence": 0.85}
+
+    if name == "define_scouting_parameters":
+        for keywords, positions, words, stats in SEARCH_PROFILES:
+            if any(keyword in lowered for keyword in keywords):
+                break
+        else:
+            keywords, positions, words, stats = SEARCH_PROFILES[-1]
+        params = {"position_codes": positions, "key_description_word": words}
+        params.update({stat: True for stat in stats})
+        age = re.search(r"(?:under|below|younger than|menos de|до)\s*(\d{2})", lowered)
+        if age:
+            params["age"] = int(age.group(1))
+        return params
+
+    if name == "extract_comparison_players":
+        return {"player_names": [], "compare_top_n": True, "top_n": 2}
+
+    if name == "extract_stats_to_explain":
+        stats = [term for term in STAT_TERMS if term.lower() in lowered]
+        return {"stats": stats or ["xG"]}
+
+    if name == "explain_statistics":
+        match = re.search(r"statistics:\s*(.+)$", text.strip())
+        stats = [stat.strip() for stat in match.group(1).split(",")] if match else ["xG"]
+        return {"explanations": [
+            {"stat": stat, "explanation": f"{stat} is a football metric used by scouts to evaluate players."}
+            for stat in stats
+        ]}
+
+    if name == "correct_position_codes":
+        return {"corrected_postion": ["cmf"]}
+
+    return _example_from_schema(tool.get("input_schema", {}))
+
+
+def build_text(text: str) -> str:
+    """Generate a scouting narrative, naming players from the prompt's table when present"""
+    rows = [line for line in text.splitlines() if "|" in line]
+    names = [row.split("|", 1)[0] for row in rows[1:]] or ["The first option", "The second option", "The third option"]
+
+    sentences = [NARRATIVE_SENTENCES[0]]
+    for index, name in enumerate(names[:3]):
+        sentences.append(NARRATIVE_SENTENCES[1 + index].format(name=name))
+    sentences.extend(NARRATIVE_SENTENCES[4:])
+    return " ".join(sentences)
+
+
+def _error_response(kind: str):
+    status, error_type, message = ERROR_KINDS[kind]
+    headers = {}
+    if kind == "429":
+        reset_at = datetime.now(timezone.utc) + timedelta(seconds=1)
+        headers = {
+            "retry-after": "1",
+            "anthropic-ratelimit-requests-remaining": "0",
+            "anthropic-ratelimit-requests-reset": reset_at.isoformat(timespec="seconds").replace("+00:00", "Z")
+        }
+    body = {"type": "error", "error": {"type": error_type, "message": message}}
+    return Response(json.dumps(body), status=status, headers=headers, mimetype="application/json")
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(state: MockState) -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/v1/messages", methods=["POST"])
+    def messages():
+        started = time.perf_counter()
+        body = request.get_json(force=True)
+        streaming = bool(body.get("stream"))
+        text = _last_user_text(body)
+
+        tool_choice = body.get("tool_choice") or {}
+        tool = next((tool for tool in body.get("tools", []) if tool.get("name") == tool_choice.get("name")), None)
+        task = tool["name"] if tool else ("stream" if streaming else "text")
+
+        error = state.pick_error(streaming)
+        if error == "timeout":
+            time.sleep(state.timeout_seconds)
+        if error and error != "stream":
+            time.sleep(state.latency_for(task) / 4)
+            state.record(task, error, time.perf_counter() - started)
+            return _error_response(error)
+
+        with state.lock:
+            state.message_count += 1
+            message_id = f"msg_mock_{state.message_count:08d}"
+
+        input_tokens = max(1, len(json.dumps(body)) // 4)
+        usage = state.cache_usage(body, input_tokens)
+
+        if tool:
+            content = [{"type": "tool_use", "id": f"toolu_{message_id}", "name": tool["name"], "input": build_tool_input(tool, text)}]
+            output_tokens = max(1, len(json.dumps(content)) // 4)
+        else:
+            content = [{"type": "text", "text": build_text(text)}]
+            output_tokens = max(1, len(content[0]["text"]) // 4)
+        usage["output_tokens"] = output_tokens
+
+        message = {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": content,
+            "stop_reason": "tool_use" if tool else "end_turn",
+            "usage": usage
+        }
+
+        if not streaming:
+            time.sleep(state.latency_for(task))
+            state.record(task, "ok", time.perf_counter() - started)
+            return jsonify(message)
+
+        return Response(
+            stream_with_context(_stream(state, message, task, started, error == "stream")),
+            mimetype="text/event-stream"
+        )
+
+    @app.route("/mock/stats", methods=["GET"])
+    def mock_stats():
+        return jsonify(state.stats())
+
+    @app.route("/mock/config", methods=["GET", "POST"])
+    def mock_config():
+        if request.method == "POST":
+            try:
+                state.configure(request.get_json(force=True) or {})
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        return jsonify(state.describe())
+
+    @app.route("/mock/reset", methods=["POST"])
+    def mock_reset():
+        state.reset()
+        return jsonify({"reset": True})
+
+    return app
+
+
+def _stream(state: MockState, message: Dict[str, Any], task: str, started: float, fail: bool) -> Iterator[str]:
+    """Emit a message as Messages API server-sent events"""
+    text = message["content"][0].get("text", "")
+    start_message = dict(message, content=[], usage=dict(message["usage"], output_tokens=1))
+
+    # Time to first token
+    time.sleep(state.latency_for(task))
+    yield _sse("message_start", {"type": "message_start", "message": start_message})
+    yield _sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+    yield _sse("ping", {"type": "ping"})
+
+    words = text.split(" ")
+    fail_at = random.randint(1, max(1, len(words) - 1)) if fail else -1
+    delay = 1 / state.tokens_per_second
+    for index, word in enumerate(words):
+        if index == fail_at:
+            state.record(task, "stream", time.perf_counter() - started)
+            yield _sse("error", {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+            return
+        chunk = word if index == 0 else f" {word}"
+        yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}})
+        time.sleep(delay)
+
+    yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+    yield _sse("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": message["usage"]["output_tokens"]}})
+    yield _sse("message_stop", {"type": "message_stop"})
+    state.record(task, "ok", time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Anthropic Messages API for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:800,0.4", help="Default latency distribution (ms)")
+    parser.add_argument("--tool-latency", default="", help="Per-tool latency, e.g. classify_intent=lognormal:350,0.3")
+    parser.add_argument("--errors", default="", help="Error rates, e.g. 429=0.02,500=0.01,529=0.01,timeout=0.001,stream=0.01")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Streaming speed")
+    parser.add_argument("--timeout-seconds", type=float, default=35.0, help="Delay used for injected timeouts")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    state = MockState()
+    state.configure({
+        "latency": args.latency,
+        "tool_latency": args.tool_latency,
+        "errors": args.errors,
+        "tokens_per_second": args.tokens_per_second,
+        "timeout_seconds": args.timeout_seconds
+    })
+
+    print(f"Mock Anthropic API listening on http://{args.host}:{args.port} with {state.describe()}")
+    create_app(state).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
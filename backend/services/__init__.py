@@ -2,7 +2,7 @@
 Services module for KatenaScout backend
 """
 # Import all services
-from services.claude_api import call_claude_api, get_anthropic_api_key
+from services.claude_api import call_claude_api, stream_claude_api, get_anthropic_api_key
 from services.data_service import (
     find_player_by_id,
     get_player_database,
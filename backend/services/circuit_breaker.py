@@ -0,0 +1,140 @@
+"""
+Circuit breaker for upstream API calls
+
+When the upstream API keeps failing, the breaker opens and calls are rejected
+immediately (callers return their fallback) instead of each worker spending
+seconds on retries. After a cool-down a limited number of probe calls are let
+through (half-open); a successful probe closes the breaker again.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open"""
+    pass
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker with closed, open and half-open states"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            recovery_timeout: Seconds to stay open before letting probe calls through
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._open_until = 0.0
+        self._half_open_calls = 0
+
+        self._times_opened = 0
+        self._rejected = 0
+        self._successes = 0
+        self._failures = 0
+
+    def _refresh_state(self, now: float) -> None:
+        """Move from open to half-open once the cool-down has elapsed (lock held)"""
+        if self._state == OPEN and now >= self._open_until:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+
+    def _trip(self, now: float, cool_down: float) -> None:
+        """Open the breaker (lock held)"""
+        if self._state != OPEN:
+            self._times_opened += 1
+            print(f"Circuit breaker opened after {self._consecutive_failures} consecutive failures")
+        self._state = OPEN
+        self._opened_at = now
+        self._open_until = max(self._open_until, now + cool_down)
+        self._half_open_calls = 0
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go upstream
+
+        Returns:
+            True if the call may proceed; False if the caller should fall back
+        """
+        with self._lock:
+            self._refresh_state(time.monotonic())
+
+            if self._state == CLOSED:
+                return True
+
+            if self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call; closes a half-open breaker"""
+        with self._lock:
+            self._successes += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                print("Circuit breaker closed after successful probe")
+            self._state = CLOSED
+            self._half_open_calls = 0
+
+    def record_failure(self, cool_down: float = 0.0) -> None:
+        """
+        Record a failed call
+
+        Args:
+            cool_down: Optional minimum time to stay open, e.g. from a Retry-After
+                       header; the breaker never reopens for less than recovery_timeout
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._failures += 1
+            self._consecutive_failures += 1
+
+            # A failed probe reopens immediately; otherwise wait for the threshold
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._trip(now, max(self.recovery_timeout, cool_down))
+
+    def release_probe(self) -> None:
+        """Release a half-open probe slot when the call ended without a verdict"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    @property
+    def state(self) -> str:
+        """Current breaker state"""
+        with self._lock:
+            self._refresh_state(time.monotonic())
+            return self._state
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters"""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(max(0.0, self._open_until - now), 1) if self._state == OPEN else 0.0,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "successes": self._successes,
+                "failures": self._failures
+            }
@@ -5,10 +5,42 @@ This module provides a standardized interface for interacting with the Claude AP
 """
 
 import os
+import json
 import time
+import random
+import queue
+import hashlib
+import threading
 import requests
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterator, Union
 from requests.exceptions import RequestException, HTTPError, ConnectionError, Timeout
+from config import (
+    CLAUDE_RATE_LIMITS,
+    CLAUDE_MAX_BACKOFF_SECONDS,
+    CLAUDE_RETRY_BUDGET_SECONDS,
+    CLAUDE_CIRCUIT_BREAKER,
+    CLAUDE_REQUEST_TIMEOUT_SECONDS,
+    CLAUDE_MIN_ATTEMPT_SECONDS,
+    CLAUDE_TASK_ROUTING,
+    CLAUDE_HEDGING,
+    DEFAULT_MODEL,
+    DEFAULT_MAX_TOKENS
+)
+from services.rate_limiter import SingleFlight, ModelRateLimiter, QueueFullError
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED
+from services.latency import LatencyTracker
+from services.telemetry import get_telemetry
+from utils.timing import stage
+from utils.deadline import Deadline, DeadlineExceeded, timeout_for
+from utils.prompt_encoder import estimate_tokens
+
+# Messages API endpoint and version shared by all calls. ANTHROPIC_BASE_URL points the
+# backend at another server implementing the same contract (e.g. loadtest/mock_anthropic.py)
+ANTHROPIC_BASE_URL = os.environ.get("ANTHROPIC_BASE_URL", "https://api.anthropic.com").rstrip("/")
+ANTHROPIC_MESSAGES_URL = f"{ANTHROPIC_BASE_URL}/v1/messages"
+ANTHROPIC_VERSION = "2023-06-01"
+
 
 def get_anthropic_api_key() -> str:
     """Get the Anthropic API key from environment variables or keys file"""
@@ -25,6 +57,180 @@ def get_anthropic_api_key() -> str:
     return os.environ.get("ANTHROPIC_API_KEY", "")
 
 
+def _build_headers(api_key: str) -> Dict[str, str]:
+    """Build the HTTP headers shared by regular and streaming Messages API calls"""
+    return {
+        "x-api-key": api_key,
+        "anthropic-version": ANTHROPIC_VERSION,
+        "content-type": "application/json",
+        # Beta headers for newer API features and prompt caching
+        "anthropic-beta": "messages-2023-12-15,prompt-caching-2024-07-31"
+    }
+
+
+def build_cached_system(static_prompt: str, dynamic_prompt: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Build a system prompt whose static prefix is marked as cacheable
+    
+    The API caches everything up to the marked block (tools + static system text),
+    so the static prompt must be byte-identical between calls to get cache hits.
+    Anything that changes per call belongs in dynamic_prompt or in the messages.
+    
+    Args:
+        static_prompt: Prompt text that never changes between calls
+        dynamic_prompt: Optional per-call text appended after the cached prefix
+        
+    Returns:
+        List of system content blocks for the Messages API
+    """
+    blocks = [{"type": "text", "text": static_prompt, "cache_control": {"type": "ephemeral"}}]
+    if dynamic_prompt:
+        blocks.append({"type": "text", "text": dynamic_prompt})
+    return blocks
+
+
+# Token usage counters used to verify prompt cache effectiveness, keyed by tool name
+_usage_lock = threading.Lock()
+_usage_stats: Dict[str, Dict[str, int]] = {}
+
+_USAGE_FIELDS = [
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens"
+]
+
+
+def _record_usage(tool_name: str, usage: Dict[str, Any]) -> None:
+    """Accumulate the token usage reported by a successful response"""
+    if not usage:
+        return
+    
+    with _usage_lock:
+        stats = _usage_stats.setdefault(tool_name, {field: 0 for field in ["calls"] + _USAGE_FIELDS})
+        stats["calls"] += 1
+        for field in _USAGE_FIELDS:
+            stats[field] += usage.get(field) or 0
+
+
+def get_prompt_cache_stats() -> Dict[str, Any]:
+    """
+    Get cumulative token usage, split into cache reads and cache writes
+    
+    Returns:
+        Dictionary with per-task counters and overall totals, including the share
+        of prompt tokens that were served from the cache
+    """
+    with _usage_lock:
+        per_task = {name: dict(stats) for name, stats in _usage_stats.items()}
+    
+    totals = {field: sum(stats[field] for stats in per_task.values()) for field in ["calls"] + _USAGE_FIELDS}
+    prompt_tokens = (
+        totals["input_tokens"] + totals["cache_creation_input_tokens"] + totals["cache_read_input_tokens"]
+    )
+    totals["cache_read_ratio"] = round(totals["cache_read_input_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+    
+    return {"totals": totals, "tasks": per_task}
+
+
+# Shared request shaping for all Claude calls in this process
+_single_flight = SingleFlight()
+_rate_limiter = ModelRateLimiter(CLAUDE_RATE_LIMITS)
+_circuit_breaker = CircuitBreaker(**CLAUDE_CIRCUIT_BREAKER)
+
+
+def get_circuit_breaker_stats() -> Dict[str, Any]:
+    """Get the Claude API circuit breaker state and counters"""
+    return _circuit_breaker.stats()
+
+
+# Latencies of successful calls per task, used as hedging thresholds, and hedge counters
+_task_latency = LatencyTracker(window=CLAUDE_HEDGING["window"])
+_hedge_lock = threading.Lock()
+_hedge_stats: Dict[str, Dict[str, int]] = {}
+
+
+def resolve_task_route(task: Optional[str], model: Optional[str] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get the model, max_tokens, timeout and hedging setting for a task
+    
+    Args:
+        task: Task name from CLAUDE_TASK_ROUTING (e.g. "intent", "narrative"), or None
+        model: Explicit model that overrides the route
+        max_tokens: Explicit max_tokens that overrides the route
+        
+    Returns:
+        Dictionary with model, max_tokens, timeout and hedge
+    """
+    route = CLAUDE_TASK_ROUTING.get(task, {}) if task else {}
+    if task and not route:
+        print(f"No route configured for Claude task '{task}', using defaults")
+    
+    return {
+        "model": model or route.get("model", DEFAULT_MODEL),
+        "max_tokens": max_tokens or route.get("max_tokens", DEFAULT_MAX_TOKENS),
+        "timeout": route.get("timeout", CLAUDE_REQUEST_TIMEOUT_SECONDS),
+        "hedge": bool(route.get("hedge", False)) and CLAUDE_HEDGING["enabled"]
+    }
+
+
+def get_hedge_delay(task: str) -> Optional[float]:
+    """
+    Get how long to wait before hedging a call for this task
+    
+    Returns:
+        The task's observed latency percentile (clamped to the configured range),
+        or None while there are too few samples to hedge
+    """
+    if _task_latency.count(task) < CLAUDE_HEDGING["min_samples"]:
+        return None
+    delay = _task_latency.percentile(task, CLAUDE_HEDGING["percentile"])
+    return min(max(delay, CLAUDE_HEDGING["min_delay_seconds"]), CLAUDE_HEDGING["max_delay_seconds"])
+
+
+def get_task_stats() -> Dict[str, Any]:
+    """
+    Get routing, latency and hedging statistics per task
+    
+    Returns:
+        Dictionary keyed by task with the routed model, latency percentiles,
+        current hedge delay and hedge counters
+    """
+    latency = _task_latency.stats()
+    with _hedge_lock:
+        hedges = {task: dict(counters) for task, counters in _hedge_stats.items()}
+    
+    stats = {}
+    for task in list(CLAUDE_TASK_ROUTING) + [task for task in latency if task not in CLAUDE_TASK_ROUTING]:
+        delay = get_hedge_delay(task)
+        stats[task] = {
+            "model": resolve_task_route(task)["model"] if task in CLAUDE_TASK_ROUTING else None,
+            **latency.get(task, {"samples": 0, "total": 0}),
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            **hedges.get(task, {"hedged": 0, "hedge_wins": 0})
+        }
+    return stats
+
+
+def _count_hedge(task: str, counter: str) -> None:
+    with _hedge_lock:
+        counters = _hedge_stats.setdefault(task, {"hedged": 0, "hedge_wins": 0})
+        counters[counter] += 1
+
+
+def get_rate_limiter_stats() -> Dict[str, Any]:
+    """
+    Get request coalescing and rate limiter counters
+    
+    Returns:
+        Dictionary with single-flight counters and per-model queue metrics
+    """
+    return {
+        "single_flight": _single_flight.stats(),
+        "models": _rate_limiter.stats()
+    }
+
+
 class ClaudeAPIResponse:
     """Response object that mimics the structure of the Anthropic client library response"""
     class Content:
@@ -37,48 +243,54 @@ class ClaudeAPIResponse:
         self.id = data.get("id")
         self.model = data.get("model")
         self.content = [self.Content(item) for item in data.get("content", [])]
+        self.usage = data.get("usage", {})
 
 
 def call_claude_api_with_retry(
     api_key: str, 
-    model: str = "claude-3-5-sonnet-20240624",  # Updated to use sonnet
-    max_tokens: int = 1000, 
-    system: Optional[str] = None, 
+    model: Optional[str] = None,
+    max_tokens: Optional[int] = None, 
+    system: Optional[Union[str, List[Dict[str, Any]]]] = None, 
     messages: Optional[List[Dict[str, Any]]] = None, 
     tools: Optional[List[Dict[str, Any]]] = None, 
     tool_choice: Optional[Dict[str, Any]] = None,
     max_retries: int = 3,
     initial_backoff: float = 1.0,
-    backoff_factor: float = 2.0
+    backoff_factor: float = 2.0,
+    deadline: Optional[Deadline] = None,
+    task: Optional[str] = None
 ) -> ClaudeAPIResponse:
     """
     Make a direct HTTP request to the Claude API with retry logic
     
     Args:
         api_key: Anthropic API key
-        model: The Claude model to use (e.g. "claude-3-5-sonnet-20241022")
-        max_tokens: Maximum number of tokens to generate
-        system: Optional system prompt
+        model: The Claude model to use; defaults to the task's routed model
+        max_tokens: Maximum number of tokens to generate; defaults to the task's route
+        system: Optional system prompt, either text or content blocks (see build_cached_system)
         messages: List of message objects with role and content
         tools: Optional list of tool objects
         tool_choice: Optional tool choice object
         max_retries: Maximum number of retry attempts
-        initial_backoff: Initial backoff time in seconds
+        initial_backoff: Initial backoff time in seconds (upper bound of the first jittered wait)
         backoff_factor: Multiplier for subsequent backoff times
+        deadline: Optional request deadline; attempts, waits and timeouts stay within it
+        task: Task name used for model routing, latency tracking and hedging (see CLAUDE_TASK_ROUTING)
         
     Returns:
-        ClaudeAPIResponse object mimicking the structure of the Anthropic client library response
+        ClaudeAPIResponse object mimicking the structure of the Anthropic client library response.
+        When the circuit breaker is open, retries are exhausted or the deadline has passed
+        this is the fallback response.
     """
+    route = resolve_task_route(task, model, max_tokens)
+    model = route["model"]
+    max_tokens = route["max_tokens"]
+    
     # API URL
-    url = "https://api.anthropic.com/v1/messages"
+    url = ANTHROPIC_MESSAGES_URL
     
     # Set headers
-    headers = {
-        "x-api-key": api_key,
-        "anthropic-version": "2023-06-01",
-        "content-type": "application/json",
-        "anthropic-beta": "messages-2023-12-15"  # Add beta header for newer API features
-    }
+    headers = _build_headers(api_key)
     
     # Build request body
     request_body = {
@@ -102,21 +314,197 @@ def call_claude_api_with_retry(
     # Get friendly debug name for the API call
     tool_name = tool_choice.get("name") if isinstance(tool_choice, dict) else "None"
     
+    # Identical concurrent requests (same scout query fired twice, frontend retries)
+    # share one upstream call instead of each spending a rate-limit slot
+    serialized_body = json.dumps(request_body, sort_keys=True, ensure_ascii=False)
+    request_key = hashlib.sha256(serialized_body.encode("utf-8")).hexdigest()
+    
+    # Local estimate of the prompt size, recorded with the call's telemetry
+    prompt_tokens = estimate_tokens(serialized_body)
+    
+    def send() -> ClaudeAPIResponse:
+        return _send_with_retry(
+            url, headers, request_body, model, tool_name, tools, tool_choice,
+            max_retries, initial_backoff, backoff_factor, deadline, route["timeout"], task,
+            prompt_tokens
+        )
+    
+    with stage(f"claude.{task or (tool_name if tool_choice else 'text')}"):
+        response, shared = _single_flight.do(
+            request_key,
+            lambda: _send_routed(task, send, route["hedge"], deadline)
+        )
+    
+    if shared:
+        print(f"Reused in-flight Claude API response for model {model}, tool: {tool_name}")
+    
+    return response
+
+
+def _send_timed(task: Optional[str], send) -> ClaudeAPIResponse:
+    """Run a send and record its latency for the task when it succeeded"""
+    started = time.perf_counter()
+    response = send()
+    if task and response.id != "error":
+        _task_latency.observe(task, time.perf_counter() - started)
+    return response
+
+
+def _send_routed(task: Optional[str], send, hedge: bool, deadline: Optional[Deadline]) -> ClaudeAPIResponse:
+    """Send a request, hedging it when the task allows and enough latency samples exist"""
+    delay = get_hedge_delay(task) if task and hedge else None
+    
+    # Hedging only pays off against a healthy upstream and with budget left for a second request
+    if (delay is None or _circuit_breaker.state != CLOSED
+            or (deadline is not None and not deadline.allows(delay + CLAUDE_MIN_ATTEMPT_SECONDS))):
+        return _send_timed(task, send)
+    
+    return _send_hedged(task, send, delay)
+
+
+def _send_hedged(task: str, send, delay: float) -> ClaudeAPIResponse:
+    """
+    Send a request and, if it has not answered after `delay` seconds, an identical second one
+    
+    The first successful response wins; the slower request is left to finish in the
+    background and its result is discarded. If both fail, the first fallback is returned.
+    """
+    results: "queue.Queue" = queue.Queue()
+    
+    def run(label: str) -> None:
+        try:
+            results.put((label, _send_timed(task, send), None))
+        except Exception as e:
+            results.put((label, None, e))
+    
+    threading.Thread(target=run, args=("primary",), name=f"claude-{task}", daemon=True).start()
+    try:
+        label, response, error = results.get(timeout=delay)
+        if error is not None:
+            raise error
+        return response
+    except queue.Empty:
+        pass
+    
+    print(f"Claude {task} call slower than {delay:.2f}s, sending hedged request")
+    _count_hedge(task, "hedged")
+    threading.Thread(target=run, args=("hedge",), name=f"claude-{task}-hedge", daemon=True).start()
+    
+    fallback, last_error = None, None
+    for _ in range(2):
+        label, response, error = results.get()
+        if response is not None and response.id != "error":
+            if label == "hedge":
+                _count_hedge(task, "hedge_wins")
+            return response
+        fallback = fallback or response
+        last_error = last_error or error
+    
+    if fallback is None:
+        raise last_error
+    return fallback
+
+
+def _parse_retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """
+    Get the server-requested wait before retrying, in seconds
+    
+    Prefers the Retry-After header; otherwise uses the latest of the
+    anthropic-ratelimit-*-reset timestamps (RFC 3339).
+    """
+    if response is None:
+        return None
+    
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    
+    waits = []
+    now = datetime.now(timezone.utc)
+    for header, value in response.headers.items():
+        header = header.lower()
+        if not (header.startswith("anthropic-ratelimit-") and header.endswith("-reset")):
+            continue
+        try:
+            reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        waits.append((reset_at - now).total_seconds())
+    
+    return max(0.0, max(waits)) if waits else None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Connection problems, timeouts, 429 and 5xx are retryable; other 4xx are not"""
+    response = getattr(error, "response", None)
+    if isinstance(error, HTTPError) and response is not None:
+        return response.status_code == 429 or response.status_code >= 500
+    return True
+
+
+def _send_with_retry(
+    url: str,
+    headers: Dict[str, str],
+    request_body: Dict[str, Any],
+    model: str,
+    tool_name: str,
+    tools: Optional[List[Dict[str, Any]]],
+    tool_choice: Optional[Dict[str, Any]],
+    max_retries: int,
+    initial_backoff: float,
+    backoff_factor: float,
+    deadline: Optional[Deadline] = None,
+    request_timeout: float = CLAUDE_REQUEST_TIMEOUT_SECONDS,
+    task: Optional[str] = None,
+    prompt_tokens: int = 0
+) -> ClaudeAPIResponse:
+    """Send a prepared request with rate limiting and retries, falling back on failure"""
+    task_label = task or (tool_name if tool_choice else "text")
+    started = time.perf_counter()
+    attempts = 0
+    
     # Initialize retry variables
     current_retry = 0
     current_backoff = initial_backoff
+    total_backoff = 0.0
     last_exception = None
     
     # Retry loop
     while current_retry <= max_retries:
+        # Log the request attempt
+        log_prefix = f"[Attempt {current_retry + 1}/{max_retries + 1}]"
+        
+        # Don't start an attempt the request no longer has time for
+        if deadline is not None and not deadline.allows(CLAUDE_MIN_ATTEMPT_SECONDS):
+            last_exception = DeadlineExceeded(f"request deadline reached after {deadline.elapsed():.1f}s")
+            print(f"{log_prefix} Request deadline reached, returning fallback for tool: {tool_name}")
+            break
+        
+        # While the upstream is failing, skip straight to the fallback
+        if not _circuit_breaker.allow_request():
+            last_exception = CircuitOpenError("Claude API circuit breaker is open")
+            print(f"{log_prefix} Circuit breaker open, returning fallback for tool: {tool_name}")
+            break
+        
         try:
-            # Log the request attempt
-            log_prefix = f"[Attempt {current_retry + 1}/{max_retries + 1}]"
-            print(f"{log_prefix} Calling Claude API with model {model}, tool: {tool_name}")
-            print(f"{log_prefix} Request body: {request_body}")
+            # Every attempt, including retries, needs a token from the model's bucket
+            waited = _rate_limiter.acquire(model, max_wait=deadline.remaining() if deadline else None)
+            if waited > 0:
+                print(f"{log_prefix} Waited {waited:.2f}s for rate limiter")
+            
+            print(f"{log_prefix} Calling Claude API with model {model}, task: {task_label}")
             
             # Make the request
-            response = requests.post(url, headers=headers, json=request_body, timeout=30)
+            attempts += 1
+            response = requests.post(
+                url, headers=headers, json=request_body,
+                timeout=timeout_for(deadline, request_timeout)
+            )
             
             # Log response for debugging
             if response.status_code != 200:
@@ -128,45 +516,117 @@ def call_claude_api_with_retry(
             # Parse response
             data = response.json()
             print(f"{log_prefix} Claude API response status: {response.status_code}")
+            _circuit_breaker.record_success()
+            
+            # Track cache reads vs writes so prompt caching can be verified
+            _record_usage(tool_name, data.get("usage", {}))
+            get_telemetry().record_call(
+                task_label, model, time.perf_counter() - started, attempts, "success", data.get("usage", {}),
+                prompt_tokens=prompt_tokens
+            )
             
             # Return response in the expected format
             return ClaudeAPIResponse(data)
         
+        except QueueFullError as e:
+            # Fail fast: waiting longer would only tie up this worker thread
+            _circuit_breaker.release_probe()
+            last_exception = e
+            print(f"{log_prefix} Rate limiter rejected Claude API call: {str(e)}")
+            break
+        
         except (HTTPError, ConnectionError, Timeout, RequestException) as e:
             last_exception = e
             current_retry += 1
             
-            if current_retry <= max_retries:
-                # Log the error and retry info
-                print(f"{log_prefix} Error calling Claude API: {str(e)}")
-                print(f"{log_prefix} Retrying in {current_backoff} seconds...")
-                
-                # Wait before retrying
-                time.sleep(current_backoff)
-                
-                # Increase backoff for next retry
-                current_backoff *= backoff_factor
-            else:
+            if isinstance(e, Timeout) and deadline is not None and not deadline.allows(CLAUDE_MIN_ATTEMPT_SECONDS):
+                # Our own budget ran out, which says nothing about the upstream's health
+                _circuit_breaker.release_probe()
+                print(f"{log_prefix} Claude API call cut off by the request deadline")
+                break
+            
+            if not _is_retryable(e):
+                # Bad request, auth error, etc.: the upstream is healthy and retrying won't help
+                _circuit_breaker.record_success()
+                print(f"{log_prefix} Non-retryable error calling Claude API: {str(e)}")
+                break
+            
+            retry_after = _parse_retry_after(getattr(e, "response", None))
+            _circuit_breaker.record_failure(retry_after or 0.0)
+            
+            if current_retry > max_retries:
                 # We've exhausted all retries
                 print(f"Error calling Claude API after {max_retries} retries: {str(e)}")
                 break
+            
+            # Full jitter spreads retries from concurrent workers; a server-requested
+            # wait takes precedence over our own schedule
+            delay = random.uniform(0, min(current_backoff, CLAUDE_MAX_BACKOFF_SECONDS))
+            if retry_after is not None:
+                delay = retry_after
+            
+            if total_backoff + delay > CLAUDE_RETRY_BUDGET_SECONDS or (
+                deadline is not None and not deadline.allows(delay + CLAUDE_MIN_ATTEMPT_SECONDS)
+            ):
+                print(f"{log_prefix} Error calling Claude API: {str(e)}")
+                print(f"{log_prefix} Required wait of {delay:.1f}s exceeds retry budget, giving up")
+                break
+            
+            # Log the error and retry info
+            print(f"{log_prefix} Error calling Claude API: {str(e)}")
+            print(f"{log_prefix} Retrying in {delay:.2f} seconds...")
+            
+            # Wait before retrying
+            time.sleep(delay)
+            total_backoff += delay
+            
+            # Increase backoff for next retry
+            current_backoff *= backoff_factor
         
         except Exception as e:
             # For non-connection related exceptions, don't retry
+            _circuit_breaker.release_probe()
             last_exception = e
             print(f"Unexpected error calling Claude API: {str(e)}")
             break
     
     # All retries failed or unexpected error occurred, return fallback response
+    get_telemetry().record_call(
+        task_label, model, time.perf_counter() - started, attempts, _fallback_outcome(last_exception, deadline),
+        prompt_tokens=prompt_tokens
+    )
+    error_message = f"Error after {current_retry} attempts: {str(last_exception)}"
+    return _build_fallback_response(model, tools, tool_choice, error_message)
+
+
+def _fallback_outcome(error: Optional[Exception], deadline: Optional[Deadline]) -> str:
+    """Classify why a call fell back, for telemetry"""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, QueueFullError):
+        return "rate_limited"
+    if isinstance(error, DeadlineExceeded) or (
+        isinstance(error, Timeout) and deadline is not None and not deadline.allows(CLAUDE_MIN_ATTEMPT_SECONDS)
+    ):
+        return "deadline"
+    if isinstance(error, RequestException) and not _is_retryable(error):
+        return "client_error"
+    return "error"
+
+
+def _build_fallback_response(
+    model: str,
+    tools: Optional[List[Dict[str, Any]]],
+    tool_choice: Optional[Dict[str, Any]],
+    error_message: str
+) -> ClaudeAPIResponse:
+    """Build the response returned when the API could not be reached"""
     fallback_data = {
         "id": "error",
         "model": model,
         "content": []
     }
     
-    # Include error info in the fallback
-    error_message = f"Error after {current_retry} attempts: {str(last_exception)}"
-    
     # For intent classification fallback
     if tools and tool_choice and tool_choice.get("name") == "classify_intent":
         fallback_data["content"].append({
@@ -199,15 +659,142 @@ def call_claude_api_with_retry(
     return ClaudeAPIResponse(fallback_data)
 
 
+def stream_claude_api(
+    api_key: str,
+    model: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    system: Optional[Union[str, List[Dict[str, Any]]]] = None,
+    messages: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    task: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Stream a text response from the Claude API using server-sent events
+    
+    Unlike call_claude_api_with_retry, this does not retry or return a fallback:
+    once tokens have been handed to the caller a retry would duplicate output,
+    so errors are raised and the caller decides how to degrade.
+    
+    Args:
+        api_key: Anthropic API key
+        model: The Claude model to use; defaults to the task's routed model
+        max_tokens: Maximum number of tokens to generate; defaults to the task's route
+        system: Optional system prompt
+        messages: List of message objects with role and content
+        timeout: Connect/read timeout in seconds; defaults to the task's route
+        deadline: Optional request deadline; caps the timeout and the rate-limiter wait
+        task: Task name used for model routing (streams are never hedged)
+        
+    Yields:
+        Text fragments in the order they are generated
+        
+    Raises:
+        RequestException: If the HTTP request fails
+        RuntimeError: If the API reports an error event mid-stream
+        QueueFullError: If the rate limiter rejects the call
+        CircuitOpenError: If the circuit breaker is open
+        DeadlineExceeded: If the deadline leaves no time for the call
+    """
+    if deadline is not None and not deadline.allows(CLAUDE_MIN_ATTEMPT_SECONDS):
+        raise DeadlineExceeded(f"request deadline reached after {deadline.elapsed():.1f}s")
+    
+    route = resolve_task_route(task, model, max_tokens)
+    model = route["model"]
+    max_tokens = route["max_tokens"]
+    timeout = timeout or route["timeout"]
+    
+    request_body = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "messages": messages or [],
+        "stream": True
+    }
+    if system:
+        request_body["system"] = system
+    
+    # Streams share the breaker and the model's rate limit but are never coalesced
+    if not _circuit_breaker.allow_request():
+        raise CircuitOpenError("Claude API circuit breaker is open")
+    try:
+        _rate_limiter.acquire(model, max_wait=deadline.remaining() if deadline else None)
+    except QueueFullError:
+        _circuit_breaker.release_probe()
+        raise
+    
+    print(f"Streaming Claude API response with model {model}")
+    prompt_tokens = estimate_tokens(json.dumps(request_body, ensure_ascii=False))
+    
+    started = time.perf_counter()
+    usage: Dict[str, Any] = {}
+    outcome = "error"
+    try:
+        with requests.post(
+            ANTHROPIC_MESSAGES_URL,
+            headers=_build_headers(api_key),
+            json=request_body,
+            stream=True,
+            timeout=timeout_for(deadline, timeout)
+        ) as response:
+            if response.status_code != 200:
+                print(f"Error response from streaming call: {response.text}")
+            response.raise_for_status()
+            _circuit_breaker.record_success()
+            
+            for line in response.iter_lines(decode_unicode=True):
+                # Only "data:" lines carry payloads; "event:" lines repeat the type
+                if not line or not line.startswith("data:"):
+                    continue
+                
+                try:
+                    event = json.loads(line[len("data:"):].strip())
+                except json.JSONDecodeError:
+                    continue
+                
+                event_type = event.get("type")
+                if event_type == "message_start":
+                    usage.update(event.get("message", {}).get("usage", {}))
+                elif event_type == "message_delta":
+                    usage.update(event.get("usage", {}))
+                elif event_type == "content_block_delta":
+                    delta = event.get("delta", {})
+                    if delta.get("type") == "text_delta" and delta.get("text"):
+                        yield delta["text"]
+                elif event_type == "error":
+                    error = event.get("error", {})
+                    raise RuntimeError(f"Claude API stream error: {error.get('type')}: {error.get('message')}")
+                elif event_type == "message_stop":
+                    break
+            outcome = "success"
+    except GeneratorExit:
+        # The consumer stopped reading (e.g. the client disconnected)
+        outcome = "cancelled"
+        raise
+    except RequestException as e:
+        if _is_retryable(e):
+            _circuit_breaker.record_failure(_parse_retry_after(getattr(e, "response", None)) or 0.0)
+        else:
+            _circuit_breaker.record_success()
+        outcome = _fallback_outcome(e, deadline)
+        raise
+    finally:
+        get_telemetry().record_call(
+            task or "text", model, time.perf_counter() - started, 1, outcome, usage, streamed=True,
+            prompt_tokens=prompt_tokens
+        )
+
+
 # Keep the original function as a simple wrapper for backward compatibility
 def call_claude_api(
     api_key: str, 
-    model: str, 
-    max_tokens: int, 
-    system: Optional[str] = None, 
+    model: Optional[str] = None, 
+    max_tokens: Optional[int] = None, 
+    system: Optional[Union[str, List[Dict[str, Any]]]] = None, 
     messages: Optional[List[Dict[str, Any]]] = None, 
     tools: Optional[List[Dict[str, Any]]] = None, 
-    tool_choice: Optional[Dict[str, Any]] = None
+    tool_choice: Optional[Dict[str, Any]] = None,
+    deadline: Optional[Deadline] = None,
+    task: Optional[str] = None
 ) -> ClaudeAPIResponse:
     """
     Make a direct HTTP request to the Claude API (with retry logic)
@@ -216,12 +803,14 @@ def call_claude_api(
     
     Args:
         api_key: Anthropic API key
-        model: The Claude model to use (e.g. "claude-3-5-sonnet-20241022")
-        max_tokens: Maximum number of tokens to generate
+        model: The Claude model to use; defaults to the task's routed model
+        max_tokens: Maximum number of tokens to generate; defaults to the task's route
         system: Optional system prompt
         messages: List of message objects with role and content
         tools: Optional list of tool objects
         tool_choice: Optional tool choice object
+        deadline: Optional request deadline
+        task: Task name for model routing and hedging (see CLAUDE_TASK_ROUTING)
         
     Returns:
         ClaudeAPIResponse object mimicking the structure of the Anthropic client library response
@@ -233,5 +822,7 @@ def call_claude_api(
         system=system,
         messages=messages,
         tools=tools,
-        tool_choice=tool_choice
+        tool_choice=tool_choice,
+        deadline=deadline,
+        task=task
     )
\ No newline at end of file
@@ -6,12 +6,31 @@ This module handles loading and accessing player data.
 
 import os
 import json
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
 
-# Cache for loaded data files
+# Cache for loaded data files (read-only, shared by all threads)
 _data_cache = {}
 
-def load_json(filename: str) -> Dict[str, Any]:
+def freeze(data: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Make loaded data read-only so request threads can share it safely
+    
+    The mapping and each of its records (e.g. a player) become read-only views;
+    code that needs a changed record must copy it first (record.copy() gives a dict).
+    
+    Args:
+        data: The parsed JSON data
+        
+    Returns:
+        A read-only view of the data
+    """
+    return MappingProxyType({
+        key: MappingProxyType(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    })
+
+def load_json(filename: str) -> Mapping[str, Any]:
     """
     Load a JSON file, trying different paths
     
@@ -19,7 +38,7 @@ def load_json(filename: str) -> Dict[str, Any]:
         filename: The name of the JSON file to load
         
     Returns:
-        The parsed JSON data
+        The parsed JSON data, read-only (see freeze)
         
     Raises:
         FileNotFoundError: If the file could not be found in any expected location
@@ -38,7 +57,7 @@ def load_json(filename: str) -> Dict[str, Any]:
     for path in paths:
         try:
             with open(path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+                data = freeze(json.load(file))
                 # Cache the result
                 _data_cache[filename] = data
                 return data
@@ -0,0 +1,242 @@
+"""
+Background jobs for long Claude generations
+
+Endpoints that produce long narratives (AI player comparison, tactical
+analysis) can hand the Claude part to this queue and return immediately with
+a job id; clients poll /jobs/<id> or subscribe to /jobs/<id>/events.
+
+- Jobs are run by a small pool of worker threads started on first use
+- Each session has its own FIFO; workers take from sessions round-robin so one
+  chatty session cannot starve the others
+- Pending jobs are bounded overall and per session (QueueFullError when full)
+- Finished jobs are kept in an in-memory job table for a limited time
+
+The job table is per process and is not part of the shared session backend:
+with several workers, /jobs/<id> must reach the worker that accepted the job
+(a single worker or sticky routing).
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from services.rate_limiter import QueueFullError
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class Job:
+    """A unit of background work and its outcome"""
+
+    def __init__(self, session_id: str, kind: str, fn: Callable[[], Any]):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.kind = kind
+        self.fn = fn
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Bumped on every status change so subscribers can wait for the next one
+        self.version = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public view of the job (the result is only included once it succeeded)"""
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if self.status == SUCCEEDED:
+            data["result"] = self.result
+        if self.status == FAILED:
+            data["error"] = self.error
+        return data
+
+
+class JobQueue:
+    """
+    Bounded, per-session fair job queue served by worker threads
+
+    Args:
+        workers: Number of worker threads
+        max_pending: Maximum queued (not yet running) jobs across all sessions
+        max_pending_per_session: Maximum queued jobs for a single session
+        result_ttl_seconds: How long finished jobs stay in the job table
+        max_jobs: Upper bound on the job table size; oldest finished jobs are dropped first
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 100, max_pending_per_session: int = 3,
+                 result_ttl_seconds: float = 600.0, max_jobs: int = 1000):
+        self.workers = max(1, int(workers))
+        self.max_pending = max_pending
+        self.max_pending_per_session = max_pending_per_session
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_jobs = max_jobs
+
+        self._cond = threading.Condition()
+        # session_id -> FIFO of queued jobs; iteration order is the round-robin order
+        self._pending: "OrderedDict[str, Deque[Job]]" = OrderedDict()
+        self._pending_count = 0
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._threads = []
+        self._running = 0
+        self._counters = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0}
+
+    def submit(self, session_id: str, kind: str, fn: Callable[[], Any]) -> Job:
+        """
+        Queue a job
+
+        Args:
+            session_id: Session the job belongs to (fairness key)
+            kind: Short job type, e.g. "comparison"
+            fn: Callable run by a worker; its return value becomes the job result
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFullError: If the global or per-session bound is reached
+        """
+        job = Job(session_id, kind, fn)
+        with self._cond:
+            session_queue = self._pending.get(session_id)
+            if self._pending_count >= self.max_pending or (
+                session_queue is not None and len(session_queue) >= self.max_pending_per_session
+            ):
+                self._counters["rejected"] += 1
+                raise QueueFullError(f"Job queue full for session {session_id}")
+
+            self._ensure_workers()
+            self._expire_jobs()
+            if session_queue is None:
+                session_queue = self._pending[session_id] = deque()
+            session_queue.append(job)
+            self._pending_count += 1
+            self._jobs[job.id] = job
+            self._counters["submitted"] += 1
+            self._cond.notify_all()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id (None if unknown or expired)"""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def wait(self, job: Job, seen_version: int, timeout: float) -> int:
+        """
+        Block until the job changes after seen_version or the timeout elapses
+
+        Returns:
+            The job's current version
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while job.version == seen_version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return job.version
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, worker usage and job counters"""
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "pending": self._pending_count,
+                "pending_sessions": len(self._pending),
+                "jobs_tracked": len(self._jobs),
+                **self._counters
+            }
+
+    def _ensure_workers(self) -> None:
+        # Called with the lock held
+        if self._threads:
+            return
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self) -> Job:
+        # Called with the lock held: take from the first session, then move it to the back
+        while not self._pending_count:
+            self._cond.wait()
+        session_id, session_queue = next(iter(self._pending.items()))
+        job = session_queue.popleft()
+        self._pending_count -= 1
+        if session_queue:
+            self._pending.move_to_end(session_id)
+        else:
+            del self._pending[session_id]
+        return job
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                job.status = RUNNING
+                job.started_at = time.time()
+                job.version += 1
+                self._running += 1
+                self._cond.notify_all()
+
+            try:
+                result, error, status = job.fn(), None, SUCCEEDED
+            except Exception as e:
+                print(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+                result, error, status = None, str(e), FAILED
+
+            with self._cond:
+                job.result, job.error, job.status = result, error, status
+                job.finished_at = time.time()
+                job.fn = None
+                job.version += 1
+                self._running -= 1
+                self._counters[status] += 1
+                self._cond.notify_all()
+
+    def _expire_jobs(self) -> None:
+        # Called with the lock held: drop expired finished jobs and enforce max_jobs
+        now = time.time()
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in FINISHED_STATES
+        ]
+        overflow = max(0, len(self._jobs) - self.max_jobs + 1)
+        for job_id in finished:
+            job = self._jobs[job_id]
+            if overflow > 0 or now - job.finished_at > self.result_ttl_seconds:
+                del self._jobs[job_id]
+                overflow -= 1
+
+
+# Shared queue, created on first use from config.JOB_QUEUE
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                from config import JOB_QUEUE
+                _job_queue = JobQueue(**JOB_QUEUE)
+    return _job_queue
@@ -0,0 +1,77 @@
+"""
+Rolling latency statistics per Claude task
+
+Keeps the durations of the most recent successful calls for each task
+(intent, parameters, narrative, ...) and derives percentiles from them. The
+p95 drives the hedging delay in services.claude_api, so thresholds follow the
+upstream's current behaviour instead of a hand-tuned constant.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of latencies per key"""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window: Number of most recent samples kept per key
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._totals: Dict[str, int] = {}
+
+    def observe(self, key: str, seconds: float) -> None:
+        """Record one duration for a key"""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._totals[key] = self._totals.get(key, 0) + 1
+
+    def count(self, key: str) -> int:
+        """Number of samples currently in the window for a key"""
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the key's window
+
+        Args:
+            key: Task name
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Duration in seconds, or None when there are no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(pct / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Window size, total count and p50/p95/p99 in milliseconds for every key"""
+        with self._lock:
+            keys = list(self._samples)
+            totals = dict(self._totals)
+
+        result = {}
+        for key in keys:
+            p50, p95, p99 = (self.percentile(key, pct) for pct in (50, 95, 99))
+            result[key] = {
+                "samples": self.count(key),
+                "total": totals.get(key, 0),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "p99_ms": round(p99 * 1000, 1) if p99 is not None else None
+            }
+        return result
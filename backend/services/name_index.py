@@ -0,0 +1,243 @@
+"""
+Player name resolution for KatenaScout
+
+Names extracted from chat ("Vini Jr", "Alvarez", "de bruyne") rarely match
+database keys exactly. The index is built once from the player database
+and resolves a name in one lookup:
+
+- exact match of the normalized full name
+- token-set matching: every query token matched against the name's tokens,
+  exactly, as a prefix ("vini" -> "vinicius") or as an abbreviation ("jr")
+- phonetic keys (Soundex) per token, for spelling variants ("Alvares")
+- trigram similarity of the whole name, for typos
+
+Candidates come from the token and phonetic postings, and from the trigram
+postings only when those find nothing convincing, so a lookup never scans
+the whole database.
+"""
+
+import bisect
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from services.nlp_service import normalize_text, levenshtein_distance
+
+# Abbreviations written in place of a name token
+TOKEN_ALIASES = {
+    "jr": "junior", "jnr": "junior", "jun": "junior", "sr": "senior", "snr": "senior"
+}
+
+# Minimum prefix length for "vini" -> "vinicius" matches
+MIN_PREFIX_LENGTH = 3
+
+# Trigram candidates scored per lookup at most (most shared trigrams first)
+MAX_TRIGRAM_CANDIDATES = 200
+
+# Confidence from token or phonetic matching above which trigram candidates are not needed
+STRONG_MATCH = 0.8
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6"
+}
+
+
+@lru_cache(maxsize=65536)
+def soundex(token: str) -> str:
+    """American Soundex code of a normalized token ("alvarez" -> "a416")"""
+    letters = [char for char in token if char.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded so short names have some"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _tokens(normalized: str) -> List[str]:
+    return [TOKEN_ALIASES.get(token, token) for token in normalized.split()]
+
+
+class NameIndex:
+    """
+    Normalized name index over the player database
+
+    Args:
+        database: Player records keyed by name (database.json)
+    """
+
+    def __init__(self, database: Mapping[str, Mapping[str, Any]]):
+        self.names: List[str] = []
+        self.wy_ids: List[str] = []
+        self.normalized: List[str] = []
+        self.name_tokens: List[List[str]] = []
+        self.name_trigrams: List[Set[str]] = []
+
+        self._exact: Dict[str, List[int]] = {}
+        self._tokens: Dict[str, List[int]] = {}
+        self._phonetic: Dict[str, List[int]] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+
+        for name, player in database.items():
+            normalized = normalize_text(name)
+            if not normalized:
+                continue
+            row = len(self.names)
+            self.names.append(name)
+            self.wy_ids.append(str(player.get("wyId", name)))
+            self.normalized.append(normalized)
+            tokens = _tokens(normalized)
+            self.name_tokens.append(tokens)
+            self.name_trigrams.append(trigrams(normalized))
+
+            self._exact.setdefault(normalized, []).append(row)
+            for token in set(tokens):
+                self._tokens.setdefault(token, []).append(row)
+                self._phonetic.setdefault(soundex(token), []).append(row)
+            for trigram in self.name_trigrams[row]:
+                self._trigrams.setdefault(trigram, []).append(row)
+
+        # Sorted vocabulary for prefix lookups
+        self._vocabulary = sorted(self._tokens)
+
+    def resolve(self, name: str, limit: int = 5, min_confidence: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Rank the players a name may refer to
+
+        Args:
+            name: Player name as written by the user or extracted by Claude
+            limit: Number of candidates returned
+            min_confidence: Candidates below this confidence are left out
+
+        Returns:
+            Candidates ordered by confidence (0-1), each with wyId, name,
+            confidence and how it matched ("exact", "token", "phonetic" or "trigram")
+        """
+        normalized = normalize_text(name)
+        if not normalized:
+            return []
+
+        scores: Dict[int, Dict[str, Any]] = {}
+        for row in self._exact.get(normalized, []):
+            scores[row] = {"confidence": 1.0, "match": "exact"}
+
+        query_tokens = _tokens(normalized)
+        query_trigrams = trigrams(normalized)
+        self._score(self._token_candidates(query_tokens), query_tokens, query_trigrams, scores)
+        if max((score["confidence"] for score in scores.values()), default=0.0) < STRONG_MATCH:
+            # Typos no token or phonetic key catches: names sharing the most trigrams
+            self._score(self._trigram_candidates(query_trigrams), query_tokens, query_trigrams, scores)
+
+        ranked = sorted(
+            (row for row, score in scores.items() if score["confidence"] >= min_confidence),
+            key=lambda row: (-scores[row]["confidence"], len(self.normalized[row]))
+        )
+        return [
+            {"wyId": self.wy_ids[row], "name": self.names[row], **scores[row]}
+            for row in ranked[:limit]
+        ]
+
+    def best_match(self, name: str, min_confidence: float = 0.0) -> Optional[Dict[str, Any]]:
+        """The most likely player for a name, or None below min_confidence"""
+        candidates = self.resolve(name, limit=1, min_confidence=min_confidence)
+        return candidates[0] if candidates else None
+
+    def _score(self, rows: Set[int], query_tokens: List[str], query_trigrams: Set[str],
+               scores: Dict[int, Dict[str, Any]]) -> None:
+        for row in rows:
+            if row in scores:
+                continue
+            token_score, match = self._token_set_score(query_tokens, self.name_tokens[row])
+            trigram_score = _jaccard(query_trigrams, self.name_trigrams[row])
+            if trigram_score > token_score:
+                token_score, match = trigram_score, "trigram"
+            scores[row] = {"confidence": round(token_score, 3), "match": match}
+
+    def _token_candidates(self, query_tokens: List[str]) -> Set[int]:
+        rows: Set[int] = set()
+        for token in query_tokens:
+            rows.update(self._tokens.get(token, []))
+            rows.update(self._phonetic.get(soundex(token), []))
+            if len(token) >= MIN_PREFIX_LENGTH:
+                start = bisect.bisect_left(self._vocabulary, token)
+                for word in self._vocabulary[start:]:
+                    if not word.startswith(token):
+                        break
+                    rows.update(self._tokens[word])
+        return rows
+
+    def _trigram_candidates(self, query_trigrams: Set[str]) -> Set[int]:
+        shared: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for row in self._trigrams.get(trigram, []):
+                shared[row] = shared.get(row, 0) + 1
+        return set(sorted(shared, key=shared.get, reverse=True)[:MAX_TRIGRAM_CANDIDATES])
+
+    @staticmethod
+    def _token_set_score(query_tokens: List[str], name_tokens: List[str]):
+        """Mean best match of the query tokens, slightly penalising unmatched name tokens"""
+        total = 0.0
+        matched: Set[int] = set()
+        kinds = set()
+        for token in query_tokens:
+            best, best_index, kind = 0.0, None, "token"
+            for index, word in enumerate(name_tokens):
+                if token == word:
+                    score, match = 1.0, "token"
+                elif len(token) >= MIN_PREFIX_LENGTH and word.startswith(token):
+                    score, match = 0.9, "token"
+                elif soundex(token) == soundex(word):
+                    score, match = 0.85, "phonetic"
+                else:
+                    longest = max(len(token), len(word))
+                    score, match = 0.8 * (1 - levenshtein_distance(token, word) / longest), "token"
+                if score > best:
+                    best, best_index, kind = score, index, match
+            total += best
+            if best_index is not None and best >= 0.5:
+                matched.add(best_index)
+                kinds.add(kind)
+
+        token_score = total / len(query_tokens)
+        # Unmatched name tokens ("Carlos" in "Carlos Alvarez" for "Alvarez") cost a little
+        coverage = len(matched) / len(name_tokens)
+        return token_score * (0.85 + 0.15 * coverage), "phonetic" if "phonetic" in kinds else "token"
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+_name_index: Optional[NameIndex] = None
+_name_index_lock = threading.Lock()
+
+
+def get_name_index() -> NameIndex:
+    """Get the process-wide name index, building it from the player database on first use"""
+    global _name_index
+    if _name_index is None:
+        with _name_index_lock:
+            if _name_index is None:
+                from services.data_service import get_player_database
+                _name_index = NameIndex(get_player_database())
+    return _name_index
+
+
+def resolve_player_name(name: str, limit: int = 5, min_confidence: float = 0.0) -> List[Dict[str, Any]]:
+    """Rank the players a name may refer to (see NameIndex.resolve)"""
+    return get_name_index().resolve(name, limit=limit, min_confidence=min_confidence)
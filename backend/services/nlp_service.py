@@ -0,0 +1,256 @@
+"""
+Natural language processing utilities for KatenaScout
+
+This module provides deterministic text matching helpers that avoid Claude
+round trips for small, closed vocabularies such as position codes.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+from unidecode import unidecode
+from config import POSITIONS_MAPPING, VALID_POSITION_CODES, POSITION_ALIASES, POSITION_MATCH_THRESHOLD
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_TRAILING_DIGITS = re.compile(r"\d+$")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, transliterate to ASCII and collapse punctuation to single spaces"""
+    return _NON_ALNUM.sub(" ", unidecode(text or "").lower()).strip()
+
+
+def levenshtein_distance(a: str, b: str) -> int:
+    """
+    Compute the edit distance between two strings
+
+    Args:
+        a: First string
+        b: Second string
+
+    Returns:
+        Minimum number of insertions, deletions and substitutions
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def _build_position_index() -> Dict[str, List[str]]:
+    """Map every normalized code, position name and alias to its position codes"""
+    index = {code: [code] for code in VALID_POSITION_CODES}
+    for name, codes in list(POSITIONS_MAPPING.items()) + list(POSITION_ALIASES.items()):
+        index.setdefault(normalize_text(name), list(codes))
+    return index
+
+
+# Built once at import; the vocabulary is fixed
+_POSITION_INDEX = _build_position_index()
+
+
+@lru_cache(maxsize=1024)
+def resolve_position_code(code: str) -> Tuple[Tuple[str, ...], float]:
+    """
+    Resolve a possibly invalid position code to valid codes
+
+    Tries, in order: exact code, the code without trailing digits ("lcmf3"),
+    known names and aliases in the supported languages ("st", "zagueiro"),
+    and finally the closest code or alias by edit distance.
+
+    Args:
+        code: Position code or name as extracted from the query
+
+    Returns:
+        Tuple of (valid codes, confidence between 0 and 1); codes are empty
+        when nothing matches at or above POSITION_MATCH_THRESHOLD
+    """
+    normalized = normalize_text(code)
+    if not normalized:
+        return (), 0.0
+
+    if normalized in _POSITION_INDEX:
+        return tuple(_POSITION_INDEX[normalized]), 1.0
+
+    stripped = _TRAILING_DIGITS.sub("", normalized).strip()
+    if stripped in _POSITION_INDEX:
+        return tuple(_POSITION_INDEX[stripped]), 0.95
+
+    best_key, best_score = None, 0.0
+    for key in _POSITION_INDEX:
+        longest = max(len(stripped), len(key))
+        # The length difference alone bounds the similarity; skip hopeless candidates
+        if 1 - abs(len(stripped) - len(key)) / longest <= best_score:
+            continue
+        score = 1 - levenshtein_distance(stripped, key) / longest
+        if score > best_score:
+            best_key, best_score = key, score
+
+    if best_key is not None and best_score >= POSITION_MATCH_THRESHOLD:
+        return tuple(_POSITION_INDEX[best_key]), round(best_score, 2)
+    return (), round(best_score, 2)
+
+
+def resolve_position_codes(codes: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Resolve a list of position codes locally
+
+    Args:
+        codes: Position codes, some of which may be invalid
+
+    Returns:
+        Tuple of (resolved valid codes without duplicates, codes that could not be resolved)
+    """
+    resolved: List[str] = []
+    unresolved: List[str] = []
+    for code in codes:
+        matches, _ = resolve_position_code(code)
+        if not matches:
+            unresolved.append(code)
+        for match in matches:
+            if match not in resolved:
+                resolved.append(match)
+    return resolved, unresolved
+
+
+# Words that carry no search meaning, per language (compared after normalize_text)
+STOP_WORDS = {
+    "english": frozenset(
+        "a am an and are as at be but by find for from good great has have i in is it looking me need of on "
+        "or player players please search show some that the their them they this to very want we who with".split()
+    ),
+    "portuguese": frozenset(
+        "a as com como da das de do dos e em eu jogador jogadores muito na nas no nos o os para por "
+        "preciso procuro procurar encontrar que quero se um uma uns umas".split()
+    ),
+    "spanish": frozenset(
+        "a al con como de del el en es estoy jugador jugadores la las lo los muy necesito para por "
+        "que quiero se un una unos unas y busco buscar encontrar".split()
+    ),
+    "bulgarian": frozenset(
+        "i na za s v ot da se e sa koito koiato iskam igrach igrachi mnogo po".split()
+    ),
+}
+
+# Common scouting synonyms mapped to one term, so paraphrases share vocabulary
+# ("CBs dominant in the air" ~ "strong aerial centre backs")
+QUERY_SYNONYMS = {
+    "air": "aerial", "header": "aerial", "heading": "aerial", "headed": "aerial",
+    "dominant": "strong", "physical": "strong", "powerful": "strong", "robust": "strong",
+    "quick": "fast", "pacey": "fast", "pace": "fast", "rapid": "fast", "speedy": "fast", "speed": "fast",
+    "dribbler": "dribble", "dribbling": "dribble", "dribbles": "dribble",
+    "crossing": "cross", "crosser": "cross",
+    "passer": "passing", "pass": "passing", "distribution": "passing",
+    "finisher": "finishing", "clinical": "finishing", "scorer": "goal", "scoring": "goal",
+    "creative": "creativity", "playmaking": "creativity", "vision": "creativity",
+    "tackling": "tackle", "tackler": "tackle",
+    "youngster": "young", "talented": "talent", "prospect": "talent",
+}
+
+# Words that flip the meaning of otherwise similar queries ("left-footed" vs
+# "right-footed"); cached queries must agree on these exactly
+QUERY_GUARD_WORDS = frozenset(
+    "left right both young old older younger under over below above tall short "
+    "esquerdo esquerda direito direita jovem jovens velho alto baixo "
+    "izquierdo izquierda derecho derecha joven jovenes viejo bajo "
+    "liav desen mlad star visok".split()
+)
+
+# Negative and negating words per language, mapped to "bad" and "not" so that
+# "poor finishing" ~ "weak finishing" but never ~ "good finishing". Positive
+# words are the implicit default and stay stop words. Per language because the
+# same word can be a negation in one and a stop word in another ("no").
+QUERY_POLARITY = {
+    "english": {
+        **dict.fromkeys("bad poor weak worse worst".split(), "bad"),
+        **dict.fromkeys("not no without never lacking lack".split(), "not"),
+    },
+    "portuguese": {
+        **dict.fromkeys("ruim ruin mau ma fraco fraca pior".split(), "bad"),
+        **dict.fromkeys("nao sem nunca".split(), "not"),
+    },
+    "spanish": {
+        **dict.fromkeys("malo mala pobre debil debile flojo floja peor".split(), "bad"),
+        **dict.fromkeys("no sin nunca".split(), "not"),
+    },
+    "bulgarian": {
+        **dict.fromkeys("losh losha loshi slab slaba slabi".split(), "bad"),
+        **dict.fromkeys("ne bez".split(), "not"),
+    },
+}
+
+
+def _build_query_position_index() -> Dict[str, str]:
+    """Map position names, aliases and codes to one token per position group"""
+    index: Dict[str, str] = {}
+    for name, codes in list(POSITION_ALIASES.items()) + list(POSITIONS_MAPPING.items()):
+        index.setdefault(normalize_text(name), "pos" + "".join(sorted(codes)))
+    for code in VALID_POSITION_CODES:
+        index.setdefault(code, "pos" + code)
+    # In queries "am" is far more often the verb than the position
+    index.pop("am", None)
+    return index
+
+
+_QUERY_POSITION_INDEX = _build_query_position_index()
+# Longest first, so multi-word names are replaced whole
+_POSITION_PHRASE_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(key) for key in sorted(_QUERY_POSITION_INDEX, key=len, reverse=True)) + r")\b"
+)
+
+
+def query_terms(text: str, language: str = "english") -> List[str]:
+    """
+    Normalize a search query into comparable terms
+
+    Accents and case are removed, simple plurals are stripped, common synonyms
+    and position names or aliases are mapped to shared terms ("centre back",
+    "cb" and "cbs" all become the same term), negative and negating words
+    become "bad" and "not", and stop words are dropped.
+
+    Args:
+        text: The query
+        language: Query language, selects the stop and polarity words
+
+    Returns:
+        Terms in query order
+    """
+    stop_words = STOP_WORDS.get(language, STOP_WORDS["english"])
+    polarity = QUERY_POLARITY.get(language, QUERY_POLARITY["english"])
+    words = []
+    for word in normalize_text(text).split():
+        if word.endswith("sses"):
+            word = word[:-2]
+        elif len(word) > 2 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(polarity.get(word) or QUERY_SYNONYMS.get(word, word))
+
+    terms = []
+    text = _POSITION_PHRASE_PATTERN.sub(lambda match: _QUERY_POSITION_INDEX[match.group(1)], " ".join(words))
+    for term in text.split():
+        if term not in stop_words:
+            terms.append(term)
+    return terms
+
+
+def query_guard(terms: List[str]) -> FrozenSet[str]:
+    """Positions, numbers, polarity and guard words of a query; queries with different guards never match"""
+    return frozenset(
+        term for term in terms
+        if term.isdigit() or term in QUERY_GUARD_WORDS or term in ("bad", "not") or term.startswith("pos")
+    )
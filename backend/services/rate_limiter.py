@@ -0,0 +1,210 @@
+"""
+Client-side request shaping for the Claude API
+
+This module provides:
+- SingleFlight: collapses identical in-flight requests into one upstream call
+- TokenBucket: a FIFO token-bucket limiter with a bounded wait queue
+- ModelRateLimiter: one TokenBucket per model, configured from config.py
+
+All classes are thread-safe and keep counters that are exposed for monitoring.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class QueueFullError(Exception):
+    """Raised when a limiter's wait queue is full and the caller should fail fast"""
+    pass
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into a single execution
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for and share its result (or exception).
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error: Optional[BaseException] = None
+            self.waiters = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the request (e.g. a hash of the request body)
+            fn: Function performing the request
+
+        Returns:
+            Tuple of (result, shared) where shared is True for callers that
+            reused the leader's result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = self._Call()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, False
+
+    def stats(self) -> Dict[str, int]:
+        """Get single-flight counters"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "waiting": sum(call.waiters for call in self._calls.values()),
+                "executed": self._executed,
+                "coalesced": self._coalesced
+            }
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter with a bounded FIFO wait queue
+
+    Implemented as a virtual scheduler (GCRA): each acquisition reserves the
+    next free slot, so waiters are served in arrival order without a condition
+    variable. Callers that would exceed the queue bound or their wait budget
+    are rejected immediately instead of blocking a worker thread.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int, max_queue: int, max_wait_seconds: float):
+        self.requests_per_minute = requests_per_minute
+        self.burst = max(1, int(burst))
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait_seconds = max_wait_seconds
+
+        self._interval = 60.0 / requests_per_minute
+        self._tolerance = (self.burst - 1) * self._interval
+        self._theoretical_arrival = 0.0
+
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._acquired = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """
+        Take a token, waiting in line if the bucket is empty
+
+        Args:
+            max_wait: Optional wait budget in seconds (defaults to max_wait_seconds)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            QueueFullError: If the queue is full or the wait would exceed the budget
+        """
+        budget = self.max_wait_seconds if max_wait is None else min(max_wait, self.max_wait_seconds)
+
+        with self._lock:
+            now = time.monotonic()
+            arrival = max(self._theoretical_arrival, now)
+            wait = max(0.0, arrival - self._tolerance - now)
+
+            if wait > 0 and self._queue_depth >= self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(f"Rate limiter queue is full ({self._queue_depth} waiting)")
+            if wait > budget:
+                self._rejected += 1
+                raise QueueFullError(f"Rate limiter wait of {wait:.1f}s exceeds budget of {budget:.1f}s")
+
+            # Reserve our slot
+            self._theoretical_arrival = arrival + self._interval
+            self._acquired += 1
+            self._total_wait += wait
+            if wait > 0:
+                self._queue_depth += 1
+                self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._queue_depth -= 1
+
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter configuration and counters"""
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "burst": self.burst,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "acquired": self._acquired,
+                "rejected": self._rejected,
+                "total_wait_seconds": round(self._total_wait, 3)
+            }
+
+
+class ModelRateLimiter:
+    """One token bucket per model, created lazily from the configured limits"""
+
+    def __init__(self, limits: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            limits: Mapping of model name (or "default") to TokenBucket settings
+        """
+        self._limits = limits
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, model: str) -> TokenBucket:
+        """Get the bucket for a model, creating it on first use"""
+        with self._lock:
+            if model not in self._buckets:
+                settings = self._limits.get(model, self._limits["default"])
+                self._buckets[model] = TokenBucket(**settings)
+            return self._buckets[model]
+
+    def acquire(self, model: str, max_wait: Optional[float] = None) -> float:
+        """Take a token for the given model; see TokenBucket.acquire"""
+        return self.bucket(model).acquire(max_wait)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters for every model seen so far"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {model: bucket.stats() for model, bucket in buckets.items()}
@@ -0,0 +1,336 @@
+"""
+Semantic cache for extracted search parameters
+
+Many scout queries are paraphrases of earlier ones ("strong aerial centre
+backs", "CBs dominant in the air"). Instead of paying a Claude round trip for
+each, new queries are matched against the queries whose parameters were
+already extracted:
+
+- queries are normalized with services.nlp_service.query_terms (accents,
+  stop words, plurals, position synonyms)
+- each is vectorized with TF-IDF over word terms and character n-grams; the
+  IDF weights are fitted locally on the cached queries of each language and
+  refitted as the index grows
+- a lookup scores candidates through an inverted index by cosine similarity;
+  the best one above the threshold is a hit, provided both queries agree on
+  numbers and guard words such as "left"/"right"
+
+Each language has its own index. Entries expire after a TTL, the oldest are
+dropped when an index is full, and bad entries can be evicted by id or by query.
+"""
+
+import copy
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from services.nlp_service import query_terms, query_guard
+
+# Character n-gram sizes used next to whole-word terms
+NGRAM_SIZES = (3, 4)
+
+
+def vectorize_terms(terms: List[str]) -> Dict[str, float]:
+    """
+    Turn query terms into sublinear term frequencies over words and char n-grams
+
+    Position tokens and numbers are only used whole: their n-grams would make
+    unrelated positions or ages look similar.
+    """
+    counts: Dict[str, int] = {}
+    for term in terms:
+        features = ["w:" + term]
+        if not (term.startswith("pos") or term.isdigit()):
+            padded = f"#{term}#"
+            for size in NGRAM_SIZES:
+                features += [padded[i:i + size] for i in range(len(padded) - size + 1)]
+        for feature in features:
+            counts[feature] = counts.get(feature, 0) + 1
+    return {feature: 1.0 + math.log(count) for feature, count in counts.items()}
+
+
+class CacheEntry:
+    """A query and the parameters extracted for it"""
+
+    def __init__(self, query: str, normalized: str, guard: FrozenSet[str],
+                 vector: Dict[str, float], params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.query = query
+        self.normalized = normalized
+        self.guard = guard
+        self.vector = vector
+        self.params = params
+        self.created_at = time.time()
+        self.hits = 0
+        self.last_hit_at: Optional[float] = None
+        self.norm = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Public view of the entry for the admin endpoints"""
+        return {
+            "id": self.id,
+            "query": self.query,
+            "normalized": self.normalized,
+            "created_at": self.created_at,
+            "hits": self.hits,
+            "last_hit_at": self.last_hit_at,
+            "params": self.params
+        }
+
+
+class _LanguageIndex:
+    """TF-IDF inverted index over the cached queries of one language (not thread-safe)"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.by_normalized: Dict[str, str] = {}
+        # feature -> {entry id: term frequency}
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.idf: Dict[str, float] = {}
+        self.fitted_size = 0
+
+    def default_idf(self) -> float:
+        """IDF of a feature no cached query has"""
+        return math.log(1 + max(len(self.entries), self.fitted_size)) + 1.0
+
+    def weight(self, feature: str) -> float:
+        return self.idf.get(feature) or self.default_idf()
+
+    def norm(self, vector: Dict[str, float]) -> float:
+        return math.sqrt(sum((tf * self.weight(feature)) ** 2 for feature, tf in vector.items()))
+
+    def add(self, entry: CacheEntry) -> None:
+        self.entries[entry.id] = entry
+        self.by_normalized[entry.normalized] = entry.id
+        for feature, tf in entry.vector.items():
+            self.postings.setdefault(feature, {})[entry.id] = tf
+        entry.norm = self.norm(entry.vector)
+        self.maybe_refit()
+
+    def remove(self, entry_id: str) -> Optional[CacheEntry]:
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return None
+        if self.by_normalized.get(entry.normalized) == entry_id:
+            del self.by_normalized[entry.normalized]
+        for feature in entry.vector:
+            posting = self.postings.get(feature)
+            if posting is not None:
+                posting.pop(entry_id, None)
+                if not posting:
+                    del self.postings[feature]
+        return entry
+
+    def maybe_refit(self) -> None:
+        """Refit the IDF weights once the index has changed size by about 10%"""
+        size = len(self.entries)
+        if abs(size - self.fitted_size) < max(5, self.fitted_size // 10):
+            return
+        total = size + 1
+        self.idf = {
+            feature: math.log(total / (1 + len(posting))) + 1.0
+            for feature, posting in self.postings.items()
+        }
+        self.fitted_size = size
+        for entry in self.entries.values():
+            entry.norm = self.norm(entry.vector)
+
+    def nearest(self, vector: Dict[str, float], guard: FrozenSet[str]) -> List[Any]:
+        """Cached entries scored by cosine similarity, best first, among those with the same guard"""
+        query_norm = self.norm(vector)
+        if not query_norm:
+            return []
+
+        dots: Dict[str, float] = {}
+        for feature, tf in vector.items():
+            posting = self.postings.get(feature)
+            if not posting:
+                continue
+            weight = self.weight(feature)
+            query_weight = tf * weight
+            for entry_id, entry_tf in posting.items():
+                dots[entry_id] = dots.get(entry_id, 0.0) + query_weight * entry_tf * weight
+
+        scored = []
+        for entry_id, dot in dots.items():
+            entry = self.entries[entry_id]
+            if entry.guard != guard or not entry.norm:
+                continue
+            scored.append((min(1.0, dot / (query_norm * entry.norm)), entry))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored
+
+
+class SemanticCache:
+    """
+    Thread-safe semantic cache from queries to extracted search parameters
+
+    Args:
+        threshold: Minimum cosine similarity for a hit
+        max_entries_per_language: Entries kept per language; the oldest are dropped first
+        ttl_seconds: Age after which an entry is no longer used
+    """
+
+    def __init__(self, threshold: float = 0.8, max_entries_per_language: int = 2000,
+                 ttl_seconds: float = 7 * 24 * 3600):
+        self.threshold = threshold
+        self.max_entries_per_language = max_entries_per_language
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, _LanguageIndex] = {}
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    def lookup(self, query: str, language: str = "english") -> Optional[Dict[str, Any]]:
+        """
+        Find the parameters of the most similar cached query
+
+        Args:
+            query: The new query
+            language: Query language
+
+        Returns:
+            A copy of the cached parameters, or None on a miss
+        """
+        terms = query_terms(query, language)
+        if not terms:
+            return None
+        vector = vectorize_terms(terms)
+        guard = query_guard(terms)
+
+        with self._lock:
+            index = self._indexes.get(language)
+            if index is not None:
+                now = time.time()
+                for score, entry in index.nearest(vector, guard):
+                    if score < self.threshold:
+                        break
+                    if now - entry.created_at > self.ttl_seconds:
+                        index.remove(entry.id)
+                        self._counters["expired"] += 1
+                        continue
+                    entry.hits += 1
+                    entry.last_hit_at = now
+                    self._counters["hits"] += 1
+                    print(f"Parameter cache hit ({score:.2f}): '{query}' ~ '{entry.query}'")
+                    return copy.deepcopy(entry.params)
+            self._counters["misses"] += 1
+        return None
+
+    def store(self, query: str, language: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Cache the parameters extracted for a query
+
+        A query that normalizes to an already cached one replaces it.
+
+        Returns:
+            The entry id, or None if the query has no searchable terms
+        """
+        terms = query_terms(query, language)
+        if not terms:
+            return None
+        entry = CacheEntry(query, " ".join(terms), query_guard(terms), vectorize_terms(terms), copy.deepcopy(params))
+
+        with self._lock:
+            index = self._indexes.setdefault(language, _LanguageIndex())
+            existing = index.by_normalized.get(entry.normalized)
+            if existing is not None:
+                index.remove(existing)
+            while len(index.entries) >= self.max_entries_per_language:
+                index.remove(next(iter(index.entries)))
+                self._counters["evictions"] += 1
+            index.add(entry)
+            self._counters["stores"] += 1
+        return entry.id
+
+    def evict(self, entry_id: str) -> bool:
+        """Remove an entry by id from whichever language holds it"""
+        with self._lock:
+            for index in self._indexes.values():
+                if index.remove(entry_id) is not None:
+                    self._counters["evictions"] += 1
+                    return True
+        return False
+
+    def evict_query(self, query: str, language: str = "english", threshold: Optional[float] = None) -> List[str]:
+        """
+        Remove every entry a query would hit (or match with the given threshold)
+
+        Returns:
+            Ids of the evicted entries
+        """
+        terms = query_terms(query, language)
+        if not terms:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+
+        with self._lock:
+            index = self._indexes.get(language)
+            if index is None:
+                return []
+            matches = [
+                entry.id for score, entry in index.nearest(vectorize_terms(terms), query_guard(terms))
+                if score >= threshold
+            ]
+            for entry_id in matches:
+                index.remove(entry_id)
+            self._counters["evictions"] += len(matches)
+        return matches
+
+    def clear(self, language: Optional[str] = None) -> int:
+        """Remove all entries, or those of one language; returns how many were removed"""
+        with self._lock:
+            languages = [language] if language else list(self._indexes)
+            removed = 0
+            for name in languages:
+                index = self._indexes.pop(name, None)
+                if index is not None:
+                    removed += len(index.entries)
+            self._counters["evictions"] += removed
+        return removed
+
+    def entries(self, language: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent entries, newest first, optionally for one language"""
+        with self._lock:
+            result = []
+            for name, index in self._indexes.items():
+                if language and name != language:
+                    continue
+                result += [dict(entry.to_dict(), language=name) for entry in index.entries.values()]
+        result.sort(key=lambda item: item["created_at"], reverse=True)
+        return result[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts per language and hit/miss counters"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "threshold": self.threshold,
+                "entries": {name: len(index.entries) for name, index in self._indexes.items()},
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else None,
+                **self._counters
+            }
+
+
+# Shared cache, created on first use from config.PARAMETER_CACHE
+_parameter_cache: Optional[SemanticCache] = None
+_parameter_cache_lock = threading.Lock()
+
+
+def get_parameter_cache() -> Optional[SemanticCache]:
+    """Get the process-wide parameter cache (None when disabled)"""
+    global _parameter_cache
+    from config import PARAMETER_CACHE
+    if not PARAMETER_CACHE["enabled"]:
+        return None
+    if _parameter_cache is None:
+        with _parameter_cache_lock:
+            if _parameter_cache is None:
+                _parameter_cache = SemanticCache(
+                    threshold=PARAMETER_CACHE["threshold"],
+                    max_entries_per_language=PARAMETER_CACHE["max_entries_per_language"],
+                    ttl_seconds=PARAMETER_CACHE["ttl_seconds"]
+                )
+    return _parameter_cache
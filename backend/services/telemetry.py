@@ -0,0 +1,313 @@
+"""
+Structured telemetry for Claude calls and request stages
+
+Every upstream Claude call is recorded with its task, model, token usage,
+wall time, attempts and outcome. Records feed:
+- in-process counters and latency histograms, exported in the Prometheus text
+  format at /metrics
+- an append-only NDJSON log, written in batches by a background thread so
+  request threads never block on disk I/O
+
+Request stage durations (the same ones reported in Server-Timing) are also
+exported as histograms, which shows which stage dominates end-to-end latency.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import TELEMETRY, CLAUDE_MODEL_PRICES
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Histogram bucket upper bounds for locally estimated prompt sizes, in tokens
+PROMPT_TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets (Prometheus semantics)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf"""
+        running, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((f"{bound:g}", running))
+        result.append(("+Inf", self.count))
+        return result
+
+
+def estimate_cost(model: str, usage: Dict[str, Any]) -> float:
+    """
+    Estimate the cost of a call in USD from its token usage
+
+    Args:
+        model: Model name
+        usage: The response's usage block
+
+    Returns:
+        Cost in USD using CLAUDE_MODEL_PRICES (per million tokens)
+    """
+    prices = CLAUDE_MODEL_PRICES.get(model, CLAUDE_MODEL_PRICES["default"])
+    return (
+        (usage.get("input_tokens") or 0) * prices["input"]
+        + (usage.get("output_tokens") or 0) * prices["output"]
+        + (usage.get("cache_creation_input_tokens") or 0) * prices["input"] * prices["cache_write_multiplier"]
+        + (usage.get("cache_read_input_tokens") or 0) * prices["input"] * prices["cache_read_multiplier"]
+    ) / 1_000_000
+
+
+class NDJSONWriter:
+    """
+    Append-only NDJSON log with batched writes on a background thread
+
+    Records are queued without blocking; when the queue is full they are
+    dropped and counted rather than slowing down requests.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100, flush_interval: float = 2.0, max_queue: int = 10000):
+        """
+        Args:
+            path: File to append to (directories are created)
+            batch_size: Records written per batch at most
+            flush_interval: Seconds between flushes when the batch is not full
+            max_queue: Records buffered before new ones are dropped
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Queue a record for writing"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch))
+            self.written += len(batch)
+        except OSError as e:
+            print(f"Error writing telemetry log {self.path}: {str(e)}")
+            self.dropped += len(batch)
+
+
+class Telemetry:
+    """Thread-safe counters and histograms for Claude calls and request stages"""
+
+    def __init__(self, log_writer: Optional[NDJSONWriter] = None):
+        self._lock = threading.Lock()
+        self._log = log_writer
+        # (task, model, outcome) -> calls
+        self._calls: Dict[Tuple[str, str, str], int] = {}
+        # (task, model) -> Histogram of call wall time
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        # (task, model, token type) -> tokens
+        self._tokens: Dict[Tuple[str, str, str], int] = {}
+        # (task, model) -> retries / cost
+        self._retries: Dict[Tuple[str, str], int] = {}
+        self._cost: Dict[Tuple[str, str], float] = {}
+        # (task, model) -> Histogram of estimated prompt tokens
+        self._prompt_tokens: Dict[Tuple[str, str], Histogram] = {}
+        # stage -> Histogram of stage duration
+        self._stages: Dict[str, Histogram] = {}
+
+    def record_call(self, task: str, model: str, duration: float, attempts: int, outcome: str,
+                    usage: Optional[Dict[str, Any]] = None, streamed: bool = False,
+                    prompt_tokens: int = 0) -> None:
+        """
+        Record one upstream Claude call (including all of its retries)
+
+        Args:
+            task: Task name (routing task, tool name or "text")
+            model: Model name
+            duration: Wall time in seconds, including retries and rate-limiter waits
+            attempts: HTTP attempts made
+            outcome: "success" or the reason for the fallback (e.g. "error", "circuit_open")
+            usage: Usage block from the response, if any
+            streamed: Whether the response was streamed
+            prompt_tokens: Locally estimated size of the request, in tokens (0 if unknown)
+        """
+        usage = usage or {}
+        cost = estimate_cost(model, usage) if usage else 0.0
+
+        with self._lock:
+            key = (task, model)
+            self._calls[(task, model, outcome)] = self._calls.get((task, model, outcome), 0) + 1
+            self._latency.setdefault(key, Histogram()).observe(duration)
+            self._retries[key] = self._retries.get(key, 0) + max(0, attempts - 1)
+            self._cost[key] = self._cost.get(key, 0.0) + cost
+            if prompt_tokens:
+                self._prompt_tokens.setdefault(key, Histogram(PROMPT_TOKEN_BUCKETS)).observe(prompt_tokens)
+            for field in TOKEN_FIELDS:
+                if usage.get(field):
+                    token_key = (task, model, field.replace("_tokens", ""))
+                    self._tokens[token_key] = self._tokens.get(token_key, 0) + usage[field]
+
+        if self._log is not None:
+            self._log.write({
+                "ts": round(time.time(), 3),
+                "type": "claude_call",
+                "task": task,
+                "model": model,
+                "outcome": outcome,
+                "duration_ms": round(duration * 1000, 1),
+                "attempts": attempts,
+                "streamed": streamed,
+                "prompt_tokens_est": prompt_tokens,
+                **{field: usage.get(field) or 0 for field in TOKEN_FIELDS},
+                "cost_usd": round(cost, 6)
+            })
+
+    def record_stages(self, endpoint: str, timings_ms: Dict[str, float]) -> None:
+        """Record the stage durations of a finished request"""
+        if not timings_ms:
+            return
+        with self._lock:
+            for name, duration in timings_ms.items():
+                self._stages.setdefault(name, Histogram()).observe(duration / 1000)
+
+        if self._log is not None:
+            self._log.write({
+                "ts": round(time.time(), 3),
+                "type": "request",
+                "endpoint": endpoint,
+                "stages_ms": {name: round(duration, 1) for name, duration in timings_ms.items()}
+            })
+
+    def render_prometheus(self) -> str:
+        """Export all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def labels(**values: str) -> str:
+            return ",".join(f'{name}="{value}"' for name, value in values.items())
+
+        with self._lock:
+            lines += ["# HELP katena_claude_calls_total Claude API calls by task, model and outcome",
+                      "# TYPE katena_claude_calls_total counter"]
+            for (task, model, outcome), count in sorted(self._calls.items()):
+                lines.append(f"katena_claude_calls_total{{{labels(task=task, model=model, outcome=outcome)}}} {count}")
+
+            lines += ["# HELP katena_claude_call_duration_seconds Wall time of Claude calls including retries",
+                      "# TYPE katena_claude_call_duration_seconds histogram"]
+            for (task, model), histogram in sorted(self._latency.items()):
+                base = labels(task=task, model=model)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'katena_claude_call_duration_seconds_bucket{{{base},le="{bound}"}} {count}')
+                lines.append(f"katena_claude_call_duration_seconds_sum{{{base}}} {histogram.sum:.6f}")
+                lines.append(f"katena_claude_call_duration_seconds_count{{{base}}} {histogram.count}")
+
+            lines += ["# HELP katena_claude_tokens_total Tokens reported by the Claude API usage block",
+                      "# TYPE katena_claude_tokens_total counter"]
+            for (task, model, kind), count in sorted(self._tokens.items()):
+                lines.append(f"katena_claude_tokens_total{{{labels(task=task, model=model, type=kind)}}} {count}")
+
+            lines += ["# HELP katena_claude_retries_total Retried Claude API attempts",
+                      "# TYPE katena_claude_retries_total counter"]
+            for (task, model), count in sorted(self._retries.items()):
+                lines.append(f"katena_claude_retries_total{{{labels(task=task, model=model)}}} {count}")
+
+            lines += ["# HELP katena_claude_cost_usd_total Estimated Claude API cost in USD",
+                      "# TYPE katena_claude_cost_usd_total counter"]
+            for (task, model), cost in sorted(self._cost.items()):
+                lines.append(f"katena_claude_cost_usd_total{{{labels(task=task, model=model)}}} {cost:.6f}")
+
+            lines += ["# HELP katena_claude_prompt_tokens Locally estimated prompt size of Claude calls",
+                      "# TYPE katena_claude_prompt_tokens histogram"]
+            for (task, model), histogram in sorted(self._prompt_tokens.items()):
+                base = labels(task=task, model=model)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'katena_claude_prompt_tokens_bucket{{{base},le="{bound}"}} {count}')
+                lines.append(f"katena_claude_prompt_tokens_sum{{{base}}} {histogram.sum:.0f}")
+                lines.append(f"katena_claude_prompt_tokens_count{{{base}}} {histogram.count}")
+
+            lines += ["# HELP katena_stage_duration_seconds Duration of request stages (as in Server-Timing)",
+                      "# TYPE katena_stage_duration_seconds histogram"]
+            for name, histogram in sorted(self._stages.items()):
+                base = labels(stage=name)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'katena_stage_duration_seconds_bucket{{{base},le="{bound}"}} {count}')
+                lines.append(f"katena_stage_duration_seconds_sum{{{base}}} {histogram.sum:.6f}")
+                lines.append(f"katena_stage_duration_seconds_count{{{base}}} {histogram.count}")
+
+        if self._log is not None:
+            lines += ["# HELP katena_telemetry_log_records_total Telemetry log records by result",
+                      "# TYPE katena_telemetry_log_records_total counter",
+                      f'katena_telemetry_log_records_total{{result="written"}} {self._log.written}',
+                      f'katena_telemetry_log_records_total{{result="dropped"}} {self._log.dropped}']
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared telemetry, created on first use from config.TELEMETRY
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Get the process-wide telemetry collector"""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                writer = None
+                if TELEMETRY["log_file"]:
+                    writer = NDJSONWriter(
+                        TELEMETRY["log_file"],
+                        batch_size=TELEMETRY["batch_size"],
+                        flush_interval=TELEMETRY["flush_interval_seconds"],
+                        max_queue=TELEMETRY["max_queue"]
+                    )
+                _telemetry = Telemetry(writer)
+    return _telemetry
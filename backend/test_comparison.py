@@ -125,5 +125,62 @@ def test_player_comparison():
     
     print("\nPlayer comparison test completed successfully!")
 
+def test_multi_player_comparison():
+    """Three or more players are ranked together; two keep the pairwise format"""
+    from core.enhanced_comparison import enhance_player_comparison
+    
+    players = [
+        {"name": "A", "stats": {"goals": 10, "passes": 40.0, "ballLosses": 9.0}},
+        {"name": "B", "stats": {"goals": 5, "passes": 60.0, "ballLosses": 4.0}},
+        {"name": "C", "stats": {"goals": 5, "passes": 50.0, "ballLosses": 6.0, "assists": 3}},
+        {"name": "D", "stats": {"goals": 1, "passes": 30.0, "ballLosses": 12.0}}
+    ]
+    result = enhance_player_comparison(players, comparison_text="")
+    
+    # "assists" is not shared by every player
+    assert sorted(result["metric_winners"]) == ["ballLosses", "goals", "passes"]
+    assert result["metric_winners"] == {"ballLosses": "player2", "goals": "player1", "passes": "player2"}
+    # Ties share the better rank; fewer ball losses is better
+    assert result["metric_ranks"]["goals"] == [1, 2, 2, 4]
+    assert result["metric_ranks"]["ballLosses"] == [3, 1, 2, 4]
+    assert [entry["player"] for entry in result["standings"]] == ["player2", "player1", "player3", "player4"]
+    assert result["overall_winner"]["winner"] == "player2"
+    
+    dominance = result["dominance_matrix"]
+    assert all(dominance[i][i] == 0 for i in range(4))
+    assert dominance[0][3] == 1.0 and dominance[3][0] == 0.0
+    # Tied metrics count for neither player
+    assert dominance[1][2] + dominance[2][1] < 1.0
+    assert result["players"][1]["stats"]["goals_winner"] is False
+    assert result["players"][2]["stats"]["goals_winner"] is False
+    
+    pairwise = enhance_player_comparison(players[:2], comparison_text="")
+    assert "standings" not in pairwise and "dominance_matrix" not in pairwise
+    assert pairwise["metric_winners"]["goals"] == "player1"
+
+def test_name_resolution():
+    """Names as written in chat resolve to wyIds with a ranked candidate list"""
+    from services.name_index import NameIndex
+    
+    index = NameIndex({
+        "Vinícius Júnior": {"wyId": 1},
+        "Julián Álvarez": {"wyId": 2},
+        "Edson Álvarez": {"wyId": 3},
+        "Kevin De Bruyne": {"wyId": 4},
+        "Erling Haaland": {"wyId": 5},
+        "Vinícius Souza": {"wyId": 6}
+    })
+    
+    assert index.best_match("Vinícius Júnior")["match"] == "exact"
+    assert index.best_match("Vini Jr")["wyId"] == "1"
+    assert index.best_match("de bruyne")["wyId"] == "4"
+    assert index.best_match("Julian Alvares")["wyId"] == "2"
+    assert index.best_match("Haland")["wyId"] == "5"
+    # An ambiguous surname ranks every player with it
+    candidates = index.resolve("Alvarez")
+    assert {c["wyId"] for c in candidates[:2]} == {"2", "3"}
+    assert candidates[0]["confidence"] == candidates[1]["confidence"]
+    assert index.resolve("Nobody Known", min_confidence=0.6) == []
+
 if __name__ == "__main__":
     test_player_comparison()
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Tests for the conversation context built for Claude prompts
+"""
+
+import os
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import context
+from core.context import build_context, build_context_messages, build_query_context, update_context_summary
+from core.session import SessionData
+from utils.prompt_encoder import estimate_tokens
+
+
+def _session(turns):
+    """A session with the given number of user/assistant message pairs"""
+    session = SessionData(session_id="context")
+    for number in range(turns):
+        session.messages.append({"role": "user", "content": f"question {number} about strikers"})
+        session.messages.append({"role": "assistant", "content": f"answer {number} with three players"})
+    return session
+
+
+def test_summary_only_folds_new_messages():
+    session = _session(5)
+    recent = context.CONTEXT_RECENT_MESSAGES
+
+    summary = update_context_summary(session)
+    assert session.summarized_until == 10 - recent
+    assert summary == [
+        f"{message['role']}: {message['content']}" for message in session.messages[:10 - recent]
+    ]
+
+    # Lines already in the summary are never recomputed: a marker line survives
+    session.context_summary[0] = "user: marker"
+    session.messages.append({"role": "user", "content": "question 5 about wingers"})
+    session.messages.append({"role": "assistant", "content": "answer 5"})
+    summary = update_context_summary(session)
+
+    assert session.summarized_until == 12 - recent
+    assert summary[0] == "user: marker"
+    assert summary[-2:] == ["user: question 2 about strikers", "assistant: answer 2 with three players"]
+
+    # Nothing new left the window: the summary is unchanged
+    assert update_context_summary(session) == summary
+    assert session.summarized_until == 12 - recent
+
+
+def test_summary_restarts_when_history_is_truncated():
+    session = _session(5)
+    update_context_summary(session)
+    session.messages = session.messages[:2]
+
+    assert update_context_summary(session) == []
+    assert session.summarized_until == 0
+
+
+def test_summary_is_bounded(monkeypatch):
+    monkeypatch.setattr(context, "CONTEXT_SUMMARY_MAX_TOKENS", 20)
+    session = _session(10)
+
+    summary = update_context_summary(session)
+
+    assert estimate_tokens("\n".join(summary)) <= 20
+    # The oldest lines go first
+    assert summary[-1] == "assistant: answer 6 with three players"
+    assert "user: question 0 about strikers" not in summary
+
+
+def test_context_is_trimmed_to_the_budget(monkeypatch):
+    monkeypatch.setitem(context.CONTEXT_BUDGETS, "intent", 40)
+    session = _session(5)
+    session.messages[-1]["content"] = "long narrative " * 200
+
+    summary, messages = build_context_messages(session, "intent", "and who is the fastest?")
+
+    assert messages[-1] == {"role": "user", "content": "and who is the fastest?"}
+    assert messages[0]["role"] == "user"
+    used = sum(estimate_tokens(message["content"]) for message in messages)
+    used += sum(estimate_tokens(line) for line in summary.splitlines())
+    assert used <= 40
+    # The long narrative was elided or dropped, never sent in full
+    assert all(len(message["content"]) <= context.CONTEXT_MESSAGE_MAX_CHARS for message in messages)
+
+
+def test_current_message_is_kept_even_over_budget(monkeypatch):
+    monkeypatch.setitem(context.CONTEXT_BUDGETS, "intent", 5)
+    session = _session(2)
+    message = "compare" + " very long question" * 20
+
+    summary, messages = build_context_messages(session, "intent", message)
+
+    assert summary == ""
+    assert messages == [{"role": "user", "content": message}]
+
+
+def test_current_message_is_not_repeated():
+    session = _session(1)
+    session.messages.append({"role": "user", "content": "strikers under 23"})
+
+    messages = build_context(session, "default", "strikers under 23")
+
+    assert [message["content"] for message in messages].count("strikers under 23") == 1
+
+
+def test_summary_entry_comes_first():
+    messages = build_context(_session(5), "default", "next question")
+
+    assert messages[0]["role"] == "summary"
+    assert messages[1]["role"] == "user"
+
+
+def test_query_context_keeps_recent_distinct_queries():
+    session = _session(4)
+
+    queries = build_query_context(session, "only left footed ones")
+
+    assert len(queries) == context.CONTEXT_MAX_QUERIES
+    assert queries[-1] == "only left footed ones"
+    assert queries[:-1] == [f"question {number} about strikers" for number in range(4 - len(queries) + 1, 4)]
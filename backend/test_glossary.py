@@ -0,0 +1,55 @@
+"""
+Tests for the stats glossary
+"""
+
+import os
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import GLOSSARY_FILE, SUPPORTED_LANGUAGES
+from core.glossary import StatsGlossary
+
+
+def test_every_known_metric_is_explained_in_every_language():
+    glossary = StatsGlossary.load()
+    for key, entry in glossary.entries.items():
+        for language in SUPPORTED_LANGUAGES:
+            assert glossary.explain(key, language), f"{key} has no {language} explanation"
+    assert glossary.resolve("expected goals") == glossary.resolve("total_xgShot") == "xgShot"
+
+
+def test_runtime_explanations_stay_in_memory():
+    with open(GLOSSARY_FILE, "rb") as file:
+        original = file.read()
+    glossary = StatsGlossary(StatsGlossary.load().to_dict(), max_learned=2)
+
+    glossary.add_explanation("Packing rate", "english", "Opponents bypassed by passes.")
+    assert glossary.explain("packing rate", "english") == "Opponents bypassed by passes."
+    assert glossary.explain("packing rate", "spanish") is None
+    assert glossary.resolve("packing rate") is None
+
+    # Bounded: the least recently used answer is dropped
+    glossary.add_explanation("Field tilt", "english", "Share of final-third passes.")
+    glossary.explain("packing rate", "english")
+    glossary.add_explanation("PPDA", "english", "Passes allowed per defensive action.")
+    assert glossary.explain("field tilt", "english") is None
+    assert glossary.explain("packing rate", "english") is not None
+
+    with open(GLOSSARY_FILE, "rb") as file:
+        assert file.read() == original
+
+
+def test_templates_are_not_served():
+    glossary = StatsGlossary({
+        "schema_version": 1,
+        "entries": {"accelerations": {
+            "name": "Accelerations", "aliases": [], "category": None,
+            "explanations": {"english": "Accelerations: Accelerations per 90 min."},
+            "sources": {"english": "template"}
+        }}
+    })
+    assert glossary.explain("accelerations", "english") is None
+    glossary.add_explanation("average accelerations", "english", "Bursts from low to high speed.")
+    assert glossary.explain("Accelerations", "english") == "Bursts from low to high speed."
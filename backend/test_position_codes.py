@@ -0,0 +1,109 @@
+"""
+Tests for local position code resolution and the Claude correction fallback
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from core.session import UnifiedSession
+from services import semantic_cache
+from services.data_service import freeze
+from services.nlp_service import resolve_position_code, resolve_position_codes
+
+
+def test_valid_codes_and_aliases():
+    assert resolve_position_code("cf") == (("cf",), 1.0)
+    assert resolve_position_code("CB") == (("cb",), 1.0)
+    # Names and aliases in the supported languages
+    assert resolve_position_code("striker") == (("cf",), 1.0)
+    assert resolve_position_code("st") == (("cf",), 1.0)
+    assert set(resolve_position_code("zagueiro")[0]) == {"cb", "lcb", "rcb"}
+    assert set(resolve_position_code("centre back")[0]) == {"cb", "lcb", "rcb"}
+
+
+def test_near_misses_and_invalid_codes():
+    # Trailing digits and typos resolve with a lower confidence
+    assert resolve_position_code("lcmf3") == (("lcmf",), 0.95)
+    codes, confidence = resolve_position_code("strikr")
+    assert codes == ("cf",) and 0.6 <= confidence < 1.0
+
+    codes, confidence = resolve_position_code("xyzqq")
+    assert codes == () and confidence < config.POSITION_MATCH_THRESHOLD
+    assert resolve_position_code("") == ((), 0.0)
+
+
+def test_resolve_position_codes_dedupes_and_reports_unresolved():
+    assert resolve_position_codes(["st", "cb", "xyzqq", "lcb"]) == (["cf", "cb", "lcb"], ["xyzqq"])
+
+
+class SessionManagerWithoutData(UnifiedSession):
+    """Session manager that does not load the player database (sessions only)"""
+
+    def _load_json(self, filename: str):
+        return freeze({})
+
+
+@pytest.fixture
+def session_manager_and_cache(monkeypatch):
+    monkeypatch.setattr(config, "SESSION_JOURNAL", {**config.SESSION_JOURNAL, "directory": ""})
+    cache = semantic_cache.SemanticCache()
+    monkeypatch.setattr(semantic_cache, "get_parameter_cache", lambda: cache)
+    return SessionManagerWithoutData(), cache
+
+
+def _fake_claude(position_codes, correction=None):
+    """call_claude_api stand-in: extraction returns position_codes, correction returns correction or fails"""
+    calls = []
+
+    def call_claude_api(task=None, **kwargs):
+        calls.append(task)
+        if task == "position_correction":
+            if correction is None:
+                raise RuntimeError("Claude unavailable")
+            return SimpleNamespace(id="msg_2", content=[SimpleNamespace(input={"corrected_postion": correction})])
+        return SimpleNamespace(id="msg_1", content=[SimpleNamespace(input={
+            "position_codes": position_codes, "key_description_word": [], "average_passes": True
+        })])
+
+    return call_claude_api, calls
+
+
+def test_aliases_are_corrected_without_claude(session_manager_and_cache):
+    session_manager, cache = session_manager_and_cache
+    session_manager.call_claude_api, calls = _fake_claude(["st", "cb"])
+    session_manager.get_session("positions", "english")
+
+    params = session_manager.get_parameters("positions", "strikers and centre backs who pass")
+
+    assert params.position_codes == ["cb", "cf"]
+    assert calls == ["parameters"]
+
+
+def test_unresolved_codes_go_to_claude(session_manager_and_cache):
+    session_manager, cache = session_manager_and_cache
+    session_manager.call_claude_api, calls = _fake_claude(["cb", "xyzqq"], correction=["dmf"])
+    session_manager.get_session("positions", "english")
+
+    params = session_manager.get_parameters("positions", "xyzqq players who pass")
+
+    assert params.position_codes == ["cb", "dmf"]
+    assert "position_correction" in calls
+    assert cache.stats()["stores"] == 1
+
+
+def test_failed_correction_falls_back_and_is_not_cached(session_manager_and_cache):
+    session_manager, cache = session_manager_and_cache
+    session_manager.call_claude_api, calls = _fake_claude(["xyzqq"])
+    session_manager.get_session("positions", "english")
+
+    params = session_manager.get_parameters("positions", "xyzqq players who pass")
+
+    assert params.position_codes == ["cmf", "rcmf", "lcmf"]
+    assert cache.stats()["stores"] == 0
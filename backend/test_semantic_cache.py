@@ -0,0 +1,36 @@
+"""
+Tests for the semantic parameter cache
+"""
+
+import os
+import sys
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.semantic_cache import SemanticCache
+
+
+def test_opposite_polarity_never_hits():
+    cache = SemanticCache(threshold=0.8)
+    cache.store("center backs good at passing", "english", {"query": "good passers"})
+    cache.store("strikers with good finishing", "english", {"query": "good finishers"})
+
+    assert cache.lookup("center backs bad at passing") is None
+    assert cache.lookup("strikers with poor finishing") is None
+    assert cache.lookup("strikers without good finishing") is None
+    assert cache.lookup("centre backs good at passing") == {"query": "good passers"}
+
+
+def test_polarity_words_per_language():
+    cache = SemanticCache(threshold=0.8)
+    cache.store("strikers with weak finishing", "english", {"query": "weak finishers"})
+    cache.store("zagueiros bons no passe", "portuguese", {"query": "bons passadores"})
+    cache.store("delanteros buenos en el remate", "spanish", {"query": "buenos rematadores"})
+
+    # Negative words share one term, so their paraphrases still hit
+    assert cache.lookup("strikers with poor finishing") == {"query": "weak finishers"}
+    # Portuguese "no" is a contraction, Spanish "no" a negation
+    assert cache.lookup("zagueiros bons no passe", "portuguese") == {"query": "bons passadores"}
+    assert cache.lookup("zagueiros ruins no passe", "portuguese") is None
+    assert cache.lookup("delanteros no buenos en el remate", "spanish") is None
@@ -0,0 +1,160 @@
+"""
+Stress test for concurrent use of one session
+
+Many threads update the same session at once, as two browser tabs or a
+request and a background job would. Every update must survive: per-session
+locks serialize the read-modify-write of each request.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from core.session import UnifiedSession, start_session_tracking
+from services.data_service import freeze
+
+THREADS = 16
+REQUESTS_PER_THREAD = 25
+
+
+class SessionManagerWithoutData(UnifiedSession):
+    """Session manager that does not load the player database (sessions only)"""
+
+    def _load_json(self, filename: str):
+        return freeze({})
+
+
+@pytest.fixture
+def session_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SESSION_JOURNAL", {**config.SESSION_JOURNAL, "directory": str(tmp_path)})
+    return SessionManagerWithoutData()
+
+
+def _request(session_manager, number):
+    """One request: read the counter, yield to other threads, write it back"""
+    start_session_tracking()
+    session = session_manager.get_session("shared")
+    count = session.entities.get("count", 0)
+    time.sleep(0.0005)
+    session.entities["count"] = count + 1
+    session.messages.append({"role": "user", "content": f"request {number}"})
+    session_manager.save_request_sessions()
+
+
+def _job(session_manager, number):
+    """A background job updating the same session outside of a request"""
+    with session_manager.locked_session("shared") as session:
+        count = session.entities.get("count", 0)
+        time.sleep(0.0005)
+        session.entities["count"] = count + 1
+        session.messages.append({"role": "assistant", "content": f"job {number}"})
+
+
+def _hammer(session_manager):
+    errors = []
+
+    def worker(thread_number):
+        try:
+            for request_number in range(REQUESTS_PER_THREAD):
+                number = thread_number * REQUESTS_PER_THREAD + request_number
+                # Every fourth thread behaves like a background job
+                if thread_number % 4 == 0:
+                    _job(session_manager, number)
+                else:
+                    _request(session_manager, number)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_concurrent_updates_are_not_lost(session_manager):
+    errors = _hammer(session_manager)
+    assert not errors
+
+    start_session_tracking()
+    session = session_manager.get_session("shared")
+    session_manager.save_request_sessions()
+
+    total = THREADS * REQUESTS_PER_THREAD
+    assert session.entities["count"] == total
+    assert len(session.messages) == total
+    assert len({message["content"] for message in session.messages}) == total
+    # Every lock was released and forgotten
+    assert session_manager._session_locks == {}
+
+
+def test_journal_recovers_every_update(session_manager):
+    assert not _hammer(session_manager)
+    session_manager.session_journal.flush()
+
+    # A new process recovers the session from its journal
+    restarted = SessionManagerWithoutData()
+    session = restarted.get_session("shared")
+
+    total = THREADS * REQUESTS_PER_THREAD
+    assert session.entities["count"] == total
+    assert len(session.messages) == total
+
+
+def test_locked_session_inside_request_reuses_its_lock(session_manager):
+    start_session_tracking()
+    session = session_manager.get_session("shared")
+    # Would deadlock if the request's own lock were taken again
+    with session_manager.locked_session("shared") as same_session:
+        assert same_session is session
+    session_manager.save_request_sessions()
+    assert session_manager._session_locks == {}
+
+
+def test_workers_sharing_a_backend_do_not_lose_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SESSION_JOURNAL", {**config.SESSION_JOURNAL, "directory": ""})
+    monkeypatch.setattr(config, "SESSION_BACKEND", {
+        **config.SESSION_BACKEND, "type": "sqlite", "sqlite_path": str(tmp_path / "sessions.db")
+    })
+    # Two workers: their session locks do not see each other
+    first, second = SessionManagerWithoutData(), SessionManagerWithoutData()
+
+    for round_number in range(2):
+        # Both load the session before either saves, as two tabs on different workers would
+        with first.locked_session("shared") as session:
+            with second.locked_session("shared") as other:
+                other.messages.append({"role": "user", "content": f"second {round_number}"})
+                other.entities[f"second {round_number}"] = True
+            session.messages.append({"role": "user", "content": f"first {round_number}"})
+            session.entities[f"first {round_number}"] = True
+
+    session = SessionManagerWithoutData().get_session("shared")
+    assert [message["content"] for message in session.messages] == [
+        "second 0", "first 0", "second 1", "first 1"
+    ]
+    assert set(session.entities) == {"first 0", "second 0", "first 1", "second 1"}
+    assert first.session_backend.stats()["conflicts"] == 2
+
+
+def test_shared_player_data_is_read_only():
+    database = freeze({"Player": {"wyId": 1, "positions": []}})
+    with pytest.raises(TypeError):
+        database["Player"]["name"] = "Changed"
+    with pytest.raises(TypeError):
+        database["Other"] = {}
+    # Copies are ordinary dicts
+    player = database["Player"].copy()
+    player["name"] = "Player"
+    assert "name" not in database["Player"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,130 @@
+"""
+Tests for the append-only session journal: recovery, torn writes and compaction
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from core.session import SessionData, UnifiedSession
+from core.session_journal import SessionJournal
+from services.data_service import freeze
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return SessionJournal(str(tmp_path), snapshot_every=50, flush_interval_seconds=0.01)
+
+
+def _records(journal, session_id):
+    with open(journal._path(session_id), encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def _chat(journal, session, turns, start=0):
+    """Append message pairs to a session, journaling after each one"""
+    for number in range(start, start + turns):
+        session.messages.append({"role": "user", "content": f"question {number}"})
+        session.messages.append({"role": "assistant", "content": f"answer {number}"})
+        session.current_intent = f"intent {number}"
+        journal.record(session)
+
+
+def test_changes_are_appended_and_recovered(journal):
+    session = SessionData(session_id="scout", language="portuguese")
+    _chat(journal, session, 3)
+    journal.flush()
+
+    operations = [record["op"] for record in _records(journal, "scout")]
+    assert operations[0] == "snapshot"
+    assert operations[1:] == ["message", "message", "set"] * 2
+
+    recovered = journal.recover("scout")
+    assert recovered.model_dump() == session.model_dump()
+    assert journal.stats()["recovered"] == 1
+    # Recovery continues the journal instead of snapshotting again
+    _chat(journal, recovered, 1, start=3)
+    journal.flush()
+    assert [record["op"] for record in _records(journal, "scout")].count("snapshot") == 1
+    assert journal.recover("scout").messages == recovered.messages
+
+
+def test_torn_last_line_is_cut_off(journal):
+    session = SessionData(session_id="scout")
+    _chat(journal, session, 2)
+    journal.flush()
+    path = journal._path("scout")
+    with open(path, "ab") as file:
+        file.write(b'{"op": "message", "message": {"role": "user", "content": "half')
+
+    recovered = journal.recover("scout")
+
+    assert recovered.messages == session.messages
+    with open(path, "rb") as file:
+        assert file.read().endswith(b"}\n")
+    # The next record starts on a line of its own
+    _chat(journal, recovered, 1, start=2)
+    journal.flush()
+    assert journal.recover("scout").messages[-1] == {"role": "assistant", "content": "answer 2"}
+
+
+def test_journal_is_compacted_from_snapshots(tmp_path):
+    journal = SessionJournal(str(tmp_path), snapshot_every=4, flush_interval_seconds=0.01)
+    session = SessionData(session_id="scout")
+    for number in range(10):
+        _chat(journal, session, 1, start=number)
+        journal.flush()
+
+    records = _records(journal, "scout")
+    assert records[0]["op"] == "snapshot"
+    assert len(records) <= 4
+    assert journal.stats()["snapshots"] > 1
+    assert journal.recover("scout").model_dump() == session.model_dump()
+
+
+def test_history_rewrite_is_snapshotted(journal):
+    session = SessionData(session_id="scout")
+    _chat(journal, session, 2)
+    session.messages = session.messages[:1]
+    journal.record(session)
+    journal.flush()
+
+    assert [record["op"] for record in _records(journal, "scout")] == ["snapshot"]
+    assert journal.recover("scout").messages == [{"role": "user", "content": "question 0"}]
+
+
+def test_unknown_sessions_are_not_recovered(journal):
+    assert journal.recover("nobody") is None
+
+
+class SessionManagerWithoutData(UnifiedSession):
+    """Session manager that does not load the player database (sessions only)"""
+
+    def _load_json(self, filename: str):
+        return freeze({})
+
+
+def test_sessions_are_recovered_lazily_after_a_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SESSION_JOURNAL", {**config.SESSION_JOURNAL, "directory": str(tmp_path)})
+    before_restart = SessionManagerWithoutData()
+    with before_restart.locked_session("scout", "spanish") as session:
+        session.messages.append({"role": "user", "content": "laterales zurdos"})
+    with before_restart.locked_session("other") as session:
+        session.messages.append({"role": "user", "content": "wingers"})
+    before_restart.session_journal.flush()
+
+    restarted = SessionManagerWithoutData()
+    # Nothing is read at startup
+    assert len(restarted.sessions) == 0
+
+    session = restarted.get_session("scout")
+    assert session.language == "spanish"
+    assert session.messages == [{"role": "user", "content": "laterales zurdos"}]
+    assert restarted.session_journal.stats()["recovered"] == 1
+    assert "other" not in restarted.sessions
@@ -0,0 +1,139 @@
+"""
+Tests for the tiered session store: freezing idle sessions into the compressed
+cold tier, thawing them back, and keeping sessions held by a request hot
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from core import session_store
+from core.session import SessionData, UnifiedSession
+from core.session_store import SessionStore
+from services.data_service import freeze
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store.time, "monotonic", clock)
+    return clock
+
+
+def _session(session_id, messages=3):
+    session = SessionData(session_id=session_id)
+    session.messages = [{"role": "user", "content": f"{session_id} message {number}"} for number in range(messages)]
+    session.entities["team"] = "Flamengo"
+    return session
+
+
+def test_idle_sessions_freeze_and_thaw_with_private_attributes(clock):
+    store = SessionStore(sweep_interval_seconds=0, cold_after_seconds=60)
+    session = _session("scout")
+    session._backend_version = 7
+    session._backend_data = b'{"session_id": "scout"}'
+    store.put("scout", session)
+
+    clock.now += 61
+    store.get("other")
+    stats = store.stats()
+    assert stats["resident_sessions"] == 0
+    assert stats["cold_sessions"] == 1 and stats["frozen"] == 1
+
+    thawed = store.get("scout")
+    assert thawed is not session
+    assert thawed.model_dump() == session.model_dump()
+    # Serialization drops private attributes; the cold tier keeps them
+    assert thawed._backend_version == 7
+    assert thawed._backend_data == b'{"session_id": "scout"}'
+    stats = store.stats()
+    assert stats["rehydrations"] == 1 and stats["cold_sessions"] == 0 and stats["cold_bytes"] == 0
+
+
+def test_cold_tier_byte_limit_drops_the_oldest(clock, tmp_path):
+    store = SessionStore(sweep_interval_seconds=0, cold_after_seconds=60, spill_dir=str(tmp_path))
+    for session_id in ("first", "second", "third"):
+        store.put(session_id, _session(session_id, messages=50))
+        clock.now += 1
+    clock.now += 60
+    store.get("other")
+    assert store.stats()["cold_sessions"] == 3
+
+    # Room for two frozen sessions: freezing another pushes out the oldest
+    store.max_cold_bytes = store.stats()["cold_bytes"] * 3 // 4
+    store.put("fourth", _session("fourth", messages=50))
+    clock.now += 61
+    store.get("other")
+
+    stats = store.stats()
+    assert stats["cold_bytes"] <= store.max_cold_bytes
+    assert stats["evicted_cold_bytes"] == 2
+    assert stats["cold_sessions"] == 2
+    # Evicted sessions went to the spill directory and still come back
+    assert store.get("first").messages == _session("first", messages=50).messages
+    assert store.stats()["reloads"] == 1
+
+
+def test_checked_out_sessions_stay_hot(clock):
+    store = SessionStore(max_sessions=2, sweep_interval_seconds=0, cold_after_seconds=60, active_grace_seconds=5)
+    session = _session("held")
+    store.put("held", session)
+    store.checkout("held")
+
+    # Long past the grace period and the idle time, with the session limit exceeded
+    clock.now += 600
+    store.put("second", _session("second"))
+    store.put("third", _session("third"))
+    store.get("other")
+    assert store.get("held") is session
+    # The session limit made room by freezing the next least recently used one
+    assert store.stats()["frozen"] == 1 and store.stats()["evicted_lru"] == 1
+
+    # Once released it is frozen like any other
+    store.checkin("held")
+    clock.now += 61
+    store.get("other")
+    assert store.stats()["resident_sessions"] == 0
+    assert store.get("held") is not session
+
+
+def test_limits_are_exceeded_while_everything_is_checked_out(clock):
+    store = SessionStore(max_sessions=1, cold_after_seconds=None)
+    store.put("first", _session("first"))
+    store.checkout("first")
+    store.put("second", _session("second"))
+
+    assert store.stats()["resident_sessions"] == 2
+    assert store.stats()["evicted_lru"] == 0
+
+
+class SessionManagerWithoutData(UnifiedSession):
+    """Session manager that does not load the player database (sessions only)"""
+
+    def _load_json(self, filename: str):
+        return freeze({})
+
+
+def test_locked_session_is_checked_out(monkeypatch):
+    monkeypatch.setattr(config, "SESSION_JOURNAL", {**config.SESSION_JOURNAL, "directory": ""})
+    session_manager = SessionManagerWithoutData()
+
+    with session_manager.locked_session("job") as session:
+        assert "job" in session_manager.sessions._checked_out
+        session.entities["done"] = True
+    assert "job" not in session_manager.sessions._checked_out
@@ -0,0 +1,72 @@
+"""
+Tests for the formation squad builder
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.squad_builder import build_squad, hungarian, select_pool
+from core.tactical_analysis import FORMATIONS
+from core.tactical_rankings import TacticalRankingEngine
+
+
+def test_hungarian_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        rows = int(rng.integers(1, 5))
+        columns = int(rng.integers(rows, 7))
+        cost = rng.integers(-20, 20, (rows, columns)).astype(float)
+        best = min(
+            sum(cost[row, permutation[row]] for row in range(rows))
+            for permutation in itertools.permutations(range(columns), rows)
+        )
+        assignment = hungarian(cost)
+        assert [row for row, _ in assignment] == list(range(rows))
+        assert len({column for _, column in assignment}) == rows
+        assert sum(cost[row, column] for row, column in assignment) == best
+
+
+def _database():
+    """Two candidates per 4-3-3 position with random stats, plus an old player"""
+    rng = np.random.default_rng(3)
+    database = {}
+    for number, code in enumerate(sorted(set(FORMATIONS["4-3-3"])) * 2 + ["cf"]):
+        database[str(number)] = {
+            "wyId": number,
+            "name": f"Player {number}",
+            "age": 35 if number == 18 else 24,
+            "positions": [{"position": {"code": code, "name": code}}],
+            "average": {metric: float(rng.random() * 10) for metric in (
+                "counterpressingRecoveries", "dangerousOpponentHalfRecoveries", "ballRecoveries",
+                "accelerations", "interceptions", "passes", "progressivePasses"
+            )},
+            "percent": {"defensiveDuelsWon": float(rng.random() * 100), "offensiveDuelsWon": float(rng.random() * 100)}
+        }
+    return database
+
+
+def test_squad_fills_every_slot_with_distinct_players():
+    engine = TacticalRankingEngine(_database(), min_position_players=1)
+    result = build_squad(engine, "gegenpressing", "4-3-3", select_pool(engine), top_k=11)
+
+    assert result["unfilled_slots"] == []
+    players = [entry["player"]["wyId"] for entry in result["squad"]]
+    assert len(set(players)) == 11
+    for entry in result["squad"]:
+        assert entry["slot"] in entry["player"]["positions"]
+
+
+def test_pool_filters_and_empty_slots():
+    engine = TacticalRankingEngine(_database(), min_position_players=1)
+    assert 18 not in [engine.players[row]["wyId"] for row in select_pool(engine, max_age=30)]
+
+    # A shortlist without a goalkeeper leaves the goalkeeper slot empty
+    result = build_squad(engine, "gegenpressing", "4-3-3", select_pool(engine, player_ids=["1", "2", "3"]))
+    assert "gk" in result["unfilled_slots"]
+    assert sum(entry["player"] is not None for entry in result["squad"]) <= 3
@@ -0,0 +1,122 @@
+"""
+Tests for the request stage scheduler
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import stages
+from core.stages import StageScheduler
+
+
+def test_stages_run_after_their_dependencies():
+    order = []
+
+    def step(name, value):
+        def run(*args):
+            order.append(name)
+            return value(*args)
+        return run
+
+    results = (
+        StageScheduler()
+        .add("players", step("players", lambda: ["Pedro", "Arrascaeta"]))
+        .add("metrics", step("metrics", lambda: {"goals": 12}))
+        .add("count", step("count", lambda players: len(players)), after=("players",))
+        .add("response", step("response", lambda metrics, count: f"{count} players, {metrics['goals']} goals"),
+             after=("metrics", "count"))
+        .run()
+    )
+
+    assert results["response"] == "2 players, 12 goals"
+    assert order.index("count") > order.index("players")
+    assert order[-1] == "response"
+
+
+def test_independent_stages_overlap():
+    # The first stage only finishes if the second runs at the same time
+    started = threading.Event()
+
+    def waits_for_other():
+        return started.wait(timeout=5)
+
+    def other():
+        started.set()
+        return True
+
+    results = StageScheduler().add("claude", waits_for_other).add("local", other).run()
+
+    assert results == {"claude": True, "local": True}
+
+
+def test_declaration_errors():
+    scheduler = StageScheduler().add("first", lambda: 1)
+
+    with pytest.raises(ValueError):
+        scheduler.add("first", lambda: 2)
+    with pytest.raises(ValueError):
+        scheduler.add("second", lambda value: value, after=("missing",))
+
+
+def test_on_error_result_feeds_dependents():
+    def fails():
+        raise RuntimeError("Claude unavailable")
+
+    results = (
+        StageScheduler()
+        .add("narrative", fails, on_error=lambda error: f"fallback: {error}")
+        .add("response", lambda text: text.upper(), after=("narrative",))
+        .run()
+    )
+
+    assert results == {"narrative": "fallback: Claude unavailable", "response": "FALLBACK: CLAUDE UNAVAILABLE"}
+
+
+def test_error_without_on_error_is_raised_and_stops_dependents():
+    calls = []
+
+    def fails():
+        raise RuntimeError("boom")
+
+    scheduler = (
+        StageScheduler()
+        .add("fails", fails)
+        .add("independent", lambda: calls.append("independent"))
+        .add("dependent", lambda value: calls.append("dependent"), after=("fails",))
+    )
+    with pytest.raises(RuntimeError, match="boom"):
+        scheduler.run()
+
+    # Stages already started finish; nothing new starts after the failure
+    assert "dependent" not in calls
+
+
+def test_queued_stages_are_taken_back_when_the_pool_is_busy(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(stages, "_executor", executor)
+    # Keep the only worker busy, as a saturated pool or an outer scheduler would
+    release = threading.Event()
+    executor.submit(release.wait, 5)
+
+    caller = threading.current_thread().name
+    try:
+        results = (
+            StageScheduler()
+            .add("first", lambda: threading.current_thread().name)
+            .add("second", lambda: threading.current_thread().name)
+            .add("third", lambda: threading.current_thread().name)
+            .run()
+        )
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    # Nothing waited on the blocked worker: every stage ran in the calling thread
+    assert results == {"first": caller, "second": caller, "third": caller}
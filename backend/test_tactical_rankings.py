@@ -0,0 +1,115 @@
+"""
+Tests for the database-wide tactical rankings
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from core import tactical_rankings
+from core.tactical_rankings import TacticalRankingEngine
+from services import data_service
+
+PRESSING_METRICS = ("counterpressingRecoveries", "dangerousOpponentHalfRecoveries", "ballRecoveries", "interceptions")
+
+
+def _player(number, code, level, metrics=PRESSING_METRICS + ("accelerations",)):
+    """A player whose numbers for the given average metrics (and duels, if all are given) equal level"""
+    player = {
+        "wyId": number,
+        "name": f"Player {number}",
+        "age": 24,
+        "positions": [{"position": {"code": code, "name": code}}],
+        "average": {metric: float(level) for metric in metrics}
+    }
+    if "accelerations" in metrics:
+        player["percent"] = {"defensiveDuelsWon": float(level * 10), "offensiveDuelsWon": float(level * 10)}
+    return player
+
+
+def _database():
+    database = {str(number): _player(number, "cmf", number) for number in range(1, 7)}
+    database.update({str(number): _player(number, "cb", number - 6) for number in range(7, 10)})
+    database["10"] = _player(10, "gk", 9)
+    # Data for one metric only: the others must never be reported as strengths
+    database["11"] = _player(11, "cmf", 9, metrics=("counterpressingRecoveries",))
+    return database
+
+
+@pytest.fixture
+def engine():
+    return TacticalRankingEngine(_database(), min_position_players=1)
+
+
+def test_rank_orders_by_style_score(engine):
+    rankings = engine.rank("gegenpressing", limit=4)
+
+    assert [player["rank"] for player in rankings] == [1, 2, 3, 4]
+    scores = [player["style_score"] for player in rankings]
+    assert scores == sorted(scores, reverse=True)
+    assert rankings[0]["wyId"] == 6
+
+
+def test_rank_filters_positions_and_goalkeepers(engine):
+    everyone = engine.rank("gegenpressing", limit=20)
+    assert 10 not in [player["wyId"] for player in everyone]
+    assert len(everyone) == 9
+
+    assert [player["wyId"] for player in engine.rank("gegenpressing", positions=["gk"])] == [10]
+
+    centre_backs = engine.rank("gegenpressing", positions=["cb"], limit=20)
+    assert {player["wyId"] for player in centre_backs} == {7, 8, 9}
+
+    # Formation filter: "cb" and "cmf" are 4-3-3 positions, with a position fit for each player
+    in_formation = engine.rank("gegenpressing", formation="4-3-3", limit=20)
+    assert all(player["position_fit"] == 100.0 for player in in_formation)
+
+
+def test_key_strengths_skip_metrics_without_data(engine):
+    # Player 11 only passes a lowered coverage threshold
+    assert 11 not in [player["wyId"] for player in engine.rank("gegenpressing", limit=20)]
+    rankings = engine.rank("gegenpressing", limit=20, min_coverage=0.1)
+    player = next(player for player in rankings if player["wyId"] == 11)
+
+    assert [strength["metric"] for strength in player["key_strengths"]] == ["average_counterpressingRecoveries"]
+    # Valid JSON: no NaN percentiles anywhere
+    json.dumps(rankings, allow_nan=False)
+
+
+@pytest.fixture(scope="module")
+def client():
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(config, "SESSION_JOURNAL", {**config.SESSION_JOURNAL, "directory": ""})
+    # The app loads the player database at import; serve it the synthetic one
+    database = _database()
+    monkeypatch.setitem(data_service._data_cache, "database.json",
+                        data_service.freeze({player["name"]: player for player in database.values()}))
+    monkeypatch.setitem(data_service._data_cache, "db_by_id.json", data_service.freeze(database))
+    monkeypatch.setattr(tactical_rankings, "_engine", TacticalRankingEngine(database, min_position_players=1))
+
+    from app import app
+    yield app.test_client()
+    monkeypatch.undo()
+
+
+def test_tactical_rankings_endpoint(client):
+    response = client.post("/tactical_rankings", json={"playing_style": "Gegenpressing", "positions": "cmf", "limit": 3})
+    data = json.loads(response.data)
+
+    assert data["success"] is True
+    assert data["style"] == "gegenpressing"
+    assert [player["rank"] for player in data["rankings"]] == [1, 2, 3]
+    assert all("cmf" in player["positions"] for player in data["rankings"])
+
+
+def test_tactical_rankings_endpoint_rejects_unknown_style(client):
+    data = json.loads(client.post("/tactical_rankings", json={"playing_style": "route one"}).data)
+
+    assert data["success"] is False
+    assert "route one" in data["message"]
@@ -5,10 +5,25 @@ Utils module for KatenaScout backend
 from utils.formatters import (
     format_search_response, 
     format_comparison_response, 
-    format_error_response
+    format_error_response,
+    format_sse_event
 )
 from utils.validators import (
     validate_search_request, 
     validate_comparison_request, 
     sanitize_player_id
-)
\ No newline at end of file
+)
+from utils.prompt_encoder import (
+    encode_players_for_prompt,
+    estimate_tokens
+)
+from utils.timing import (
+    stage,
+    start_request_timing,
+    get_stage_timings,
+    format_server_timing
+)
+from utils.deadline import (
+    Deadline,
+    DeadlineExceeded
+)
@@ -0,0 +1,57 @@
+"""
+Request-scoped latency budgets for KatenaScout
+
+A route creates a Deadline when the request arrives and passes it down the
+pipeline (intent, entities, parameters, handlers, Claude calls). Each stage
+only uses the budget that is left, so a slow early Claude call shortens the
+timeouts and retries of later ones instead of the request taking minutes.
+"""
+
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when there is not enough budget left to start an operation"""
+    pass
+
+
+class Deadline:
+    """A fixed point in time by which the request should be answered"""
+
+    def __init__(self, budget_seconds: float):
+        """
+        Args:
+            budget_seconds: Total time allowed from now
+        """
+        self.budget_seconds = budget_seconds
+        self._started = time.monotonic()
+        self._expires_at = self._started + budget_seconds
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative)"""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        """Seconds spent since the deadline was created"""
+        return time.monotonic() - self._started
+
+    def expired(self) -> bool:
+        """Whether the budget is used up"""
+        return self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """Whether at least `seconds` of budget are left"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: float) -> float:
+        """A timeout for the next operation: the remaining budget, capped at `cap`"""
+        return min(cap, self.remaining())
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget={self.budget_seconds:.1f}s, remaining={self.remaining():.1f}s)"
+
+
+def timeout_for(deadline: Optional[Deadline], cap: float) -> float:
+    """Timeout for the next operation under an optional deadline (`cap` when there is none)"""
+    return deadline.timeout(cap) if deadline is not None else cap
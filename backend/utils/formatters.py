@@ -13,6 +13,9 @@ from config import PLAYER_IMAGES_DIR
 # Helper function to add player image information
 def add_player_image_info(player_data):
     """Add image URL and availability information to player data"""
+    if 'has_image' in player_data:
+        # Already added (e.g. while the narrative was being generated)
+        return player_data
     if 'wyId' in player_data and player_data['wyId']:
         # Convert wyId to string if it's not already
         player_id = str(player_data['wyId'])
@@ -135,7 +138,10 @@ def format_comparison_response(
     categorized_metrics: Optional[Dict[str, List[str]]] = None,
     category_winners: Optional[Dict[str, str]] = None,
     negative_metrics: Optional[List[str]] = None,
-    in_chat_comparison: Optional[bool] = False
+    in_chat_comparison: Optional[bool] = False,
+    standings: Optional[List[Dict[str, Any]]] = None,
+    dominance_matrix: Optional[List[List[float]]] = None,
+    metric_ranks: Optional[Dict[str, List[int]]] = None
 ) -> Dict[str, Any]:
     # Debug information
     print(f"DEBUG - Formatting comparison response with in_chat_comparison={in_chat_comparison}")
@@ -170,6 +176,14 @@ def format_comparison_response(
         'in_chat_comparison': in_chat_comparison  # Add the in_chat_comparison flag
     }
     
+    # N-way comparisons (three or more players) also carry the full rankings
+    if standings is not None:
+        response_data['standings'] = standings
+    if dominance_matrix is not None:
+        response_data['dominance_matrix'] = dominance_matrix
+    if metric_ranks is not None:
+        response_data['metric_ranks'] = metric_ranks
+    
     # Extra debug to verify the final response - minimal version
     print(f"DEBUG - Final comparison response has in_chat_comparison: {in_chat_comparison}")
     
@@ -189,4 +203,17 @@ def format_error_response(
     )
     
     # Convert to dict for jsonify
-    return response.model_dump()
\ No newline at end of file
+    return response.model_dump()
+
+def format_sse_event(event: str, data: Dict[str, Any]) -> str:
+    """
+    Format a single server-sent event
+    
+    Args:
+        event: Event name (e.g. "players", "narrative", "done")
+        data: JSON-serialisable payload
+        
+    Returns:
+        The event encoded in the text/event-stream wire format
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
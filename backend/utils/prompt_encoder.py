@@ -0,0 +1,172 @@
+"""
+Compact prompt encoding for KatenaScout
+
+This module turns player result lists into a compact table (a header row plus
+one row per player) for inclusion in Claude prompts. Compared to keyed JSON it
+does not repeat field names per player, rounds numbers and only includes the
+stats relevant to the active search, which cuts input tokens considerably.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from models.parameters import SearchParameters
+
+# Player profile columns included before the stat columns
+PROFILE_COLUMNS = ["name", "positions", "age", "height", "foot", "club", "nationality", "contractUntil", "score"]
+
+# Parameters that select players but are not statistics
+NON_STAT_PARAMETERS = [
+    "key_description_word", "position_codes", "age", "height", "weight",
+    "foot", "contract_expiration", "player_name", "is_name_search"
+]
+
+# Cell separator and placeholder for missing values
+SEPARATOR = "|"
+MISSING = "-"
+
+# Rough characters-per-token ratio used for local token estimates
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without calling the API
+
+    This is a heuristic (about four characters per token for mixed English
+    text and numbers); use it for budgeting and benchmarks, not billing.
+
+    Args:
+        text: The text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def stat_columns_for_params(params: SearchParameters) -> List[str]:
+    """
+    Get the player stat keys that correspond to the active search parameters
+
+    Mirrors the naming used by get_player_info: "average_passes" -> "passes",
+    "percent_successfulPasses" -> "successfulPasses_percent".
+
+    Args:
+        params: The active search parameters
+
+    Returns:
+        List of stat keys in parameter order
+    """
+    columns = []
+    for param in params.get_true_parameters():
+        if param in NON_STAT_PARAMETERS:
+            continue
+
+        parts = param.split('_', 1)
+        if len(parts) != 2:
+            continue
+
+        category, metric = parts
+        if category == "percent":
+            columns.append(f"{metric}_percent")
+        elif category in ("total", "average"):
+            columns.append(metric)
+
+    return columns
+
+
+def _format_cell(value: Any, decimals: int) -> str:
+    """Format a single value for the table"""
+    if value is None or value == "":
+        return MISSING
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, float):
+        # Round and drop trailing zeros ("12.50" -> "12.5", "3.00" -> "3")
+        text = f"{value:.{decimals}f}".rstrip("0").rstrip(".")
+        return text if text not in ("", "-0") else "0"
+    if isinstance(value, (list, tuple)):
+        return "/".join(str(item) for item in value) or MISSING
+    # Keep the separator out of free-text cells
+    return str(value).replace(SEPARATOR, "/").replace("\n", " ")
+
+
+def _project(player: Dict[str, Any], profile_columns: List[str], stat_columns: List[str]) -> Iterable[Any]:
+    """
+    Project a player onto the table columns
+
+    Values are read straight from the original player dict (and its "stats"),
+    so nothing is copied and complete_profile is never touched.
+    """
+    stats = player.get("stats") or {}
+    for column in profile_columns:
+        yield player.get(column)
+    for column in stat_columns:
+        yield stats.get(column)
+
+
+def encode_players_for_prompt(
+    players: List[Dict[str, Any]],
+    params: Optional[SearchParameters] = None,
+    decimals: int = 2
+) -> str:
+    """
+    Encode a list of players as a compact table for an LLM prompt
+
+    Args:
+        players: Player dictionaries as returned by get_player_info
+        params: Active search parameters; selects the stat columns. When not
+                provided, the union of the players' stat keys is used.
+        decimals: Maximum number of decimals for numeric values
+
+    Returns:
+        The encoded table, header row first
+    """
+    if params is not None:
+        stat_columns = stat_columns_for_params(params)
+    else:
+        stat_columns = []
+        for player in players:
+            for key in (player.get("stats") or {}):
+                if key not in stat_columns:
+                    stat_columns.append(key)
+
+    # Drop profile columns no player has, so the header stays short
+    profile_columns = [
+        column for column in PROFILE_COLUMNS
+        if any(player.get(column) not in (None, "", [], "Unknown") for player in players)
+    ]
+
+    lines = [SEPARATOR.join(profile_columns + stat_columns)]
+    for player in players:
+        lines.append(SEPARATOR.join(
+            _format_cell(value, decimals) for value in _project(player, profile_columns, stat_columns)
+        ))
+
+    return "\n".join(lines)
+
+
+def compare_encodings(players: List[Dict[str, Any]], params: Optional[SearchParameters] = None) -> Dict[str, Tuple[int, int]]:
+    """
+    Compare the legacy JSON encoding with the compact table
+
+    Args:
+        players: Player dictionaries as returned by get_player_info
+        params: Active search parameters
+
+    Returns:
+        Dictionary mapping encoding name to (characters, estimated tokens)
+    """
+    import json
+
+    legacy = json.dumps([
+        {key: value for key, value in player.items() if key != "complete_profile"}
+        for player in players
+    ])
+    compact = encode_players_for_prompt(players, params)
+
+    return {
+        "json": (len(legacy), estimate_tokens(legacy)),
+        "table": (len(compact), estimate_tokens(compact))
+    }
@@ -0,0 +1,62 @@
+"""
+Per-request stage timing for KatenaScout
+
+Code paths mark their stages with the stage() context manager; the durations
+are collected for the current request and returned to the client in a
+Server-Timing header, so load tests can break latency down per stage
+(intent recognition, parameter extraction, search, each Claude call, ...).
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Stage durations (milliseconds) of the request being handled, None outside a request
+_stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_timings", default=None)
+
+
+def start_request_timing() -> None:
+    """Start collecting stage timings for a new request"""
+    _stage_timings.set({})
+
+
+def get_stage_timings() -> Dict[str, float]:
+    """Get the stage timings collected for the current request"""
+    return dict(_stage_timings.get() or {})
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a stage of the current request
+
+    Repeated stages with the same name are summed. Outside a request (scripts,
+    tests) this is a no-op.
+
+    Args:
+        name: Stage name; letters, digits, "." and "_" only (Server-Timing token)
+    """
+    timings = _stage_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """
+    Format stage timings as a Server-Timing header value
+
+    Args:
+        timings: Mapping of stage name to duration in milliseconds
+
+    Returns:
+        Header value, e.g. "intent;dur=812.4, search;dur=35.0"
+    """
+    return ", ".join(f"{name};dur={duration:.1f}" for name, duration in timings.items())
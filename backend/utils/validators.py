@@ -3,7 +3,7 @@ Validation utilities for KatenaScout request inputs
 """
 
 from typing import Dict, Any, Tuple, Optional, List
-from config import SUPPORTED_LANGUAGES
+from config import SUPPORTED_LANGUAGES, MAX_COMPARISON_PLAYERS
 
 def validate_search_request(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Dict[str, Any]]:
     """
@@ -71,7 +71,10 @@ def validate_comparison_request(data: Dict[str, Any]) -> Tuple[bool, Optional[st
         "session_id": data.get("session_id", "default"),
         "player_ids": data.get("player_ids", []),
         "language": data.get("language", "english"),
-        "include_ai_analysis": data.get("include_ai_analysis", False)
+        "include_ai_analysis": data.get("include_ai_analysis", False),
+        "async": data.get("async", False),
+        "playing_style": data.get("playing_style", ""),
+        "formation": data.get("formation", "")
     }
     
     # Validate player_ids
@@ -81,6 +84,9 @@ def validate_comparison_request(data: Dict[str, Any]) -> Tuple[bool, Optional[st
     if len(validated["player_ids"]) < 2:
         return False, "At least two player IDs are required for comparison", validated
     
+    if len(validated["player_ids"]) > MAX_COMPARISON_PLAYERS:
+        return False, f"At most {MAX_COMPARISON_PLAYERS} players can be compared at once", validated
+    
     # Validate language
     if validated["language"] not in SUPPORTED_LANGUAGES:
         validated["language"] = "english"
@@ -89,6 +95,10 @@ def validate_comparison_request(data: Dict[str, Any]) -> Tuple[bool, Optional[st
     if not isinstance(validated["include_ai_analysis"], bool):
         validated["include_ai_analysis"] = False
     
+    # Validate async
+    if not isinstance(validated["async"], bool):
+        validated["async"] = False
+    
     return True, None, validated
 
 def validate_tactical_analysis_request(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Dict[str, Any]]:
@@ -122,7 +132,8 @@ def validate_tactical_analysis_request(data: Dict[str, Any]) -> Tuple[bool, Opti
         "playing_style": data.get("playing_style", "balanced_approach"),
         "formation": data.get("formation", "4-3-3"),
         "original_query": data.get("original_query", "Compare players for tactical fit"),
-        "language": data.get("language", "english")
+        "language": data.get("language", "english"),
+        "async": data.get("async", False)
     }
     
     # Validate player_ids
@@ -136,6 +147,137 @@ def validate_tactical_analysis_request(data: Dict[str, Any]) -> Tuple[bool, Opti
     if validated["language"] not in SUPPORTED_LANGUAGES:
         validated["language"] = "english"
     
+    # Validate async
+    if not isinstance(validated["async"], bool):
+        validated["async"] = False
+    
+    return True, None, validated
+
+def validate_tactical_rankings_request(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Dict[str, Any]]:
+    """
+    Validate tactical rankings request data
+
+    Args:
+        data: Request JSON data
+
+    Returns:
+        Tuple of (is_valid, error_message, validated_data)
+    """
+    from config import TACTICAL_RANKINGS
+    from core.tactical_analysis import FORMATIONS
+    from core.tactical_rankings import resolve_style
+
+    # Check if required fields are present
+    if not data:
+        return False, "Request body is missing", {}
+
+    if "playing_style" not in data:
+        return False, "playing_style parameter is required", {}
+
+    # Initialize validated data with defaults
+    validated = {
+        "playing_style": data.get("playing_style"),
+        "formation": data.get("formation"),
+        "positions": data.get("positions", []),
+        "limit": data.get("limit", TACTICAL_RANKINGS["default_limit"]),
+        "language": data.get("language", "english")
+    }
+
+    # Validate language
+    if validated["language"] not in SUPPORTED_LANGUAGES:
+        validated["language"] = "english"
+
+    # Validate playing_style (keys and display names are accepted)
+    style = resolve_style(str(validated["playing_style"]))
+    if style is None:
+        return False, f"Unknown playing_style: {validated['playing_style']}", validated
+    validated["playing_style"] = style
+
+    # Validate formation
+    if validated["formation"] is not None and validated["formation"] not in FORMATIONS:
+        return False, f"Unknown formation: {validated['formation']}", validated
+
+    # Validate positions (a single code is accepted too)
+    if isinstance(validated["positions"], str):
+        validated["positions"] = [validated["positions"]]
+    if not isinstance(validated["positions"], list):
+        return False, "positions must be an array of position codes", validated
+    validated["positions"] = [str(code).strip().lower() for code in validated["positions"] if code]
+
+    # Validate limit
+    try:
+        validated["limit"] = int(validated["limit"])
+    except (ValueError, TypeError):
+        validated["limit"] = TACTICAL_RANKINGS["default_limit"]
+    validated["limit"] = max(1, min(validated["limit"], TACTICAL_RANKINGS["max_limit"]))
+
+    return True, None, validated
+
+def validate_squad_builder_request(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Dict[str, Any]]:
+    """
+    Validate squad builder request data
+
+    Args:
+        data: Request JSON data
+
+    Returns:
+        Tuple of (is_valid, error_message, validated_data)
+    """
+    import re
+    from core.tactical_analysis import FORMATIONS
+    from core.tactical_rankings import resolve_style
+
+    # Check if required fields are present
+    if not data:
+        return False, "Request body is missing", {}
+
+    if "formation" not in data:
+        return False, "formation parameter is required", {}
+
+    if "playing_style" not in data:
+        return False, "playing_style parameter is required", {}
+
+    # Initialize validated data with defaults
+    validated = {
+        "formation": data.get("formation"),
+        "playing_style": data.get("playing_style"),
+        "player_ids": data.get("player_ids", []),
+        "club": data.get("club"),
+        "min_age": data.get("min_age"),
+        "max_age": data.get("max_age"),
+        "contract_expiration": data.get("contract_expiration"),
+        "language": data.get("language", "english")
+    }
+
+    # Validate language
+    if validated["language"] not in SUPPORTED_LANGUAGES:
+        validated["language"] = "english"
+
+    # Validate formation and playing_style
+    if validated["formation"] not in FORMATIONS:
+        return False, f"Unknown formation: {validated['formation']}", validated
+    style = resolve_style(str(validated["playing_style"]))
+    if style is None:
+        return False, f"Unknown playing_style: {validated['playing_style']}", validated
+    validated["playing_style"] = style
+
+    # Validate player_ids (the shortlist pool)
+    if not isinstance(validated["player_ids"], list):
+        return False, "player_ids must be an array", validated
+    validated["player_ids"] = [str(player_id) for player_id in validated["player_ids"]]
+
+    # Validate age range
+    for field in ("min_age", "max_age"):
+        if validated[field] is not None:
+            try:
+                validated[field] = int(validated[field])
+            except (ValueError, TypeError):
+                return False, f"{field} must be a number", validated
+
+    # Validate contract_expiration
+    if validated["contract_expiration"] and not re.match(r"^\d{4}-\d{2}-\d{2}$", str(validated["contract_expiration"])):
+        return False, "contract_expiration must be a date (YYYY-MM-DD)", validated
+
     return True, None, validated
 
 def sanitize_player_id(player_id: str) -> str: